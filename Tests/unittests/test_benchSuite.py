@@ -0,0 +1,77 @@
+"""
+Unit tests for the benchmark suite of the bootstrap path
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from lib.test.scripts import benchSuite
+
+
+def document(**times):
+    return {'results': {name: {'min': seconds, 'median': seconds}
+                        for name, seconds in times.items()}}
+
+
+class TestBenchSuite(unittest.TestCase):
+
+    def testCompare(self):
+        rows = benchSuite.compare(document(a=1.0, b=1.0, c=1.0, d=1e-5),
+                                  document(a=1.3, b=1.1, c=0.5, d=2e-5,
+                                           e=1.0),
+                                  0.2, 0.0001)
+        self.assertEqual([(r[0], r[3]) for r in rows],
+                         [('a', 'REGRESSION'), ('b', ''), ('c', 'improved'),
+                          ('d', '')])
+
+    def testRun(self):
+        result = benchSuite.run(['cfgData', 'master'], 2, 0.01)
+        self.assertEqual(set(result['results']),
+                         {'cfgData.parse', 'cfgData.interpolate',
+                          'cfgData.load', 'cfgData.loadCompiled',
+                          'master.call', 'master.snapshot',
+                          'master.shared'})
+        for summary in result['results'].values():
+            self.assertEqual(len(summary['samples']), 2)
+            self.assertLessEqual(summary['min'], summary['median'])
+        json.dumps(result)
+
+    def testSkip(self):
+        def unavailable(ctx):
+            raise benchSuite.Skip('not here')
+        with patch.dict(benchSuite.benchmarks, {'unavailable': unavailable}):
+            result = benchSuite.run(['unavailable'], 1, 1.0)
+        self.assertEqual(result['skipped'], {'unavailable': 'not here'})
+        self.assertEqual(result['results'], {})
+
+    def testRegressionExitStatus(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / 'baseline.json'
+            output = Path(tmp) / 'current.json'
+            args = ['--benchmark', 'cfgData', '--repeat', '1',
+                    '--scale', '0.01']
+            with patch('builtins.print'):
+                self.assertEqual(benchSuite.main(args + ['--output',
+                                                         str(baseline)]), 0)
+                slow = json.loads(baseline.read_text())
+                for summary in slow['results'].values():
+                    summary['min'] /= 100
+                baseline.write_text(json.dumps(slow))
+                self.assertEqual(benchSuite.main(
+                    args + ['--output', str(output),
+                            '--compare', str(baseline)]), 1)
+            self.assertIn('cfgData.parse',
+                          json.loads(output.read_text())['results'])
+
+
+if __name__ == "__main__":
+    unittest.main()
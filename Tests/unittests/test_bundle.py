@@ -0,0 +1,123 @@
+"""
+Unit tests for the bundles of compiled modules
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+from importlib import import_module
+from importlib.util import source_hash
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from gvConfig import bundle
+from gvConfig.bundle import BundleError, BundleFinder
+
+package = 'gvbundletest'
+sources = {
+    '__init__.py': 'VALUE = "package"\n',
+    'one.py': 'from . import two\nVALUE = two.VALUE + 1\n',
+    'two.py': 'VALUE = 1\n',
+    'sub/__init__.py': '',
+    'sub/three.py': 'from ..two import VALUE as TWO\nVALUE = TWO + 2\n',
+    'not-a-module.py': 'raise SyntaxError\n',
+    'data/ignored.py': 'raise SyntaxError\n',   # Not a package
+}
+
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.directory = self.root / package
+        for name, text in sources.items():
+            path = self.directory / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        self.path = self.root / 'config.bundle'
+        self.finders = []
+
+    def tearDown(self):
+        for finder in self.finders:
+            bundle.uninstall(finder)
+        for name in list(sys.modules):
+            if name == package or name.startswith(f'{package}.'):
+                del sys.modules[name]
+        if str(self.root) in sys.path:
+            sys.path.remove(str(self.root))
+        self._tmp.cleanup()
+
+    def install(self, verify=False):
+        finder = bundle.install(self.path, verify)
+        self.finders.append(finder)
+        return finder
+
+    def testBuild(self):
+        names = bundle.build(self.path, [(package, self.directory)])
+        self.assertEqual(sorted(names), [package, f'{package}.one',
+                                         f'{package}.sub',
+                                         f'{package}.sub.three',
+                                         f'{package}.two'])
+        with zipfile.ZipFile(self.path) as z:
+            data = z.read(f'{package}/one.pyc')
+        self.assertEqual(int.from_bytes(data[4:8], 'little'), 0b11)
+        self.assertEqual(data[8:16],
+                         source_hash(sources['one.py'].encode()))
+
+    def testImportWithoutSources(self):
+        bundle.build(self.path, [(package, self.directory)])
+        shutil.rmtree(self.directory)
+        finder = self.install()
+        self.assertIs(self.install(), finder)
+        self.assertEqual(import_module(f'{package}.one').VALUE, 2)
+        three = import_module(f'{package}.sub.three')
+        self.assertEqual(three.VALUE, 3)
+        self.assertIs(three.__loader__, finder)
+        self.assertEqual(sys.modules[package].VALUE, 'package')
+        self.assertEqual(finder.imported, [package, f'{package}.one',
+                                           f'{package}.two',
+                                           f'{package}.sub',
+                                           f'{package}.sub.three'])
+        with self.assertRaises(ImportError):
+            import_module(f'{package}.missing')
+
+    def testVerify(self):
+        bundle.build(self.path, [(package, self.directory)])
+        (self.directory / 'two.py').write_text('VALUE = 10\n')
+        (self.directory / '__init__.py').write_text('VALUE = "changed"\n')
+        # The changed modules are found without the sources on sys.path
+        finder = self.install(verify=True)
+        self.assertEqual(import_module(f'{package}.one').VALUE, 11)
+        self.assertEqual(sys.modules[package].VALUE, 'changed')
+        self.assertNotIn(package, finder.imported)
+        self.assertNotIn(f'{package}.two', finder.imported)
+        self.assertIn(f'{package}.one', finder.imported)
+        self.assertNotIn(str(self.root), sys.path)
+
+    def testUnusable(self):
+        self.path.write_bytes(b'not a zip file')
+        with self.assertRaises(BundleError):
+            BundleFinder(self.path)
+        with zipfile.ZipFile(self.path, 'w') as z:
+            z.writestr('manifest.json', '{"version": 1, "magic": "00000000",'
+                                        ' "modules": {}}')
+        with self.assertRaises(BundleError) as cm:
+            BundleFinder(self.path)
+        self.assertIn('another version of Python', str(cm.exception))
+
+    def testMain(self):
+        self.assertEqual(bundle.main([str(self.path),
+                                      f'{package}={self.directory}']), 0)
+        self.assertEqual(len(BundleFinder(self.path).modules), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Unit tests for the index of who may change the configuration
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from gvConfig import cfgData
+from gvConfig.cfgAuth import AuthIndex, Permission
+from gvConfig.cfgReload import CfgReloader
+
+store = '''[
+  [ "Global Village" = {
+      "organization-email"  = "orgadmin@globalvillage.tz",
+      "organization-admins" = ["1", ["carol", ["dave"]]],
+    }
+    "Site 1" {
+      "group"       = "Site 1",
+      "site-admins" = ["2"],
+      "site-email"  = "%organization-email",
+    }
+    "Site 2" {
+      "group"       = "Site 2",
+      "site-admins" = [],
+    }
+    "Open" = { "open-key" = "value" }
+  ],
+  [ { "userid" = "jonathan", "userident" = "1", "user-k" = "a" }
+    { "userid" = "erin", "userident" = "2", "user-k" = "b" }
+  ]
+]
+'''
+
+
+class TestCfgAuth(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AuthIndex(cfgData.loads(store))
+
+    def testAdminLists(self):
+        check = self.index.check
+        for name in ('1', 'jonathan', 'carol', 'dave'):
+            self.assertTrue(check(name, 'Global Village', Permission.ALL))
+        self.assertFalse(check('erin', 'Global Village', Permission.CHANGE))
+        self.assertTrue(check('erin', 'Site 1', Permission.DELETE))
+        self.assertFalse(check('jonathan', 'Site 1', Permission.ADD))
+        # An empty list protects the group from everyone
+        self.assertFalse(check('jonathan', 'Site 2', Permission.CHANGE))
+        self.assertEqual(self.index.permissions('carol', 'Site 1'),
+                         Permission.NONE)
+
+    def testUserGroups(self):
+        self.assertTrue(self.index.check('jonathan', 'jonathan',
+                                         Permission.ALL))
+        self.assertTrue(self.index.check('1', 'jonathan', Permission.ADD))
+        self.assertFalse(self.index.check('erin', 'jonathan',
+                                          Permission.CHANGE))
+
+    def testUnprotectedGroups(self):
+        self.assertNotIn('Open', self.index.protected)
+        self.assertTrue(self.index.check('anyone', 'Open', Permission.ALL))
+        self.assertTrue(self.index.check('anyone', 'New', Permission.ADD))
+        self.assertEqual(self.index.permissions('anyone', 'Open'),
+                         Permission.ALL)
+
+    def testRequire(self):
+        self.index.require('carol', 'Global Village', Permission.CHANGE)
+        with self.assertRaises(PermissionError):
+            self.index.require('erin', 'Global Village', Permission.CHANGE)
+
+    def testUpdate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'store.data'
+            path.write_text(store)
+            reloader = CfgReloader(path, compiled=False)
+            index = AuthIndex(reloader.load())
+
+            def edit(old, new):
+                path.write_text(path.read_text().replace(old, new))
+                changes = reloader.reload()
+                names = index.update(reloader.data, changes)
+                full = AuthIndex(reloader.data)
+                self.assertEqual(index._index, full._index)
+                self.assertEqual(index.protected, full.protected)
+                return names
+
+            # A change that does not touch the admin lists or the users
+            self.assertEqual(edit('"a" }', '"c" }'), set())
+            self.assertEqual(edit('["2"]', '["2", "carol"]'),
+                             {'2', 'erin', 'carol'})
+            self.assertTrue(index.check('carol', 'Site 1', Permission.CHANGE))
+            # jonathan is now known to the organization by another userident
+            edit('"userident" = "1"', '"userident" = "9"')
+            self.assertFalse(index.check('jonathan', 'Global Village',
+                                         Permission.CHANGE))
+            self.assertTrue(index.check('jonathan', 'jonathan',
+                                        Permission.CHANGE))
+            self.assertTrue(index.check('1', 'Global Village',
+                                        Permission.CHANGE))
+            edit('"site-admins" = [],', '"site-key" = "x",')
+            self.assertNotIn('Site 2', index.protected)
+            edit('{ "userid" = "erin", "userident" = "2", "user-k" = "b" }',
+                 '')
+            self.assertNotIn('erin', index._index)
+            self.assertNotIn('erin', index.protected)
+            self.assertEqual(index._index['2'], {'Site 1': Permission.ALL})
+
+
+if __name__ == "__main__":
+    unittest.main()
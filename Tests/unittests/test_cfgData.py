@@ -0,0 +1,135 @@
+"""
+Unit tests for the configuration data loader
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+from gvConfig import cfgData
+from gvConfig.cfgData import CfgDataError, Interpolation
+from lib.test.lib.synthetic import writeCfgData
+
+template = Path(__file__).resolve().parents[2] / 'templates' / 'cfg.data'
+
+
+class TestCfgData(unittest.TestCase):
+
+    def assertError(self, text, line, fragment):
+        with self.assertRaises(CfgDataError) as cm:
+            cfgData.loads(text, 'test.data')
+        self.assertEqual(cm.exception.line, line)
+        self.assertIn(fragment, str(cm.exception))
+        self.assertTrue(str(cm.exception).startswith(f'test.data:{line}:'))
+
+    def testTemplate(self):
+        data = cfgData.load(template, compiled=False)
+        self.assertEqual(list(data), ['Global Village', 'Dummy Site 1',
+                                      'jonathan'])
+        site = data['Dummy Site 1']
+        self.assertEqual(site['site-city'], 'Ottawa')
+        self.assertIsNone(site['site-room'])
+        self.assertEqual(site['use-logging'], 'true')
+        self.assertEqual(data['Global Village']['organization-admins'], ['1'])
+        self.assertEqual(data['jonathan']['user-name'][-1], 'Gossage')
+        self.assertEqual(data.groups['Dummy Site 1'].line, 23)
+
+    def testInterpolation(self):
+        data = cfgData.loads('''[
+            "org" = { "a" = "1", "b" = "2", "flag" = "true" }
+            "site" {
+                "a" = "%a % 9",             # The same key, earlier group
+                "c" = "%b",                 # Another key, earlier group
+                "d" = "%c",                 # A key in the same group
+                "e" = "%missing % %b % x",  # A chain that finds b
+                "f" = "%missing % x",
+                "g" = "%missing",
+                "h" = "%%literal",
+                "i" = ["%a", "plain"],
+                "flag" = "%flag % false",
+            }
+        ]''')
+        self.assertEqual(data['site'], {'a': '1', 'c': '2', 'd': '2',
+                                        'e': '2', 'f': 'x', 'g': None,
+                                        'h': '%literal', 'i': ['1', 'plain'],
+                                        'flag': 'true'})
+        self.assertEqual(data.dependencies[('site', 'd')], (('site', 'c'),))
+        self.assertEqual(sorted(data.dependents('org', 'b')),
+                         [('site', 'c'), ('site', 'd'), ('site', 'e')])
+
+    def testLaterGroupsAreNotVisible(self):
+        data = cfgData.loads('[ "a" { "x" = "%y % none" } "b" { "y" = "1" } ]')
+        self.assertEqual(data['a']['x'], 'none')
+
+    def testParseInterpolation(self):
+        self.assertEqual(cfgData.parseInterpolation('%a % %b % null'),
+                         Interpolation(('a', 'b'), None))
+        self.assertEqual(cfgData.parseInterpolation('plain'), 'plain')
+        self.assertIsNone(cfgData.parseInterpolation('null'))
+        self.assertEqual(cfgData.parseInterpolation('%'), '%')
+
+    def testAnonymousGroups(self):
+        data = cfgData.loads('[{ "group" = "g1" }, { "userid" = "jo" },'
+                             ' { "x" = "1" }]')
+        self.assertEqual(list(data), ['g1', 'jo', '@2'])
+
+    def testErrors(self):
+        self.assertError('[\n "g" { "a" = "x }\n]', 2, 'unterminated string')
+        self.assertError('[\n "g" { "a" = "x". }\n]', 2, "unexpected")
+        self.assertError('[\n "g" {\n "a" "x" }\n]', 3, "expected '='")
+        self.assertError('[ "g" {\n "a" = "1",\n "a" = "2" } ]', 3,
+                         "duplicate key 'a'")
+        self.assertError('[ "g" { }\n "g" { } ]', 2, "duplicate group 'g'")
+        self.assertError('[ "g" {\n "a" = "%b",\n "b" = "%a" } ]', 3,
+                         "circular interpolation of 'b'")
+        self.assertError('[ "g" { "a" = "1"', 1, 'end of file')
+
+    def testOffsets(self):
+        text = '[\n  "é" = { "a" = "1" },\n  "b" { "c" = "2" }\n]\n'
+        data = cfgData.loads(text)
+        raw = text.encode('utf-8')
+        for name in data:
+            g = data.groups[name]
+            part = raw[g.start:g.end].decode('utf-8')
+            self.assertTrue(part.startswith(f'"{name}"'))
+            self.assertTrue(part.endswith('}'))
+
+    def testDeepChains(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = writeCfgData(Path(tmp) / 'deep.data', 3000, 6)
+            data = cfgData.load(path, compiled=False)
+            self.assertEqual(data['group-2999']['shared-0'], 'value 0')
+
+    def testCompiledForm(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = writeCfgData(Path(tmp) / 'cfg.data', 20, 10)
+            first = cfgData.load(path)
+            cache = cfgData.compiledPath(path)
+            self.assertTrue(cache.is_file())
+            second = cfgData.load(path)
+            self.assertEqual(second['group-19'], first['group-19'])
+            self.assertEqual(second.dependencies, first.dependencies)
+            # The keys are interned in both forms
+            for data in (first, second):
+                key = next(k for k in data['group-19'] if k == 'shared-0')
+                self.assertIs(key, sys.intern('shared-0'))
+            # A change to the contents invalidates the compiled form
+            path.write_text(path.read_text().replace('value 19.9',
+                                                     'changed'))
+            self.assertEqual(cfgData.load(path)['group-19']['g19-k9'],
+                             'changed')
+            # A damaged compiled form is ignored
+            cache.write_bytes(b'junk')
+            self.assertEqual(cfgData.load(path)['group-19']['g19-k9'],
+                             'changed')
+
+
+if __name__ == "__main__":
+    unittest.main()
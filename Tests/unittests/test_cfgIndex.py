@@ -0,0 +1,87 @@
+"""
+Unit tests for selective loading of configuration data through an index
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from gvConfig import cfgData, cfgIndex
+from gvConfig.cfgIndex import CfgIndex
+from lib.test.lib.synthetic import writeCfgStore
+
+
+class TestCfgIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = writeCfgStore(Path(self._tmp.name) / 'store.data', 20, 5,
+                                  keys=4)
+        self.full = cfgData.load(self.path, compiled=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def testBuild(self):
+        index = CfgIndex(self.path)
+        self.assertFalse(index.load())
+        index.build()
+        self.assertTrue(cfgIndex.indexPath(self.path).is_file())
+        again = CfgIndex(self.path)
+        self.assertTrue(again.load())
+        self.assertEqual(len(again.entries), len(self.full))
+        entry = again.closure(['user-3-1'])
+        self.assertEqual([e.name for e in entry],
+                         ['organization', 'site-3', 'user-3-1'])
+        raw = self.path.read_bytes()
+        for e in entry:
+            self.assertEqual(raw[e.start:e.end].count(b'{'), 1)
+
+    def testSelect(self):
+        for attempt in range(2):     # Builds the index, then uses it
+            data = cfgIndex.loadGroups(self.path, ['user-3-1', 'site-7',
+                                                   'nobody'])
+            self.assertEqual(list(data), ['organization', 'site-3',
+                                          'user-3-1', 'site-7'])
+            for name in data:
+                self.assertEqual(data[name], self.full[name])
+                self.assertEqual(data.groups[name].line,
+                                 self.full.groups[name].line)
+            self.assertEqual(data.dependencies,
+                             {node: targets for node, targets
+                              in self.full.dependencies.items()
+                              if node[0] in data})
+
+    def testStale(self):
+        cfgIndex.loadGroups(self.path, ['site-1'])
+        text = self.path.read_text()
+        self.path.write_text(text.replace('"site-1" = {',
+                                          '"site-1" = { "new" = "%site-k0",'))
+        st = self.path.stat()
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        data = cfgIndex.loadGroups(self.path, ['site-1'])
+        self.assertEqual(data['site-1']['new'], 'site 1 value 0')
+
+    def testErrorLines(self):
+        cfgIndex.loadGroups(self.path, ['site-1'])
+        index = CfgIndex(self.path)
+        self.assertTrue(index.load())
+        entry = index.closure(['site-1'])[-1]
+        with self.assertRaises(cfgData.CfgDataError) as cm:
+            index._decode([entry._replace(end=entry.end - 1)])
+        # The line numbers are those of the file, not of the group
+        last = self.path.read_bytes()[:entry.end].count(b'\n') + 1
+        self.assertGreater(cm.exception.line, entry.line)
+        self.assertLessEqual(cm.exception.line, last)
+        self.assertIn('end of file', cm.exception.msg)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Unit tests for the incremental reload of configuration data files
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+from pathlib import Path
+import random
+import tempfile
+import unittest
+
+from gvConfig import cfgData
+from gvConfig.cfgReload import Change, CfgReloader, missing
+from lib.test.lib.synthetic import writeCfgStore
+
+
+class TestCfgReload(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = writeCfgStore(Path(self._tmp.name) / 'store.data', 20, 5,
+                                  keys=4)
+        self.reloader = CfgReloader(self.path, compiled=False)
+        self.assertEqual(self.reloader.reload(), {})    # The first load
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def edit(self, old, new, count=1):
+        text = self.path.read_text()
+        self.assertIn(old, text)
+        self.path.write_text(text.replace(old, new, count))
+        return self.reloader.reload()
+
+    def assertMatchesFile(self):
+        """The reloaded data is the same as that of a full load"""
+        full = cfgData.loads(self.path.read_text(), str(self.path))
+        data = self.reloader.data
+        self.assertEqual(list(data), list(full))
+        for name in full:
+            self.assertEqual(data[name], full[name])
+            a, b = data.groups[name], full.groups[name]
+            self.assertEqual((a.line, a.start, a.end, a.keyLines),
+                             (b.line, b.start, b.end, b.keyLines))
+        self.assertEqual(data.dependencies, full.dependencies)
+
+    def testValueEdit(self):
+        changes = self.edit('"admin@example.org"', '"root@example.org"')
+        self.assertFalse(self.reloader.full)
+        self.assertEqual(self.reloader.reparsed, 1)
+        # The organization value and every site-admin that takes it
+        self.assertEqual(len(changes), 21)
+        self.assertEqual(changes[('organization', 'organization-email')],
+                         Change('admin@example.org', 'root@example.org'))
+        self.assertEqual(changes[('site-7', 'site-admin')].new,
+                         'root@example.org')
+        self.assertEqual(self.reloader.resolved, 21)
+        self.assertMatchesFile()
+
+    def testUnchangedFile(self):
+        self.path.write_bytes(self.path.read_bytes())
+        self.assertEqual(self.reloader.reload(), {})
+        self.assertEqual(self.reloader.reparsed, 0)
+
+    def testEditMovesLaterGroups(self):
+        self.edit('"site 3 value 0",', '"site 3 value 0",\n'
+                  '      "extra" = "%organization-k1",  # Added\n')
+        self.assertFalse(self.reloader.full)
+        self.assertMatchesFile()
+        changes = self.edit('      "extra" = "%organization-k1",  # Added\n',
+                            '')
+        self.assertEqual(changes, {('site-3', 'extra'):
+                                   Change('value 1', missing)})
+        self.assertMatchesFile()
+
+    def testNewKeyShadowsEarlierGroup(self):
+        # user-4-0 takes site-email from site-4 until it has its own
+        changes = self.edit('"user 0 value 0",', '"user 0 value 0",'
+                            ' "site-email" = "me@example.org",', 5)
+        self.assertFalse(self.reloader.full)
+        self.assertEqual(changes[('user-0-0', 'user-email')],
+                         Change('site0@example.org', 'me@example.org'))
+        self.assertMatchesFile()
+
+    def testRenamedGroup(self):
+        changes = self.edit('"site-5" = {', '"site-five" = {')
+        self.assertFalse(self.reloader.full)
+        self.assertIn('site-five', self.reloader.data)
+        self.assertEqual(changes[('site-5', 'site-k0')].new, missing)
+        self.assertMatchesFile()
+
+    def testCommentBetweenGroups(self):
+        self.edit('  [  # Organization',
+                  '  # New comment\n  [  # Organization')
+        self.assertTrue(self.reloader.full)
+        self.assertMatchesFile()
+
+    def testSyntaxErrorKeepsData(self):
+        before = {name: dict(self.reloader.data[name])
+                  for name in self.reloader.data}
+        with self.assertRaises(cfgData.CfgDataError) as e:
+            self.edit('"site 3 value 0"', '"site 3 value 0')
+        self.assertIn('unterminated string', str(e.exception))
+        self.assertEqual({name: dict(self.reloader.data[name])
+                          for name in self.reloader.data}, before)
+        self.edit('"site 3 value 0', '"site 3 value 0"')
+        self.assertMatchesFile()
+
+    def testCircularEditKeepsData(self):
+        self.edit('"organization-k1" = "value 1"',
+                  '"organization-k1" = "%organization-k2"')
+        self.assertEqual(self.reloader.data['site-0']['site-k1'], 'value 2')
+        with self.assertRaisesRegex(cfgData.CfgDataError, 'circular'):
+            self.edit('"organization-k2" = "value 2"',
+                      '"organization-k2" = "%organization-k1"')
+        self.assertEqual(self.reloader.data['site-0']['site-k1'], 'value 2')
+        self.assertEqual(self.reloader.data['organization']['organization-k2'],
+                         'value 2')
+
+    def testRandomEdits(self):
+        rng = random.Random(16)
+        for n in range(60):
+            lines = self.path.read_text().split('\n')
+            k = rng.randrange(len(lines))
+            line = lines[k]
+            if '=' not in line or '{' in line or 'userid' in line:
+                continue
+            key = line.split('=')[0]
+            lines[k:k + 1] = rng.choice([
+                [f'{key}= "value {n}",'],
+                [f'{key}= "%organization-k{n % 4}",'],
+                [line, f'      "new-{n % 5}" = "%site-k{n % 4} % none",'],
+                []])
+            self.path.write_text('\n'.join(lines))
+            try:
+                cfgData.loads(self.path.read_text())
+            except cfgData.CfgDataError:
+                self.path.write_text('\n'.join(lines[:k] + [line] +
+                                               lines[k + 1:]))
+            self.reloader.reload()
+            self.assertMatchesFile()
+
+
+if __name__ == "__main__":
+    unittest.main()
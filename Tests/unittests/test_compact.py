@@ -0,0 +1,102 @@
+"""
+Unit tests for the compact configuration entry storage
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import sys
+import unittest
+
+from gvConfig import cfgData
+from gvConfig.compact import AdminPool, CompactEntry, CompactGroups, \
+    CompactStore
+
+
+class Admin():
+
+    def __init__(self, owner, groups=()):
+        self.owner = owner
+        self.groups = list(groups)
+
+
+class SlotAdmin():
+
+    __slots__ = ('owner',)
+
+    def __init__(self, owner):
+        self.owner = owner
+
+
+class TestCompact(unittest.TestCase):
+
+    def testEntry(self):
+        key = ''.join(['user', '-name'])
+        entry = CompactEntry(key, 'Jo', Admin('root'))
+        self.assertIs(entry.key, sys.intern('user-name'))
+        self.assertFalse(hasattr(entry, '__dict__'))
+        self.assertEqual(entry, CompactEntry('user-name', 'Jo', entry.admin))
+        self.assertNotEqual(entry, CompactEntry('user-name', 'Jo'))
+        with self.assertRaises(TypeError):
+            hash(entry)
+
+    def testPool(self):
+        pool = AdminPool()
+        first = Admin('root', ['wheel'])
+        self.assertIs(pool.intern(first), first)
+        self.assertIs(pool.intern(Admin('root', ['wheel'])), first)
+        self.assertIsNot(pool.intern(Admin('root', ['users'])), first)
+        self.assertIs(pool.intern(SlotAdmin('root')),
+                      pool.intern(SlotAdmin('root')))
+        self.assertIsNone(pool.intern(None))
+        self.assertEqual(len(pool), 3)
+        self.assertEqual(pool.index(first), 1)
+
+    def testStore(self):
+        store = CompactStore.fromEntries([
+            CompactEntry('a', '1', Admin('x')),
+            ('b', ['2', '3'], Admin('x')),
+            ('c', None)])
+        self.assertEqual(list(store), ['a', 'b', 'c'])
+        self.assertEqual(store['b'].value, ['2', '3'])
+        self.assertIs(store.admin('a'), store.admin('b'))
+        self.assertIsNone(store.admin('c'))
+        self.assertEqual(store.value('c'), None)
+        store.add('a', 'changed', None)
+        self.assertEqual(store['a'], CompactEntry('a', 'changed'))
+        self.assertEqual(len(store), 3)
+        self.assertNotIn('d', store)
+        with self.assertRaises(KeyError):
+            store['d']
+        self.assertEqual(dict(store)['b'].key, 'b')
+
+    def testEntriesAreChangedInPlace(self):
+        store = CompactStore.fromEntries([('a', '1', Admin('x')), ('b', '2')])
+        entry = store['a']
+        entry.value = 'changed'
+        self.assertEqual(store.value('a'), 'changed')
+        self.assertEqual(store['a'].value, 'changed')
+        store['b'].admin = Admin('x')
+        self.assertIs(store.admin('b'), store.admin('a'))
+        store.add('a', 'added', None)
+        self.assertEqual(entry, CompactEntry('a', 'added'))
+        with self.assertRaises(TypeError):
+            hash(entry)
+
+    def testGroups(self):
+        data = cfgData.loads('[ "org" = { "a" = "1" },'
+                             ' "site" = { "a" = "%a", "b" = "true" } ]')
+        groups = data.compact({('site', 'b'): Admin('siteadmin')})
+        self.assertIsInstance(groups, CompactGroups)
+        self.assertEqual(list(groups), ['org', 'site'])
+        self.assertEqual(groups['site'].value('a'), '1')
+        self.assertEqual(groups['site'].admin('b').owner, 'siteadmin')
+        self.assertIs(groups['org'].pool, groups['site'].pool)
+        self.assertIs(groups.group('site'), groups['site'])
+
+
+if __name__ == "__main__":
+    unittest.main()
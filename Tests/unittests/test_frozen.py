@@ -0,0 +1,88 @@
+"""
+Unit tests for the frozen configuration
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import pickle
+import unittest
+
+from gvConfig.compact import CompactEntry
+from gvConfig.frozen import Frozen, attributeName, freeze
+from gvConfig.layered import Layer, LayerStack
+
+
+class Getter():
+    """A configuration that only has `get`"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+class TestFrozen(unittest.TestCase):
+
+    def testAttributes(self):
+        frozen = freeze({'debug': True, 'site-city': 'Ottawa', 'pname': 'x'})
+        self.assertIsInstance(frozen, Frozen)
+        self.assertIs(frozen.debug, True)
+        self.assertEqual(frozen.site_city, 'Ottawa')
+        self.assertEqual(frozen['site-city'], 'Ottawa')
+        self.assertEqual(frozen.get('pname'), 'x')
+        self.assertIsNone(frozen.get('missing'))
+        self.assertEqual(dict(frozen), {'debug': True, 'site-city': 'Ottawa',
+                                        'pname': 'x'})
+        self.assertFalse(hasattr(frozen, '__dict__'))
+        with self.assertRaises(AttributeError):
+            frozen.missing
+
+    def testNames(self):
+        self.assertEqual(attributeName('use-logging'), 'use_logging')
+        self.assertIsNone(attributeName('class'))
+        self.assertIsNone(attributeName('1st'))
+        self.assertIsNone(attributeName('_private'))
+        self.assertIsNone(attributeName('a.b'))
+        self.assertEqual(attributeName('get'), 'get_')
+        self.assertEqual(attributeName('a-b', ['a_b']), 'a_b_')
+        frozen = freeze({'a_b': 1, 'a-b': 2, 'items': 3, 'class': 4})
+        self.assertEqual((frozen.a_b, frozen.a_b_, frozen.items_), (1, 2, 3))
+        self.assertEqual(frozen['class'], 4)
+        self.assertEqual(list(frozen.items())[2], ('items', 3))
+
+    def testImmutable(self):
+        frozen = freeze({'debug': True})
+        with self.assertRaises(AttributeError):
+            frozen.debug = False
+        with self.assertRaises(AttributeError):
+            del frozen.debug
+        with self.assertRaises(TypeError):
+            frozen['debug'] = False
+        self.assertIs(frozen.debug, True)
+
+    def testSources(self):
+        # Entries are unwrapped and interpolations resolved
+        entries = {'a': CompactEntry('a', 1), 'b': 2}
+        self.assertEqual(dict(freeze(entries)), {'a': 1, 'b': 2})
+        self.assertEqual(freeze(Getter({'a': 1}), ['a', 'b']).b, None)
+        view = LayerStack([Layer('org', {'city': 'Ottawa'})]).view(
+            Layer('site', {'site-city': '%city'}))
+        self.assertEqual(freeze(view).site_city, 'Ottawa')
+
+    def testClasses(self):
+        # The same keys share a class, and a frozen copy can be pickled
+        one = freeze({'a': 1, 'b': 2})
+        two = freeze({'a': 3, 'b': 4})
+        self.assertIs(type(one), type(two))
+        self.assertIsNot(type(one), type(freeze({'a': 1})))
+        copy = pickle.loads(pickle.dumps(two))
+        self.assertEqual((copy.a, copy.b), (3, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the in-memory index of users and groups
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from lib.linux import identity
+from lib.linux.identity import IdentityIndex
+from lib.test.lib.synthetic import writeGroup, writePasswd
+
+
+class TestIdentity(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = writePasswd(self.dir / 'passwd', 2000, 'target', 0.5)
+        self.groupPath = writeGroup(self.dir / 'group', 2000, 500, 2)
+        self.index = IdentityIndex(self.path, self.groupPath)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def testParseGroup(self):
+        g = identity.parseGroup('adm:x:4:syslog,jo\n')
+        self.assertEqual((g.name, g.gid, g.members), ('adm', 4,
+                                                      ('syslog', 'jo')))
+        self.assertEqual(identity.parseGroup('users:x:100:').members, ())
+        self.assertIsNone(identity.parseGroup('# comment'))
+        self.assertIsNone(identity.parseGroup('adm:x:four:'))
+        self.assertIsNone(identity.parseGroup('adm:x:4'))
+
+    def testUser(self):
+        u = self.index.user('user000042')
+        self.assertEqual((u.uid, u.gid, u.username),
+                         (10042, 10042, 'Synthetic User 42'))
+        # group021 lists users 42 and 43
+        self.assertEqual(u.groups, ('group021',))
+        self.assertEqual(u.gids, (10042, 10021))
+        self.assertEqual(self.index.byUid(10042), u)
+        self.assertEqual(self.index.user('target').uid, 1000)
+        self.assertIsNone(self.index.user('missing'))
+        self.assertIsNone(self.index.byUid(99))
+        self.assertEqual(u.cfgEntries(),
+                         {'userid': 'user000042',
+                          'user-name': ['Synthetic', 'User', '42']})
+
+    def testPrimaryGroupIsNotSupplementary(self):
+        # group000 is the primary group of user000000 and lists it
+        self.assertEqual(self.index.user('user000000').groups, ())
+        self.assertEqual(self.index.user('user000001').groups, ('group000',))
+        self.assertEqual(self.index.user('user001510').gids, (10010,))
+
+    def testGroups(self):
+        g = self.index.group('group002')
+        self.assertEqual(g.gid, 10002)
+        self.assertEqual(self.index.byGid(10002), g)
+        self.assertIsNone(self.index.group('nogroup'))
+        members = self.index.members('group002')
+        self.assertEqual(members, ['user000002', 'user000502', 'user001002',
+                                   'user001502', 'user000004', 'user000005'])
+
+    def testLookup(self):
+        found = self.index.lookup(['root', 'user001999', 'missing'])
+        self.assertEqual(found['root'].uid, 0)
+        self.assertEqual(found['user001999'].uid, 11999)
+        self.assertIsNone(found['missing'])
+        self.assertEqual(len(self.index), 2002)
+        self.assertIn('target', self.index)
+        self.assertEqual(self.index.builds, 1)
+
+    def testChangedFilesAreReadAgain(self):
+        self.assertIsNone(self.index.user('newuser'))
+        with open(self.path, 'a') as f:
+            f.write('newuser:x:5000:10001:New User:/home/new:/bin/sh\n')
+        with open(self.groupPath, 'a') as f:
+            f.write('extra:x:6000:newuser\n')
+        # Not seen until the next check
+        self.index.checkInterval = 3600
+        self.assertIsNone(self.index.user('newuser'))
+        self.index.refresh()
+        u = self.index.user('newuser')
+        self.assertEqual((u.uid, u.groups), (5000, ('extra',)))
+        self.assertEqual(self.index.builds, 2)
+        self.index.refresh()
+        self.assertEqual(self.index.builds, 2)
+
+    def testMissingGroupFile(self):
+        index = IdentityIndex(self.path, self.dir / 'nogroup')
+        self.assertEqual(index.user('root').groups, ())
+        self.assertIsNone(index.group('group000'))
+
+    def testShared(self):
+        self.assertIs(identity.identityIndex(self.path, self.groupPath),
+                      identity.identityIndex(str(self.path),
+                                             os.fspath(self.groupPath)))
+
+
+if __name__ == "__main__":
+    unittest.main()
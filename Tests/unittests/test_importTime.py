@@ -0,0 +1,133 @@
+"""
+Unit tests for lazy imports and the import time budget of the bootstrap
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+from lib import importTime
+from lib.importTime import ImportTime
+from lib.lazyImport import lazyModule
+
+top = Path(__file__).resolve().parents[2]
+budgetFile = Path(__file__).with_name('importBudget.json')
+
+sample = '''\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        900 |     encodings.aliases
+import time:      2000 |       2500 | encodings
+'''
+
+
+class TestLazyModule(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        package = Path(self._tmp.name) / 'lazyPackage'
+        package.mkdir()
+        (package / '__init__.py').write_text('')
+        (package / 'heavy.py').write_text(
+            'import sys\n'
+            'sys.lazyImportEvents.append("heavy")\n'
+            'value = 42\n')
+        sys.path.insert(0, self._tmp.name)
+        sys.lazyImportEvents = []
+
+    def tearDown(self):
+        sys.path.remove(self._tmp.name)
+        for name in ('lazyPackage', 'lazyPackage.heavy'):
+            sys.modules.pop(name, None)
+        del sys.lazyImportEvents
+        self._tmp.cleanup()
+
+    def testDeferred(self):
+        heavy = lazyModule('lazyPackage.heavy')
+        self.assertEqual(sys.lazyImportEvents, [])
+        self.assertIs(sys.modules['lazyPackage.heavy'], heavy)
+        self.assertEqual(heavy.value, 42)
+        self.assertEqual(sys.lazyImportEvents, ['heavy'])
+        from lazyPackage import heavy as again
+        self.assertEqual(again.value, 42)
+        self.assertEqual(sys.lazyImportEvents, ['heavy'])
+        self.assertIs(lazyModule('lazyPackage.heavy'), heavy)
+
+    def testMissing(self):
+        with self.assertRaises(ModuleNotFoundError):
+            lazyModule('lazyPackage.missing')
+
+
+class TestImportTime(unittest.TestCase):
+
+    def testParse(self):
+        self.assertEqual(importTime.parseImportTime(sample),
+                         {'_io': ImportTime(120, 120, 1),
+                          'encodings.aliases': ImportTime(300, 900, 2),
+                          'encodings': ImportTime(2000, 2500, 0)})
+
+    def testCheck(self):
+        measured = importTime.parseImportTime(sample)
+        budget = importTime.makeBudget(['encodings'], measured, ['_io'],
+                                       factor=1.0, slack=0)
+        self.assertEqual(budget['modules'], {'encodings': 2500})
+        problems = importTime.checkBudget(measured, budget)
+        self.assertEqual(len(problems), 1)
+        self.assertIn('_io', problems[0])
+        budget['modules']['encodings'] = 2000
+        budget['deferred'] = []
+        self.assertIn('encodings took 2500 us',
+                      importTime.checkBudget(measured, budget)[0])
+
+    def testBaseline(self):
+        measured = importTime.parseImportTime(sample)
+        budget = importTime.makeBudget(['encodings'], measured,
+                                       factor=1.0, slack=0, baseline=1000)
+        self.assertEqual(budget['baseline'], 1000)
+        budget['modules']['encodings'] = 2000
+        # A machine that starts the interpreter half as fast is allowed
+        # twice the time
+        self.assertEqual(importTime.checkBudget(measured, budget, 2000), [])
+        self.assertEqual(len(importTime.checkBudget(measured, budget, 1000)),
+                         1)
+        self.assertEqual(importTime.checkBudget(measured, budget,
+                                                timing=False), [])
+
+    def testFailedImportsAreLeftOut(self):
+        measured = importTime.measureImports(['json', 'noSuchModuleHere'],
+                                             runs=1, cwd=top)
+        self.assertIn('json', measured)
+        self.assertNotIn('noSuchModuleHere', measured)
+
+    def testBootstrapImports(self):
+        """Fails when the bootstrap imports a module that it must import
+        lazily"""
+        budget = importTime.loadBudget(budgetFile)
+        measured = importTime.measureImports(budget['bootstrap'], runs=1,
+                                             cwd=top)
+        self.assertEqual(importTime.checkBudget(measured, budget,
+                                                timing=False), [])
+
+    @unittest.skipUnless(os.environ.get('GV_IMPORT_TIMING'),
+                         'set GV_IMPORT_TIMING to check the import times')
+    def testBootstrapBudget(self):
+        """Fails when the bootstrap imports more slowly than its budget
+        allows. Update the budget with `python -m lib.importTime update`
+        after an intended change."""
+        budget = importTime.loadBudget(budgetFile)
+        baseline = importTime.measureBaseline(runs=3, cwd=top)
+        measured = importTime.measureImports(budget['bootstrap'], runs=3,
+                                             cwd=top)
+        self.assertEqual(importTime.checkBudget(measured, budget, baseline),
+                         [])
+
+if __name__ == "__main__":
+    unittest.main()
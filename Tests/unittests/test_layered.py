@@ -0,0 +1,117 @@
+"""
+Unit tests for the layered views of the configuration
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+from pathlib import Path
+import unittest
+
+from gvConfig import cfgData
+from gvConfig.cfgData import CfgDataError
+from gvConfig.layered import Layer, LayerStack, _Chain, layers
+
+template = Path(__file__).resolve().parents[2] / 'templates' / 'cfg.data'
+
+
+class TestLayered(unittest.TestCase):
+
+    def setUp(self):
+        self.data = cfgData.load(template, compiled=False)
+        organization, site, self.user = layers(self.data)
+        self.stack = LayerStack([organization, site])
+
+    def testTemplate(self):
+        # A view of the organization, the site and the user resolves every
+        # value as the loader does
+        view = self.stack.view(self.user)
+        expected = {}
+        for name in self.data:
+            expected.update(self.data[name])
+        self.assertEqual(dict(view), expected)
+        self.assertEqual(list(view)[:2], ['organization-type',
+                                          'organization-room'])
+        self.assertEqual(view['site-city'], 'Ottawa')
+        self.assertIsNone(view['site-room'])
+
+    def testInterpolation(self):
+        stack = LayerStack([
+            Layer('org', {'a': '1', 'b': '2', 'flag': 'true'}),
+            Layer('site', {'a': '%a % 9', 'c': '%b', 'd': '%c',
+                           'e': '%missing % %b % x', 'h': '%%literal',
+                           'i': ['%a', 'plain'], 'flag': '%flag % false'})])
+        view = stack.view(Layer('user', {'b': '3', 'j': '%b', 'k': '%a'}))
+        self.assertEqual(view['a'], '1')
+        self.assertEqual(view['c'], '2')    # The site only sees the org
+        self.assertEqual(view['d'], '2')
+        self.assertEqual(view['e'], '2')
+        self.assertEqual(view['h'], '%literal')
+        self.assertEqual(view['i'], ['1', 'plain'])
+        self.assertEqual(view['j'], '3')
+        self.assertEqual(view['k'], '1')
+        self.assertEqual(view['flag'], 'true')
+        self.assertEqual(stack.get('b'), '2')
+        self.assertNotIn('missing', view)
+
+    def testSharedValues(self):
+        # The resolved values of the stack are shared by every view
+        users = [self.stack.view(Layer(f'u{n}', {'userid': f'u{n}',
+                                                 'home': '%site-city'}))
+                 for n in range(3)]
+        for view in users:
+            self.assertEqual(view['home'], 'Ottawa')
+        self.assertIs(users[0]['site-website'], users[1]['site-website'])
+        self.assertEqual(self.stack._memo[(1, 'site-city')], 'Ottawa')
+        self.assertEqual([u['userid'] for u in users], ['u0', 'u1', 'u2'])
+
+    def testOverlay(self):
+        view = self.stack.view(self.user)
+        self.assertIsNone(view._overlay)
+        self.assertEqual(view['site-city'], 'Ottawa')
+        view['site-city'] = '%Toronto'      # Taken as it is
+        view['extra'] = 1
+        del view['site-room']
+        self.assertEqual(view['site-city'], '%Toronto')
+        self.assertNotIn('site-room', view)
+        self.assertNotIn('site-room', list(view))
+        with self.assertRaises(KeyError):
+            view['site-room']
+        with self.assertRaises(KeyError):
+            del view['missing']
+        self.assertEqual(view.changes(), {'site-city': '%Toronto',
+                                          'extra': 1})
+        # The layers are not changed
+        self.assertEqual(self.stack.view(self.user)['site-city'], 'Ottawa')
+        # The overlay wins over a value memoized before it was written
+        view = self.stack.view(self.user)
+        self.assertEqual(view['site-city'], 'Ottawa')
+        view._write()['site-city'] = 'Kingston'
+        self.assertEqual(view['site-city'], 'Kingston')
+
+    def testChainIsAbstract(self):
+        with self.assertRaises(TypeError):
+            _Chain()
+
+    def testCopyOnWrite(self):
+        view = self.stack.view(self.user)
+        view['a'] = 1
+        other = view.copy()
+        self.assertIs(other._overlay, view._overlay)
+        other['a'] = 2
+        view['b'] = 3
+        self.assertEqual(view.changes(), {'a': 1, 'b': 3})
+        self.assertEqual(other.changes(), {'a': 2})
+
+    def testCircular(self):
+        stack = LayerStack([Layer('org', {'a': '%b', 'b': '%a'}, 'test')])
+        with self.assertRaises(CfgDataError) as cm:
+            stack.view()['a']
+        self.assertIn('circular', str(cm.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Unit tests for lazily computed configuration entries
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+from threading import Thread
+import unittest
+
+from gvConfig.lazy import LazySource
+from gvConfig.providers import Providers, provides
+
+
+class Platform(Providers):
+    """A configCode like class with lazy and eager providers"""
+
+    def __init__(self):
+        self._cfgSource = LazySource()
+        self.calls = []
+
+    @provides('userid')
+    def platformA(self):
+        self.calls.append('A')
+        self._cfgSource['userid'] = 'jo'
+
+    @provides('uid', 'gid')
+    def platformUserData(self):
+        self.calls.append('UserData')
+        self._cfgSource['uid'] = 1000 if self._cfgSource['userid'] else 0
+        self._cfgSource['gid'] = 100
+
+    def platformEager(self):
+        self.calls.append('Eager')
+        self._cfgSource['eager'] = True
+
+    def register(self):
+        self.runProviders(self._cfgSource)
+
+
+class TestLazySource(unittest.TestCase):
+
+    def setUp(self):
+        self.p = Platform()
+        self.p.register()
+        self.src = self.p._cfgSource
+
+    def testOnlyEagerProvidersRunAtRegistration(self):
+        self.assertEqual(self.p.calls, ['Eager'])
+        self.assertEqual(sorted(self.src), ['eager', 'gid', 'uid', 'userid'])
+        self.assertEqual(len(self.src), 4)
+        self.assertIn('uid', self.src)
+        self.assertEqual(self.p.calls, ['Eager'])
+
+    def testReadingOneKeyRunsOnlyItsProvider(self):
+        self.assertEqual(self.src['userid'], 'jo')
+        self.assertEqual(self.p.calls, ['Eager', 'A'])
+        self.assertEqual(sorted(self.src.pending()), ['gid', 'uid'])
+
+    def testProvidersRunOnceAndMayDependOnEachOther(self):
+        self.assertEqual(self.src['gid'], 100)
+        self.assertEqual(self.src['uid'], 1000)
+        self.assertEqual(self.src['userid'], 'jo')
+        self.assertEqual(self.p.calls, ['Eager', 'UserData', 'A'])
+        self.assertEqual(self.src.pending(), [])
+
+    def testResolve(self):
+        self.src.resolve()
+        self.assertEqual(dict(self.src), {'eager': True, 'userid': 'jo',
+                                          'uid': 1000, 'gid': 100})
+
+    def testKeysThatAreNotSetAreAbsent(self):
+        provided = []
+        self.src.register(['shell', 'home'],
+                          lambda: self.src.__setitem__('home', '/home/jo'))
+        self.src.onProvided = lambda: provided.append(True)
+        self.assertIn('shell', self.src)
+        self.assertEqual(dict(self.src), {'eager': True, 'userid': 'jo',
+                                          'uid': 1000, 'gid': 100,
+                                          'home': '/home/jo'})
+        self.assertNotIn('shell', self.src)
+        self.assertIsNone(self.src.get('shell'))
+        with self.assertRaises(KeyError):
+            self.src['shell']
+        self.assertEqual(len(provided), 3)
+
+    def testAssignmentReplacesProvider(self):
+        self.src['uid'] = 5
+        del self.src['gid']
+        self.assertEqual(self.src['uid'], 5)
+        self.assertNotIn('gid', self.src)
+        self.assertEqual(self.p.calls, ['Eager'])
+        with self.assertRaises(KeyError):
+            del self.src['gid']
+
+    def testConcurrentReadsRunProviderOnce(self):
+        threads = [Thread(target=lambda: self.src['uid']) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.p.calls.count('UserData'), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Unit tests for the asynchronous lifecycle of applications
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+import unittest
+
+from lib import lifecycle
+
+
+class AsyncApp():
+    """Records the order of its lifecycle and of the bootstrap"""
+
+    def __init__(self, ret=0, startupRet=0, block=False):
+        self.events = []
+        self.ret = ret
+        self.startupRet = startupRet
+        self.block = block
+        self.background = None
+
+    async def startup(self):
+        self.events.append('startup start')
+        await asyncio.sleep(0.05)
+        self.events.append('startup end')
+        return self.startupRet
+
+    async def __call__(self):
+        self.events.append('run')
+        self.background = asyncio.ensure_future(asyncio.sleep(60))
+        if self.block:
+            await asyncio.sleep(60)
+        return self.ret
+
+    def shutdown(self):
+        self.events.append('shutdown')
+        return 0
+
+
+class TestLifecycle(unittest.TestCase):
+
+    def testIsAsync(self):
+        class Plain():
+            def startup(self):
+                pass
+
+            def __call__(self):
+                pass
+
+        class Callable():
+            async def __call__(self):
+                pass
+        self.assertTrue(lifecycle.isAsync(AsyncApp()))
+        self.assertTrue(lifecycle.isAsync(Callable()))
+        self.assertFalse(lifecycle.isAsync(Plain()))
+        self.assertFalse(lifecycle.isAsync(len))
+
+    def testBootstrapOverlapsStartup(self):
+        app = AsyncApp()
+
+        async def master():
+            app.events.append('master start')
+            await asyncio.sleep(0.1)
+            app.events.append('master end')
+
+        def configurationFile():
+            time.sleep(0.02)
+            app.events.append('file')
+        self.assertEqual(lifecycle.run(app, [master(), configurationFile],
+                                       ready=lambda: app.events.append(
+                                           'ready')),
+                         0)
+        self.assertLess(app.events.index('master start'),
+                        app.events.index('startup end'))
+        # The application runs only once the bootstrap is complete
+        self.assertEqual(app.events[-4:],
+                         ['master end', 'ready', 'run', 'shutdown'])
+        self.assertIn('file', app.events)
+        # Tasks left running by the application are cancelled
+        self.assertTrue(app.background.cancelled())
+
+    def testSynchronousMethods(self):
+        class Mixed():
+            def __init__(self):
+                self.events = []
+
+            def startup(self):
+                self.events.append('startup')
+
+            async def __call__(self):
+                self.events.append('run')
+                return 1
+
+        app = Mixed()
+        with self.assertRaisesRegex(AssertionError, 'return code 1'):
+            lifecycle.run(app)
+        self.assertEqual(app.events, ['startup', 'run'])
+
+    def testStartupFailure(self):
+        app = AsyncApp(startupRet=3)
+
+        async def master():
+            await asyncio.sleep(60)
+        task = master()
+        with self.assertRaisesRegex(AssertionError, 'startup failed'):
+            lifecycle.run(app, [task])
+        self.assertNotIn('run', app.events)
+        self.assertNotIn('shutdown', app.events)
+        self.assertIsNone(task.cr_frame)    # The bootstrap was cancelled
+
+    def testBootstrapError(self):
+        app = AsyncApp()
+
+        def broken():
+            raise OSError('no configuration')
+        with self.assertRaisesRegex(OSError, 'no configuration'):
+            lifecycle.run(app, [broken])
+        self.assertNotIn('run', app.events)
+        self.assertEqual(app.events[-1], 'shutdown')
+
+    @unittest.skipUnless(threading.current_thread() is
+                         threading.main_thread() and hasattr(signal, 'SIGINT'),
+                         'needs the main thread')
+    def testKeyboardInterrupt(self):
+        app = AsyncApp(block=True)
+        timer = threading.Timer(0.2, os.kill, (os.getpid(), signal.SIGINT))
+        timer.start()
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                lifecycle.run(app)
+        finally:
+            timer.cancel()
+        self.assertEqual(app.events[-2:], ['run', 'shutdown'])
+        self.assertTrue(app.background.cancelled())
+
+
+if __name__ == "__main__":
+    unittest.main()
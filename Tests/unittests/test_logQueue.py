@@ -0,0 +1,212 @@
+"""
+Unit tests for queue based logging
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import logging
+import os
+import threading
+import time
+import unittest
+
+from lib import logQueue
+
+
+class Recorder(logging.Handler):
+    """Keeps the messages of the records it handles. It can be held up."""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def emit(self, record):
+        self.entered.set()
+        self.gate.wait(10)
+        self.messages.append(record.getMessage())
+        if record.exc_text:
+            self.messages.append(record.exc_text)
+
+
+class QueueTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger(f'test_logQueue.{self.id()}')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.recorder = Recorder()
+        self.logger.handlers = [self.recorder]
+
+    def tearDown(self):
+        self.recorder.gate.set()
+        logQueue.uninstall()
+        self.logger.handlers = []
+
+    def install(self, spec=True, **kw):
+        return logQueue.install(spec, [self.logger], **kw)
+
+    def holdWriter(self):
+        """Holds the writer on the first record until the gate is set"""
+        self.recorder.gate.clear()
+        self.logger.info('first')
+        self.assertTrue(self.recorder.entered.wait(10))
+
+
+class TestLogQueue(QueueTestCase):
+
+    def testRecordsAreWrittenInOrder(self):
+        backend = self.install()
+        self.assertIs(self.install(), backend)
+        self.assertIsInstance(self.logger.handlers[0], logQueue.QueueHandler)
+        threads = [threading.Thread(
+            target=lambda n=n: [self.logger.info('%d-%d', n, i)
+                                for i in range(200)])
+                   for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(logQueue.flush())
+        self.assertEqual(len(self.recorder.messages), 1600)
+        for n in range(8):
+            mine = [m for m in self.recorder.messages
+                    if m.startswith(f'{n}-')]
+            self.assertEqual(mine, [f'{n}-{i}' for i in range(200)])
+
+    def testMessageAndTracebackAreFormattedWhenLogged(self):
+        self.install()
+        self.recorder.gate.clear()
+        values = [1]
+        self.logger.info('values %s', values)
+        try:
+            raise ValueError('bad value')
+        except ValueError:
+            self.logger.exception('failed')
+        values.append(2)
+        self.recorder.gate.set()
+        logQueue.flush()
+        self.assertEqual(self.recorder.messages[0], 'values [1]')
+        self.assertIn('ValueError: bad value', self.recorder.messages[2])
+
+    def testHandlerLevels(self):
+        self.recorder.setLevel(logging.WARNING)
+        self.install()
+        self.assertEqual(self.logger.handlers[0].level, logging.WARNING)
+        self.logger.info('ignored')
+        self.logger.warning('kept')
+        logQueue.flush()
+        self.assertEqual(self.recorder.messages, ['kept'])
+
+    def testDrop(self):
+        backend = self.install('drop:10')
+        self.holdWriter()
+        for i in range(25):
+            self.logger.info('%d', i)
+        self.assertEqual(backend.droppedTotal, 15)
+        self.recorder.gate.set()
+        logQueue.flush()
+        self.assertEqual(self.recorder.messages[:11],
+                         ['first'] + [str(i) for i in range(10)])
+        self.assertIn('15 log records were dropped',
+                      ' '.join(self.recorder.messages))
+
+    def testBlock(self):
+        backend = self.install('block:5')
+        self.holdWriter()
+        done = threading.Event()
+
+        def fill():
+            for i in range(10):
+                self.logger.info('%d', i)
+            done.set()
+        t = threading.Thread(target=fill)
+        t.start()
+        self.assertFalse(done.wait(0.2))    # Waiting for room on the queue
+        self.recorder.gate.set()
+        t.join(10)
+        self.assertTrue(done.is_set())
+        logQueue.flush()
+        self.assertEqual(self.recorder.messages,
+                         ['first'] + [str(i) for i in range(10)])
+        self.assertEqual(backend.droppedTotal, 0)
+
+    def testSample(self):
+        backend = self.install('sample:10', sampleRate=5)
+        self.holdWriter()
+        for i in range(10):
+            self.logger.info('%d', i)
+        for i in range(20):
+            self.logger.info('over %d', i)
+        self.logger.error('error')
+        self.recorder.gate.set()
+        logQueue.flush()
+        messages = self.recorder.messages
+        self.assertIn('error', messages)
+        self.assertEqual([m for m in messages if m.startswith('over')],
+                         ['over 4', 'over 9', 'over 14', 'over 19'])
+        # Each record kept replaced the oldest one on the queue
+        self.assertEqual(backend.droppedTotal, 21)
+        self.assertEqual(len(messages), 1 + 10 + 1)
+
+    def testUninstall(self):
+        self.install()
+        self.logger.info('queued')
+        logQueue.uninstall()
+        self.assertEqual(self.logger.handlers, [self.recorder])
+        self.assertEqual(self.recorder.messages, ['queued'])
+        self.assertTrue(logQueue.flush())
+
+    def testBadSpecification(self):
+        with self.assertRaises(ValueError):
+            self.install('fast')
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def testFork(self):
+        self.install()
+        self.logger.info('parent')
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                self.logger.info('child')
+                ok = logQueue.flush(5)
+                os.write(w, ('|'.join(self.recorder.messages) +
+                             f'|{ok}').encode())
+            finally:
+                os._exit(0)
+        os.close(w)
+        with os.fdopen(r) as f:
+            child = f.read()
+        os.waitpid(pid, 0)
+        # The parent record is only in the child if it was written before
+        # the fork, by the writer of the parent
+        self.assertIn(child, ('parent|child|True', 'child|True'))
+        logQueue.flush()
+        self.assertEqual(self.recorder.messages, ['parent'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def testForkDoesNotWaitForTheWriter(self):
+        release = threading.Event()
+        self.recorder.emit = lambda record: release.wait(10)
+        self.install()
+        self.logger.info('slow')
+        start = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        forked = time.monotonic() - start
+        os.waitpid(pid, 0)
+        release.set()
+        self.assertTrue(logQueue.flush())
+        self.assertLess(forked, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,500 @@
+"""
+Unit tests for the dependency aware running of the master files
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from pathlib import Path
+import py_compile
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from unittest.mock import patch
+
+from gvConfig import bundle, snapshot
+from gvConfig.master import Master
+from lib.test.lib import synthetic
+
+# A master file with a lazy provider that does not find its value
+lazyMaster = '''
+from gvConfig.lazy import LazySource
+from gvConfig.providers import Providers, provides
+
+
+class configCode(Providers):
+    dependencies = ()
+
+    def __init__(self):
+        global last
+        last = self
+        self._cfgSource = LazySource()
+        self.errors = 0
+
+    def __call__(self):
+        self.runProviders(self._cfgSource)
+
+    @provides('userid')
+    def platformA(self):
+        self._cfgSource['userid'] = 'jo'
+
+    @provides('uid')
+    def platformUserData(self):
+        self.errors += 1
+
+    def shutdown(self):
+        return self.errors
+'''
+
+
+class MasterTestCase(unittest.TestCase):
+    """Runs `Master` over synthetic master files in a temporary directory"""
+
+    package = 'gvconfig'
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.configDir = Path(self._tmp.name)
+        self._saved = (Master.configDir, Master._L, Master._C,
+                       Master.maxWorkers, Master.useSnapshot,
+                       Master.snapshotFile, Master.sharedSnapshot,
+                       Master.sharedDir, Master.remoteUrl,
+                       Master.remoteDigests, Master.bundlePath)
+        Master.configDir = self.configDir
+        Master._L = logging.getLogger('test_master')
+        Master._C = synthetic.Configuration
+        synthetic.events.clear()
+        synthetic.merged.clear()
+
+    def tearDown(self):
+        (Master.configDir, Master._L, Master._C, Master.maxWorkers,
+         Master.useSnapshot, Master.snapshotFile, Master.sharedSnapshot,
+         Master.sharedDir, Master.remoteUrl, Master.remoteDigests,
+         Master.bundlePath) = self._saved
+        for name in list(sys.modules):
+            if name == self.package or name.startswith(f'{self.package}.'):
+                del sys.modules[name]
+        if str(self.configDir) in sys.path:
+            sys.path.remove(str(self.configDir))
+        self._tmp.cleanup()
+
+    def write(self, name, delay=0.0, dependencies=None, **kw):
+        return synthetic.writeMasterFile(self.configDir, self.package, name,
+                                         delay, dependencies=dependencies,
+                                         **kw)
+
+    def order(self, event):
+        return [n for e, n, _ in synthetic.events if e == event]
+
+
+class TestMaster(MasterTestCase):
+
+    def testUndeclaredRunsInOrder(self):
+        for name in ('platform', 'siteMaster', 'organizationMaster'):
+            self.write(name)
+        self.assertEqual(Master()(), 0)
+        self.assertEqual(self.order('start'),
+                         ['platform', 'siteMaster', 'organizationMaster'])
+        self.assertEqual(self.order('merge'),
+                         ['platform', 'siteMaster', 'organizationMaster'])
+        self.assertEqual(len(synthetic.merged), 3)
+
+    def testIndependentRunTogether(self):
+        self.write('platform', 0.2, ())
+        self.write('siteMaster', 0.2, ())
+        self.write('organizationMaster', 0.0, ('siteMaster',))
+        self.write('gvMaster', 0.0, ('platform', 'organizationMaster'))
+        master = Master()
+        self.assertEqual(master(), 0)
+        starts = {n: t for e, n, t in synthetic.events if e == 'start'}
+        ends = {n: t for e, n, t in synthetic.events if e == 'end'}
+        merges = {n: t for e, n, t in synthetic.events if e == 'merge'}
+        # platform and siteMaster overlap
+        self.assertLess(starts['siteMaster'], ends['platform'])
+        self.assertLess(starts['platform'], ends['siteMaster'])
+        # Dependents only start once their dependencies have been merged
+        self.assertLess(merges['siteMaster'], starts['organizationMaster'])
+        self.assertLess(merges['organizationMaster'], starts['gvMaster'])
+        # Contributions are merged in masterFiles order
+        self.assertEqual(self.order('merge'),
+                         ['platform', 'siteMaster', 'organizationMaster',
+                          'gvMaster'])
+        self.assertEqual(set(master.timings),
+                         {'platform', 'siteMaster', 'organizationMaster',
+                          'GlobalVillage'})
+        self.assertGreaterEqual(master.timings['platform'], 0.2)
+
+    def testCycle(self):
+        self.write('platform', 0.0, ('siteMaster',))
+        self.write('siteMaster', 0.0, ('platform',))
+        with self.assertLogs('test_master', logging.WARNING):
+            self.assertEqual(Master()(), 0)
+        self.assertEqual(self.order('merge'), ['platform', 'siteMaster'])
+
+    def testArun(self):
+        self.write('platform', 0.2, (), asynchronous=True)
+        self.write('siteMaster', 0.2, ())
+        self.write('organizationMaster', 0.0, ('siteMaster',),
+                   asynchronous=True)
+        master = Master()
+
+        async def run():
+            # Other work on the loop goes on while the master files run
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            ticker = asyncio.ensure_future(tick())
+            result = await master.arun()
+            ticker.cancel()
+            return result, ticks
+        result, ticks = asyncio.run(run())
+        self.assertEqual(result, 0)
+        self.assertGreater(ticks, 5)
+        starts = {n: t for e, n, t in synthetic.events if e == 'start'}
+        ends = {n: t for e, n, t in synthetic.events if e == 'end'}
+        self.assertLess(starts['siteMaster'], ends['platform'])
+        self.assertLess(starts['platform'], ends['siteMaster'])
+        self.assertEqual(self.order('merge'),
+                         ['platform', 'siteMaster', 'organizationMaster'])
+        self.assertEqual(len(synthetic.merged), 3)
+
+    def testAsyncMasterFileWithoutLoop(self):
+        self.write('platform', 0.0, (), asynchronous=True)
+        self.assertEqual(Master()(), 0)
+        self.assertEqual(self.order('end'), ['platform'])
+
+    def testLateErrorsOfLazyProviders(self):
+        path = self.configDir / self.package / 'platform.py'
+        path.parent.mkdir(parents=True)
+        (path.parent / '__init__.py').touch()
+        path.write_text(lazyMaster)
+        master = Master()
+        self.assertEqual(master(), 0)
+        self.assertEqual(master.lateErrors, 0)
+        source = sys.modules[f'{self.package}.platform'].last._cfgSource
+        self.assertIsNone(source.get('uid'))
+        self.assertEqual(master.lateErrors, 1)
+        self.assertEqual(dict(source), {'userid': 'jo'})
+        self.assertEqual(master.lateErrors, 1)
+
+    def testMissingFilesAreSkipped(self):
+        self.write('gvMaster', 0.0, ('platform',))
+        self.assertEqual(Master()(), 0)
+        self.assertEqual(self.order('merge'), ['gvMaster'])
+
+    def testRerunLeavesTheCompiledForm(self):
+        cached = Path(py_compile.compile(str(self.write('platform', 0.0, (),
+                                                        keys=1))))
+        master = Master()
+        master()
+        self.write('platform', 0.0, (), keys=2)
+        self.assertEqual(master.rerun('platform'), 0)
+        self.assertTrue(cached.is_file())
+        self.assertEqual(synthetic.merged['platform-1'], 1)
+
+
+class TestSnapshot(MasterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        Master.useSnapshot = True
+        Master.snapshotFile = self.configDir / 'cache' / 'bootstrap.snapshot'
+        self.write('platform', 0.0, (), keys=3)
+        self.write('siteMaster', 0.0, ('platform',), keys=2)
+
+    def rerun(self):
+        synthetic.events.clear()
+        synthetic.merged.clear()
+        return Master()()
+
+    def testWarmStartSkipsMasterFiles(self):
+        self.assertEqual(Master()(), 0)
+        self.assertTrue(Master.snapshotFile.is_file())
+        cold = dict(synthetic.merged)
+        self.assertEqual(len(cold), 5)
+        self.assertEqual(self.rerun(), 0)
+        self.assertEqual(self.order('start'), [])
+        self.assertEqual(synthetic.merged, cold)
+
+    def testChangedMasterFileInvalidates(self):
+        Master()()
+        path = self.write('siteMaster', 0.0, ('platform',), keys=4)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        self.rerun()
+        self.assertEqual(self.order('start'), ['platform', 'siteMaster'])
+
+    def testExpiredEntriesRerunTheirMasterFile(self):
+        self.write('siteMaster', 0.0, ('platform',), keys=2,
+                   ttl={'siteMaster-1': 0.0})
+        Master()()
+        self.rerun()
+        self.assertEqual(self.order('start'), ['siteMaster'])
+        self.assertEqual(len(synthetic.merged), 5)
+
+    def testExpiredEntriesKeepTheMergeOrder(self):
+        self.write('platform', 0.0, (), keys=3, ttl={'platform-0': 0.0})
+        path = self.write('siteMaster', 0.0, ('platform',), keys=2)
+        path.write_text(path.read_text().replace("f'siteMaster-{n}': n",
+                                                 "f'platform-{n}': 'site'"))
+        Master()()
+        full = dict(synthetic.merged)
+        self.assertEqual(full['platform-0'], 'site')
+        for _ in range(2):
+            self.rerun()
+            self.assertEqual(self.order('start'), ['platform'])
+            self.assertEqual(synthetic.merged, full)
+
+    def testVersionMismatch(self):
+        Master()()
+        with patch.object(snapshot, 'snapshotVersion', 0):
+            self.rerun()
+        self.assertEqual(self.order('start'), ['platform', 'siteMaster'])
+
+
+class TestSharedSnapshot(MasterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        Master.sharedSnapshot = True
+        Master.sharedDir = self.configDir / 'shm'
+        self.write('platform', 0.0, (), keys=3)
+        self.write('siteMaster', 0.0, ('platform',), keys=2)
+
+    def rerun(self):
+        synthetic.events.clear()
+        synthetic.merged.clear()
+        master = Master()
+        return master, master()
+
+    def testLaterProcessesAttach(self):
+        first, errors = self.rerun()
+        self.assertEqual(errors, 0)
+        self.assertIsNone(first.sharedView)
+        built = dict(synthetic.merged)
+        self.assertEqual(len(built), 5)
+        second, errors = self.rerun()
+        self.assertEqual(errors, 0)
+        self.assertEqual(self.order('start'), [])
+        self.assertEqual(second.sharedView.generation, 1)
+        self.assertEqual(synthetic.merged, built)
+
+    def testExpiredSnapshotIsPublishedAgain(self):
+        self.write('siteMaster', 0.0, ('platform',), keys=2,
+                   ttl={'siteMaster-1': 0.0})
+        self.rerun()
+        master, _ = self.rerun()
+        self.assertEqual(self.order('start'), ['platform', 'siteMaster'])
+        self.assertIsNone(master.sharedView)
+        self.assertEqual(len(synthetic.merged), 5)
+
+    def testPublishedFromWarmSnapshot(self):
+        Master.useSnapshot = True
+        Master.snapshotFile = self.configDir / 'cache' / 'bootstrap.snapshot'
+        Master.sharedSnapshot = False
+        self.rerun()
+        Master.sharedSnapshot = True
+        self.rerun()
+        self.assertEqual(self.order('start'), [])
+        master, _ = self.rerun()
+        self.assertEqual(master.sharedView.generation, 1)
+        self.assertEqual(len(synthetic.merged), 5)
+
+
+class StubConfiguration():
+    """
+    Keeps the sources that are added to it, as `lib.configuration` does, so
+    that their lazy entries are only computed when they are read
+    """
+
+    sources = []
+
+    @classmethod
+    def add(cls, source):
+        cls.sources.append(source)
+
+    @classmethod
+    def read(cls, key):
+        for source in reversed(cls.sources):
+            if key in source:
+                return source[key]
+        raise KeyError(key)
+
+
+class TestPlatformProviders(MasterTestCase):
+    """
+    Runs the platform master file over a stub configuration, to check that
+    the lazy providers only run when one of their keys is read
+    """
+
+    def setUp(self):
+        super().setUp()
+        configuration = types.ModuleType('lib.configuration')
+        configuration.__dict__.update(
+            Configuration=StubConfiguration,
+            CfgEntry=lambda key, value, **kw: value,
+            CfgAdmin=lambda user, **kw: user,
+            userid='userid', uid='uid', gid='gid', username='username',
+            computer_name='computer_name')
+        logging_ = types.ModuleType('lib.gvLogging')
+        logging_.Logging = logging.getLogger('test_master')
+        modules = patch.dict(sys.modules, {'lib.configuration': configuration,
+                                           'lib.gvLogging': logging_})
+        modules.start()
+        self.addCleanup(modules.stop)
+        sys.modules.pop('gvConfig.platform', None)
+        self.addCleanup(sys.modules.pop, 'gvConfig.platform', None)
+        StubConfiguration.sources = []
+        Master._C = StubConfiguration
+        Master.sharedDir = self.configDir / 'shm'
+        Master.snapshotFile = self.configDir / 'cache' / 'bootstrap.snapshot'
+        path = self.configDir / self.package / 'platform.py'
+        path.parent.mkdir(parents=True)
+        (path.parent / '__init__.py').touch()
+        path.write_text('from gvConfig.platform import configCode\n')
+        record = types.SimpleNamespace(uid=1000, gid=100, username='Jo')
+        lookup = patch('lib.platforms.lookupUser', return_value=record)
+        self.lookupUser = lookup.start()
+        self.addCleanup(lookup.stop)
+
+    def launch(self):
+        StubConfiguration.sources = []
+        self.assertEqual(Master()(), 0)
+        self.assertTrue(StubConfiguration.read('userid'))
+        self.lookupUser.assert_not_called()
+
+    def check(self, launches):
+        for _ in range(launches):
+            self.launch()
+        self.assertEqual(StubConfiguration.read('uid'), 1000)
+        self.lookupUser.assert_called_once()
+
+    def testUserDataIsNotReadWithTheUserid(self):
+        self.check(1)
+
+    def testSnapshotDoesNotReadTheUserData(self):
+        Master.useSnapshot = True
+        self.check(2)
+
+    def testSharedSnapshotDoesNotReadTheUserData(self):
+        Master.sharedSnapshot = True
+        self.check(2)
+
+    def testBothSnapshotsDoNotReadTheUserData(self):
+        Master.useSnapshot = True
+        Master.sharedSnapshot = True
+        self.check(3)
+
+
+class TestRemote(MasterTestCase):
+
+    def testRemoteMasterFiles(self):
+        self.write('platform', 0.0, (), keys=1)
+        site = self.write('siteMaster', 0.0, ('platform',), keys=2)
+        served = {'siteMaster.py': site.read_bytes()}
+        site.unlink()
+        with synthetic.ConfigServer(served) as server:
+            Master.remoteUrl = server.url
+            Master.remoteDigests = {'siteMaster': hashlib.sha256(
+                served['siteMaster.py']).hexdigest()}
+            master = Master()
+            self.assertEqual(master(), 0)
+        self.assertEqual(self.order('start'), ['platform', 'siteMaster'])
+        self.assertEqual(len(synthetic.merged), 3)
+        self.assertEqual(master.remote.status, {'siteMaster': 'fetched',
+                                                'organizationMaster':
+                                                'failed'})
+        self.assertEqual(site.read_bytes(), served['siteMaster.py'])
+        # The server is gone, but the copy is still fresh
+        synthetic.events.clear()
+        master = Master()
+        self.assertEqual(master(), 0)
+        self.assertEqual(master.remote.status['siteMaster'], 'fresh')
+        self.assertEqual(self.order('start'), ['platform', 'siteMaster'])
+
+
+class TestBundle(MasterTestCase):
+
+    def tearDown(self):
+        for finder in list(sys.meta_path):
+            if isinstance(finder, bundle.BundleFinder):
+                bundle.uninstall(finder)
+        super().tearDown()
+
+    def testMasterFilesFromBundle(self):
+        self.write('platform', 0.0, (), keys=1)
+        self.write('siteMaster', 0.0, ('platform',), keys=2)
+        directory = self.configDir / self.package
+        Master.bundlePath = self.configDir / 'config.bundle'
+        bundle.build(Master.bundlePath, [(self.package, directory)])
+        shutil.rmtree(directory)
+        master = Master()
+        self.assertEqual(master(), 0)
+        self.assertEqual(self.order('start'), ['platform', 'siteMaster'])
+        self.assertEqual(len(synthetic.merged), 3)
+        self.assertNotIn(str(self.configDir), sys.path)
+        self.assertEqual(master.bundle.imported,
+                         [self.package, f'{self.package}.platform',
+                          f'{self.package}.siteMaster'])
+
+    def testRemoteMasterFilesAreNotTakenFromTheBundle(self):
+        self.write('platform', 0.0, (), keys=1)
+        site = self.write('siteMaster', 0.0, ('platform',), keys=2)
+        Master.bundlePath = self.configDir / 'config.bundle'
+        bundle.build(Master.bundlePath, [(self.package, self.configDir /
+                                          self.package)])
+        served = {'siteMaster.py': self.write('siteMaster', 0.0,
+                                              ('platform',),
+                                              keys=3).read_bytes()}
+        site.unlink()
+        with synthetic.ConfigServer(served) as server:
+            Master.remoteUrl = server.url
+            Master.remoteDigests = {'siteMaster': hashlib.sha256(
+                served['siteMaster.py']).hexdigest()}
+            master = Master()
+            self.assertEqual(master(), 0)
+        self.assertEqual(master.remote.status['siteMaster'], 'fetched')
+        self.assertEqual(synthetic.merged['siteMaster-2'], 2)
+        self.assertEqual(master.bundle.imported,
+                         [self.package, f'{self.package}.platform'])
+
+    def testRerunUsesTheSource(self):
+        self.write('platform', 0.0, (), keys=1)
+        self.write('siteMaster', 0.0, ('platform',), keys=2)
+        Master.bundlePath = self.configDir / 'config.bundle'
+        bundle.build(Master.bundlePath, [(self.package, self.configDir /
+                                          self.package)])
+        master = Master()
+        self.assertEqual(master(), 0)
+        self.write('siteMaster', 0.0, ('platform',), keys=3)
+        synthetic.events.clear()
+        self.assertEqual(master.rerun('siteMaster'), 0)
+        self.assertEqual(self.order('start'), ['siteMaster'])
+        self.assertEqual(synthetic.merged['siteMaster-2'], 2)
+        self.assertNotIn(str(self.configDir), sys.path)
+
+    def testUnusableBundle(self):
+        self.write('platform', 0.0, (), keys=1)
+        Master.bundlePath = self.configDir / 'missing.bundle'
+        master = Master()
+        with self.assertLogs('test_master', 'WARNING'):
+            self.assertEqual(master(), 0)
+        self.assertIsNone(master.bundle)
+        self.assertEqual(self.order('start'), ['platform'])
+
+
+if __name__ == "__main__":
+    unittest.main()
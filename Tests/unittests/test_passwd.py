@@ -0,0 +1,94 @@
+"""
+Unit tests for the streaming and indexed password file lookups
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from lib.linux import passwd
+from lib.test.lib.synthetic import writePasswd
+
+
+class TestPasswd(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = writePasswd(self.dir / 'passwd', 5000, 'target', 0.7)
+        self.indexPath = self.dir / 'passwd.idx'
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def testParseRecord(self):
+        r = passwd.parseRecord('jo:x:1000:100:Jo Smith,,,:/home/jo:/bin/sh\n')
+        self.assertEqual(r.uid, 1000)
+        self.assertEqual(r.gid, 100)
+        self.assertEqual(r.username, 'Jo Smith')
+        self.assertIsNone(passwd.parseRecord('# comment'))
+        self.assertIsNone(passwd.parseRecord('jo:x:abc:100:::'))
+        self.assertIsNone(passwd.parseRecord('too:few:fields'))
+
+    def testFindUser(self):
+        r = passwd.findUser('target', self.path)
+        self.assertEqual((r.userid, r.uid, r.username),
+                         ('target', 1000, 'Target User'))
+        self.assertEqual(passwd.findUser('root', self.path).uid, 0)
+        self.assertEqual(passwd.findUser('user004999', self.path).uid, 14999)
+        self.assertIsNone(passwd.findUser('targ', self.path))
+        self.assertIsNone(passwd.findUser('missing', self.path))
+
+    def testFindUserAcrossChunks(self):
+        saved = passwd.chunkSize
+        passwd.chunkSize = 7    # Forces matches to straddle chunks
+        try:
+            for userid in ('root', 'target', 'user000123', 'user004999'):
+                expected = next(r for r in passwd.iterRecords(self.path)
+                                if r.userid == userid)
+                self.assertEqual(passwd.findUser(userid, self.path), expected)
+        finally:
+            passwd.chunkSize = saved
+
+    def testIndex(self):
+        index = passwd.PasswdIndex(self.indexPath, self.path)
+        self.assertEqual(index.lookup('target'),
+                         passwd.findUser('target', self.path))
+        self.assertTrue(self.indexPath.is_file())
+        self.assertIsNone(index.lookup('missing'))
+        for n in (0, 2500, 4999):
+            userid = f'user{n:06d}'
+            self.assertEqual(index.lookup(userid).uid, 10000 + n)
+
+    def testIndexInvalidation(self):
+        index = passwd.PasswdIndex(self.indexPath, self.path)
+        self.assertIsNone(index.lookup('newuser'))
+        with open(self.path, 'r+', encoding='utf-8') as f:
+            text = f.read()
+            f.seek(0)
+            f.write('newuser:x:42:42:New User:/home/new:/bin/sh\n' + text)
+        # Make sure that the change is visible even on coarse clocks
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns,
+                                st.st_mtime_ns + 1000000000))
+        self.assertEqual(index.lookup('newuser').uid, 42)
+        self.assertEqual(index.lookup('target').uid, 1000)
+
+    def testLookupUser(self):
+        self.assertEqual(passwd.lookupUser('target', self.path).uid, 1000)
+        self.assertEqual(passwd.lookupUser('target', self.path,
+                                           self.indexPath).uid, 1000)
+        if passwd.pwd is not None:
+            me = passwd.pwd.getpwuid(os.getuid())
+            self.assertEqual(passwd.lookupUser(me.pw_name).uid, os.getuid())
+
+
+if __name__ == "__main__":
+    unittest.main()
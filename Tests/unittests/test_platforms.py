@@ -0,0 +1,104 @@
+"""
+Unit tests for the dispatch to the platform specific packages
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from lib import platforms
+import lib.linux
+import lib.windows
+from lib.linux import passwd
+
+top = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def run(code):
+    """Runs `code` in a new interpreter and returns its standard output"""
+    return subprocess.run([sys.executable, '-c', code], cwd=top, check=True,
+                          capture_output=True, text=True).stdout.split()
+
+
+class TestPlatforms(unittest.TestCase):
+
+    def setUp(self):
+        platforms.reset()
+        self.addCleanup(platforms.reset)
+
+    def testCurrent(self):
+        self.assertEqual(platforms.current('linux'), 'linux')
+        self.assertEqual(platforms.current('win32'), 'win32')
+        self.assertIsNone(platforms.current('darwin'))
+        with mock.patch.object(sys, 'platform', 'linux'):
+            self.assertEqual(platforms.current(), 'linux')
+        # Examined once per process
+        with mock.patch.object(sys, 'platform', 'darwin'):
+            self.assertEqual(platforms.current(), 'linux')
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'Linux only')
+    def testDispatch(self):
+        self.assertIs(platforms.package(), lib.linux)
+        self.assertIs(platforms.lookupUser, passwd.lookupUser)
+        self.assertIn('lookupUser', vars(platforms))
+        self.assertIs(lib.linux.findUser, passwd.findUser)
+        self.assertIn('findUser', dir(lib.linux))
+        with self.assertRaises(AttributeError):
+            platforms.noSuchFunction
+        with self.assertRaises(AttributeError):
+            lib.linux.noSuchFunction
+        platforms.reset()
+        self.assertNotIn('lookupUser', vars(platforms))
+
+    def testUnsupported(self):
+        for platform, message in (('win32', 'not supported yet'),
+                                  ('darwin', 'not a supported platform')):
+            platforms.reset()
+            with mock.patch.object(sys, 'platform', platform):
+                with self.assertRaises(platforms.UnsupportedPlatform) as cm:
+                    platforms.package()
+                self.assertIn(message, str(cm.exception))
+                with self.assertRaises(AttributeError) as cm:
+                    platforms.lookupUser
+                self.assertIsInstance(cm.exception.__cause__,
+                                      platforms.UnsupportedPlatform)
+                self.assertFalse(hasattr(platforms, 'lookupUser'))
+        self.assertEqual(dir(lib.windows), sorted(vars(lib.windows)))
+        with self.assertRaises(AttributeError):
+            lib.windows.lookupUser
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'Linux only')
+    def testImportsOnlyWhatIsUsed(self):
+        loaded = run('import sys\n'
+                     'from lib import platforms\n'
+                     'platforms.lookupUser\n'
+                     'print(*sorted(m for m in sys.modules'
+                     ' if m.startswith("lib.")))')
+        self.assertEqual(loaded, ['lib.linux', 'lib.linux.passwd',
+                                  'lib.platforms'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs fork')
+    def testForkInheritsTable(self):
+        found = run('import os, sys\n'
+                    'from lib import platforms\n'
+                    'names = platforms.preload(["lookupUser", "Inotify"])\n'
+                    'pid = os.fork()\n'
+                    'if pid == 0:\n'
+                    '    print(*[n in vars(platforms) for n in names],'
+                    ' flush=True)\n'
+                    '    os._exit(0)\n'
+                    'os.waitpid(pid, 0)\n')
+        self.assertEqual(found, ['True', 'True'])
+
+
+if __name__ == "__main__":
+    unittest.main()
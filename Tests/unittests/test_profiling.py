@@ -0,0 +1,145 @@
+"""
+Unit tests for the profiling sessions and the merge tool
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import io
+import os
+from pathlib import Path
+import pstats
+import tempfile
+import time
+import unittest
+
+from lib import profiling
+from lib.profiling import Session
+
+
+def busy(seconds):
+    end = time.process_time() + seconds
+    total = 0
+    while time.process_time() < end:
+        total += sum(range(100))
+    return total
+
+
+def idle():
+    return 0
+
+
+class ProfilingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def functions(self, path):
+        return {f[2] for f in pstats.Stats(str(path)).stats}
+
+
+class TestSessions(ProfilingTestCase):
+
+    def testSpecification(self):
+        session = Session.fromSpecification(f'sample:run:{self.directory}',
+                                            'app')
+        self.assertIsInstance(session.profiler, profiling.SamplingProfiler)
+        self.assertEqual((session.scope, session.directory, session.program),
+                         ('run', self.directory, 'app'))
+        session = Session.fromSpecification(True)
+        self.assertIsInstance(session.profiler,
+                              profiling.DeterministicProfiler)
+        self.assertEqual(session.scope, 'process')
+        with self.assertRaises(ValueError):
+            Session.fromSpecification('gprof')
+        with self.assertRaises(ValueError):
+            Session.fromSpecification('cprofile:sometimes')
+
+    def testUniqueNames(self):
+        paths = set()
+        for _ in range(3):
+            session = Session('cprofile', 'process', self.directory, 'app')
+            session.begin()
+            idle()
+            paths.add(session.finish())
+        self.assertEqual(len(paths), 3)
+        for path in paths:
+            self.assertTrue(path.name.startswith(f'app-{os.getpid()}-'))
+            self.assertEqual(path.suffix, '.prof')
+
+    def runPhases(self, scope):
+        session = Session('cprofile', scope, self.directory, scope)
+        session.begin()
+        busy(0.001)
+        session.phase('run')
+        idle()
+        session.phase('shutdown')
+        return self.functions(session.finish())
+
+    def testScopes(self):
+        startup = self.runPhases('startup')
+        self.assertIn('busy', startup)
+        self.assertNotIn('idle', startup)
+        run = self.runPhases('run')
+        self.assertNotIn('busy', run)
+        self.assertIn('idle', run)
+        process = self.runPhases('process')
+        self.assertTrue({'busy', 'idle'} <= process)
+
+    def testSampling(self):
+        session = Session('sample', 'process', self.directory, 'app')
+        session.profiler.interval = 0.001
+        session.begin()
+        busy(0.2)
+        path = session.finish()
+        self.assertEqual(path.suffix, '.folded')
+        self.assertGreater(session.profiler.samples, 10)
+        lines = path.read_text().splitlines()
+        self.assertTrue(any(';busy (' in line for line in lines))
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+
+
+class TestMerge(ProfilingTestCase):
+
+    def testMerge(self):
+        for n in range(2):
+            for backend in ('cprofile', 'sample'):
+                session = Session(backend, 'process', self.directory, 'app')
+                session.profiler.interval = 0.001
+                session.begin()
+                busy(0.05)
+                session.finish()
+        out = io.StringIO()
+        combined = self.directory / 'combined'
+        self.assertEqual(profiling.merge([self.directory], out,
+                                         combined=combined), 4)
+        report = out.getvalue()
+        self.assertIn('cProfile: 2 profiles', report)
+        self.assertIn('Sampled: 2 profiles', report)
+        self.assertIn('busy', report)
+        self.assertIn('busy', self.functions(f'{combined}.prof'))
+        self.assertTrue(Path(f'{combined}.folded').is_file())
+
+    def testCommand(self):
+        output = self.directory / 'report.txt'
+        self.assertEqual(profiling.main(['merge', str(self.directory),
+                                         '-o', str(output)]), 1)
+        session = Session('cprofile', 'process', self.directory, 'app')
+        session.begin()
+        busy(0.001)
+        session.finish()
+        self.assertEqual(profiling.main(['merge', str(self.directory),
+                                         '-o', str(output)]), 0)
+        self.assertIn('busy', output.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
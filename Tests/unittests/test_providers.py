@@ -0,0 +1,127 @@
+"""
+Unit tests for the provider registry of the master files
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import asyncio
+import unittest
+
+from gvConfig.lazy import LazySource
+from gvConfig.providers import Cost, ProviderSpec, Providers, provides
+
+
+class Platform(Providers):
+
+    def __init__(self):
+        self.calls = []
+
+    @provides('userid')
+    def platformA(self):
+        self.calls.append('A')
+
+    @provides(cost=Cost.EXPENSIVE)
+    def platformScan(self):
+        self.calls.append('Scan')
+
+    @provides(cost=Cost.IO, cacheable=False)
+    def platformIO(self):
+        self.calls.append('IO')
+
+    def platformPlain(self):
+        self.calls.append('Plain')
+
+    @provides('host', cost=Cost.IO, parallel=False, cacheable=False)
+    def hostName(self):
+        self.calls.append('host')
+
+    def helper(self):
+        """Not a provider"""
+
+
+class Serial(Providers):
+
+    @provides(parallel=False)
+    def platformOnly(self):
+        pass
+
+
+class AsyncPlatform(Providers):
+
+    def __init__(self):
+        self.calls = []
+
+    @provides(cost=Cost.IO)
+    async def platformFetch(self):
+        await asyncio.sleep(0.01)
+        self.calls.append('Fetch')
+
+    @provides('later')
+    async def platformLater(self):
+        self.calls.append('Later')
+
+    @provides(cost=Cost.IO, parallel=False)
+    def platformAlone(self):
+        self.calls.append('Alone')
+
+    def platformPlain(self):
+        self.calls.append('Plain')
+
+
+class TestProviders(unittest.TestCase):
+
+    def testRegistryIsBuiltAtClassCreation(self):
+        self.assertEqual([s.name for s in Platform.providers],
+                         ['hostName', 'platformA', 'platformIO',
+                          'platformPlain', 'platformScan'])
+        self.assertEqual(Platform.providers[1],
+                         ProviderSpec('platformA', ('userid',)))
+        self.assertEqual(Platform.providers[3], ProviderSpec('platformPlain'))
+        self.assertEqual(Providers.providers, ())
+
+    def testCostAndFlags(self):
+        self.assertEqual(Platform.providerCost(), Cost.EXPENSIVE)
+        self.assertTrue(Platform.parallelSafe())    # hostName is lazy
+        self.assertFalse(Serial.parallelSafe())
+        self.assertEqual(Serial.providerCost(), Cost.CHEAP)
+        self.assertEqual(Platform.volatileKeys(), {'host': 0.0})
+
+    def testRunProviders(self):
+        p = Platform()
+        source = LazySource()
+        p.runProviders(source)
+        # Eager providers run cheapest first, lazy ones are registered
+        self.assertEqual(p.calls, ['Plain', 'IO', 'Scan'])
+        self.assertEqual(sorted(source.pending()), ['host', 'userid'])
+
+    def testArunProviders(self):
+        p = AsyncPlatform()
+        source = LazySource()
+        asyncio.run(p.arunProviders(source))
+        # Coroutine providers run at once even if they declare keys, and the
+        # provider that must run alone runs last
+        self.assertEqual(p.calls[0], 'Plain')
+        self.assertEqual(p.calls[-1], 'Alone')
+        self.assertEqual(sorted(p.calls), ['Alone', 'Fetch', 'Later',
+                                           'Plain'])
+        self.assertEqual(source.pending(), [])
+        # Synchronous providers behave as in runProviders
+        p = Platform()
+        asyncio.run(p.arunProviders(source))
+        self.assertEqual(sorted(p.calls), ['IO', 'Plain', 'Scan'])
+        self.assertEqual(sorted(source.pending()), ['host', 'userid'])
+
+    def testSubclassesInheritProviders(self):
+        class Site(Platform):
+            def platformSite(self):
+                pass
+        self.assertIn('platformSite', [s.name for s in Site.providers])
+        self.assertEqual(len(Site.providers), len(Platform.providers) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
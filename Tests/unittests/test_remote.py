@@ -0,0 +1,122 @@
+"""
+Unit tests for the master files fetched from a configuration server
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import hashlib
+import json
+from pathlib import Path
+import tempfile
+import time
+import unittest
+
+from gvConfig.remote import RemoteMasters
+from lib.test.lib.synthetic import ConfigServer
+
+files = {'siteMaster.py': b'SITE = 1\n',
+         'organizationMaster.py': b'ORGANIZATION = 1\n'}
+modules = ['siteMaster', 'organizationMaster']
+
+
+class TestRemote(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name) / 'gvconfig'
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def remote(self, server, digests=None):
+        if digests is None:
+            # The server is plain HTTP, so the master files are pinned
+            digests = {m: hashlib.sha256(server.files[f'{m}.py']).hexdigest()
+                       for m in modules if f'{m}.py' in server.files}
+        return RemoteMasters(server.url, self.directory, digests)
+
+    def testFetchedTogether(self):
+        with ConfigServer(dict(files), delay=0.3) as server:
+            remote = self.remote(server)
+            start = time.perf_counter()
+            status = remote.sync(modules)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(status, {m: 'fetched' for m in modules})
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual(remote.path('siteMaster').read_bytes(), b'SITE = 1\n')
+        meta = json.loads(remote.metaPath('siteMaster').read_text())
+        self.assertEqual(meta['maxAge'], 60.0)
+        self.assertTrue(meta['etag'].startswith('"'))
+
+    def testFreshCopyIsUsed(self):
+        with ConfigServer(dict(files)) as server:
+            self.remote(server).sync(modules)
+            status = self.remote(server).sync(modules)
+        self.assertEqual(status, {m: 'fresh' for m in modules})
+        self.assertEqual(len(server.requests), 2)
+
+    def testStaleWhileRevalidate(self):
+        with ConfigServer(dict(files)) as server:
+            self.remote(server).sync(modules)
+            server.delay = 0.5
+            server.files['siteMaster.py'] = b'SITE = 2\n'
+            remote = self.remote(server)
+            start = time.perf_counter()
+            status = remote.sync(modules, now=time.time() + 3600)
+            elapsed = time.perf_counter() - start
+            self.assertEqual(status, {m: 'stale' for m in modules})
+            # The old copy is used at once
+            self.assertLess(elapsed, 0.2)
+            self.assertEqual(remote.path('siteMaster').read_bytes(),
+                             b'SITE = 1\n')
+            self.assertTrue(remote.wait(5))
+        self.assertEqual(remote.refreshed, {'siteMaster': 'fetched',
+                                            'organizationMaster':
+                                            'notModified'})
+        # The outcome of the sync is not changed by the revalidation
+        self.assertEqual(remote.status, status)
+        self.assertEqual(remote.path('siteMaster').read_bytes(), b'SITE = 2\n')
+        self.assertEqual(sorted(r[1:] for r in server.requests[2:]),
+                         [(True, 200), (True, 304)])
+
+    def testServerUnavailable(self):
+        with ConfigServer(dict(files)) as server:
+            self.remote(server).sync(modules[:1])
+        remote = self.remote(server)
+        status = remote.sync(modules, now=time.time() + 3600)
+        self.assertEqual(status, {'siteMaster': 'stale',
+                                  'organizationMaster': 'failed'})
+        self.assertIn('organizationMaster', remote.errors)
+        self.assertTrue(remote.wait(5))
+        self.assertEqual(remote.status['siteMaster'], 'stale')
+        self.assertEqual(remote.refreshed, {'siteMaster': 'stale'})
+        self.assertIn('siteMaster', remote.refreshErrors)
+        self.assertEqual(remote.path('siteMaster').read_bytes(), b'SITE = 1\n')
+
+    def testUnverifiedMasterFilesAreRefused(self):
+        with ConfigServer(dict(files)) as server:
+            unpinned = self.remote(server, {})
+            status = unpinned.sync(modules)
+            pinned = self.remote(server, {'siteMaster': '0' * 64})
+            status.update(pinned.sync(modules[:1]))
+        self.assertEqual(status, {m: 'failed' for m in modules})
+        self.assertIn('pinned digest', str(unpinned.errors['siteMaster']))
+        self.assertIn('does not match', str(pinned.errors['siteMaster']))
+        self.assertFalse(unpinned.path('siteMaster').exists())
+
+    def testConnectionsReused(self):
+        with ConfigServer(dict(files)) as server:
+            remote = self.remote(server)
+            for module in modules * 3:
+                remote.fetch(module)
+            remote.pool.close()
+        self.assertEqual(remote.pool.opened, 1)
+        self.assertEqual(len(server.requests), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Unit tests for the configuration shared between processes
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import os
+from pathlib import Path, PurePosixPath
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from gvConfig import sharedSnapshot
+from gvConfig.sharedSnapshot import SharedSnapshot
+
+entries = {'name': 'gv',
+           'userid': 'user000001',
+           'uid': 10001,
+           'ratio': 0.5,
+           'enabled': True,
+           'missing': None,
+           'groups': ['adm', 'users'],
+           'limits': {'files': 1024, 'procs': (1, 2)},
+           'blob': b'\0\1\2',
+           'home': PurePosixPath('/home/user000001'),
+           'résumé': 'café'}
+
+
+class TestSharedSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        self.shared = SharedSnapshot('a' * 64, self.directory)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def testRoundTrip(self):
+        self.assertEqual(self.shared.publish(entries), 1)
+        view = self.shared.attach()
+        self.assertEqual(view.generation, 1)
+        self.assertEqual(list(view), list(entries))
+        self.assertEqual(len(view), len(entries))
+        self.assertEqual(dict(view), entries)
+        self.assertIsInstance(view['home'], PurePosixPath)
+        self.assertNotIn('other', view)
+        self.assertNotIn(1, view)
+        with self.assertRaises(KeyError):
+            view['other']
+        view.close()
+
+    def testValuesAreDecodedWhenRead(self):
+        self.shared.publish(entries)
+        view = self.shared.attach()
+        self.assertIn('groups', view)
+        self.assertEqual(view._values, {})
+        self.assertEqual(view['groups'], ['adm', 'users'])
+        self.assertEqual(list(view._values), ['groups'])
+
+    def testManyKeys(self):
+        many = {f'key-{n}': n for n in range(5000)}
+        self.shared.publish(many)
+        view = self.shared.attach()
+        for key, value in many.items():
+            self.assertEqual(view[key], value)
+        self.assertNotIn('key-5000', view)
+
+    def testGenerations(self):
+        self.shared.publish({'value': 1})
+        old = self.shared.attach()
+        self.assertFalse(old.stale())
+        self.assertEqual(self.shared.publish({'value': 2, 'more': 3}), 2)
+        # The old generation is unchanged until the process attaches again
+        self.assertTrue(old.stale())
+        self.assertEqual(dict(old), {'value': 1})
+        new = self.shared.attach()
+        self.assertEqual(new.generation, 2)
+        self.assertEqual(dict(new), {'value': 2, 'more': 3})
+
+    def testExpiry(self):
+        now = time.time()
+        self.shared.publish({'value': 1}, now + 10)
+        self.assertIsNotNone(self.shared.attach(now))
+        self.assertTrue(self.shared.attach(now).stale(now + 10))
+        self.assertIsNone(self.shared.attach(now + 10))
+
+    def testLazyMasterFiles(self):
+        self.shared.publish({'value': 1}, lazy=['platform'])
+        view = self.shared.attach()
+        self.assertEqual(view.lazy, ['platform'])
+        self.assertEqual(dict(view), {'value': 1})
+        self.assertEqual(len(view), 1)
+        self.assertNotIn(sharedSnapshot._lazyKey, view)
+        self.assertEqual(self.shared.attach().lazy, ['platform'])
+        self.shared.publish({'value': 1})
+        self.assertEqual(self.shared.attach().lazy, [])
+
+    def testRejected(self):
+        self.assertIsNone(self.shared.attach())
+        self.shared.publish(entries)
+        # The same file name for a different key
+        self.assertIsNone(SharedSnapshot('a' * 63 + 'b',
+                                         self.directory).attach())
+        with patch.object(sharedSnapshot, 'layoutVersion', 0):
+            self.assertIsNone(self.shared.attach())
+        os.chmod(self.shared.path, 0o622)
+        self.assertIsNone(self.shared.attach())
+
+    def testUnpicklableValue(self):
+        self.assertEqual(self.shared.publish({'lock': lambda: None}), 0)
+        self.assertIsNone(self.shared.attach())
+
+    @unittest.skipUnless(hasattr(os, 'O_NOFOLLOW'), 'needs O_NOFOLLOW')
+    def testLinksAreNotFollowed(self):
+        victim = self.directory / 'victim'
+        victim.write_bytes(b'kept')
+        path = self.shared.path
+        path.with_name(f'{path.name}.{os.getpid()}').symlink_to(victim)
+        path.with_name(f'{path.name}.lock').symlink_to(victim)
+        self.assertEqual(self.shared.publish({'value': 1}), 1)
+        self.assertEqual(self.shared.attach()['value'], 1)
+        self.shared.acquire()
+        self.assertIsNone(self.shared._lock)
+        self.assertEqual(victim.read_bytes(), b'kept')
+
+    def testLockOfSomeoneElseIsNotUsed(self):
+        lock = self.shared.path.with_name(f'{self.shared.path.name}.lock')
+        lock.touch(0o666)
+        os.chmod(lock, 0o666)
+        self.shared.acquire()
+        self.assertIsNone(self.shared._lock)
+        os.chmod(lock, 0o600)
+        self.shared.acquire()
+        self.assertIsNotNone(self.shared._lock)
+        self.shared.release()
+
+    def testPrune(self):
+        old = SharedSnapshot('b' * 64, self.directory)
+        held = SharedSnapshot('c' * 64, self.directory)
+        for shared in (self.shared, old, held):
+            shared.publish({'value': 1})
+            shared.acquire()
+            shared.release()
+        held.path.unlink()
+        held.acquire()
+        leftover = old.path.with_name(f'{old.path.name}.12345')
+        leftover.touch()
+        other = self.directory / 'other'
+        other.touch()
+        now = time.time()
+        self.assertEqual(self.shared.prune(now=now), 0)
+        self.assertEqual(self.shared.prune(7200, now + 3600), 0)
+        self.assertEqual(self.shared.prune(5, now + 10), 3)
+        held.release()
+        self.assertEqual(sorted(p.name for p in self.directory.iterdir()),
+                         sorted([self.shared.path.name,
+                                 f'{self.shared.path.name}.lock',
+                                 f'{held.path.name}.lock', 'other']))
+        self.assertEqual(self.shared.prune(5, now + 10), 1)
+        self.assertIsNotNone(self.shared.attach())
+
+
+if __name__ == "__main__":
+    unittest.main()
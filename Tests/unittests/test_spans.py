@@ -0,0 +1,142 @@
+"""
+Unit tests for the startup instrumentation spans
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import json
+from pathlib import Path
+import tempfile
+import threading
+import time
+import unittest
+
+from gvConfig.master import Master
+from gvConfig.providers import Providers
+from lib import spans
+from lib.spans import span
+from Tests.unittests.test_master import MasterTestCase
+
+
+class Platform(Providers):
+
+    def platformA(self):
+        time.sleep(0.001)
+
+    def platformB(self):
+        pass
+
+
+class SpansTestCase(unittest.TestCase):
+
+    def setUp(self):
+        spans.reset()
+        spans.enable()
+
+    def tearDown(self):
+        spans.disable()
+        spans.reset()
+
+
+class TestSpans(SpansTestCase):
+
+    def testDisabled(self):
+        spans.disable()
+        with span('nothing') as s:
+            pass
+        self.assertIsNone(s)
+        self.assertIs(span('a'), span('b', 'other', key=1))
+        self.assertEqual(spans.recorded(), [])
+
+    def testNesting(self):
+        with span('outer', 'stage') as outer:
+            with span('inner', 'provider', keys=2):
+                time.sleep(0.002)
+            with span('second'):
+                pass
+        with span('later'):
+            pass
+        self.assertEqual([s.name for s in spans.recorded()],
+                         ['outer', 'later'])
+        self.assertEqual([c.name for c in outer.children],
+                         ['inner', 'second'])
+        self.assertGreaterEqual(outer.duration, 0.002)
+        tree = spans.report()['threads'][0]['spans'][0]
+        self.assertEqual(tree['name'], 'outer')
+        self.assertEqual(tree['children'][0]['args'], {'keys': 2})
+        self.assertGreaterEqual(tree['duration'],
+                                tree['children'][0]['duration'])
+
+    def testThreads(self):
+        def work():
+            with span('thread'):
+                pass
+        with span('main'):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+        self.assertEqual(len(spans.recorded()), 2)
+        self.assertEqual(len(spans.report()['threads']), 2)
+        self.assertEqual(spans.recorded()[0].children, [])
+
+    def testChromeTrace(self):
+        with span('outer', 'stage'):
+            with span('inner', 'provider', keys=2):
+                pass
+        events = spans.chromeTrace()['traceEvents']
+        self.assertEqual([e['name'] for e in events], ['outer', 'inner'])
+        for e in events:
+            self.assertEqual(e['ph'], 'X')
+            self.assertGreaterEqual(e['dur'], 0)
+        self.assertEqual(events[1]['args'], {'keys': '2'})
+        self.assertGreaterEqual(events[1]['ts'], events[0]['ts'])
+
+    def testWrite(self):
+        with span('outer'):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = Path(tmp) / 'trace' / 'startup'
+            spans.write(prefix)
+            report = json.loads(Path(f'{prefix}.json').read_text())
+            trace = json.loads(Path(f'{prefix}.trace.json').read_text())
+        self.assertEqual(report['threads'][0]['spans'][0]['name'], 'outer')
+        self.assertEqual(trace['traceEvents'][0]['name'], 'outer')
+
+    def testProviders(self):
+        with span('platform'):
+            Platform().runProviders({})
+        children = spans.recorded()[0].children
+        self.assertEqual([(c.name, c.category) for c in children],
+                         [('platformA', 'provider'),
+                          ('platformB', 'provider')])
+
+
+class TestMasterSpans(MasterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        spans.reset()
+        spans.enable()
+
+    def tearDown(self):
+        spans.disable()
+        spans.reset()
+        super().tearDown()
+
+    def testMasterFiles(self):
+        for name in ('platform', 'siteMaster'):
+            self.write(name)
+        with span('configuration', 'stage'):
+            self.assertEqual(Master()(), 0)
+        children = spans.recorded()[0].children
+        self.assertEqual([(c.name, c.category) for c in children],
+                         [('platform', 'import'), ('siteMaster', 'import'),
+                          ('platform', 'master'), ('siteMaster', 'master')])
+
+
+if __name__ == "__main__":
+    unittest.main()
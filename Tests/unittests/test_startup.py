@@ -6,17 +6,19 @@ Created on Jul. 6, 2020
 @author: Jonathan Gossage
 """
 
+from pathlib import Path
 import sys
 import unittest
 
-# Setup the PYTHONPATH for this run
+# Setup the PYTHONPATH for this run. The Library project, which provides
+# lib.configuration and lib.gvLogging, is checked out next to this one.
+_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0,
-                '/home/jgossage/GlobalVillage/EclipseWorkspaces/Library')
+                str(_root.parent / 'Library'))
 sys.path.insert(1,
-                '/home/jgossage/GlobalVillage/EclipseWorkspaces/'
-                'StartupApp/templates')
+                str(_root / 'templates'))
 sys.path.insert(2,
-                '/home/jgossage/GlobalVillage/EclipseWorkspaces/StartupApp')
+                str(_root))
 from pydev import gv_start_ide as ide
 
 
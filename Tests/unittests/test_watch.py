@@ -0,0 +1,113 @@
+"""
+Unit tests for reloading the configuration when its files change
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import os
+import threading
+import unittest
+
+from gvConfig.cfgReload import Change
+from gvConfig.master import Master
+from gvConfig.watch import ConfigWatcher
+from lib.linux import inotify
+from lib.test.lib import synthetic
+from Tests.unittests.test_master import MasterTestCase
+
+
+class TestPollingWatch(MasterTestCase):
+
+    polling = True
+
+    def setUp(self):
+        super().setUp()
+        self.write('platform', 0.0, (), keys=2)
+        self.write('siteMaster', 0.0, ('platform',), keys=2)
+        self.data = self.configDir / 'site.data'
+        self.data.write_text('"org" = { "email" = "a@example.org" }\n'
+                             '"site" = { "admin" = "%email", "x" = "1" }\n')
+        self.master = Master()
+        self.assertEqual(self.master(), 0)
+        self.watcher = ConfigWatcher(self.master, [self.data],
+                                     interval=0.01, polling=self.polling)
+        self.received = []
+        self.watcher.subscribe(self.received.append)
+
+    def tearDown(self):
+        self.watcher.stop()
+        super().tearDown()
+
+    def check(self):
+        """Waits for the next change"""
+        return self.watcher.check(5)
+
+    def testDataFile(self):
+        self.data.write_text('"org" = { "email" = "b@example.org" }\n'
+                             '"site" = { "admin" = "%email", "x" = "1" }\n')
+        notifications = self.check()
+        self.assertEqual(len(notifications), 1)
+        n = notifications[0]
+        self.assertEqual((n.kind, n.error), ('data', None))
+        self.assertEqual(n.changes, {
+            ('org', 'email'): Change('a@example.org', 'b@example.org'),
+            ('site', 'admin'): Change('a@example.org', 'b@example.org')})
+        self.assertEqual(n.data['site']['x'], '1')
+        self.assertEqual(self.received, notifications)
+        self.assertEqual(self.watcher.reloaders[self.data.resolve()]
+                         .reparsed, 1)
+
+    def testReplacedDataFile(self):
+        new = self.configDir / 'site.data.new'
+        new.write_text('"org" = { "email" = "a@example.org" }\n'
+                       '"site" = { "admin" = "%email", "x" = "2" }\n')
+        os.replace(new, self.data)
+        changes = {}
+        for n in self.check():
+            changes.update(n.changes)
+        self.assertEqual(changes, {('site', 'x'): Change('1', '2')})
+
+    def testInvalidDataFile(self):
+        self.data.write_text('"org" = { "email" = }\n')
+        n, = self.check()
+        self.assertIsNotNone(n.error)
+        self.assertEqual(self.watcher.reloaders[self.data.resolve()]
+                         .data['site']['admin'], 'a@example.org')
+
+    def testMasterFile(self):
+        synthetic.events.clear()
+        path = self.write('siteMaster', 0.0, ('platform',), keys=3)
+        n, = self.check()
+        self.assertEqual((n.kind, n.key, n.error),
+                         ('master', 'siteMaster', None))
+        # Only the changed master file ran
+        self.assertEqual(self.order('start'), ['siteMaster'])
+        self.assertEqual(synthetic.merged['siteMaster-2'], 2)
+        self.assertEqual(n.path, path.resolve())
+
+    def testBackgroundThread(self):
+        done = threading.Event()
+        self.watcher.subscribe(lambda n: done.set())
+        self.watcher.start()
+        self.data.write_text('"org" = { "email" = "c@example.org" }\n'
+                             '"site" = { "admin" = "%email", "x" = "1" }\n')
+        self.assertTrue(done.wait(5))
+        self.watcher.stop()
+        self.assertEqual(self.received[0].changes[('site', 'admin')].new,
+                         'c@example.org')
+
+
+@unittest.skipUnless(inotify.available, 'needs inotify')
+class TestInotifyWatch(TestPollingWatch):
+
+    polling = False
+
+    def testUsesInotify(self):
+        self.assertIsInstance(self.watcher.watcher, inotify.Inotify)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Unit tests for the pre-fork launcher
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from lib import zygote
+
+top = Path(__file__).resolve().parents[2]
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+class TestZygote(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.socket = self.tmp / 'zygote.sock'
+        self.log = self.tmp / 'zygote.log'
+        self.server = subprocess.Popen(
+            [sys.executable, '-c',
+             'import sys\n'
+             'from lib.test.lib.synthetic import zygoteServer\n'
+             'zygoteServer(sys.argv[1], sys.argv[2])\n',
+             str(self.socket), str(self.log)],
+            cwd=top, stdout=subprocess.PIPE, text=True)
+        self.serverPid = int(self.server.stdout.readline())
+        deadline = time.monotonic() + 10
+        while not self.socket.exists():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def tearDown(self):
+        if self.server.poll() is None:
+            zygote.stop(self.socket)
+            self.server.wait(10)
+        self.server.stdout.close()
+        self._tmp.cleanup()
+
+    def spawn(self, *argv, **kw):
+        """Runs a worker and returns its status and what it reported"""
+        out = self.tmp / f'out-{time.monotonic_ns()}'
+        with open(out, 'w') as f:
+            worker = zygote.spawn(self.socket, argv,
+                                  stdio=(0, f.fileno(), 2), **kw)
+            status = worker.wait(10)
+        return worker, status, json.loads(out.read_text())
+
+    def testWorkers(self):
+        first, status, seen = self.spawn('0', 'a', env={'ZYGOTE_TEST': 'x'},
+                                         cwd=self.tmp)
+        self.assertEqual(status, 0)
+        self.assertEqual(seen['pid'], first.pid)
+        self.assertEqual(seen['ppid'], self.serverPid)
+        self.assertEqual(seen['argv'], ['0', 'a'])
+        self.assertEqual(seen['env'], 'x')
+        self.assertEqual(Path(seen['cwd']).resolve(), self.tmp.resolve())
+        second, status, other = self.spawn('3')
+        self.assertEqual(status, 3)
+        self.assertNotEqual(other['pid'], seen['pid'])
+        self.assertIsNone(other['env'])
+        # 256 would be truncated to 0, a success
+        _, status, _ = self.spawn('256')
+        self.assertEqual(status, 1)
+
+    def testReinitialized(self):
+        _, _, first = self.spawn()
+        _, _, second = self.spawn()
+        # Every worker seeds its random number generator again
+        self.assertNotEqual(first['random'], second['random'])
+        # and opens its own log file
+        self.assertTrue(first['reopened'])
+        log = self.log.read_text().splitlines()
+        self.assertEqual(log, [f'worker {first["pid"]}',
+                               f'worker {second["pid"]}'])
+
+    def testStop(self):
+        zygote.stop(self.socket)
+        self.assertEqual(self.server.wait(10), 0)
+        self.assertFalse(self.socket.exists())
+
+
+class TestThreads(unittest.TestCase):
+
+    def testRefusesToServeWithThreads(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait, name='writer')
+        thread.start()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                z = zygote.Zygote(Path(tmp) / 'zygote.sock', lambda: 0)
+                with self.assertRaises(RuntimeError) as cm:
+                    z.serve()
+                self.assertIn('writer', str(cm.exception))
+                self.assertIsNone(z.listener)
+        finally:
+            stop.set()
+            thread.join()
+
+
+class TestReopenLogging(unittest.TestCase):
+
+    def testFileIsNotTruncated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'worker.log'
+            handler = logging.FileHandler(path, mode='w')
+            logger = logging.getLogger('test_zygote.reopen')
+            logger.addHandler(handler)
+            logger.propagate = False
+            try:
+                logger.warning('zygote')
+                zygote._reopenLogging()
+                logger.warning('worker')
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+            self.assertEqual(path.read_text().splitlines(),
+                             ['zygote', 'worker'])
+
+
+class TestAtFork(unittest.TestCase):
+
+    def testRegistered(self):
+        calls = []
+        fn = zygote.atFork(lambda: calls.append(1))
+        try:
+            zygote.reinitialize()
+        finally:
+            zygote._atFork.remove(fn)
+        self.assertEqual(calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
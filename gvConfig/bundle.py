@@ -0,0 +1,245 @@
+"""
+The configuration directory as a single bundle of compiled modules
+
+`Master` imports the master files from the configuration directory, which it
+puts at the front of `sys.path`. When that directory is on a network file
+system every import, of a master file or of anything else imported after it,
+probes the directory with stat calls and opens of source and cached bytecode
+files, each a round trip to the server.
+
+`build` compiles the master file package and any other packages, such as the
+platform packages `lib.linux` and `lib.windows`, into one zip file. Each
+module is held as a bytecode file in the checked hash form of PEP 552: its
+header holds a hash of the source instead of its modification time. A
+`manifest.json` member records the modules and the interpreter that compiled
+them.
+
+`install` reads the whole bundle with one open and puts a `BundleFinder` at
+the front of `sys.meta_path`, which imports the modules of the bundle from
+memory. A bundle compiled by another version of Python is not used. With
+`verify` set, the finder compares the hash in each module with the source
+on disk, as the checked hash form intends, and imports a module whose source
+changed from that source, found by its path; that costs the file system
+accesses that the bundle saves, so it is meant for development.
+
+A bundle is made with:
+
+    python -m gvConfig.bundle <bundle> <package>=<directory> ...
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from importlib.util import MAGIC_NUMBER, source_hash, spec_from_file_location
+import io
+import json
+import marshal
+import os
+from pathlib import Path
+import sys
+from types import CodeType, ModuleType
+from typing import (Dict, Iterable, List, NamedTuple, Optional, Sequence,
+                    Tuple, Union)
+import zipfile
+
+__all__ = ['BundleError', 'BundleFinder', 'build', 'bundleVersion', 'install',
+           'uninstall']
+
+# Identifies the layout of a bundle. Change it whenever the layout changes.
+bundleVersion = 1
+
+PathLike = Union[str, os.PathLike]
+
+_checkedHash = 0b11     # The flags of a checked hash based bytecode file
+
+
+class BundleError(ValueError):
+    """A bundle that cannot be used"""
+
+
+class _Module(NamedTuple):
+    member: str             # The bytecode file in the bundle
+    source: str             # The source it was compiled from
+    package: bool
+
+
+def _modules(package: str, directory: Path) -> Iterable[Tuple[str, Path]]:
+    """The modules of a package directory and its subpackages, by name"""
+    for path in sorted(directory.rglob('*.py')):
+        parts = path.relative_to(directory).with_suffix('').parts
+        if any(not p.isidentifier() for p in parts[:-1]) or \
+                not (path.parent / '__init__.py').is_file():
+            continue
+        if parts[-1] == '__init__':
+            parts = parts[:-1]
+        elif not parts[-1].isidentifier():
+            continue
+        yield '.'.join((package, *parts)), path
+
+
+def build(output: PathLike,
+          packages: Sequence[Tuple[str, PathLike]],
+          optimize: int = -1) -> List[str]:
+    """
+    Compiles `packages`, (package name, directory) pairs, into the bundle
+    `output`. Returns the names of the modules in it.
+    """
+    manifest: Dict[str, _Module] = {}
+    output = Path(output)
+    tmp = output.with_name(f'{output.name}.{os.getpid()}')
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_STORED) as bundle:
+        for package, directory in packages:
+            for name, path in _modules(package, Path(directory)):
+                source = path.read_bytes()
+                code = compile(source, str(path), 'exec', dont_inherit=True,
+                               optimize=optimize)
+                member = name.replace('.', '/') + (
+                    '/__init__.pyc' if path.name == '__init__.py' else '.pyc')
+                bundle.writestr(member, MAGIC_NUMBER +
+                                _checkedHash.to_bytes(4, 'little') +
+                                source_hash(source) + marshal.dumps(code))
+                manifest[name] = _Module(member, str(path.resolve()),
+                                         path.name == '__init__.py')
+        bundle.writestr('manifest.json', json.dumps({
+            'version': bundleVersion,
+            'magic': MAGIC_NUMBER.hex(),
+            'modules': {k: list(v) for k, v in manifest.items()}}))
+    os.replace(tmp, output)
+    return list(manifest)
+
+
+class BundleFinder(MetaPathFinder, Loader):
+    """Imports the modules of the bundle `path` from memory"""
+
+    def __init__(self, path: PathLike, verify: bool = False) -> None:
+        self.path = Path(path)
+        self.verify = verify
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        try:
+            self._zip = zipfile.ZipFile(io.BytesIO(data))
+            manifest = json.loads(self._zip.read('manifest.json'))
+        except (zipfile.BadZipFile, KeyError, ValueError) as e:
+            raise BundleError(f'{self.path} is not a bundle: {e}') from e
+        if manifest.get('version') != bundleVersion:
+            raise BundleError(f'{self.path} has layout version'
+                              f' {manifest.get("version")}, not'
+                              f' {bundleVersion}')
+        if manifest.get('magic') != MAGIC_NUMBER.hex():
+            raise BundleError(f'{self.path} was compiled by another version'
+                              ' of Python')
+        self.modules: Dict[str, _Module] = {
+            k: _Module(*v) for k, v in manifest['modules'].items()}
+        self.imported: List[str] = []
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.modules
+
+    def _code(self, name: str) -> Optional[CodeType]:
+        module = self.modules[name]
+        data = self._zip.read(module.member)
+        if data[:4] != MAGIC_NUMBER or \
+                int.from_bytes(data[4:8], 'little') != _checkedHash:
+            raise ImportError(f'bad bytecode for {name} in {self.path}',
+                              name=name)
+        if self.verify:
+            try:
+                source = Path(module.source).read_bytes()
+            except OSError:
+                source = None
+            if source is not None and source_hash(source) != data[8:16]:
+                return None
+        return marshal.loads(data[16:])
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]] = None,
+                  target: Optional[ModuleType] = None
+                  ) -> Optional[ModuleSpec]:
+        module = self.modules.get(fullname)
+        if module is None:
+            return None
+        code = self._code(fullname)
+        if code is None:
+            # The source changed, so it is imported from there. It is found
+            # by its path, since its directory need not be on sys.path.
+            return spec_from_file_location(
+                fullname, module.source,
+                submodule_search_locations=[str(Path(module.source).parent)]
+                if module.package else None)
+        spec = ModuleSpec(fullname, self,
+                          origin=f'{self.path}/{module.member}',
+                          is_package=module.package)
+        spec.has_location = True
+        spec.loader_state = code
+        if module.package:
+            # Submodules that are not in the bundle, or whose source changed,
+            # are found in the source directory
+            spec.submodule_search_locations = [
+                str(Path(module.source).parent)]
+        return spec
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        return None
+
+    def exec_module(self, module: ModuleType) -> None:
+        spec = module.__spec__
+        self.imported.append(spec.name)
+        exec(spec.loader_state, module.__dict__)
+
+    def get_code(self, fullname: str) -> Optional[CodeType]:
+        return self._code(fullname)
+
+    def get_source(self, fullname: str) -> Optional[str]:
+        return None
+
+    def is_package(self, fullname: str) -> bool:
+        return self.modules[fullname].package
+
+
+def install(path: PathLike, verify: bool = False) -> BundleFinder:
+    """
+    Makes the modules of the bundle `path` importable, ahead of every other
+    source of modules. Installing the same bundle again returns the finder
+    that is already installed.
+    """
+    path = Path(path)
+    for finder in sys.meta_path:
+        if isinstance(finder, BundleFinder) and finder.path == path:
+            return finder
+    finder = BundleFinder(path, verify)
+    sys.meta_path.insert(0, finder)
+    return finder
+
+
+def uninstall(finder: BundleFinder) -> None:
+    """Stops importing from the bundle of `finder`"""
+    if finder in sys.meta_path:
+        sys.meta_path.remove(finder)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='python -m gvConfig.bundle',
+        description='Compiles packages into a bundle of modules')
+    parser.add_argument('bundle', help='the bundle file to write')
+    parser.add_argument('packages', nargs='+', metavar='package=directory',
+                        help='a package and the directory that holds it')
+    parser.add_argument('--optimize', type=int, default=-1)
+    args = parser.parse_args(argv)
+    packages = []
+    for item in args.packages:
+        package, sep, directory = item.partition('=')
+        if not sep:
+            parser.error(f'expected package=directory, not {item!r}')
+        packages.append((package, directory))
+    names = build(args.bundle, packages, args.optimize)
+    print(f'{len(names)} modules in {args.bundle}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
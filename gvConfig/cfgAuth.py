@@ -0,0 +1,217 @@
+"""
+Who may change the configuration
+
+A group of the configuration data can list the users that administer it, in
+a key whose name ends in `-admins`, such as `organization-admins` in
+`templates/cfg.data`. Only those users may change, add or delete the
+variables of the group. A user is named in such a list by userid or by
+userident, the identification that the organization gives the user, and the
+lists may be nested. The group of a user, the one with a `userid` key, is
+administered by that user.
+
+Walking the lists on every write is too slow for tools that change many
+values. `AuthIndex` is built once, when the configuration data is loaded, and
+maps each user to the permissions that the user has in each group, as a
+`Permission` bit set. A userid and the userident of the same user share their
+permissions. A check is then two dictionary lookups and a bit test.
+
+The index follows the configuration data: `update` takes the changes that
+`gvConfig.cfgReload.CfgReloader.reload` reports and recomputes only the
+permissions of the groups and users that they touch.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from enum import IntFlag
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Set
+
+from gvConfig.cfgData import Node
+
+__all__ = ['AuthIndex', 'Permission']
+
+Groups = Mapping[str, Mapping[str, Any]]
+
+
+class Permission(IntFlag):
+    """What a user may do to the variables of a group"""
+    NONE = 0
+    CHANGE = 1
+    ADD = 2
+    DELETE = 4
+    ALL = CHANGE | ADD | DELETE
+
+
+_none: Dict[str, int] = {}
+
+
+def _principals(value: Any) -> Iterator[str]:
+    """The users named in an admin list, which may be nested"""
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _principals(item)
+    elif value is not None and value != '':
+        yield str(value)
+
+
+class AuthIndex():
+    """
+    The permissions of each user in each protected group of the configuration
+    data `data`, a mapping of group names to their values such as
+    `gvConfig.cfgData.CfgData`. A group is protected when it has an admin list
+    or belongs to a user. Anyone may write to any other group.
+    """
+
+    # The permissions given by an admin list, by the end of its key
+    adminKeys: Dict[str, Permission] = {'-admins': Permission.ALL}
+    useridKey = 'userid'
+    useridentKey = 'userident'
+
+    def __init__(self, data: Optional[Groups] = None) -> None:
+        # What each group grants to each name, and the same by name
+        self._granted: Dict[str, Dict[str, int]] = {}
+        self._grantedTo: Dict[str, Dict[str, int]] = {}
+        # The userid and userident of the user of each user group, and the
+        # user groups of each name
+        self._owners: Dict[str, Set[str]] = {}
+        self._ownedBy: Dict[str, Set[str]] = {}
+        # The index: the permissions of each name, by group
+        self._index: Dict[str, Dict[str, int]] = {}
+        self.protected: Set[str] = set()
+        if data is not None:
+            self.rebuild(data)
+
+    def _adminBits(self, key: str) -> int:
+        for suffix, permission in self.adminKeys.items():
+            if key.endswith(suffix):
+                return permission
+        return 0
+
+    def _owner(self, values: Mapping[str, Any]) -> Set[str]:
+        """The names of the user of a user group"""
+        if values.get(self.useridKey) in (None, ''):
+            return set()
+        return {str(values[k]) for k in (self.useridKey, self.useridentKey)
+                if values.get(k) not in (None, '')}
+
+    def _readGroup(self, group: str, values: Optional[Mapping[str, Any]]
+                   ) -> Set[str]:
+        """
+        Takes the grants and the owner of a group from its values, or removes
+        them if it is None. Returns the names whose grants changed.
+        """
+        old = self._granted.pop(group, {})
+        for name in old:
+            del self._grantedTo[name][group]
+            if not self._grantedTo[name]:
+                del self._grantedTo[name]
+        oldOwner = self._owners.pop(group, set())
+        for name in oldOwner:
+            self._ownedBy[name].discard(group)
+            if not self._ownedBy[name]:
+                del self._ownedBy[name]
+        self.protected.discard(group)
+        if values is None:
+            return set(old) | oldOwner
+        grants: Dict[str, int] = {}
+        protected = False
+        for key, value in values.items():
+            bits = int(self._adminBits(key))
+            if bits:
+                protected = True
+                for name in _principals(value):
+                    grants[name] = grants.get(name, 0) | bits
+        owner = self._owner(values)
+        for name in owner:
+            grants[name] = grants.get(name, 0) | Permission.ALL._value_
+            self._ownedBy.setdefault(name, set()).add(group)
+        if owner:
+            self._owners[group] = owner
+        if protected or owner:
+            self.protected.add(group)
+        if grants:
+            self._granted[group] = grants
+            for name, bits in grants.items():
+                self._grantedTo.setdefault(name, {})[group] = bits
+        return set(old) | oldOwner | set(grants)
+
+    def _same(self, name: str) -> Set[str]:
+        """The names of the user `name`, its userid and userident"""
+        same = {name}
+        for group in self._ownedBy.get(name, ()):
+            same |= self._owners[group]
+        return same
+
+    def _reindex(self, names: Iterable[str]) -> Set[str]:
+        """
+        Recomputes the index of `names` and of the other names of the same
+        users. Returns the names recomputed.
+        """
+        every: Set[str] = set()
+        for name in names:
+            every |= self._same(name)
+        for name in every:
+            entry: Dict[str, int] = {}
+            for n in self._same(name):
+                for group, bits in self._grantedTo.get(n, _none).items():
+                    entry[group] = entry.get(group, 0) | bits
+            if entry:
+                self._index[name] = entry
+            else:
+                self._index.pop(name, None)
+        return every
+
+    def rebuild(self, data: Groups) -> None:
+        """Builds the index from all of the configuration data `data`"""
+        self._granted.clear()
+        self._grantedTo.clear()
+        self._owners.clear()
+        self._ownedBy.clear()
+        self._index.clear()
+        self.protected.clear()
+        for group in data:
+            self._readGroup(group, data[group])
+        self._reindex(list(self._grantedTo))
+
+    def update(self, data: Groups, changes: Iterable[Node]) -> Set[str]:
+        """
+        Follows changes to the configuration data, which is now `data`.
+        `changes` holds the changed values, as (group, key) pairs, such as
+        the result of `CfgReloader.reload`. Only changes to admin lists, to
+        userids and to useridents, and groups that were removed, touch the
+        index. Returns the names whose permissions were recomputed.
+        """
+        groups = {group for group, key in changes
+                  if self._adminBits(key) or
+                  key in (self.useridKey, self.useridentKey) or
+                  group not in data}
+        names: Set[str] = set()
+        for group in groups:
+            names |= self._readGroup(group, data[group] if group in data
+                                     else None)
+        return self._reindex(names)
+
+    def permissions(self, name: str, group: str) -> Permission:
+        """
+        What the user `name`, a userid or userident, may do in `group`.
+        Anyone may do anything in a group that is not protected.
+        """
+        if group not in self.protected:
+            return Permission.ALL
+        return Permission(self._index.get(name, _none).get(group, 0))
+
+    def check(self, name: str, group: str, permission: Permission) -> bool:
+        """True if the user `name` has every permission of `permission`"""
+        # The index holds plain ints since operators on flags are slow
+        bits = permission._value_
+        return group not in self.protected or \
+            self._index.get(name, _none).get(group, 0) & bits == bits
+
+    def require(self, name: str, group: str, permission: Permission) -> None:
+        """Raises PermissionError unless `check` allows the write"""
+        if not self.check(name, group, permission):
+            what = (permission.name or str(permission)).lower()
+            raise PermissionError(f'{name} may not {what} variables of'
+                                  f' {group!r}')
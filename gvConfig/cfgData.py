@@ -0,0 +1,585 @@
+"""
+Loader for the configuration data format
+
+Organization, site and user configuration is written in the format shown in
+`templates/cfg.data`:
+
+* The file holds one or more lists, written `[ ... ]`, separated by optional
+  commas. A list holds groups and may hold further lists.
+* A group is written `"name" = { ... }`. Both the name and the `=` are
+  optional. An anonymous group is named by the value of its `group` key, or
+  of its `userid` key, or failing those by its position, as `@3`.
+* A group holds `"key" = value` pairs separated by optional commas. A value is
+  a string, a list of values or a group.
+* `#` starts a comment that runs to the end of the line.
+* A string value of the form `%other-key % default` is an interpolation. It
+  takes the value of `other-key`, or `default` if there is no such key. The
+  default may itself be an interpolation, which forms a chain, and is `null`
+  if it is not given. The string `null` is the value None. A value that really
+  starts with `%` is written with `%%`.
+
+A key named in an interpolation is looked up first in the group of the value,
+unless it is the key of the value itself, and then in the groups before it,
+latest first. A site group can therefore take its values from the
+organization group that precedes it, and a key can even default to the value
+of the same key in an earlier group.
+
+The file is tokenized line by line and parsed in a single pass. The
+interpolations are then resolved in a single pass over their dependency
+graph. Every error is reported as a `CfgDataError` with the line number where
+it was found.
+
+Parsing a large file takes time, so `load` keeps a compiled form of the result
+in a `__pycache__` directory next to the file, protected by a hash of the
+contents of the file, and later loads of an unchanged file use it instead.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from bisect import bisect_left
+import hashlib
+import marshal
+import os
+from pathlib import Path
+import re
+import sys
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, List,
+                    Mapping, NamedTuple, Optional, Set, Tuple, Union)
+
+if TYPE_CHECKING:
+    from gvConfig import compact
+
+__all__ = ['CfgDataError', 'CfgGroup', 'CfgData', 'Interpolation', 'tokenize',
+           'parse', 'resolve', 'loads', 'load', 'loadBytes', 'compiledPath',
+           'parseInterpolation', 'splitLines']
+
+# Identifies the layout of the compiled form. Change it whenever the layout
+# changes so that old compiled files are not used.
+compiledVersion = 1
+
+PathLike = Union[str, os.PathLike]
+Node = Tuple[str, str]      # A (group name, key) pair
+
+
+class CfgDataError(ValueError):
+    """An error in a configuration data file"""
+
+    def __init__(self, msg: str, source: str = '<string>',
+                 line: Optional[int] = None) -> None:
+        self.msg = msg
+        self.source = source
+        self.line = line
+        where = source if line is None else f'{source}:{line}'
+        super().__init__(f'{where}: {msg}')
+
+
+class Token(NamedTuple):
+    kind: str       # One of [ ] { } = , or 'str' for a string
+    value: str
+    line: int
+    pos: int        # The offset of the first byte of the token in the file
+    end: int        # The offset of the byte following the token
+
+
+_token = re.compile(r'''
+    \s*
+    (?:
+        (?P<comment>\#.*)
+      | "(?P<string>(?:[^"\\\n]|\\.)*)"
+      | (?P<punct>[\[\]{}=,])
+      | (?P<error>\S)
+    )''', re.VERBOSE)
+_escape = re.compile(r'\\(.)')
+
+
+def tokenize(lines: Iterable[str],
+             source: str = '<string>',
+             firstLine: int = 1,
+             offset: int = 0) -> Iterator[Token]:
+    """
+    Yields the tokens of the lines of a configuration data file. `firstLine`
+    and `offset` are the line number and byte offset of the first line, which
+    allows a part of a file to be tokenized.
+    """
+    number = firstLine
+    for text in lines:
+        isAscii = text.isascii()
+        pos = 0
+        size = len(text)
+        while pos < size:
+            m = _token.match(text, pos)
+            if m is None:
+                break       # Only white space is left
+            pos = m.end()
+            kind = m.lastgroup
+            if kind == 'comment':
+                continue
+            start = m.start(kind) - (kind == 'string')
+            if isAscii:
+                begin, end = offset + start, offset + pos
+            else:
+                begin = offset + len(text[:start].encode('utf-8'))
+                end = offset + len(text[:pos].encode('utf-8'))
+            if kind == 'string':
+                value = m.group('string')
+                if '\\' in value:
+                    value = _escape.sub(r'\1', value)
+                yield Token('str', value, number, begin, end)
+            elif kind == 'punct':
+                yield Token(m.group('punct'), '', number, begin, end)
+            elif m.group('error') == '"':
+                raise CfgDataError('unterminated string', source, number)
+            else:
+                raise CfgDataError(f'unexpected character'
+                                   f' {m.group("error")!r}', source, number)
+        offset += len(text) if isAscii else len(text.encode('utf-8'))
+        number += 1
+
+
+def splitLines(text: str) -> List[str]:
+    """
+    Splits text into lines, keeping the line ends. Unlike str.splitlines,
+    only a newline ends a line, so that line numbers and offsets match those
+    of the file.
+    """
+    lines = [line + '\n' for line in text.split('\n')]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+class CfgGroup():
+    """
+    A group of configuration data. `raw` holds the values as they were
+    written and `values` the values after interpolation. `start` and `end` are
+    the byte offsets of the text of the group in the file.
+    """
+
+    def __init__(self, name: str, line: int, start: int, end: int,
+                 raw: Dict[str, Any], keyLines: Dict[str, int]) -> None:
+        self.name = name
+        self.line = line
+        self.start = start
+        self.end = end
+        self.raw = raw
+        self.keyLines = keyLines
+        self.values: Dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return f'CfgGroup({self.name!r}, line={self.line})'
+
+
+class _Parser():
+    """A recursive descent parser over a stream of tokens"""
+
+    def __init__(self, tokens: Iterator[Token], source: str) -> None:
+        self.tokens = tokens
+        self.source = source
+        self.look: Optional[Token] = next(tokens, None)
+        self.groups: List[CfgGroup] = []
+        self.last = 0
+
+    def error(self, msg: str, token: Optional[Token] = None) -> CfgDataError:
+        token = token or self.look
+        return CfgDataError(msg, self.source,
+                            token.line if token else self.last)
+
+    def take(self, kind: Optional[str] = None) -> Token:
+        token = self.look
+        if token is None:
+            raise self.error('unexpected end of file')
+        if kind is not None and token.kind != kind:
+            raise self.error(f'expected {kind!r}, found'
+                             f' {token.value or token.kind!r}')
+        self.last = token.line
+        self.look = next(self.tokens, None)
+        return token
+
+    def document(self) -> List[CfgGroup]:
+        while self.look is not None:
+            if self.look.kind == ',':
+                self.take()
+            else:
+                self.section()
+        return self.groups
+
+    def section(self) -> None:
+        """A list of groups, or a group on its own"""
+        if self.look.kind == '[':
+            self.take()
+            while self.look is not None and self.look.kind != ']':
+                if self.look.kind == ',':
+                    self.take()
+                else:
+                    self.section()
+            self.take(']')
+        elif self.look.kind in ('str', '{'):
+            self.group()
+        else:
+            raise self.error(f'expected a group or a list, found'
+                             f' {self.look.kind!r}')
+
+    def group(self) -> None:
+        first = self.look
+        name = None
+        if first.kind == 'str':
+            name = self.take().value
+            if self.look is not None and self.look.kind == '=':
+                self.take()
+            if self.look is None or self.look.kind != '{':
+                raise self.error(f'expected a group after {name!r}')
+        raw, keyLines, end = self.pairs()
+        if name is None:
+            name = raw.get('group') or raw.get('userid') or \
+                f'@{len(self.groups)}'
+            if not isinstance(name, str):
+                raise CfgDataError('the group or userid of a group must be a'
+                                   ' string', self.source, first.line)
+        self.groups.append(CfgGroup(name, first.line, first.pos, end, raw,
+                                    keyLines))
+
+    def pairs(self) -> Tuple[Dict[str, Any], Dict[str, int], int]:
+        self.take('{')
+        raw: Dict[str, Any] = {}
+        keyLines: Dict[str, int] = {}
+        while self.look is not None and self.look.kind != '}':
+            if self.look.kind == ',':
+                self.take()
+                continue
+            key = self.take('str')
+            self.take('=')
+            if key.value in raw:
+                raise self.error(f'duplicate key {key.value!r}', key)
+            # The same keys recur in the groups of thousands of users, so
+            # each is held once.
+            name = sys.intern(key.value)
+            raw[name] = self.value()
+            keyLines[name] = key.line
+        return raw, keyLines, self.take('}').end
+
+    def value(self) -> Any:
+        kind = self.look.kind if self.look is not None else None
+        if kind == 'str':
+            return self.take().value
+        if kind == '[':
+            self.take()
+            items = []
+            while self.look is not None and self.look.kind != ']':
+                if self.look.kind == ',':
+                    self.take()
+                else:
+                    items.append(self.value())
+            self.take(']')
+            return items
+        if kind == '{':
+            return self.pairs()[0]
+        raise self.error('expected a value')
+
+
+def parse(lines: Iterable[str],
+          source: str = '<string>',
+          firstLine: int = 1,
+          offset: int = 0) -> List[CfgGroup]:
+    """Parses configuration data into groups, without interpolation"""
+    groups = _Parser(tokenize(lines, source, firstLine, offset),
+                     source).document()
+    seen: Dict[str, CfgGroup] = {}
+    for g in groups:
+        if g.name in seen:
+            raise CfgDataError(f'duplicate group {g.name!r}, first defined'
+                               f' on line {seen[g.name].line}', source, g.line)
+        seen[g.name] = g
+    return groups
+
+
+class Interpolation(NamedTuple):
+    """The keys to try, in order, and the default if none of them exist"""
+    refs: Tuple[str, ...]
+    default: Optional[str]
+
+
+_interpolation = re.compile(r'%([^%\s]+)\s*(?:%\s*(.*?))?\s*$', re.DOTALL)
+
+
+def parseInterpolation(text: str) -> Union[Interpolation, str, None]:
+    """
+    Converts a raw string value into an Interpolation, or into its plain
+    value if it is not one.
+    """
+    if not text.startswith('%'):
+        return None if text == 'null' else text
+    if text.startswith('%%'):
+        return text[1:]
+    refs = []
+    while True:
+        m = _interpolation.match(text)
+        if m is None:
+            return Interpolation(tuple(refs), text) if refs else text
+        refs.append(m.group(1))
+        text = m.group(2)
+        if text is None or not text.startswith('%') or text.startswith('%%'):
+            default = parseInterpolation(text) if text is not None else None
+            return Interpolation(tuple(refs), default)
+
+
+class _Resolver():
+    """Resolves the interpolations of a sequence of groups"""
+
+    def __init__(self, groups: List[CfgGroup], source: str) -> None:
+        self.groups = groups
+        self.source = source
+        self.index = {g.name: i for i, g in enumerate(groups)}
+        self.definedIn: Dict[str, List[int]] = {}
+        for i, g in enumerate(groups):
+            for key in g.raw:
+                self.definedIn.setdefault(key, []).append(i)
+        self.dependencies: Dict[Node, Tuple[Node, ...]] = {}
+
+    def find(self, ref: str, gi: int, own: str) -> Optional[Tuple[int, str]]:
+        """Finds the definition of `ref` visible from key `own` of group gi"""
+        if ref != own and ref in self.groups[gi].raw:
+            return gi, ref
+        where = self.definedIn.get(ref)
+        if not where:
+            return None
+        i = bisect_left(where, gi)
+        if i == 0:
+            return None
+        return where[i - 1], ref
+
+    def target(self, value: Any, gi: int, own: str
+               ) -> Optional[Tuple[int, str]]:
+        """The definition that an interpolated string takes its value from"""
+        for ref in value.refs:
+            found = self.find(ref, gi, own)
+            if found is not None:
+                return found
+        return None
+
+    def interpolations(self, value: Any) -> Iterator[Interpolation]:
+        if isinstance(value, str):
+            if value.startswith('%') and not value.startswith('%%'):
+                parsed = parseInterpolation(value)
+                if isinstance(parsed, Interpolation):
+                    yield parsed
+        elif isinstance(value, list):
+            for v in value:
+                yield from self.interpolations(v)
+        elif isinstance(value, dict):
+            for v in value.values():
+                yield from self.interpolations(v)
+
+    def substitute(self, value: Any, gi: int, own: str) -> Any:
+        if isinstance(value, str):
+            parsed = parseInterpolation(value)
+            if isinstance(parsed, Interpolation):
+                found = self.target(parsed, gi, own)
+                if found is None:
+                    return parsed.default
+                return self.groups[found[0]].values[found[1]]
+            return parsed
+        if isinstance(value, list):
+            return [self.substitute(v, gi, own) for v in value]
+        if isinstance(value, dict):
+            return {k: self.substitute(v, gi, own) for k, v in value.items()}
+        return value
+
+    def run(self, only: Optional[Iterable[Tuple[int, str]]] = None) -> None:
+        """
+        Resolves every value. The values are visited depth first along their
+        dependencies with an explicit stack, so long chains of interpolations
+        do not exhaust the Python stack, and every value is resolved once.
+        If `only` is given, only those (group index, key) values are resolved
+        again, and the others are taken as already resolved.
+        """
+        if only is None:
+            done: Set[Tuple[int, str]] = set()
+            nodes: Iterable[Tuple[int, str]] = (
+                (gi, key) for gi, g in enumerate(self.groups) for key in g.raw)
+        else:
+            done = _Resolved(only)
+            nodes = sorted(done.pending)
+        for start in nodes:
+            if start in done:
+                continue
+            stack = [start]
+            active = {start}
+            while stack:
+                ngi, nkey = node = stack[-1]
+                group = self.groups[ngi]
+                pending = None
+                for interp in self.interpolations(group.raw[nkey]):
+                    found = self.target(interp, ngi, nkey)
+                    if found is None or found in done:
+                        continue
+                    if found in active:
+                        raise CfgDataError(
+                            f'circular interpolation of {nkey!r}'
+                            f' through {found[1]!r}', self.source,
+                            group.keyLines.get(nkey, group.line))
+                    pending = found
+                    break
+                if pending is not None:
+                    stack.append(pending)
+                    active.add(pending)
+                    continue
+                group.values[nkey] = self.substitute(group.raw[nkey],
+                                                     ngi, nkey)
+                targets = tuple((self.groups[f[0]].name, f[1])
+                                for f in (self.target(i, ngi, nkey)
+                                          for i in self.interpolations(
+                                              group.raw[nkey]))
+                                if f is not None)
+                if targets:
+                    self.dependencies[(group.name, nkey)] = targets
+                done.add(node)
+                active.discard(node)
+                stack.pop()
+
+
+class _Resolved(set):
+    """
+    The values that are resolved, when only the values in `pending` are
+    resolved again. Every other value counts as resolved.
+    """
+
+    def __init__(self, pending: Iterable[Tuple[int, str]]) -> None:
+        super().__init__()
+        self.pending = set(pending)
+
+    def __contains__(self, node: object) -> bool:
+        return node not in self.pending or super().__contains__(node)
+
+
+def resolve(groups: List[CfgGroup], source: str = '<string>'
+            ) -> Dict[Node, Tuple[Node, ...]]:
+    """
+    Fills in the `values` of every group. Returns the dependencies between
+    the values: each interpolated value is mapped to the values that it was
+    taken from.
+    """
+    resolver = _Resolver(groups, source)
+    resolver.run()
+    return resolver.dependencies
+
+
+class CfgData():
+    """
+    The contents of a configuration data file. The groups are kept in the
+    order in which they were defined.
+    """
+
+    def __init__(self, groups: List[CfgGroup],
+                 dependencies: Dict[Node, Tuple[Node, ...]],
+                 source: str = '<string>') -> None:
+        self.source = source
+        self.groups: Dict[str, CfgGroup] = {g.name: g for g in groups}
+        self.dependencies = dependencies
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        """The values of a group"""
+        return self.groups[name].values
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.groups
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.groups)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def compact(self, admins: Optional[Mapping[Node, Any]] = None,
+                pool: Optional['compact.AdminPool'] = None
+                ) -> 'compact.CompactGroups':
+        """
+        The values of the groups in the columnar form of `gvConfig.compact`,
+        for a process that keeps the groups of many users. `admins` gives the
+        administrator of a (group, key) pair.
+        """
+        # Imported here since only the processes that keep many groups need
+        # it.
+        from gvConfig import compact
+        return compact.CompactGroups.fromGroups(self, admins, pool)
+
+    def dependents(self, group: str, key: str) -> List[Node]:
+        """The values whose interpolation takes, directly or indirectly, the
+        value of `key` in `group`"""
+        reverse: Dict[Node, List[Node]] = {}
+        for node, targets in self.dependencies.items():
+            for target in targets:
+                reverse.setdefault(target, []).append(node)
+        found: List[Node] = []
+        todo = [(group, key)]
+        while todo:
+            for node in reverse.get(todo.pop(), ()):
+                if node not in found:
+                    found.append(node)
+                    todo.append(node)
+        return found
+
+    def _dump(self) -> Any:
+        return ([(g.name, g.line, g.start, g.end, g.raw, g.values, g.keyLines)
+                 for g in self.groups.values()],
+                self.dependencies)
+
+    @classmethod
+    def _restore(cls, data: Any, source: str) -> 'CfgData':
+        groups = []
+        for name, line, start, end, raw, values, keyLines in data[0]:
+            g = CfgGroup(name, line, start, end, raw, keyLines)
+            g.values = values
+            groups.append(g)
+        return cls(groups, data[1], source)
+
+
+def loads(text: str, source: str = '<string>') -> CfgData:
+    """Parses and resolves configuration data held in a string"""
+    groups = parse(splitLines(text), source)
+    return CfgData(groups, resolve(groups, source), source)
+
+
+def compiledPath(path: PathLike) -> Path:
+    """The location of the compiled form of a configuration data file"""
+    path = Path(path)
+    return path.parent / '__pycache__' / f'{path.name}.cfgc'
+
+
+def load(path: PathLike, compiled: bool = True) -> CfgData:
+    """
+    Loads a configuration data file. If `compiled` is true, the compiled form
+    is used when it matches the contents of the file, and is written when it
+    does not.
+    """
+    return loadBytes(Path(path).read_bytes(), path, compiled)
+
+
+def loadBytes(data: bytes, path: PathLike, compiled: bool = True) -> CfgData:
+    """Loads the contents `data` of the configuration data file `path`"""
+    path = Path(path)
+    digest = hashlib.sha256(data).digest()
+    cache = compiledPath(path)
+    if compiled:
+        try:
+            version, cachedDigest, body = marshal.loads(cache.read_bytes())
+            if version == compiledVersion and cachedDigest == digest:
+                return CfgData._restore(body, str(path))
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    text = data.decode('utf-8')
+    groups = parse(splitLines(text), str(path))
+    result = CfgData(groups, resolve(groups, str(path)), str(path))
+    if compiled:
+        try:
+            cache.parent.mkdir(exist_ok=True)
+            tmp = cache.with_name(f'{cache.name}.{os.getpid()}')
+            tmp.write_bytes(marshal.dumps((compiledVersion, digest,
+                                           result._dump())))
+            os.replace(tmp, cache)
+        except OSError:
+            pass    # The compiled form is only an optimization
+    return result
@@ -0,0 +1,188 @@
+"""
+Selective loading of configuration data through an index
+
+A configuration store can hold the groups of hundreds of sites and thousands
+of users, while a process needs only the groups of its own organization, site
+and user. The index is a sidecar file that maps the name of each group to the
+byte offset and length of its text in the configuration data file, together
+with the groups that the interpolations of the group take values from.
+
+`CfgIndex.select` maps the file into memory and decodes only the requested
+groups and the groups that they depend on, directly or indirectly. Since the
+groups are decoded in the order of the file, every interpolation finds the
+same value as it does when the whole file is loaded.
+
+The index remembers the device, inode, modification time and size of the
+configuration data file and is rebuilt, by loading the whole file once, when
+any of them change.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import marshal
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from gvConfig import cfgData
+from gvConfig.cfgData import CfgData, CfgDataError
+
+__all__ = ['CfgIndex', 'IndexEntry', 'indexPath', 'loadGroups']
+
+# Identifies the layout of the index. Change it whenever the layout changes so
+# that old indexes are rebuilt.
+indexVersion = 1
+
+PathLike = Union[str, os.PathLike]
+Signature = Tuple[int, int, int, int]
+
+
+class IndexEntry(NamedTuple):
+    """The location of a group in the file and the groups that it uses"""
+    name: str
+    line: int
+    start: int
+    end: int
+    depends: Tuple[str, ...]
+
+
+def indexPath(path: PathLike) -> Path:
+    """The default location of the index of a configuration data file"""
+    path = Path(path)
+    return path.parent / '__pycache__' / f'{path.name}.cfgi'
+
+
+class CfgIndex():
+    """The index of the groups of a configuration data file"""
+
+    def __init__(self, path: PathLike,
+                 indexFile: Optional[PathLike] = None) -> None:
+        self.path = Path(path)
+        self.indexFile = Path(indexFile) if indexFile else indexPath(path)
+        self.signature: Optional[Signature] = None
+        self.entries: Dict[str, Tuple] = {}
+
+    def fileSignature(self) -> Signature:
+        st = os.stat(self.path)
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def load(self) -> bool:
+        """
+        Reads the index. Returns False if there is no index or if it does not
+        match the configuration data file.
+        """
+        try:
+            version, signature, entries = marshal.loads(
+                self.indexFile.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if version != indexVersion or \
+                tuple(signature) != self.fileSignature():
+            return False
+        self.signature = tuple(signature)
+        # The entries are made into IndexEntry tuples when they are needed,
+        # since only a few of them are.
+        self.entries = {e[0]: e for e in entries}
+        return True
+
+    def build(self) -> CfgData:
+        """
+        Loads the whole configuration data file, writes its index and returns
+        the loaded data.
+        """
+        # The signature is taken first so that a change made while the file
+        # is being read makes the index stale rather than wrong.
+        signature = self.fileSignature()
+        data = cfgData.load(self.path)
+        entries = {}
+        for name, g in data.groups.items():
+            depends = {target[0]
+                       for key in g.raw
+                       for target in data.dependencies.get((name, key), ())
+                       if target[0] != name}
+            entries[name] = IndexEntry(name, g.line, g.start, g.end,
+                                       tuple(sorted(depends)))
+        self.signature = signature
+        self.entries = entries
+        try:
+            self.indexFile.parent.mkdir(exist_ok=True)
+            tmp = self.indexFile.with_name(
+                f'{self.indexFile.name}.{os.getpid()}')
+            tmp.write_bytes(marshal.dumps(
+                (indexVersion, signature,
+                 [tuple(e) for e in entries.values()])))
+            os.replace(tmp, self.indexFile)
+        except OSError:
+            pass    # The index is only an optimization
+        return data
+
+    def closure(self, names: Iterable[str]) -> List[IndexEntry]:
+        """
+        The entries of the named groups and of every group that they depend
+        on, in the order of the file. Names that are not in the index are
+        ignored.
+        """
+        found: Dict[str, IndexEntry] = {}
+        todo = [n for n in names if n in self.entries]
+        while todo:
+            name = todo.pop()
+            if name not in found:
+                entry = found[name] = IndexEntry._make(self.entries[name])
+                todo.extend(entry.depends)
+        return sorted(found.values(), key=lambda e: e.start)
+
+    def select(self, names: Iterable[str]) -> CfgData:
+        """
+        Loads the named groups, and the groups that they depend on, without
+        decoding the rest of the file. The index is brought up to date first.
+        """
+        names = list(names)
+        if not self.load():
+            data = self.build()
+            wanted = {e.name for e in self.closure(names)}
+            groups = [g for n, g in data.groups.items() if n in wanted]
+            return CfgData(groups,
+                           {node: targets for node, targets
+                            in data.dependencies.items() if node[0] in wanted},
+                           str(self.path))
+        try:
+            return self._decode(self.closure(names))
+        except (CfgDataError, UnicodeDecodeError):
+            if self.fileSignature() == self.signature:
+                raise
+            # The file changed after the index was read
+            self.build()
+            return self._decode(self.closure(names))
+
+    def _decode(self, entries: List[IndexEntry]) -> CfgData:
+        source = str(self.path)
+        groups = []
+        if entries:
+            with open(self.path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                for e in entries:
+                    text = m[e.start:e.end].decode('utf-8')
+                    parsed = cfgData.parse(cfgData.splitLines(text), source,
+                                           e.line, e.start)
+                    if len(parsed) != 1:
+                        raise CfgDataError(f'the index entry of group'
+                                           f' {e.name!r} is not a group',
+                                           source, e.line)
+                    # An anonymous group may be named by its position
+                    parsed[0].name = e.name
+                    groups.append(parsed[0])
+        return CfgData(groups, cfgData.resolve(groups, source), source)
+
+
+def loadGroups(path: PathLike,
+               names: Iterable[str],
+               indexFile: Optional[PathLike] = None) -> CfgData:
+    """
+    Loads the named groups of a configuration data file, and the groups that
+    they depend on, through the index of the file.
+    """
+    return CfgIndex(path, indexFile).select(names)
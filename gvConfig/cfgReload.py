@@ -0,0 +1,364 @@
+"""
+Incremental reload of configuration data files
+
+A configuration data file that holds the groups of many sites and users is
+large, and parsing it takes time, while an edit usually changes one line.
+`CfgReloader` keeps a file loaded and, when the file changes, finds the bytes
+that changed by comparing the new contents with the old. Only the groups that
+contain the changed bytes are parsed again, since the text of every other
+group is unchanged and only moves.
+
+The values that are resolved again are those that changed and the values
+whose interpolation takes, directly or indirectly, one of them. When a key is
+added or removed, the values that name that key in an interpolation are also
+resolved again, since they may now take another value. Everything else keeps
+the value it had.
+
+The file is parsed in full when the change is not inside groups, such as an
+edit of a comment between groups, and when a group taken by its position, as
+`@3`, would change its name. A full parse also reports a syntax error with
+the right line number. When the file cannot be loaded the previous contents
+stay in place.
+
+`reload` returns the values that changed, each as a `Change` of the old and
+new value, where `missing` stands for a value that was added or removed.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from bisect import bisect_left, bisect_right
+import os
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Union
+
+from gvConfig import cfgData
+from gvConfig.cfgData import CfgData, CfgDataError, CfgGroup, Node
+
+__all__ = ['CfgReloader', 'Change', 'missing']
+
+PathLike = Union[str, os.PathLike]
+
+
+class _Missing():
+
+    def __repr__(self) -> str:
+        return 'missing'
+
+
+# The old value of a value that was added, or the new value of one removed
+missing = _Missing()
+
+
+class Change(NamedTuple):
+    """A value that changed"""
+    old: Any
+    new: Any
+
+
+class _Fallback(Exception):
+    """The change cannot be applied without a full parse"""
+
+
+def _commonPrefix(a: bytes, b: bytes) -> int:
+    """The length of the longest common prefix of `a` and `b`"""
+    lo, hi = 0, min(len(a), len(b))
+    # a[:lo] == b[:lo] holds throughout. Each comparison is done by memcmp.
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _commonSuffix(a: bytes, b: bytes, limit: int) -> int:
+    """The length, at most `limit`, of the longest common suffix"""
+    lo, hi = 0, limit
+    la, lb = len(a), len(b)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[la - mid:la - lo] == b[lb - mid:lb - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _diff(old: Dict[str, Dict[str, Any]], data: CfgData
+          ) -> Dict[Node, Change]:
+    """The changes from the values of the groups in `old` to `data`"""
+    changes: Dict[Node, Change] = {}
+    for name, values in old.items():
+        newValues = data[name] if name in data else {}
+        for key, value in values.items():
+            new = newValues.get(key, missing)
+            if new != value:
+                changes[(name, key)] = Change(value, new)
+    for name in data:
+        oldValues = old.get(name, {})
+        for key, value in data[name].items():
+            if key not in oldValues:
+                changes[(name, key)] = Change(missing, value)
+    return changes
+
+
+def _positional(group: CfgGroup) -> bool:
+    """True if the group is named by its position"""
+    return group.name.startswith('@') and \
+        not (group.raw.get('group') or group.raw.get('userid'))
+
+
+class CfgReloader():
+    """
+    Keeps the configuration data file at `path` loaded and brings it up to
+    date when the file changes. `reparsed` and `resolved` give the number of
+    groups parsed and values resolved by the last reload, and `full` whether
+    it parsed the whole file.
+    """
+
+    def __init__(self, path: PathLike, compiled: bool = True) -> None:
+        self.path = Path(path)
+        self.source = str(self.path)
+        self.compiled = compiled
+        self.text = b''
+        self.data: Optional[CfgData] = None
+        self.reparsed = 0
+        self.resolved = 0
+        self.full = False
+        self._resolver: Optional[cfgData._Resolver] = None
+        # The values that take each value, the reverse of the dependencies
+        self._reverse: Optional[Dict[Node, Set[Node]]] = None
+        # The values that name each key in an interpolation
+        self._refs: Optional[Dict[str, Set[Node]]] = None
+
+    def load(self) -> CfgData:
+        """Loads the whole file"""
+        text = self.path.read_bytes()
+        self._set(text, cfgData.loadBytes(text, self.path, self.compiled))
+        return self.data
+
+    def _set(self, text: bytes, data: CfgData) -> None:
+        self.text = text
+        self.data = data
+        self._resolver = None
+        self._reverse = None
+        self._refs = None
+
+    def _getResolver(self) -> 'cfgData._Resolver':
+        if self._resolver is None:
+            self._resolver = self._newResolver(list(self.data.groups.values()))
+        return self._resolver
+
+    def _newResolver(self, groups: List[CfgGroup]) -> 'cfgData._Resolver':
+        resolver = cfgData._Resolver(groups, self.source)
+        resolver.dependencies = self.data.dependencies
+        return resolver
+
+    def _getReverse(self) -> Dict[Node, Set[Node]]:
+        if self._reverse is None:
+            self._reverse = {}
+            for node, targets in self.data.dependencies.items():
+                for target in targets:
+                    self._reverse.setdefault(target, set()).add(node)
+        return self._reverse
+
+    def _nodeRefs(self, group: CfgGroup):
+        resolver = self._getResolver()
+        for key, raw in group.raw.items():
+            for interp in resolver.interpolations(raw):
+                for ref in interp.refs:
+                    yield ref, (group.name, key)
+
+    def _getRefs(self) -> Dict[str, Set[Node]]:
+        if self._refs is None:
+            self._refs = {}
+            for group in self.data.groups.values():
+                for ref, node in self._nodeRefs(group):
+                    self._refs.setdefault(ref, set()).add(node)
+        return self._refs
+
+    def reload(self) -> Dict[Node, Change]:
+        """
+        Brings the data up to date with the file and returns the values that
+        changed. The first call loads the file and returns no changes. Raises
+        CfgDataError, and keeps the previous data, if the file is not valid.
+        """
+        if self.data is None:
+            self.load()
+            return {}
+        text = self.path.read_bytes()
+        self.reparsed = self.resolved = 0
+        self.full = False
+        if text == self.text:
+            return {}
+        try:
+            return self._update(text)
+        except (_Fallback, CfgDataError, UnicodeDecodeError):
+            return self._reloadAll(text)
+
+    def _reloadAll(self, text: bytes) -> Dict[Node, Change]:
+        old = self.data
+        data = cfgData.loadBytes(text, self.path, self.compiled)
+        self._set(text, data)
+        self.full = True
+        self.reparsed = len(data)
+        self.resolved = sum(len(g.raw) for g in data.groups.values())
+        return _diff({name: g.values for name, g in old.groups.items()}, data)
+
+    def _update(self, text: bytes) -> Dict[Node, Change]:
+        old = self.text
+        p = _commonPrefix(old, text)
+        s = _commonSuffix(old, text, min(len(old), len(text)) - p)
+        qOld, qNew = len(old) - s, len(text) - s
+        groups = list(self.data.groups.values())
+        starts = [g.start for g in groups]
+        i = bisect_right(starts, p) - 1
+        j = bisect_left(starts, max(qOld, p + 1)) - 1
+        if i < 0 or j < i or p >= groups[i].end or qOld > groups[j].end:
+            raise _Fallback('the change is not inside groups')
+        delta = len(text) - len(old)
+        start, end = groups[i].start, groups[j].end + delta
+        parsed = cfgData.parse(cfgData.splitLines(
+            text[start:end].decode('utf-8')), self.source, groups[i].line,
+            start)
+        later = groups[j + 1:]
+        if len(parsed) != j + 1 - i and any(_positional(g) for g in later):
+            raise _Fallback('groups named by their position move')
+        for t, g in enumerate(parsed):
+            if _positional(g):
+                g.name = f'@{i + t}'
+        oldGroups = groups[i:j + 1]
+        others = set(self.data.groups).difference(g.name for g in oldGroups)
+        names = [g.name for g in parsed]
+        if len(set(names)) != len(names) or others.intersection(names):
+            raise _Fallback('duplicate group')
+        newGroups = groups[:i] + parsed + later
+        if names == [g.name for g in oldGroups]:
+            changes = self._updateGroups(oldGroups, parsed, newGroups)
+        else:
+            changes = self._resolveAll(newGroups)
+        # The groups after the change have moved
+        lineDelta = text.count(b'\n', p, qNew) - old.count(b'\n', p, qOld)
+        for g in later:
+            g.start += delta
+            g.end += delta
+            if lineDelta:
+                g.line += lineDelta
+                g.keyLines = {k: n + lineDelta for k, n in g.keyLines.items()}
+        self.text = text
+        self.reparsed = len(parsed)
+        return changes
+
+    def _updateGroups(self, oldGroups: List[CfgGroup],
+                      parsed: List[CfgGroup],
+                      newGroups: List[CfgGroup]) -> Dict[Node, Change]:
+        """Applies groups parsed again that have the same names as before"""
+        changed: Set[Node] = set()
+        removed: Dict[Node, Any] = {}
+        keysChanged: Set[str] = set()
+        oldValues: Dict[Node, Any] = {}
+        for og, ng in zip(oldGroups, parsed):
+            for key, raw in ng.raw.items():
+                if key not in og.raw:
+                    changed.add((ng.name, key))
+                    keysChanged.add(key)
+                else:
+                    oldValues[(ng.name, key)] = og.values[key]
+                    ng.values[key] = og.values[key]
+                    if og.raw[key] != raw:
+                        changed.add((ng.name, key))
+            for key in og.raw:
+                if key not in ng.raw:
+                    removed[(og.name, key)] = og.values[key]
+                    keysChanged.add(key)
+        # Every value that may take a different value now
+        reverse = self._getReverse()
+        dirty = set(changed)
+        todo = list(changed) + list(removed)
+        if keysChanged:
+            refs = self._getRefs()
+            for key in keysChanged:
+                todo.extend(refs.get(key, ()))
+        while todo:
+            node = todo.pop()
+            if node not in removed and node not in dirty:
+                dirty.add(node)
+            for d in reverse.get(node, ()):
+                if d not in dirty:
+                    dirty.add(d)
+                    todo.append(d)
+        dirty.difference_update(removed)
+        resolver = (self._newResolver(newGroups) if keysChanged else
+                    self._getResolver())
+        resolver.groups = newGroups
+        dependencies = self.data.dependencies
+        savedDependencies = {n: dependencies[n] for n in dirty | set(removed)
+                             if n in dependencies}
+        for n in savedDependencies:
+            del dependencies[n]
+        saved: Dict[Node, Any] = {}
+        for name, key in dirty:
+            group = newGroups[resolver.index[name]]
+            if (name, key) not in oldValues and key in group.values:
+                oldValues[(name, key)] = saved[(name, key)] = \
+                    group.values[key]
+        try:
+            resolver.run((resolver.index[name], key) for name, key in dirty)
+        except BaseException:
+            # Leave the data as it was
+            for (name, key), value in saved.items():
+                self.data.groups[name].values[key] = value
+            for n in dirty:
+                dependencies.pop(n, None)
+            dependencies.update(savedDependencies)
+            self._resolver = None
+            raise
+        # Commit the parsed groups and the indexes
+        for g in parsed:
+            self.data.groups[g.name] = g
+        self._resolver = resolver
+        for n, targets in savedDependencies.items():
+            for t in targets:
+                reverse.get(t, set()).discard(n)
+        for n in dirty:
+            for t in dependencies.get(n, ()):
+                reverse.setdefault(t, set()).add(n)
+        if self._refs is not None:
+            for og, ng in zip(oldGroups, parsed):
+                for ref, node in self._nodeRefs(og):
+                    self._refs.get(ref, set()).discard(node)
+                for ref, node in self._nodeRefs(ng):
+                    self._refs.setdefault(ref, set()).add(node)
+        self.resolved = len(dirty)
+        changes: Dict[Node, Change] = {}
+        for node in dirty:
+            new = self.data.groups[node[0]].values[node[1]]
+            previous = oldValues.get(node, missing)
+            if previous is missing or previous != new:
+                changes[node] = Change(previous, new)
+        for node, value in removed.items():
+            changes[node] = Change(value, missing)
+        return changes
+
+    def _resolveAll(self, newGroups: List[CfgGroup]) -> Dict[Node, Change]:
+        """
+        Resolves every value again, without parsing the unchanged groups,
+        when groups were added, removed or renamed.
+        """
+        old = {name: g.values for name, g in self.data.groups.items()}
+        for g in newGroups:
+            g.values = {}
+        try:
+            dependencies = cfgData.resolve(newGroups, self.source)
+        except BaseException:
+            for name, g in self.data.groups.items():
+                g.values = old[name]
+            raise
+        data = CfgData(newGroups, dependencies, self.source)
+        self._set(self.text, data)
+        self.resolved = sum(len(g.raw) for g in newGroups)
+        return _diff(old, data)
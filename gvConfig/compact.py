@@ -0,0 +1,272 @@
+"""
+Compact storage for configuration entries
+
+Each configuration value is normally held as a `CfgEntry` object, with a
+`CfgAdmin` object describing who administers it, in a dict keyed by the
+configuration key. That is convenient, but a process that loads the
+organization, site and user configuration of thousands of users holds
+hundreds of thousands of entries, and the object overhead of each entry soon
+outweighs the data in it.
+
+This module provides three ways of reducing it:
+
+* `CompactEntry` has the key, value and administrator of `CfgEntry` in
+  `__slots__`, so it has no instance dict, and its key is interned, so that
+  the same key in thousands of groups is held once.
+* `AdminPool` keeps one shared instance of each distinct administrator.
+  Administrators are compared by their attributes, so administrators that are
+  created separately but are equal are replaced by the same instance.
+* `CompactStore` is a columnar, read-mostly store of the entries of one
+  group. The values are held in a list and the administrators as indexes
+  into an `AdminPool` in an array of machine integers. Reading an entry gives
+  a `StoreEntry`, a view of its row, so an entry can be changed in place as a
+  `CfgEntry` can. `CompactGroups` holds a `CompactStore` for each
+  group of a configuration data file, with a shared pool of administrators.
+
+The keys of a configuration data file are interned as the file is parsed, as
+those of `CompactEntry` are, and `gvConfig.cfgData.CfgData.compact` gives its
+groups as `CompactGroups`.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from array import array
+import sys
+from typing import (Any, Dict, Hashable, Iterable, Iterator, List, Mapping,
+                    Optional, Tuple)
+
+__all__ = ['CompactEntry', 'AdminPool', 'CompactStore', 'StoreEntry',
+           'CompactGroups']
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class CompactEntry():
+    """A configuration entry without an instance dict"""
+
+    __slots__ = ('key', 'value', 'admin')
+
+    def __init__(self, key: str, value: Any, admin: Any = None) -> None:
+        self.key = _intern(key)
+        self.value = value
+        self.admin = admin
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (CompactEntry, StoreEntry)):
+            return NotImplemented
+        return (self.key, self.value, self.admin) == \
+            (other.key, other.value, other.admin)
+
+    # Entries are changed in place, as CfgEntry objects are, so they are not
+    # hashable.
+    __hash__ = None     # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (f'CompactEntry({self.key!r}, {self.value!r},'
+                f' admin={self.admin!r})')
+
+
+def _freeze(value: Any) -> Hashable:
+    """A hashable form of an attribute value, for comparing administrators"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return ('id', id(value))
+    return value
+
+
+class AdminPool():
+    """
+    The distinct administrators of a set of entries. Index 0 stands for an
+    entry without an administrator.
+    """
+
+    def __init__(self) -> None:
+        self.admins: List[Any] = [None]
+        self._byKey: Dict[Hashable, int] = {}
+        self._byId: Dict[int, int] = {}
+
+    def _key(self, admin: Any) -> Hashable:
+        attributes = getattr(admin, '__dict__', None)
+        if attributes is None:
+            names = [n for c in type(admin).__mro__
+                     for n in getattr(c, '__slots__', ())]
+            attributes = {n: getattr(admin, n) for n in names
+                          if hasattr(admin, n)}
+        return (type(admin), _freeze(attributes))
+
+    def index(self, admin: Any) -> int:
+        """The index of the shared instance that is equal to `admin`"""
+        if admin is None:
+            return 0
+        found = self._byId.get(id(admin))
+        if found is not None and self.admins[found] is admin:
+            return found
+        key = self._key(admin)
+        found = self._byKey.get(key)
+        if found is None:
+            found = self._byKey[key] = len(self.admins)
+            self.admins.append(admin)
+            # Only the shared instances are remembered by identity, since
+            # they are kept alive by the pool.
+            self._byId[id(admin)] = found
+        return found
+
+    def intern(self, admin: Any) -> Any:
+        """The shared instance that is equal to `admin`"""
+        return self.admins[self.index(admin)]
+
+    def __len__(self) -> int:
+        return len(self.admins) - 1
+
+
+class StoreEntry():
+    """
+    An entry of a `CompactStore`. It has the attributes of a `CompactEntry`,
+    but its value and administrator are those of its row in the store, so
+    assigning them changes the store.
+    """
+
+    __slots__ = ('key', '_store', '_row')
+
+    def __init__(self, store: 'CompactStore', key: str, row: int) -> None:
+        self.key = key
+        self._store = store
+        self._row = row
+
+    @property
+    def value(self) -> Any:
+        return self._store._values[self._row]
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._store._values[self._row] = _intern(value)
+
+    @property
+    def admin(self) -> Any:
+        return self._store.pool.admins[self._store._admins[self._row]]
+
+    @admin.setter
+    def admin(self, admin: Any) -> None:
+        self._store._admins[self._row] = self._store.pool.index(admin)
+
+    __eq__ = CompactEntry.__eq__
+    __hash__ = None     # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (f'StoreEntry({self.key!r}, {self.value!r},'
+                f' admin={self.admin!r})')
+
+
+class CompactStore(Mapping):
+    """
+    A columnar mapping of configuration keys to entries. An entry that is
+    read is a `StoreEntry` view of its row; `value` and `admin` read a column
+    directly.
+    """
+
+    __slots__ = ('pool', '_rows', '_values', '_admins')
+
+    def __init__(self, pool: Optional[AdminPool] = None) -> None:
+        self.pool = pool if pool is not None else AdminPool()
+        self._rows: Dict[str, int] = {}
+        self._values: List[Any] = []
+        self._admins = array('I')
+
+    @classmethod
+    def fromEntries(cls, entries: Iterable[Any],
+                    pool: Optional[AdminPool] = None) -> 'CompactStore':
+        """
+        Makes a store from objects with `key`, `value` and `admin`
+        attributes, such as `CfgEntry`, or from (key, value, admin) tuples.
+        """
+        store = cls(pool)
+        for e in entries:
+            if isinstance(e, tuple):
+                store.add(*e)
+            else:
+                store.add(e.key, e.value, getattr(e, 'admin', None))
+        return store
+
+    def add(self, key: str, value: Any, admin: Any = None) -> None:
+        """Adds an entry, or replaces the entry that has the same key"""
+        value = _intern(value)
+        adminIndex = self.pool.index(admin)
+        row = self._rows.get(key)
+        if row is None:
+            self._rows[_intern(key)] = len(self._values)
+            self._values.append(value)
+            self._admins.append(adminIndex)
+        else:
+            self._values[row] = value
+            self._admins[row] = adminIndex
+
+    def value(self, key: str) -> Any:
+        return self._values[self._rows[key]]
+
+    def admin(self, key: str) -> Any:
+        return self.pool.admins[self._admins[self._rows[key]]]
+
+    def __getitem__(self, key: str) -> StoreEntry:
+        return StoreEntry(self, key, self._rows[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class CompactGroups(Mapping):
+    """The groups of configuration data, each as a `CompactStore`"""
+
+    def __init__(self, pool: Optional[AdminPool] = None) -> None:
+        self.pool = pool if pool is not None else AdminPool()
+        self._groups: Dict[str, CompactStore] = {}
+
+    @classmethod
+    def fromGroups(cls, groups: Mapping[str, Mapping[str, Any]],
+                   admins: Optional[Mapping[Tuple[str, str], Any]] = None,
+                   pool: Optional[AdminPool] = None) -> 'CompactGroups':
+        """
+        Makes the groups from a mapping of group names to values, such as a
+        `gvConfig.cfgData.CfgData`. `admins` gives the administrator of a
+        (group, key) pair.
+        """
+        result = cls(pool)
+        admins = admins or {}
+        for name in groups:
+            store = result.group(name)
+            for key, value in groups[name].items():
+                store.add(key, value, admins.get((name, key)))
+        return result
+
+    def group(self, name: str) -> CompactStore:
+        """The store of a group, which is created if it does not exist"""
+        store = self._groups.get(name)
+        if store is None:
+            store = self._groups[_intern(name)] = CompactStore(self.pool)
+        return store
+
+    def __getitem__(self, name: str) -> CompactStore:
+        return self._groups[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._groups)
+
+    def __len__(self) -> int:
+        return len(self._groups)
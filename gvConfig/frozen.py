@@ -0,0 +1,141 @@
+"""
+A frozen copy of the configuration for the hot paths of applications
+
+An application reads its settings with `_C.get(_c.key)`, which goes through
+the generic lookup of the configuration and unwraps the `CfgEntry` that holds
+the value, every time. That is fine during the startup, but not in a loop
+that serves requests. Once the bootstrap is over the configuration rarely
+changes, so `freeze` copies it into a `Frozen` object:
+
+* Every key has a slot of its own, named after the key with each `-`
+  replaced by `_`, so `frozen.site_city` is the value of `site-city`. A slot
+  is read as fast as any attribute of an object. A key whose name is not a
+  valid attribute name, or is a Python keyword, is only available by item
+  access, and a key whose attribute name is already taken gets a name with
+  a `_` appended.
+* The values are read through the source once, so interpolations are
+  resolved and entries are unwrapped.
+* `frozen[key]` and `frozen.get(key)` are single dictionary lookups.
+
+A `Frozen` object cannot be changed. The values themselves are shared with
+the source and must not be changed either. Freeze the configuration again to
+see later changes.
+
+When the freeze configuration key is set, the startup template freezes the
+configuration once the bootstrap has finished, asynchronous or not, and
+keeps the copy in its `frozen` global and in the frozen configuration key.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import keyword
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+__all__ = ['Frozen', 'attributeName', 'freeze']
+
+
+class Frozen(Mapping):
+    """
+    The frozen configuration. Each call to `freeze` with a different set of
+    keys makes a subclass with a slot for each key.
+    """
+
+    __slots__ = ('_values',)
+
+    # The attribute name of each key that has one
+    names: Dict[str, str] = {}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('the frozen configuration cannot be changed')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('the frozen configuration cannot be changed')
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f'Frozen({self._values!r})'
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The classes are made at run time, so they cannot be pickled by name
+        return freeze, (self._values,)
+
+
+def attributeName(key: str, taken: Iterable[str] = ()) -> Optional[str]:
+    """
+    The name of the slot of `key`, or None if it has none. `taken` holds the
+    names already used by other keys.
+    """
+    if not isinstance(key, str):
+        return None
+    name = key.replace('-', '_')
+    if (not name.isidentifier() or name.startswith('_') or
+            keyword.iskeyword(name)):
+        return None
+    while hasattr(Frozen, name) or name in taken:
+        name += '_'
+    return name
+
+
+# The classes made so far, by their keys
+_classes: Dict[Tuple[str, ...], type] = {}
+
+
+def _frozenClass(keys: Tuple[str, ...]) -> type:
+    cls = _classes.get(keys)
+    if cls is None:
+        names: Dict[str, str] = {}
+        for key in keys:
+            name = attributeName(key, names.values())
+            if name is not None:
+                names[key] = name
+        cls = type('Frozen', (Frozen,), {'__slots__': tuple(names.values()),
+                                         'names': names,
+                                         '__module__': __name__})
+        if len(_classes) >= 64:
+            _classes.clear()
+        _classes[keys] = cls
+    return cls
+
+
+def _unwrap(value: Any) -> Any:
+    """The value of a configuration entry, such as `CfgEntry`"""
+    if hasattr(value, 'key') and hasattr(value, 'value'):
+        return value.value
+    return value
+
+
+def freeze(source: Any, keys: Optional[Iterable[str]] = None) -> Frozen:
+    """
+    Returns a frozen copy of `keys` of the configuration `source`. `source`
+    is a mapping, or any object with a `get` method such as the
+    configuration, of keys to values or to configuration entries. Without
+    `keys`, every key of `source` is copied.
+    """
+    if keys is None:
+        keys = source.keys() if hasattr(source, 'keys') else iter(source)
+    get = source.get
+    values = {key: _unwrap(get(key)) for key in keys}
+    cls = _frozenClass(tuple(values))
+    frozen = object.__new__(cls)
+    setter = object.__setattr__
+    setter(frozen, '_values', values)
+    for key, name in cls.names.items():
+        setter(frozen, name, values[key])
+    return frozen
@@ -0,0 +1,313 @@
+"""
+Layered views of the configuration
+
+The configuration data of `templates/cfg.data` is layered: the organization
+group comes first, then the site groups, then the user groups, and a value
+such as `%organization-city % null` takes its value from an earlier layer.
+Building the configuration of a user by copying and merging the dictionaries
+of every layer costs a full copy per user, which adds up when thousands of
+users share one organization and one site.
+
+A `LayerStack` is an ordered, immutable sequence of `Layer` objects that is
+built once and shared. A `LayeredView` puts the layers of one consumer, such
+as the group of a user, on top of a stack, and adds an overlay that takes the
+values set on the view. The overlay is only created by the first write, and a
+`copy` of a view shares it until one of them writes to it, so a view costs
+its own layers, its own changes and its memo.
+
+A key is looked up in the overlay, then in the layers from the latest to the
+first. A string value is interpreted as in `gvConfig.cfgData`: a key named in
+an interpolation is looked up first in the layer of the value, unless it is
+the key of the value itself, and then in the layers before it, latest first.
+An interpolation therefore never depends on a later layer, so the resolved
+values of the layers of a stack are kept in the stack, for every view, and
+each view keeps the values looked up through it in a memo of its own. Values
+set on a view are taken as they are, without interpolation.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import (Any, Dict, Iterable, Iterator, List, Mapping,
+                    MutableMapping, Optional, Set, Tuple)
+
+from gvConfig.cfgData import CfgData, CfgDataError, Interpolation, \
+    parseInterpolation
+
+__all__ = ['Layer', 'LayerStack', 'LayeredView', 'layers']
+
+_deleted = object()     # Marks a key deleted from a view in its overlay
+
+
+class Layer(Mapping):
+    """
+    A layer of configuration values, as they were written. The layer copies
+    `values` and must not be changed afterwards, since it is shared.
+    """
+
+    def __init__(self, name: str, values: Mapping[str, Any],
+                 source: str = '<layer>') -> None:
+        self.name = name
+        self.source = source
+        self._values: Dict[str, Any] = dict(values)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f'Layer({self.name!r}, {len(self._values)} values)'
+
+
+def layers(data: CfgData) -> List[Layer]:
+    """The groups of configuration data as layers, in order"""
+    return [Layer(g.name, g.raw, data.source) for g in data.groups.values()]
+
+
+class _Chain(ABC):
+    """
+    Resolves the values of a sequence of layers. Subclasses find the layer
+    that defines a key and the value that a layer holds.
+    """
+
+    @abstractmethod
+    def _find(self, ref: str, pos: int, own: str) -> Optional[int]:
+        """The position of the layer that `ref` is taken from at `pos`"""
+
+    @abstractmethod
+    def _layer(self, pos: int) -> Layer:
+        """The layer at `pos`"""
+
+    @abstractmethod
+    def _value(self, pos: int, key: str, active: Set[Tuple[int, str]]
+               ) -> Any:
+        """The resolved value of `key` in the layer at `pos`"""
+
+    def _resolve(self, pos: int, key: str, active: Set[Tuple[int, str]]
+                 ) -> Any:
+        node = (pos, key)
+        if node in active:
+            layer = self._layer(pos)
+            raise CfgDataError(f'circular interpolation of {key!r} in'
+                               f' {layer.name!r}', layer.source)
+        active.add(node)
+        try:
+            return self._substitute(self._layer(pos)[key], pos, key, active)
+        finally:
+            active.discard(node)
+
+    def _substitute(self, value: Any, pos: int, own: str,
+                    active: Set[Tuple[int, str]]) -> Any:
+        if isinstance(value, str):
+            if not value.startswith('%') and value != 'null':
+                return value
+            parsed = parseInterpolation(value)
+            if isinstance(parsed, Interpolation):
+                for ref in parsed.refs:
+                    found = self._find(ref, pos, own)
+                    if found is not None:
+                        return self._value(found, ref, active)
+                return parsed.default
+            return parsed
+        if isinstance(value, list):
+            return [self._substitute(v, pos, own, active) for v in value]
+        if isinstance(value, dict):
+            return {k: self._substitute(v, pos, own, active)
+                    for k, v in value.items()}
+        return value
+
+
+class LayerStack(_Chain):
+    """
+    The shared base of layered views: `layers`, from the first to the
+    latest. The resolved values of the layers are kept for every view.
+    """
+
+    def __init__(self, layers: Iterable[Layer]) -> None:
+        self.layers: Tuple[Layer, ...] = tuple(layers)
+        # The positions of the layers that define each key, in order
+        self._definedIn: Dict[str, List[int]] = {}
+        for pos, layer in enumerate(self.layers):
+            for key in layer:
+                self._definedIn.setdefault(key, []).append(pos)
+        self._memo: Dict[Tuple[int, str], Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.layers)
+
+    def __repr__(self) -> str:
+        return f'LayerStack({[layer.name for layer in self.layers]!r})'
+
+    def keys(self) -> Iterable[str]:
+        """Every key of the stack, in the order of first definition"""
+        return self._definedIn.keys()
+
+    def top(self, key: str, below: Optional[int] = None) -> Optional[int]:
+        """
+        The position of the latest layer that defines `key`, of those before
+        position `below` if it is given.
+        """
+        where = self._definedIn.get(key)
+        if not where:
+            return None
+        if below is None or below >= len(self.layers):
+            return where[-1]
+        i = bisect_left(where, below)
+        return where[i - 1] if i else None
+
+    def _find(self, ref: str, pos: int, own: str) -> Optional[int]:
+        if ref != own and ref in self.layers[pos]:
+            return pos
+        return self.top(ref, pos)
+
+    def _layer(self, pos: int) -> Layer:
+        return self.layers[pos]
+
+    def _value(self, pos: int, key: str, active: Set[Tuple[int, str]]
+               ) -> Any:
+        # Reads and writes of a dictionary item are atomic, so views in
+        # several threads can share the memo. A value may be resolved twice.
+        try:
+            return self._memo[(pos, key)]
+        except KeyError:
+            pass
+        value = self._memo[(pos, key)] = self._resolve(pos, key, active)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The resolved value of `key` in the stack"""
+        pos = self.top(key)
+        return default if pos is None else self._value(pos, key, set())
+
+    def view(self, *layers: Layer) -> 'LayeredView':
+        """A new view with `layers` on top of the stack"""
+        return LayeredView(self, *layers)
+
+
+class LayeredView(_Chain, MutableMapping):
+    """
+    The configuration seen by one consumer: the layers of `base`, then
+    `layers`, then the values set on the view. It is safe to read a view from
+    several threads, but not to change it while it is read.
+    """
+
+    def __init__(self, base: LayerStack, *layers: Layer) -> None:
+        self.base = base
+        self.layers = layers
+        # The position of the first layer of the view, and the one after the
+        # last
+        self._first = len(base.layers)
+        self._end = self._first + len(layers)
+        self._overlay: Optional[Dict[str, Any]] = None
+        self._ownsOverlay = False
+        self._memo: Dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        names = [layer.name for layer in self.layers]
+        return (f'LayeredView({self.base!r}, {names!r},'
+                f' {len(self._overlay or ())} changes)')
+
+    def _layer(self, pos: int) -> Layer:
+        return self.layers[pos - self._first]
+
+    def _top(self, key: str, below: int) -> Optional[int]:
+        """The position of the latest layer before `below` that has `key`"""
+        first = self._first
+        for pos in range(below - 1, first - 1, -1):
+            if key in self.layers[pos - first]:
+                return pos
+        return self.base.top(key)
+
+    def _find(self, ref: str, pos: int, own: str) -> Optional[int]:
+        if ref != own and ref in self._layer(pos):
+            return pos
+        return self._top(ref, pos)
+
+    def _value(self, pos: int, key: str, active: Set[Tuple[int, str]]
+               ) -> Any:
+        if pos < self._first:
+            return self.base._value(pos, key, active)
+        return self._resolve(pos, key, active)
+
+    def __getitem__(self, key: str) -> Any:
+        # The overlay always wins, so it is looked in before the memo, which
+        # only holds values resolved from the layers
+        if self._overlay is not None and key in self._overlay:
+            value = self._overlay[key]
+            if value is _deleted:
+                raise KeyError(key)
+            return value
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        pos = self._top(key, self._end)
+        if pos is None:
+            raise KeyError(key)
+        value = self._memo[key] = self._value(pos, key, set())
+        return value
+
+    def _write(self) -> Dict[str, Any]:
+        """The overlay, copied first if it is shared with another view"""
+        if not self._ownsOverlay:
+            self._overlay = dict(self._overlay or ())
+            self._ownsOverlay = True
+        return self._overlay
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._write()[key] = value
+        # No other value can depend on the key, since the overlay is never
+        # interpolated and layers only take values from earlier layers
+        self._memo.pop(key, None)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._write()[key] = _deleted
+        self._memo.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        if self._overlay is not None and key in self._overlay:
+            return self._overlay[key] is not _deleted
+        return key in self._memo or \
+            self._top(key, self._end) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        overlay = self._overlay or {}
+        seen: Set[str] = set()
+        for keys in (self.base.keys(), *self.layers, overlay):
+            for key in keys:
+                if key not in seen:
+                    seen.add(key)
+                    if overlay.get(key) is not _deleted:
+                        yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def changes(self) -> Dict[str, Any]:
+        """The values set on the view, with deleted keys left out"""
+        return {k: v for k, v in (self._overlay or {}).items()
+                if v is not _deleted}
+
+    def copy(self) -> 'LayeredView':
+        """
+        A view of the same layers with the same changes. The two views share
+        their changes until one of them is changed.
+        """
+        view = LayeredView(self.base, *self.layers)
+        view._overlay = self._overlay
+        self._ownsOverlay = False
+        return view
@@ -0,0 +1,137 @@
+"""
+Lazily computed configuration entries
+
+Many configuration values are expensive to compute and most applications
+never read most of them. A provider method that is decorated with
+`gvConfig.providers.provides` names the configuration keys that it produces.
+Instead of being run when the configuration is built, the provider is
+registered in a `LazySource` against those keys and is only run the first time
+that one of them is read. The values that it produces are then kept, so the
+provider runs at most once.
+
+A provider stores its values in the `LazySource` in the usual way, by item
+assignment, and may read other keys of the same `LazySource`. Any provider
+that they need is run first. A key that its provider does not set, because
+the value is not available, is no longer part of the mapping once the
+provider has run.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from threading import RLock
+from typing import (Any, Callable, Dict, ItemsView, Iterator, KeysView, List,
+                    MutableMapping, Optional, Sequence, ValuesView)
+
+__all__ = ['LazySource']
+
+
+class LazySource(MutableMapping):
+    """
+    A mapping of configuration keys to entries in which some entries are
+    computed on first access.
+
+    The keys of registered providers are part of the mapping, so iteration,
+    `len` and `in` do not run any provider. Reading the value of such a key
+    runs its provider. `keys`, `items` and `values` run every pending
+    provider first, so that a copy made with `dict` or `update` holds only
+    the keys that have values; `resolved` copies the values computed so far
+    without running any. A configuration that the source is added to must
+    therefore keep the source itself, not a copy, for the providers to stay
+    lazy. It is safe to read the mapping from several threads.
+
+    `onProvided`, if it is set, is called after each provider has run.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[str, Any] = {}
+        self._providers: Dict[str, Callable[[], None]] = {}
+        self._lock = RLock()
+        self.onProvided: Optional[Callable[[], None]] = None
+
+    def register(self, keys: Sequence[str], provider: Callable[[], None]
+                 ) -> None:
+        """Registers `provider` as the source of the values for `keys`"""
+        with self._lock:
+            for key in keys:
+                self._providers[key] = provider
+
+    def pending(self) -> List[str]:
+        """Returns the keys whose provider has not run yet"""
+        with self._lock:
+            return list(self._providers)
+
+    def resolved(self) -> Dict[str, Any]:
+        """
+        Returns the values computed so far, without running any provider
+        """
+        with self._lock:
+            return dict(self._values)
+
+    def resolve(self) -> None:
+        """Runs every provider that has not run yet"""
+        for key in self.pending():
+            self.get(key)
+
+    def _provide(self, key: str) -> None:
+        provider = self._providers.get(key)
+        if provider is None:
+            return
+        # Remove all the keys of the provider first, so that it runs only
+        # once even if it reads one of its own keys or fails. Those that it
+        # does not set are then absent.
+        for k in [k for k, p in self._providers.items() if p is provider]:
+            del self._providers[k]
+        try:
+            provider()
+        finally:
+            if self.onProvided is not None:
+                self.onProvided()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        with self._lock:
+            self._provide(key)
+            return self._values[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._values[key] = value
+            self._providers.pop(key, None)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if key not in self._values and key not in self._providers:
+                raise KeyError(key)
+            self._values.pop(key, None)
+            self._providers.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._providers
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = list(self._values)
+            keys.extend(k for k in self._providers if k not in self._values)
+        return iter(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values.keys() | self._providers.keys())
+
+    def keys(self) -> KeysView:
+        self.resolve()
+        return KeysView(self)
+
+    def items(self) -> ItemsView:
+        self.resolve()
+        return ItemsView(self)
+
+    def values(self) -> ValuesView:
+        self.resolve()
+        return ValuesView(self)
@@ -35,26 +35,152 @@ application runs.
     @author: Jonathan Gossage
 """
 from importlib import import_module as im
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 import sys
-from typing import Dict, Tuple
+import time
+from types import CodeType, ModuleType
+from typing import (TYPE_CHECKING, Any, Collection, Dict, List, Mapping,
+                    Optional, Tuple)
+
+from gvConfig.lazy import LazySource
+from gvConfig.providers import Cost
+from lib.spans import span
+
+if TYPE_CHECKING:
+    from gvConfig.bundle import BundleFinder
+    from gvConfig.remote import RemoteMasters
+    from gvConfig.sharedSnapshot import SharedSnapshot, SharedView
+    from gvConfig.snapshot import Snapshot
+
+
+class _SourceLoader(SourceFileLoader):
+    """
+    Loads a module from its source file alone. The compiled form records the
+    time of the source to the second, so it may not see a quick second edit.
+    It is neither read nor written.
+    """
+
+    def get_code(self, fullname: str) -> CodeType:
+        return self.source_to_code(self.get_data(self.path), self.path)
+
+
+def _execSource(name: str, path: Path) -> ModuleType:
+    """
+    Runs the source file `path` as the module `name`, in the module that is
+    already imported if there is one, as a reload does
+    """
+    package, _, child = name.rpartition('.')
+    im(package)
+    loader = _SourceLoader(name, str(path))
+    spec = spec_from_file_location(name, path, loader=loader)
+    module = sys.modules.get(name)
+    if module is None:
+        module = module_from_spec(spec)     # type: ignore[arg-type]
+        sys.modules[name] = module
+        try:
+            loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        setattr(sys.modules[package], child, module)
+    else:
+        module.__spec__ = spec
+        module.__loader__ = loader
+        module.__file__ = str(path)
+        loader.exec_module(module)
+    return module
+
 
 class Master():
     """
+    Runs the master files in `masterFiles`.
+
+    The `configCode` class of each master file can declare the master files
+    that it depends on in a class attribute called `dependencies`, which is a
+    tuple of keys of `masterFiles`. A master file only runs after the master
+    files that it depends on have run and their contributions have been added
+    to the configuration. Master files that do not depend on each other run at
+    the same time in a thread pool. A master file that does not declare its
+    dependencies depends on all the master files listed before it, which is
+    the order that the master files have always been run in. The cost class
+    of a master file, from its provider registry (see `gvConfig.providers`),
+    decides how it is scheduled: cheap master files run in the calling thread
+    while the expensive ones run in the pool.
+
+    The contributions of the master files that run at the same time are added
+    to the configuration in the order of `masterFiles`, so the result does
+    not depend on which master file finishes first. The wall time taken by
+    each master file is recorded in `timings`.
+
+    `arun` runs the master files as tasks of a running event loop instead,
+    which lets the bootstrap overlap with the startup of an asynchronous
+    application. A master file whose `configCode` has an `async` `__call__`
+    is awaited there; when the instance is called it is run on an event loop
+    of its own.
+
+    When `useSnapshot` is set, the contributions of the master files are saved
+    in a snapshot, see `gvConfig.snapshot`, and later runs add them to the
+    configuration from the snapshot instead of running the master files. Only
+    the master files that contributed a value whose time to live has expired
+    are run again, and their contributions keep the place that they have in a
+    full run.
+
+    When `sharedSnapshot` is set, the processes of a host share one copy of
+    the contributions, see `gvConfig.sharedSnapshot`. The first process runs
+    the master files and publishes what they contributed. The processes that
+    start after it, or that waited for it, add the published snapshot to the
+    configuration instead, and it is kept in `sharedView`.
+
+    When `remoteUrl` is set, the master files of `remoteKeys` come from that
+    configuration server, see `gvConfig.remote`. A local copy is used while
+    it is revalidated in the background, so the startup only waits for the
+    server when there is no copy. A master file is only taken over HTTPS or
+    when its digest is pinned in `remoteDigests`. The `RemoteMasters` used
+    is kept in `remote`.
+
+    A master file whose entries are computed lazily, see `gvConfig.lazy`,
+    counts the errors of a lazy provider when one of its keys is first read,
+    after the master file has been merged. Those errors are logged and
+    counted in `lateErrors`.
+
+    When `bundlePath` is set, the master files are imported from that bundle
+    of compiled modules, see `gvConfig.bundle`, with a single read of it and
+    without putting the configuration directory on `sys.path`. Only the
+    master files in the bundle are run. If the bundle cannot be used the
+    configuration directory is used instead. The finder of the bundle is
+    kept in `bundle`. The master files of the configuration server, when
+    `remoteUrl` is set as well, and a master file that is run again by
+    `rerun` come from the configuration directory, not from the bundle.
     """
     _L = None
+    _C = None
     configDir: Path = Path(Path(sys.argv[0]).resolve().parent)
     gvPackage  = 'gvconfig'
+    maxWorkers: Optional[int] = None     # The size of the thread pool
+    useSnapshot = False                  # Use the bootstrap snapshot cache
+    snapshotFile: Optional[Path] = None  # None uses the default location
+    sharedSnapshot = False               # Share the contributions on the host
+    sharedDir: Optional[Path] = None     # None uses the default location
+    remoteUrl: Optional[str] = None      # The configuration server, if any
+    # The pinned SHA-256 digests of the remote master files, by module
+    remoteDigests: Optional[Dict[str, str]] = None
+    bundlePath: Optional[Path] = None    # The master files as a bundle
     
     @classmethod
     def lateInitialization(cls):
         import lib.gvLogging as _l
         Master._L = _l.Logging
+        import lib.configuration as _c
+        Master._C = _c.Configuration
 
     platformKey = 'platform'
     siteKey = 'siteMaster'
     organizationMasterKey = 'organizationMaster'
     gvKey = 'GlobalVillage'
+    # The master files that come from the configuration server
+    remoteKeys: Tuple[str, ...] = (siteKey, organizationMasterKey)
     
     masterFiles: Dict[str, Tuple[str, str]] =\
     {platformKey : ('platform', 'Master'),
@@ -70,20 +196,489 @@ class Master():
         """
         if Master._L is None:
             Master.lateInitialization()
+        self.timings: Dict[str, float] = {}
+        self.sharedView: Optional['SharedView'] = None
+        # Set while this process builds the shared snapshot
+        self._shared: Optional['SharedSnapshot'] = None
+        self._published: List[Mapping[str, Any]] = []
+        self._lazy: List[str] = []  # Master files with lazy entries
+        self._expires: Optional[float] = None
+        self.remote: Optional['RemoteMasters'] = None
+        self.bundle: Optional['BundleFinder'] = None
+        self.lateErrors = 0     # Counted by lazy providers after the merge
 
-    def __call__(self) -> int:
+    def _import(self, only: Optional[Collection[str]] = None
+                ) -> Tuple[Dict[str, ModuleType], int]:
+        """
+        Imports the master files that exist, in `masterFiles` order. If
+        `only` is given, only those master files are imported.
+        """
+        modules: Dict[str, ModuleType] = {}
         errors = 0
-        sys.path.insert(0, Master.configDir)
-        for _, targetModule in Master.masterFiles.values():
-            if Path(Master.configDir / self.gvPackage /\
-                    targetModule).joinpath('.py').is_file():
+        for key, (targetModule, _) in Master.masterFiles.items():
+            if only is not None and key not in only:
+                continue
+            name = f'{self.gvPackage}.{targetModule}'
+            path = (Master.configDir / self.gvPackage /
+                    targetModule).with_suffix('.py')
+            # The master files of the configuration server are fetched into
+            # the configuration directory, so the bundle has an old copy
+            fromSource = self.bundle is not None and \
+                bool(Master.remoteUrl) and key in Master.remoteKeys
+            if self.bundle is not None and not fromSource:
+                exists = name in self.bundle
+            else:
+                exists = path.is_file()
+            if exists:
                 try:
-                    pm = im(targetModule, Master.gvPackage)
-                    pm.configCode()()  # Run the code for the target module
+                    with span(targetModule, 'import'):
+                        if fromSource and name not in sys.modules:
+                            modules[key] = _execSource(name, path)
+                        else:
+                            modules[key] = im(name)
                 except ImportError:
-                    Master._L.warning('Unable to import'
-                                      f' {self.gvPackage}.{targetModule}')
+                    Master._L.warning(f'Unable to import {name}')
                     errors += 1
-                errors += pm.shutdown()
+        return modules, errors
+
+    def _levels(self, modules: Dict[str, ModuleType]) -> List[List[str]]:
+        """
+        Groups the master files into levels. Every master file in a level
+        depends only on master files in earlier levels, so the master files in
+        a level can run at the same time. Each level is in `masterFiles`
+        order.
+        """
+        keys = list(modules)
+        depends: Dict[str, set] = {}
+        for i, key in enumerate(keys):
+            declared = getattr(modules[key].configCode, 'dependencies', None)
+            if declared is None:
+                declared = keys[:i]
+            depends[key] = {d for d in declared if d in modules}
+        levels: List[List[str]] = []
+        done: set = set()
+        while len(done) < len(keys):
+            level = [k for k in keys
+                     if k not in done and depends[k] <= done]
+            if not level:
+                cycle = [k for k in keys if k not in done]
+                Master._L.warning('Circular master file dependencies'
+                                  f' between {cycle}, running them in order')
+                levels.extend([k] for k in cycle)
+                break
+            levels.append(level)
+            done.update(level)
+        return levels
+
+    @staticmethod
+    def _cost(module: ModuleType) -> Cost:
+        """
+        The cost class of a master file, from its provider registry. A master
+        file without a registry is assumed to do I/O.
+        """
+        code = module.configCode
+        if hasattr(code, 'providerCost'):
+            return code.providerCost()
+        return Cost.IO
+
+    @staticmethod
+    def _parallel(module: ModuleType) -> bool:
+        code = module.configCode
+        return code.parallelSafe() if hasattr(code, 'parallelSafe') else True
+
+    @staticmethod
+    def _ttl(module: ModuleType) -> Dict[str, float]:
+        """
+        The time to live of the volatile entries of a master file. Entries
+        from providers that are not cacheable expire at once.
+        """
+        code = module.configCode
+        ttl = dict(getattr(code, 'ttl', None) or {})
+        if hasattr(code, 'volatileKeys'):
+            ttl.update(code.volatileKeys())
+        return ttl
+
+    def _run(self, key: str, code) -> None:
+        start = time.perf_counter()
+        with span(key, 'master'):
+            result = code()  # Run the code for the target module
+            if hasattr(result, '__await__'):
+                # An asynchronous master file run without an event loop
+                import asyncio
+                asyncio.run(result)
+        self.timings[key] = time.perf_counter() - start
+
+    async def _arun(self, key: str, code) -> None:
+        start = time.perf_counter()
+        with span(key, 'master'):
+            await code()
+        self.timings[key] = time.perf_counter() - start
+
+    def _together(self, level: List[str],
+                  modules: Dict[str, ModuleType]) -> List[str]:
+        """
+        The master files of a level that do real work and can run at the same
+        time as the others, the most expensive first. Cheap master files, and
+        those that must not run at the same time as others, run in the
+        calling thread.
+        """
+        together = sorted((k for k in level
+                           if self._cost(modules[k]) > Cost.CHEAP and
+                           self._parallel(modules[k])),
+                          key=lambda k: self._cost(modules[k]),
+                          reverse=True)
+        if len(together) < 2 or Master.maxWorkers == 1:
+            return []
+        return together
+
+    def _merge(self, level: List[str],
+               modules: Dict[str, ModuleType],
+               codes: Dict[str, object],
+               snapshot: Optional['Snapshot']) -> int:
+        """
+        Adds the contributions of a level to the configuration, in a fixed
+        order, before the next level runs.
+        """
+        errors = 0
+        for key in level:
+            # The entries that are computed when they are read are left out,
+            # since copying them would compute them
+            source = codes[key]._cfgSource
+            lazy = isinstance(source, LazySource) and bool(source.pending())
+            entries = source.resolved() if lazy else source
+            if snapshot is not None:
+                snapshot.record(key, entries, self._ttl(modules[key]), lazy)
+            if self._shared is not None:
+                self._publishing(entries, self._ttl(modules[key]))
+                if lazy:
+                    self._lazy.append(key)
+            errors += codes[key].shutdown()
+            self._countLate(key, codes[key])
         return errors
 
+    def _countLate(self, key: str, code) -> None:
+        """
+        Counts the errors of the lazy providers of a master file in
+        `lateErrors`, since they run after its error count was returned
+        """
+        source = getattr(code, '_cfgSource', None)
+        if not isinstance(source, LazySource) or not source.pending() or \
+                not isinstance(getattr(code, 'errors', None), int):
+            return
+        counted = code.errors
+
+        def provided() -> None:
+            nonlocal counted
+            new = code.errors - counted
+            if new > 0:
+                counted = code.errors
+                self.lateErrors += new
+                Master._L.warning(f'The lazily computed entries of the master'
+                                  f' file {key} had {new} errors')
+        source.onProvided = provided
+
+    def _publishing(self, entries: Mapping[str, Any],
+                    ttl: Optional[Mapping[str, float]] = None,
+                    expires: Optional[float] = None) -> None:
+        """Adds a contribution to those for the shared snapshot"""
+        self._published.append(entries)
+        now = time.time()
+        expiries = [now + seconds for k, seconds in (ttl or {}).items()
+                    if k in entries]
+        if expires is not None:
+            expiries.append(expires)
+        if self._expires is not None:
+            expiries.append(self._expires)
+        self._expires = min(expiries, default=None)
+
+    def _runModules(self,
+                    modules: Dict[str, ModuleType],
+                    snapshot: Optional['Snapshot']) -> int:
+        """
+        Runs the master files and adds their contributions to the
+        configuration. The contributions are also recorded in the snapshot if
+        there is one.
+        """
+        errors = 0
+        pool = None
+        try:
+            for level in self._levels(modules):
+                codes = {key: modules[key].configCode() for key in level}
+                # Master files that do real work run in the pool. The others
+                # run here while the pool is busy.
+                together = self._together(level, modules)
+                futures = []
+                if together:
+                    if pool is None:
+                        from concurrent.futures import ThreadPoolExecutor
+                        pool = ThreadPoolExecutor(Master.maxWorkers,
+                                                  'gvMaster')
+                    futures = [pool.submit(self._run, key, codes[key])
+                               for key in together]
+                for key in level:
+                    if key not in together:
+                        self._run(key, codes[key])
+                for f in futures:
+                    f.result()
+                errors += self._merge(level, modules, codes, snapshot)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return errors
+
+    async def _arunModules(self,
+                           modules: Dict[str, ModuleType],
+                           snapshot: Optional['Snapshot']) -> int:
+        """
+        Like `_runModules`, but the master files run as tasks of the running
+        event loop. Asynchronous master files are awaited and the master files
+        that would run in the pool run in the default executor of the loop.
+        """
+        import asyncio
+        import inspect
+        loop = asyncio.get_running_loop()
+        errors = 0
+        for level in self._levels(modules):
+            codes = {key: modules[key].configCode() for key in level}
+            together = self._together(level, modules)
+            tasks = []
+            inline = []
+            for key in level:
+                if inspect.iscoroutinefunction(type(codes[key]).__call__):
+                    tasks.append(asyncio.ensure_future(
+                        self._arun(key, codes[key])))
+                elif key in together:
+                    tasks.append(loop.run_in_executor(None, self._run, key,
+                                                      codes[key]))
+                else:
+                    inline.append(key)
+            try:
+                for key in inline:
+                    self._run(key, codes[key])
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for t in tasks:
+                    t.cancel()
+                raise
+            errors += self._merge(level, modules, codes, snapshot)
+        return errors
+
+    def _begin(self) -> Tuple[bool, Optional['Snapshot'],
+                              Optional[List[str]]]:
+        """
+        Prepares a run. Returns whether any master file must run, the snapshot
+        if one is used and the master files to run if not all of them.
+        """
+        self._paths()
+        self.timings = {}
+        snapshot: Optional['Snapshot'] = None
+        only: Optional[List[str]] = None
+        if Master.remoteUrl:
+            self._fetchRemote()
+        if Master.sharedSnapshot and self._attach():
+            # The master files with lazily computed entries run again, to
+            # register their providers
+            lazy = self.sharedView.lazy
+            return bool(lazy), snapshot, list(lazy) or None
+        if Master.useSnapshot:
+            # Imported here since most runs do not use a snapshot
+            from gvConfig.snapshot import Snapshot, bootstrapKey, snapshotPath
+            snapshot = Snapshot(Master.snapshotFile or
+                                snapshotPath(Master.configDir),
+                                bootstrapKey(Master.configDir,
+                                             self.gvPackage,
+                                             Master.masterFiles))
+            if snapshot.load():
+                # Everything that has not expired comes from the snapshot.
+                # Only the master files with expired values are run again.
+                only = snapshot.stale()
+                for key in snapshot.order:
+                    if key not in only:
+                        Master._C.add(snapshot.entries(key))
+                        if self._shared is not None:
+                            self._publishing(snapshot.entries(key),
+                                             expires=snapshot.files[key][1])
+                if not only and self._shared is None:
+                    return False, snapshot, only
+        return True, snapshot, only
+
+    def _paths(self) -> None:
+        """
+        Makes the master files importable, from the bundle if there is one
+        and from the configuration directory if not
+        """
+        if Master.bundlePath is not None and self.bundle is None:
+            # Imported here since most runs do not use a bundle
+            from gvConfig.bundle import BundleError, install
+            try:
+                self.bundle = install(Master.bundlePath)
+            except (OSError, BundleError) as e:
+                Master._L.warning('Unable to use the bundle'
+                                  f' {Master.bundlePath}: {e}')
+        if self.bundle is None and str(Master.configDir) not in sys.path:
+            sys.path.insert(0, str(Master.configDir))
+
+    def _fetchRemote(self) -> None:
+        """
+        Brings the master files of the configuration server into the master
+        file package. Only those with no local copy are waited for.
+        """
+        # Imported here since most runs have no configuration server
+        from gvConfig.remote import RemoteMasters
+        self.remote = RemoteMasters(Master.remoteUrl,
+                                    Master.configDir / self.gvPackage,
+                                    Master.remoteDigests)
+        modules = [Master.masterFiles[k][0] for k in Master.remoteKeys
+                   if k in Master.masterFiles]
+        with span('remote master files', 'stage'):
+            status = self.remote.sync(modules)
+        for module, what in status.items():
+            if what == 'failed':
+                Master._L.warning(f'Unable to fetch the master file {module}'
+                                  f' from {Master.remoteUrl}:'
+                                  f' {self.remote.errors[module]}')
+            elif what == 'stale':
+                Master._L.info(f'Using the stale master file {module} while'
+                               ' it is revalidated')
+
+    def _attach(self) -> bool:
+        """
+        Adds the shared snapshot to the configuration. Returns False if there
+        is none, in which case this process must build it and publish it.
+        Only one process builds it at a time; the others wait for it here.
+        """
+        # Imported here since most runs do not share their configuration
+        from gvConfig.sharedSnapshot import SharedSnapshot
+        from gvConfig.snapshot import bootstrapKey
+        shared = SharedSnapshot(bootstrapKey(Master.configDir,
+                                             self.gvPackage,
+                                             Master.masterFiles),
+                                Master.sharedDir)
+        view = shared.attach()
+        if view is None:
+            shared.acquire()
+            view = shared.attach()
+            if view is None:
+                self._shared = shared
+                self._published = []
+                self._lazy = []
+                self._expires = None
+                return False
+            shared.release()
+        self.sharedView = view
+        Master._C.add(view)
+        Master._L.info(f'Attached to generation {view.generation} of the'
+                       f' shared configuration {view.path}')
+        return True
+
+    def _publish(self) -> None:
+        """Publishes the contributions as the shared snapshot"""
+        entries: Dict[str, Any] = {}
+        for source in self._published:
+            entries.update(source)
+        generation = self._shared.publish(entries, self._expires, self._lazy)
+        if generation:
+            Master._L.info(f'Published generation {generation} of the shared'
+                           f' configuration {self._shared.path}')
+            removed = self._shared.prune()
+            if removed:
+                Master._L.info(f'Removed {removed} old shared configuration'
+                               ' files')
+        else:
+            Master._L.warning('Unable to publish the shared configuration'
+                              f' {self._shared.path}')
+
+    def _release(self) -> None:
+        if self._shared is not None:
+            self._shared.release()
+            self._shared = None
+            self._published = []
+            self._lazy = []
+
+    def _reapply(self, snapshot: 'Snapshot', only: List[str]) -> None:
+        """
+        Adds the contributions again, in the order of the snapshot, from the
+        first master file that ran again. The master files that did not run
+        were added before it, so that it could use them, but a master file
+        listed after it must still override it, as it does in a full run.
+        """
+        ran = [k for k in snapshot.order if k in only and k in self.timings]
+        if not ran:
+            return
+        for key in snapshot.order[snapshot.order.index(ran[0]):]:
+            if key not in only or key in self.timings:
+                Master._C.add(snapshot.entries(key))
+        if self._shared is not None:
+            self._published = [snapshot.entries(k) for k in snapshot.order
+                               if k not in only or k in self.timings]
+
+    def _end(self, snapshot: Optional['Snapshot'], errors: int,
+             only: Optional[List[str]] = None) -> int:
+        if snapshot is not None and only:
+            self._reapply(snapshot, only)
+        elif self.sharedView is not None and only:
+            # The entries of the master files listed after them still
+            # override theirs
+            Master._C.add(self.sharedView)
+        for key, seconds in self.timings.items():
+            Master._L.info(f'Master file {key} ran in {seconds * 1000:.3f} ms')
+        if snapshot is not None and errors == 0:
+            if not snapshot.save():
+                Master._L.warning('Unable to save the configuration snapshot'
+                                  f' {snapshot.path}')
+        if self._shared is not None and errors == 0:
+            self._publish()
+        return errors
+
+    def rerun(self, key: str) -> int:
+        """
+        Runs the master file `key` again, with the current version of its
+        module, and adds its contributions to the configuration. Only that
+        master file runs. This is done when the master file changes.
+
+        The module is run from its source in the configuration directory,
+        even when the master files were imported from a bundle, since the
+        bundle holds the version that was current when it was built.
+        """
+        targetModule = Master.masterFiles[key][0]
+        name = f'{self.gvPackage}.{targetModule}'
+        path = (Master.configDir / self.gvPackage /
+                targetModule).with_suffix('.py')
+        self._paths()
+        try:
+            with span(targetModule, 'import'):
+                module = _execSource(name, path)
+        except (OSError, ImportError, SyntaxError):
+            Master._L.warning(f'Unable to import {name} from {path}')
+            return 1
+        code = module.configCode()
+        self._run(key, code)
+        return self._merge([key], {key: module}, {key: code}, None)
+
+    def __call__(self) -> int:
+        try:
+            run, snapshot, only = self._begin()
+            if not run:
+                return 0
+            modules, errors = self._import(only)
+            errors += self._runModules(modules, snapshot)
+            return self._end(snapshot, errors, only)
+        finally:
+            self._release()
+
+    async def arun(self) -> int:
+        """
+        Runs the master files as tasks of the running event loop, so that
+        they overlap with other work on the loop, such as the startup of an
+        asynchronous application. The result is the same as calling the
+        instance.
+        """
+        try:
+            run, snapshot, only = self._begin()
+            if not run:
+                return 0
+            modules, errors = self._import(only)
+            errors += await self._arunModules(modules, snapshot)
+            return self._end(snapshot, errors, only)
+        finally:
+            self._release()
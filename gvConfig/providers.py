@@ -0,0 +1,195 @@
+"""
+Registry of the provider methods of a master file
+
+The `configCode` class of a master file contains a set of provider methods,
+each of which adds one or more entries to the configuration. By convention
+the provider methods of the platform master file are called platformXyz.
+
+A `configCode` class that derives from `Providers` has its provider methods
+collected once, when the class is created, into the class attribute
+`providers`. Each provider is described by a `ProviderSpec` that holds:
+
+* the configuration keys that the provider produces,
+* its cost class, which is one of the `Cost` values,
+* whether it can run at the same time as other providers, and
+* whether its values can be kept in the bootstrap snapshot.
+
+The metadata is given with the `provides` decorator. A method whose name
+starts with `providerPrefix` is a provider even if it is not decorated, so
+adding a provider method is still all that is needed to add an entry.
+
+A provider that declares its keys is lazy, see `gvConfig.lazy`, and runs the
+first time one of its keys is read. The other providers run when the master
+file runs, the cheapest first.
+
+A master file with an `async` `__call__` runs its providers with
+`arunProviders` instead. Providers that are coroutine functions are then
+awaited, and providers that do I/O or expensive work run in the default
+executor of the event loop, all at the same time. Since a lazy provider runs
+when its key is read, which cannot wait for an event loop, a coroutine
+provider always runs when the master file runs.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from enum import IntEnum
+from typing import Any, Callable, Dict, NamedTuple, Tuple, TypeVar
+
+from lib.spans import span
+
+__all__ = ['Cost', 'ProviderSpec', 'Providers', 'provides']
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class Cost(IntEnum):
+    """The cost class of a provider"""
+    CHEAP = 0           # A computation or a system call
+    IO = 1              # Reads files or other external data
+    EXPENSIVE = 2       # Reads a lot of data or does a lot of computation
+
+
+class ProviderSpec(NamedTuple):
+    """The description of one provider method"""
+    name: str
+    keys: Tuple[str, ...] = ()
+    cost: Cost = Cost.CHEAP
+    parallel: bool = True
+    cacheable: bool = True
+
+    @property
+    def lazy(self) -> bool:
+        """A provider that declares its keys runs on first access"""
+        return bool(self.keys)
+
+
+def provides(*keys: str,
+             cost: Cost = Cost.CHEAP,
+             parallel: bool = True,
+             cacheable: bool = True) -> Callable[[F], F]:
+    """Describes a provider method and the configuration keys it produces"""
+    def decorate(method: F) -> F:
+        method.providerSpec = ProviderSpec(method.__name__, keys, Cost(cost),
+                                           parallel, cacheable)
+        return method
+    return decorate
+
+
+class Providers():
+    """
+    The base class of the `configCode` class of a master file. It builds the
+    registry of provider methods when a subclass is created.
+    """
+
+    providerPrefix = 'platform'
+    providers: Tuple[ProviderSpec, ...] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        specs = []
+        # Sorted by name so that the order does not depend on the order of
+        # the definitions.
+        for name in sorted(dir(cls)):
+            if name in vars(Providers):
+                continue
+            attribute = getattr(cls, name, None)
+            spec = getattr(attribute, 'providerSpec', None)
+            if spec is None:
+                if not (name.startswith(cls.providerPrefix) and
+                        callable(attribute)):
+                    continue
+                spec = ProviderSpec(name)
+            elif spec.name != name:
+                spec = spec._replace(name=name)
+            specs.append(spec)
+        cls.providers = tuple(specs)
+
+    @classmethod
+    def providerCost(cls) -> Cost:
+        """
+        The cost of running the master file, which is the highest cost of a
+        provider that is not lazy.
+        """
+        return max((s.cost for s in cls.providers if not s.lazy),
+                   default=Cost.CHEAP)
+
+    @classmethod
+    def parallelSafe(cls) -> bool:
+        """
+        True if the master file can run at the same time as other master
+        files, which is when none of its providers that are not lazy forbid
+        it.
+        """
+        return all(s.parallel for s in cls.providers if not s.lazy)
+
+    @classmethod
+    def volatileKeys(cls) -> Dict[str, float]:
+        """
+        The time to live of the keys that must not be kept in a snapshot. It
+        is zero for every key of a provider that is not cacheable.
+        """
+        return {k: 0.0 for s in cls.providers if not s.cacheable
+                for k in s.keys}
+
+    def runProvider(self, spec: ProviderSpec) -> None:
+        """Runs one provider. Override this to observe the providers."""
+        with span(spec.name, 'provider'):
+            getattr(self, spec.name)()
+
+    def runProviders(self, source) -> None:
+        """
+        Registers the lazy providers in `source`, a `gvConfig.lazy.LazySource`,
+        and runs the other providers, cheapest first.
+        """
+        for spec in self.providers:
+            if spec.lazy:
+                source.register(spec.keys,
+                                lambda spec=spec: self.runProvider(spec))
+        for spec in sorted((s for s in self.providers if not s.lazy),
+                           key=lambda s: s.cost):
+            self.runProvider(spec)
+
+    async def arunProvider(self, spec: ProviderSpec) -> None:
+        """Runs one coroutine provider"""
+        with span(spec.name, 'provider'):
+            await getattr(self, spec.name)()
+
+    async def arunProviders(self, source) -> None:
+        """
+        Like `runProviders`, but run by an asynchronous master file. The
+        coroutine providers and the providers that are not cheap run at the
+        same time. Providers that forbid it run alone, after the others.
+        """
+        import asyncio
+        import inspect
+        loop = asyncio.get_running_loop()
+        tasks = []
+        inline = []
+        alone = []      # Run after the others have finished
+        for spec in sorted(self.providers, key=lambda s: s.cost):
+            coroutine = inspect.iscoroutinefunction(getattr(self, spec.name))
+            if spec.lazy and not coroutine:
+                source.register(spec.keys,
+                                lambda spec=spec: self.runProvider(spec))
+            elif coroutine:
+                tasks.append(asyncio.ensure_future(self.arunProvider(spec)))
+            elif not spec.parallel:
+                alone.append(spec)
+            elif spec.cost > Cost.CHEAP:
+                tasks.append(loop.run_in_executor(None, self.runProvider,
+                                                  spec))
+            else:
+                inline.append(spec)
+        try:
+            for spec in inline:
+                self.runProvider(spec)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            raise
+        for spec in alone:
+            self.runProvider(spec)
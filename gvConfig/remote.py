@@ -0,0 +1,305 @@
+"""
+Master files fetched from a configuration server
+
+The organization and site master files are kept on a central configuration
+server, so that every host of an organization runs the same ones.
+`RemoteMasters` fetches them over HTTP into the master file package, where
+`Master` imports them as usual. It is used by `Master` when its `remoteUrl`
+is set.
+
+A master file is fetched as `<url>/<module>.py`. What the server said about
+it is recorded next to the compiled modules of the package, in
+`__pycache__/<module>.remote.json`: the time it was fetched, how long it stays
+fresh and its `ETag` and `Last-Modified` headers. The startup then depends on
+the local copy:
+
+* A fresh copy is used as it is, without asking the server.
+* A stale copy is used as it is, and is revalidated in the background with a
+  conditional request, `If-None-Match` or `If-Modified-Since`. A changed
+  master file is written to the package for the next run, or for the
+  configuration watcher to pick up, see `gvConfig.watch`.
+* Only when there is no copy does the startup wait for the server.
+
+The master files are fetched at the same time, each in a thread of its own,
+through a pool of persistent connections to the server. A copy stays fresh
+for the `max-age` of the `Cache-Control` header of the response, or for
+`maxAge` seconds if the server gives none.
+
+A master file is Python source that the startup runs, so it is only taken
+from a server that proves who it is, over HTTPS, or when it has the SHA-256
+digest pinned for it in `digests`. A pinned digest is checked whatever the
+scheme, and a master file that does not match is not written. Over plain
+HTTP a master file without a pinned digest is refused.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import hashlib
+import http.client
+import json
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import (Any, Dict, Iterable, List, Mapping, Optional, Tuple,
+                    Union)
+from urllib.parse import quote, urlsplit
+
+__all__ = ['ConnectionPool', 'RemoteMasters', 'RemoteError']
+
+PathLike = Union[str, os.PathLike]
+
+
+class RemoteError(OSError):
+    """The configuration server could not supply a master file"""
+
+
+class ConnectionPool():
+    """
+    Persistent HTTP connections to one server, `url`. A connection is taken
+    from the pool for each request and put back when the response has been
+    read, unless the server closes it.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f'unsupported configuration server URL {url!r}')
+        self.scheme = parts.scheme
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port
+        self.path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.opened = 0     # How many connections have been opened
+
+    def _connect(self) -> http.client.HTTPConnection:
+        self.opened += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port,
+                                               timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port,
+                                          timeout=self.timeout)
+
+    def request(self, path: str, headers: Dict[str, str]
+                ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Sends a GET request for `path`, relative to the URL of the pool.
+        Returns the status, the headers, with lower case names, and the body.
+        """
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        reused = conn is not None
+        if conn is None:
+            conn = self._connect()
+        target = f'{self.path}/{quote(path)}'
+        while True:
+            try:
+                conn.request('GET', target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if not reused:
+                    raise
+                # The server may have closed an idle connection
+                reused = False
+                conn = self._connect()
+        if response.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        return (response.status,
+                {k.lower(): v for k, v in response.getheaders()}, body)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_maxAge = re.compile(r'(?:^|[,\s])max-age\s*=\s*(\d+)', re.IGNORECASE)
+
+
+class RemoteMasters():
+    """
+    The master files of the configuration server `url`, kept in the master
+    file package `directory`. `digests` pins the SHA-256 digest, in hex, of
+    master files by module name.
+    """
+
+    maxAge = 300.0          # Seconds a copy stays fresh without max-age
+    timeout = 5.0           # Seconds to wait for the server
+
+    def __init__(self, url: str, directory: PathLike,
+                 digests: Optional[Mapping[str, str]] = None) -> None:
+        self.url = url
+        self.directory = Path(directory)
+        self.digests: Dict[str, str] = dict(digests or {})
+        self.pool = ConnectionPool(url, self.timeout)
+        self.refreshing: Optional[threading.Thread] = None
+        # What happened to each master file during the last sync, and during
+        # the background revalidation that it started. Each is replaced as a
+        # whole when its sync or revalidation is done.
+        self.status: Dict[str, str] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.refreshed: Dict[str, str] = {}
+        self.refreshErrors: Dict[str, Exception] = {}
+
+    def path(self, module: str) -> Path:
+        return self.directory / f'{module}.py'
+
+    def metaPath(self, module: str) -> Path:
+        return self.directory / '__pycache__' / f'{module}.remote.json'
+
+    def _meta(self, module: str) -> Optional[Dict[str, Any]]:
+        """What is recorded about the local copy, or None if there is none"""
+        if not self.path(module).is_file():
+            return None
+        try:
+            return json.loads(self.metaPath(module).read_text('utf-8'))
+        except (OSError, ValueError):
+            # A master file that was not fetched is stale at once
+            return {'fetched': 0.0, 'maxAge': 0.0}
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.'
+                             f'{threading.get_ident()}')
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _check(self, module: str, body: bytes) -> None:
+        """
+        Raises RemoteError unless the master file `body` may be used: it
+        must match its pinned digest, and have one if it came over plain
+        HTTP
+        """
+        pinned = self.digests.get(module)
+        if pinned is None:
+            if self.pool.scheme != 'https':
+                raise RemoteError(f'{module} is not taken from {self.url}'
+                                  ' without a pinned digest, since the'
+                                  ' server is not authenticated')
+        elif hashlib.sha256(body).hexdigest() != pinned.lower():
+            raise RemoteError(f'{module} from {self.url} does not match its'
+                              ' pinned digest')
+
+    def fetch(self, module: str) -> str:
+        """
+        Fetches a master file from the server, conditionally if there is a
+        local copy. Returns 'fetched' or 'notModified'.
+        """
+        meta = self._meta(module) or {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('lastModified'):
+            headers['If-Modified-Since'] = meta['lastModified']
+        try:
+            status, received, body = self.pool.request(f'{module}.py', headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise RemoteError(f'unable to fetch {module} from'
+                              f' {self.url}: {e}') from e
+        if status == 304 and meta:
+            result = 'notModified'
+        elif status == 200:
+            self._check(module, body)
+            if not self.path(module).is_file() or \
+                    self.path(module).read_bytes() != body:
+                self._write(self.path(module), body)
+            result = 'fetched'
+            meta = {'etag': received.get('etag'),
+                    'lastModified': received.get('last-modified')}
+        else:
+            raise RemoteError(f'unable to fetch {module} from {self.url}:'
+                              f' status {status}')
+        m = _maxAge.search(received.get('cache-control', ''))
+        meta['maxAge'] = float(m.group(1)) if m else self.maxAge
+        meta['fetched'] = time.time()
+        self._write(self.metaPath(module), json.dumps(meta).encode('utf-8'))
+        return result
+
+    def _fetchAll(self, modules: Iterable[str]
+                  ) -> Tuple[Dict[str, str], Dict[str, Exception]]:
+        """
+        Fetches master files at the same time. Returns the outcome for each
+        and the errors.
+        """
+        status: Dict[str, str] = {}
+        errors: Dict[str, Exception] = {}
+
+        def one(module: str) -> None:
+            try:
+                status[module] = self.fetch(module)
+            except RemoteError as e:
+                errors[module] = e
+                if self.path(module).is_file():
+                    status[module] = 'stale'
+                else:
+                    status[module] = 'failed'
+
+        threads = [threading.Thread(target=one, args=(m,), daemon=True,
+                                    name=f'gvRemote-{m}')
+                   for m in modules]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return status, errors
+
+    def _refresh(self, modules: List[str]) -> None:
+        """Revalidates stale master files, in `refreshing`"""
+        self.refreshed, self.refreshErrors = self._fetchAll(modules)
+
+    def sync(self, modules: Iterable[str], now: Optional[float] = None
+             ) -> Dict[str, str]:
+        """
+        Makes the master files `modules` available in the package. Only those
+        without a local copy are waited for; stale copies are revalidated in
+        the background, in `refreshing`, whose outcome is in `refreshed` and
+        `refreshErrors` once it is done. Returns the status of each master
+        file: 'fresh', 'stale', 'fetched', 'notModified' or 'failed'.
+        """
+        now = time.time() if now is None else now
+        result: Dict[str, str] = {}
+        missing: List[str] = []
+        stale: List[str] = []
+        for module in modules:
+            meta = self._meta(module)
+            if meta is None:
+                missing.append(module)
+            elif now - meta.get('fetched', 0.0) < meta.get('maxAge', 0.0):
+                result[module] = 'fresh'
+            else:
+                result[module] = 'stale'
+                stale.append(module)
+        if stale:
+            self.refreshing = threading.Thread(target=self._refresh,
+                                               args=(stale,), daemon=True,
+                                               name='gvRemoteRefresh')
+            self.refreshing.start()
+        errors: Dict[str, Exception] = {}
+        if missing:
+            fetched, errors = self._fetchAll(missing)
+            result.update(fetched)
+        self.status, self.errors = dict(result), errors
+        return result
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the background revalidation. Returns False if it is still
+        running.
+        """
+        if self.refreshing is not None:
+            self.refreshing.join(timeout)
+            return not self.refreshing.is_alive()
+        return True
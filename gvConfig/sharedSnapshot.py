@@ -0,0 +1,433 @@
+"""
+Configuration shared between the processes of a host
+
+When many worker processes start from the same configuration directory, each
+of them runs the master files and holds its own copy of the configuration
+that they build. In shared mode the first process publishes the merged
+contributions of the master files in a read-only snapshot file, named by the
+bootstrap key of `gvConfig.snapshot.bootstrapKey`, and the processes that
+start after it map the file into memory instead of running the master files.
+Every process that is attached to a snapshot shares the same pages of
+memory, and a value is only decoded when it is first read.
+
+The snapshot is kept in /dev/shm when there is one, and otherwise in the
+cache directory of the user. Its layout is
+
+* a header with the layout version, the generation, the time that the first
+  volatile value expires and the number of entries,
+* a table of the offsets and lengths of the key and the value of each entry,
+* an open addressing hash table of the entries by the CRC-32 of their key and
+* the keys, in UTF-8, and the values, each encoded by `marshal` or, if that is
+  not possible, by `pickle`.
+
+A new version of the snapshot, for example one published after the
+configuration was reloaded, is written to a new file with the next
+generation number that is then renamed over the old one. A process that is
+attached to the old generation keeps a consistent view of it until it
+attaches again, see `SharedView.stale`.
+
+The entries that a master file computes only when they are read, see
+`gvConfig.lazy`, are not published, since publishing them would compute them.
+The snapshot lists such master files instead, in `SharedView.lazy`, and a
+process that attaches to it runs them, which only registers their providers.
+
+A change to the master files changes the bootstrap key, and so the name of
+the snapshot. The snapshots and lock files of other keys that have not been
+published for `pruneAge` seconds are removed when a snapshot is published,
+see `SharedSnapshot.prune`.
+
+The values may be pickles, so a snapshot is only used if it belongs to the
+user and cannot be written by anyone else.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import hashlib
+import marshal
+import mmap
+import os
+from pathlib import Path
+import pickle
+import struct
+import time
+from typing import (Any, Dict, Iterator, List, Mapping, Optional,
+                    Sequence, Tuple)
+import zlib
+
+__all__ = ['SharedSnapshot', 'SharedView', 'layoutVersion', 'pruneAge',
+           'sharedDirectory']
+
+# Identifies the layout of a snapshot file. Change it whenever it changes.
+layoutVersion = 2
+# The snapshots of other keys that have not been published for this many
+# seconds are removed
+pruneAge = 24 * 3600.0
+
+_magic = b'GVCFGSHM'
+# magic, layout version, hash table slots, generation, expiry time, entries
+# and the digest of the key
+_header = struct.Struct('<8sIIQdQ32s')
+_entry = struct.Struct('<IIII')     # key offset and length, value ditto
+_slot = struct.Struct('<II')        # CRC-32 of the key, entry number + 1
+_limit = 0xFFFFFFFF
+# Files are opened without following a symbolic link where that is possible
+_nofollow = getattr(os, 'O_NOFOLLOW', 0)
+# The entry that lists the master files with lazily computed entries. No
+# configuration key can start with a NUL.
+_lazyKey = '\0lazy'
+
+
+def sharedDirectory() -> Path:
+    """
+    Returns the directory of the shared snapshots, which is /dev/shm if it
+    can be used and the cache directory of the user otherwise.
+    """
+    shm = Path('/dev/shm')
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'globalvillage'
+
+
+def _private(st: os.stat_result) -> bool:
+    """Whether a file belongs to the user and no one else can write it"""
+    return not (hasattr(os, 'getuid') and st.st_uid != os.getuid() or
+                st.st_mode & 0o022)
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.sha256(key.encode('utf-8')).digest()
+
+
+def _encode(value: Any) -> bytes:
+    try:
+        return b'm' + marshal.dumps(value)
+    except ValueError:
+        # Anything other than the built in types, including subclasses
+        return b'p' + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _build(entries: Mapping[str, Any], key: str, generation: int,
+           expires: Optional[float], lazy: Sequence[str] = ()
+           ) -> List[bytes]:
+    """Returns the contents of a snapshot file of `entries`, in pieces"""
+    items = [(k.encode('utf-8'), _encode(v)) for k, v in entries.items()]
+    if lazy:
+        items.append((_lazyKey.encode('utf-8'), _encode(list(lazy))))
+    count = len(items)
+    slots = 1 << max(3, (2 * count).bit_length())   # At most half full
+    mask = slots - 1
+    slotsAt = _header.size + count * _entry.size
+    table = bytearray(slotsAt + slots * _slot.size)
+    pos = len(table)
+    for i, (kb, vb) in enumerate(items):
+        _entry.pack_into(table, _header.size + i * _entry.size,
+                         pos, len(kb), pos + len(kb), len(vb))
+        pos += len(kb) + len(vb)
+        h = zlib.crc32(kb)
+        s = h & mask
+        while _slot.unpack_from(table, slotsAt + s * _slot.size)[1]:
+            s = (s + 1) & mask
+        _slot.pack_into(table, slotsAt + s * _slot.size, h, i + 1)
+    if pos > _limit:
+        raise ValueError('The configuration is too large to be shared')
+    _header.pack_into(table, 0, _magic, layoutVersion, slots, generation,
+                      expires or 0.0, count, _digest(key))
+    pieces = [bytes(table)]
+    for kb, vb in items:
+        pieces += (kb, vb)
+    return pieces
+
+
+class SharedView(Mapping):
+    """
+    The read-only mapping of configuration keys to values of one generation
+    of a snapshot. Values are decoded the first time that they are read.
+    `lazy` lists the master files whose lazily computed entries are not in
+    the snapshot.
+    """
+
+    def __init__(self, buffer: mmap.mmap, path: Path,
+                 identity: Tuple[int, int]) -> None:
+        self.path = path
+        self._mm = buffer
+        self._buffer = memoryview(buffer)
+        self._identity = identity
+        (_, _, self._slots, self.generation, expires, self._count,
+         _) = _header.unpack_from(buffer)
+        self.expires: Optional[float] = expires or None
+        self._slotsAt = _header.size + self._count * _entry.size
+        self._values: Dict[str, Any] = {}
+        lazy = self._find(_lazyKey)
+        self.lazy: List[str] = self._decode(lazy) if lazy >= 0 else []
+        self._hidden = int(lazy >= 0)
+
+    def _find(self, key: object) -> int:
+        """Returns the number of the entry for `key`, or -1"""
+        if not isinstance(key, str):
+            return -1
+        kb = key.encode('utf-8')
+        h = zlib.crc32(kb)
+        mask = self._slots - 1
+        s = h & mask
+        while True:
+            sh, i = _slot.unpack_from(self._mm,
+                                      self._slotsAt + s * _slot.size)
+            if not i:
+                return -1
+            if sh == h:
+                ko, kl, _, _ = _entry.unpack_from(
+                    self._mm, _header.size + (i - 1) * _entry.size)
+                if kl == len(kb) and self._mm[ko:ko + kl] == kb:
+                    return i - 1
+            s = (s + 1) & mask
+
+    def _decode(self, i: int) -> Any:
+        """Returns the value of the entry number `i`"""
+        _, _, vo, vl = _entry.unpack_from(self._mm,
+                                          _header.size + i * _entry.size)
+        with self._buffer[vo + 1:vo + vl] as data:
+            if self._mm[vo:vo + 1] == b'm':
+                return marshal.loads(data)
+            return pickle.loads(data)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        i = self._find(key) if key != _lazyKey else -1
+        if i < 0:
+            raise KeyError(key)
+        value = self._decode(i)
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or (key != _lazyKey and
+                                       self._find(key) >= 0)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            ko, kl, _, _ = _entry.unpack_from(self._mm,
+                                              _header.size + i * _entry.size)
+            key = self._mm[ko:ko + kl].decode('utf-8')
+            if key != _lazyKey:
+                yield key
+
+    def __len__(self) -> int:
+        return self._count - self._hidden
+
+    def stale(self, now: Optional[float] = None) -> bool:
+        """
+        Returns True if a later generation has been published, or the
+        snapshot has been removed, or a value in it has expired.
+        """
+        now = time.time() if now is None else now
+        if self.expires is not None and self.expires <= now:
+            return True
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return True
+        return (st.st_dev, st.st_ino) != self._identity
+
+    def close(self) -> None:
+        """Unmaps the snapshot. The values already read can still be used."""
+        self._buffer.release()
+        self._mm.close()
+
+
+class SharedSnapshot():
+    """
+    The snapshot of the configuration for the bootstrap key `key`, in
+    `directory`, by default `sharedDirectory()`.
+    """
+
+    def __init__(self, key: str, directory: Optional[Path] = None) -> None:
+        self.key = key
+        uid = os.getuid() if hasattr(os, 'getuid') else 0
+        self._prefix = f'gv-config-{uid}-'
+        self.path = (Path(directory or sharedDirectory()) /
+                     f'{self._prefix}{key[:32]}')
+        self._lock: Optional[int] = None
+
+    def _open(self) -> Optional[Tuple[mmap.mmap, Tuple[int, int]]]:
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            st = os.fstat(fd)
+            if not _private(st) or st.st_size < _header.size:
+                return None
+            return (mmap.mmap(fd, 0, access=mmap.ACCESS_READ),
+                    (st.st_dev, st.st_ino))
+        except (OSError, ValueError):
+            return None
+        finally:
+            os.close(fd)
+
+    def attach(self, now: Optional[float] = None) -> Optional[SharedView]:
+        """
+        Maps the current generation of the snapshot. Returns None if there is
+        none, or if it was made for a different key or layout, or if a value
+        in it has expired.
+        """
+        opened = self._open()
+        if opened is None:
+            return None
+        buffer, identity = opened
+        magic, version, slots, _, expires, count, digest = \
+            _header.unpack_from(buffer)
+        now = time.time() if now is None else now
+        if (magic != _magic or version != layoutVersion or
+                digest != _digest(self.key) or
+                len(buffer) < _header.size + count * _entry.size +
+                slots * _slot.size or
+                expires and expires <= now):
+            buffer.close()
+            return None
+        return SharedView(buffer, self.path, identity)
+
+    def generation(self) -> int:
+        """The generation of the current snapshot, 0 if there is none"""
+        opened = self._open()
+        if opened is None:
+            return 0
+        buffer, _ = opened
+        with buffer:
+            magic, version, _, generation, _, _, digest = \
+                _header.unpack_from(buffer)
+        if (magic, version, digest) != (_magic, layoutVersion,
+                                        _digest(self.key)):
+            return 0
+        return generation
+
+    def publish(self,
+                entries: Mapping[str, Any],
+                expires: Optional[float] = None,
+                lazy: Sequence[str] = ()) -> int:
+        """
+        Publishes `entries` as the next generation of the snapshot, atomically,
+        and returns the generation. `expires` is the time at which the first
+        volatile value expires and `lazy` lists the master files whose lazily
+        computed entries are left out. Returns 0 if the snapshot could not be
+        written, for example because a value can not be pickled.
+        """
+        try:
+            generation = self.generation() + 1
+            pieces = _build(entries, self.key, generation, expires, lazy)
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}')
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | _nofollow
+            try:
+                fd = os.open(tmp, flags, 0o600)
+            except FileExistsError:
+                # Left by an earlier process with the same pid, or planted.
+                # Removing it removes a symbolic link, not its target.
+                os.unlink(tmp)
+                fd = os.open(tmp, flags, 0o600)
+            try:
+                with open(fd, 'wb') as f:
+                    f.writelines(pieces)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except (OSError, ValueError, pickle.PicklingError, AttributeError,
+                TypeError):
+            return 0
+        return generation
+
+    def prune(self, age: float = pruneAge,
+              now: Optional[float] = None) -> int:
+        """
+        Removes the snapshots of the user for other keys, the files left by
+        processes that failed to publish them and the lock files that no
+        snapshot uses, if they have not been written for `age` seconds. A
+        lock file is only removed while no other process holds it. Returns
+        the number of files removed.
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        try:
+            names = [p for p in self.path.parent.iterdir()
+                     if p.name.startswith(self._prefix) and
+                     p.name.split('.')[0] != self.path.name]
+        except OSError:
+            return 0
+        for path in names:
+            if path.name.endswith('.lock'):
+                continue
+            try:
+                st = os.lstat(path)
+                if not _private(st) or st.st_mtime > now - age:
+                    continue
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+        for path in names:
+            if path.name.endswith('.lock') and \
+                    not path.with_suffix('').exists() and \
+                    self._unlinkLock(path, now - age):
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _unlinkLock(path: Path, before: float) -> bool:
+        """
+        Removes a lock file that was created before `before` if no other
+        process holds it
+        """
+        try:
+            import fcntl
+        except ImportError:
+            return False
+        try:
+            fd = os.open(path, os.O_RDWR | _nofollow)
+        except OSError:
+            return False
+        try:
+            st = os.fstat(fd)
+            if not _private(st) or st.st_mtime > before:
+                return False
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+
+    def acquire(self) -> None:
+        """
+        Waits until no other process is building the snapshot, so that only
+        the first process runs the master files and the others attach to
+        what it publishes.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            return
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self._lock = os.open(self.path.with_name(f'{self.path.name}.lock'),
+                                 os.O_RDWR | os.O_CREAT | _nofollow, 0o600)
+            # A lock file that someone else controls could keep this process
+            # waiting for ever, so it is not used.
+            if not _private(os.fstat(self._lock)):
+                self.release()
+                return
+            fcntl.flock(self._lock, fcntl.LOCK_EX)
+        except OSError:
+            self.release()
+
+    def release(self) -> None:
+        if self._lock is not None:
+            os.close(self._lock)
+            self._lock = None
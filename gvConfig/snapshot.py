@@ -0,0 +1,170 @@
+"""
+Persistent snapshot of the configuration contributed by the master files
+
+Running every master file at every process launch repeats the same work over
+and over: the password file is read, the platform is examined and the site and
+organization master files are processed, all to produce the same result. The
+snapshot stores the contribution of each master file in a cache file so that a
+later launch can add them to the configuration after a single read of the
+cache file.
+
+A snapshot is only used when its key matches the key of the current launch.
+The key covers:
+
+* the version of the snapshot format,
+* the contents, modification times and sizes of the master files,
+* the identity of the platform and of the Python interpreter, and
+* the user running the program.
+
+Some values are volatile even when none of these change. The `configCode`
+class of a master file can give them a time to live, in seconds, in a class
+attribute called `ttl` that maps a configuration key to its time to live. When
+any value contributed by a master file expires, that master file is run again
+and its contribution in the snapshot is replaced. The entries that a master
+file computes only when they are read are not recorded, since recording them
+would compute them, and such a master file is run at every launch.
+
+The snapshot is a pickle and is therefore only read from, and written to, the
+private cache directory of the user.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from getpass import getuser
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import sys
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+__all__ = ['Snapshot', 'bootstrapKey', 'snapshotPath', 'snapshotVersion']
+
+# Identifies the layout of a snapshot. Change it whenever the layout changes.
+snapshotVersion = 1
+
+
+def snapshotPath(configDir: Path) -> Path:
+    """
+    Returns the default location of the snapshot for a configuration
+    directory. Each configuration directory has its own snapshot in the cache
+    directory of the user.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    name = hashlib.sha1(str(configDir).encode('utf-8')).hexdigest()[:16]
+    return Path(base) / 'globalvillage' / f'bootstrap-{name}.snapshot'
+
+
+def bootstrapKey(configDir: Path,
+                 package: str,
+                 masterFiles: Mapping[str, Tuple[str, str]]) -> str:
+    """Computes the key that a usable snapshot must have"""
+    h = hashlib.sha256(f'gv-snapshot {snapshotVersion}\0'.encode('utf-8'))
+    for key, (module, _) in masterFiles.items():
+        path = (configDir / package / module).with_suffix('.py')
+        h.update(f'{key}\0'.encode('utf-8'))
+        try:
+            st = path.stat()
+            data = path.read_bytes()
+        except OSError:
+            h.update(b'missing\0')
+            continue
+        h.update(f'{st.st_mtime_ns}\0{st.st_size}\0'.encode('utf-8'))
+        h.update(data)
+    if hasattr(os, 'uname'):
+        uname = tuple(os.uname())
+    else:
+        import platform
+        uname = tuple(platform.uname())
+    identity = (sys.platform, *uname, sys.version, getuser(),
+                str(os.getuid() if hasattr(os, 'getuid') else ''))
+    h.update('\0'.join(identity).encode('utf-8'))
+    return h.hexdigest()
+
+
+class Snapshot():
+    """
+    The contributions of the master files, by `Master.masterFiles` key, in
+    the order that they were added to the configuration.
+    """
+
+    def __init__(self, path: Path, key: str) -> None:
+        self.path = path
+        self.key = key
+        # The entries contributed by each master file and the time that the
+        # first of them expires, or None if none of them expire.
+        self.files: Dict[str, Tuple[Dict[str, Any], Optional[float]]] = {}
+        self.order: List[str] = []
+
+    def load(self) -> bool:
+        """
+        Reads the snapshot. Returns False if there is no snapshot or if it
+        was made for a different key or by a different version of this module.
+        """
+        try:
+            data = pickle.loads(self.path.read_bytes())
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, IndexError, TypeError, ValueError):
+            return False
+        if (not isinstance(data, dict) or
+                data.get('version') != snapshotVersion or
+                data.get('key') != self.key):
+            return False
+        self.files = data['files']
+        self.order = data['order']
+        return True
+
+    def stale(self, now: Optional[float] = None) -> List[str]:
+        """Returns the master files that have a value that has expired"""
+        now = time.time() if now is None else now
+        return [k for k in self.order
+                if self.files[k][1] is not None and self.files[k][1] <= now]
+
+    def entries(self, fileKey: str) -> Dict[str, Any]:
+        return self.files[fileKey][0]
+
+    def record(self,
+               fileKey: str,
+               entries: Mapping[str, Any],
+               ttl: Optional[Mapping[str, float]] = None,
+               lazy: bool = False) -> None:
+        """
+        Replaces the contribution of a master file. A master file that has
+        a contribution keeps its place in `order`. `lazy` marks a
+        contribution without the entries that are computed when they are
+        first read, see `gvConfig.lazy`. It expires at once, so that the
+        master file runs again, which only registers its providers.
+        """
+        now = time.time()
+        expiries = [now + seconds for k, seconds in (ttl or {}).items()
+                    if k in entries]
+        if lazy:
+            expiries.append(now)
+        self.files[fileKey] = (dict(entries), min(expiries, default=None))
+        if fileKey not in self.order:
+            self.order.append(fileKey)
+
+    def save(self) -> bool:
+        """
+        Writes the snapshot atomically. Returns False if it could not be
+        written, for example because an entry can not be pickled.
+        """
+        data = {'version': snapshotVersion,
+                'key': self.key,
+                'files': self.files,
+                'order': self.order}
+        try:
+            blob = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}')
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, self.path)
+        except (OSError, pickle.PicklingError, AttributeError, TypeError):
+            return False
+        return True
@@ -0,0 +1,232 @@
+"""
+Reloading of the configuration when its files change
+
+The configuration is normally built once, when the application starts.
+`ConfigWatcher` keeps it up to date while the application runs. It watches
+the master files in the configuration directory and any number of
+configuration data files, and when one of them changes:
+
+* a changed master file is run again on its own, see `Master.rerun`, and
+* a changed configuration data file is reloaded incrementally, see
+  `gvConfig.cfgReload`, so only the groups that changed are parsed again and
+  only the values that depend on the changes are resolved again.
+
+The application is told of each change through the callbacks given to
+`subscribe`, which receive a `Notification`. They run in the thread of the
+watcher, or in the thread that calls `check`.
+
+Changes are seen through inotify on Linux. Elsewhere, or when inotify cannot
+be used, the files are polled every `interval` seconds by comparing their
+modification time, size and inode. Since the directories of the files are
+watched, a file that is replaced by renaming another over it is seen too.
+Changes that arrive within `settle` seconds of each other are handled
+together, since an editor writes a file in several steps.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import (Callable, Dict, Iterable, List, NamedTuple, Optional,
+                    Set, Tuple, Union)
+
+from gvConfig.cfgData import CfgData, CfgDataError, Node
+from gvConfig.cfgReload import CfgReloader, Change
+
+__all__ = ['ConfigWatcher', 'Notification', 'PollingWatcher']
+
+PathLike = Union[str, os.PathLike]
+Signature = Optional[Tuple[int, int, int]]
+
+_log = logging.getLogger('gvConfig.watch')
+
+
+class Notification(NamedTuple):
+    """
+    A change to the configuration. `kind` is 'master' for a master file, with
+    its key in `key`, or 'data' for a configuration data file, with the
+    values that changed in `changes` and all of the data of the file, as it
+    is now, in `data`. `error` is set if the change could not be applied, in
+    which case the configuration is as it was.
+    """
+    kind: str
+    path: Path
+    key: Optional[str] = None
+    changes: Dict[Node, Change] = {}
+    error: Optional[Exception] = None
+    data: Optional[CfgData] = None
+
+
+def _signature(path: Path) -> Signature:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class PollingWatcher():
+    """Reports the files that change by comparing their status"""
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+        self._files: Dict[Path, Signature] = {}
+
+    def add(self, path: PathLike) -> None:
+        path = Path(path)
+        self._files[path] = _signature(path)
+
+    def read(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Returns the files that changed, checking every `interval` seconds
+        for up to `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, old in self._files.items():
+                new = _signature(path)
+                if new != old:
+                    self._files[path] = new
+                    changed.add(path)
+            if changed:
+                return changed
+            wait = self.interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return changed
+            time.sleep(wait)
+
+    def close(self) -> None:
+        pass
+
+
+class ConfigWatcher():
+    """
+    Watches the master files of `master`, a `gvConfig.master.Master`, and
+    the configuration data files in `dataFiles`, and applies their changes.
+    `polling` forces the polling watcher, which checks every `interval`
+    seconds.
+    """
+
+    def __init__(self,
+                 master=None,
+                 dataFiles: Iterable[PathLike] = (),
+                 interval: float = 1.0,
+                 settle: float = 0.05,
+                 polling: bool = False) -> None:
+        self.master = master
+        self.settle = settle
+        self.reloaders: Dict[Path, CfgReloader] = {}
+        self.masterFiles: Dict[Path, str] = {}
+        self._callbacks: List[Callable[[Notification], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        if master is not None:
+            directory = Path(master.configDir) / master.gvPackage
+            for key, (targetModule, _) in master.masterFiles.items():
+                path = (directory / targetModule).with_suffix('.py')
+                self.masterFiles[path.resolve()] = key
+        for path in dataFiles:
+            reloader = CfgReloader(path)
+            reloader.load()
+            self.reloaders[Path(path).resolve()] = reloader
+        self.watcher = self._watcher(interval, polling)
+
+    def _watcher(self, interval: float, polling: bool):
+        paths = list(self.masterFiles) + list(self.reloaders)
+        if not polling:
+            from lib.linux import inotify
+            if inotify.available:
+                try:
+                    watcher = inotify.Inotify()
+                    for directory in {p.parent for p in paths}:
+                        watcher.add(directory)
+                    return watcher
+                except OSError as e:
+                    _log.warning(f'Polling for configuration changes, inotify'
+                                 f' cannot be used: {e}')
+        watcher = PollingWatcher(interval)
+        for path in paths:
+            watcher.add(path)
+        return watcher
+
+    def subscribe(self, callback: Callable[[Notification], None]) -> None:
+        """Calls `callback` with a `Notification` for each change"""
+        self._callbacks.append(callback)
+
+    def check(self, timeout: Optional[float] = 0.0) -> List[Notification]:
+        """
+        Waits up to `timeout` seconds for changes, applies them and returns
+        the notifications sent.
+        """
+        changed = self.watcher.read(timeout)
+        while changed:
+            more = self.watcher.read(self.settle)
+            if not more:
+                break
+            changed |= more
+        notifications = []
+        for path in sorted(p.resolve() for p in changed):
+            notification = self._apply(path)
+            if notification is not None:
+                notifications.append(notification)
+                self._notify(notification)
+        return notifications
+
+    def _apply(self, path: Path) -> Optional[Notification]:
+        if path in self.masterFiles:
+            key = self.masterFiles[path]
+            if not path.is_file():
+                return None
+            try:
+                errors = self.master.rerun(key)
+            except Exception as e:
+                return Notification('master', path, key, error=e)
+            return Notification('master', path, key,
+                                error=(RuntimeError(f'{errors} errors')
+                                       if errors else None))
+        reloader = self.reloaders.get(path)
+        if reloader is None or not path.is_file():
+            return None
+        try:
+            changes = reloader.reload()
+        except (CfgDataError, OSError, UnicodeDecodeError) as e:
+            return Notification('data', path, error=e)
+        if not changes:
+            return None
+        return Notification('data', path, changes=changes,
+                            data=reloader.data)
+
+    def _notify(self, notification: Notification) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(notification)
+            except Exception:
+                _log.exception('A configuration change callback failed')
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self.check(0.5)
+
+    def start(self) -> None:
+        """Watches for changes in a background thread"""
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run,
+                                            name='gvConfigWatch', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        self.watcher.close()
@@ -0,0 +1,218 @@
+"""
+Import time budget of the startup path
+
+The import time of each module is measured by running a fresh interpreter
+with `-X importtime`, which reports, for every module imported, the time spent
+in the module itself and the cumulative time including the modules that it
+imported, in microseconds. Since the times vary from run to run, each module
+is given the shortest of several runs.
+
+A budget is a JSON file:
+
+    {
+      "bootstrap": ["gvConfig.master", ...],
+      "baseline": 9000,
+      "modules": {"gvConfig.master": 12000, ...},
+      "deferred": ["pickle", ...]
+    }
+
+`bootstrap` lists the modules that are imported, and `deferred` lists the
+modules that must not be imported during the bootstrap at all because they
+are imported lazily. Which modules are imported does not depend on the
+machine, so that is always checked. A bootstrap module that cannot be
+imported, because a package that it needs is not installed, is skipped.
+
+`modules` gives the most cumulative import time, in microseconds, allowed
+for each bootstrap module, and `baseline` the import time of the startup of
+an interpreter that runs nothing, measured when the budget was made. The
+times are checked relative to the baseline measured in the same check: each
+allowance is scaled by how much slower or faster the interpreter started,
+so that a busy or a different machine does not break the budget. The budget
+is made from measurements with a small margin, a quarter of the time plus a
+millisecond by default, so that a regression of more than that is caught.
+It is made with:
+
+    python -m lib.importTime update Tests/unittests/importBudget.json
+
+and checked, as the regression test does when the GV_IMPORT_TIMING
+environment variable is set, with:
+
+    python -m lib.importTime check Tests/unittests/importBudget.json
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import json
+import os
+from pathlib import Path
+import re
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
+
+__all__ = ['ImportTime', 'parseImportTime', 'measureImports',
+           'measureBaseline', 'makeBudget', 'checkBudget', 'loadBudget']
+
+PathLike = Union[str, os.PathLike]
+
+_line = re.compile(r'import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)')
+_failed = re.compile(r'^import failed: (\S+)$', re.MULTILINE)
+
+
+class ImportTime(NamedTuple):
+    """The import time of a module in microseconds"""
+    self: int
+    cumulative: int
+    depth: int      # The nesting of the import, 0 for the top level
+
+
+def parseImportTime(text: str) -> Dict[str, ImportTime]:
+    """Extracts the module import times from `-X importtime` output"""
+    times = {}
+    for m in _line.finditer(text):
+        times[m.group(4)] = ImportTime(int(m.group(1)), int(m.group(2)),
+                                       (len(m.group(3)) - 1) // 2)
+    return times
+
+
+def _run(code: str, executable: Optional[str],
+         cwd: Optional[PathLike]) -> Dict[str, ImportTime]:
+    """
+    The import times of running `code` in a fresh interpreter, without the
+    modules that it reports as failed
+    """
+    env = dict(os.environ)
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    result = subprocess.run([executable or sys.executable, '-X',
+                             'importtime', '-c', code],
+                            capture_output=True, text=True, cwd=cwd,
+                            env=env, check=True)
+    times = parseImportTime(result.stderr)
+    for name in _failed.findall(result.stderr):
+        times.pop(name, None)
+    return times
+
+
+def measureImports(modules: Iterable[str],
+                   runs: int = 3,
+                   executable: Optional[str] = None,
+                   cwd: Optional[PathLike] = None) -> Dict[str, ImportTime]:
+    """
+    Imports `modules`, in order, in `runs` fresh interpreters and returns the
+    shortest import time of every module that was imported. A module that
+    cannot be imported is left out, with what it imported before it failed.
+    """
+    code = 'import sys\n' + ''.join(
+        f'try:\n    import {m}\nexcept ImportError:\n'
+        f'    print("import failed: {m}", file=sys.stderr)\n'
+        for m in modules)
+    best: Dict[str, ImportTime] = {}
+    for _ in range(runs):
+        for name, t in _run(code, executable, cwd).items():
+            if name not in best or t.cumulative < best[name].cumulative:
+                best[name] = t
+    return best
+
+
+def measureBaseline(runs: int = 3,
+                    executable: Optional[str] = None,
+                    cwd: Optional[PathLike] = None) -> int:
+    """
+    The shortest, over `runs` fresh interpreters, of the import time of the
+    startup of an interpreter that runs nothing, in microseconds
+    """
+    return min(sum(t.cumulative for t in _run('pass', executable,
+                                              cwd).values() if t.depth == 0)
+               for _ in range(runs))
+
+
+def makeBudget(bootstrap: List[str],
+               measured: Dict[str, ImportTime],
+               deferred: Iterable[str] = (),
+               factor: float = 1.25,
+               slack: int = 1000,
+               baseline: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Makes a budget that allows each bootstrap module `factor` times its
+    measured cumulative import time plus `slack` microseconds. `baseline` is
+    the time given by `measureBaseline` along with `measured`.
+    """
+    budget: Dict[str, Any] = {'bootstrap': list(bootstrap)}
+    if baseline is not None:
+        budget['baseline'] = baseline
+    budget['modules'] = {m: int(measured[m].cumulative * factor + slack)
+                         for m in bootstrap if m in measured}
+    budget['deferred'] = sorted(deferred)
+    return budget
+
+
+def checkBudget(measured: Dict[str, ImportTime],
+                budget: Dict[str, Any],
+                baseline: Optional[int] = None,
+                timing: bool = True) -> List[str]:
+    """
+    Returns a description of every way that `measured` breaks `budget`. The
+    times are only checked if `timing` is set, each allowance scaled by
+    `baseline`, measured along with `measured`, over that of the budget.
+    """
+    problems = []
+    scale = 1.0
+    if baseline is not None and budget.get('baseline'):
+        scale = baseline / budget['baseline']
+    for name, allowed in budget['modules'].items() if timing else ():
+        t = measured.get(name)
+        if t is None:
+            continue    # Imported before the measurement started
+        allowed = int(allowed * scale)
+        if t.cumulative > allowed:
+            problems.append(f'{name} took {t.cumulative} us to import,'
+                            f' the budget is {allowed} us')
+    for name in budget.get('deferred', ()):
+        if name in measured:
+            problems.append(f'{name} was imported during the bootstrap but'
+                            ' must be imported lazily')
+    return problems
+
+
+def loadBudget(path: PathLike) -> Dict[str, Any]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='python -m lib.importTime',
+        description='Makes or checks the import time budget of the bootstrap')
+    parser.add_argument('command', choices=('update', 'check'))
+    parser.add_argument('budget', help='the budget file')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--factor', type=float, default=1.25)
+    parser.add_argument('--slack', type=int, default=1000,
+                        help='microseconds added to every module budget')
+    args = parser.parse_args(argv)
+    budget = loadBudget(args.budget)
+    baseline = measureBaseline(args.runs)
+    measured = measureImports(budget['bootstrap'], args.runs)
+    if args.command == 'update':
+        budget = makeBudget(budget['bootstrap'], measured,
+                            budget.get('deferred', ()), args.factor,
+                            args.slack, baseline)
+        Path(args.budget).write_text(json.dumps(budget, indent=2) + '\n',
+                                     encoding='utf-8')
+    print(f'{baseline:9} us {budget.get("baseline", 0):9} us  (baseline)')
+    for name in budget['bootstrap']:
+        if name in measured:
+            print(f'{measured[name].cumulative:9} us'
+                  f' {budget["modules"].get(name, 0):9} us  {name}')
+    problems = checkBudget(measured, budget, baseline)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
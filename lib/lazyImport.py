@@ -0,0 +1,54 @@
+"""
+Lazy imports for the startup path
+
+Every module imported while an application starts adds to its startup time,
+even when the application never uses it. A module that is only needed in
+some runs, such as the configuration file index or a profiler, is better
+imported the first time that it is used.
+
+`lazyModule` returns a module whose code has not run yet. The module is
+entered in `sys.modules` and in its parent package in the usual way, and its
+code runs the first time that one of its attributes is read, so it can be
+bound to a global name and used as if it had been imported normally:
+
+    cfgIndex = lazyModule('gvConfig.cfgIndex')
+    ...
+    data = cfgIndex.loadGroups(path, groups)     # Imported here
+
+Modules needed only inside one function are simply imported inside that
+function, as `Master` does for its thread pool and snapshot.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+__all__ = ['lazyModule']
+
+
+def lazyModule(name: str) -> ModuleType:
+    """
+    Returns the module called `name`, which is imported when one of its
+    attributes is first read. A module that has already been imported is
+    returned as it is. Raises ModuleNotFoundError at once if the module does
+    not exist.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
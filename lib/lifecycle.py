@@ -0,0 +1,129 @@
+"""
+Asynchronous lifecycle of applications started from the startup template
+
+The template calls the `startup`, `__call__` and `shutdown` methods of the
+user application one after another. When any of them is a coroutine function
+the whole lifecycle runs instead on one event loop, managed by `run`:
+
+* The bootstrap tasks, such as `gvConfig.master.Master.arun` or the loading of
+  the configuration file, start first and run while the application starts,
+  so the two overlap.
+* The application runs once `startup` has finished and every bootstrap task
+  has completed, since it may read anything that they add to the
+  configuration. The `ready` function, if any, is called in between, when
+  the configuration is complete.
+* `shutdown` runs whenever `startup` has finished, including when the run is
+  interrupted.
+
+The methods that are not coroutine functions are called in the loop thread,
+and the result of each method is its return code, where None stands for 0.
+
+On the first Ctrl-C the running task is cancelled. The bootstrap tasks and
+any tasks that the application left running are cancelled and waited for,
+`shutdown` runs and `KeyboardInterrupt` is raised as usual. An error in a
+bootstrap task is raised when the application would have started.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import inspect
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+__all__ = ['isAsync', 'lifecycle', 'run']
+
+Bootstrap = Union[Awaitable[Any], Callable[[], Any]]
+
+lifecycleMethods = ('startup', '__call__', 'shutdown')
+
+
+def isAsync(app: Any) -> bool:
+    """True if a lifecycle method of `app` is a coroutine function"""
+    for name in lifecycleMethods:
+        method = getattr(app, name, None)
+        if inspect.iscoroutinefunction(method):
+            return True
+    # A class or a callable object whose __call__ is a coroutine function
+    return not inspect.isroutine(app) and \
+        inspect.iscoroutinefunction(getattr(type(app), '__call__', None))
+
+
+async def _result(value: Any) -> int:
+    if inspect.isawaitable(value):
+        value = await value
+    return value or 0
+
+
+async def lifecycle(app: Any, bootstrap: Iterable[Bootstrap] = (),
+                    ready: Optional[Callable[[], Any]] = None) -> int:
+    """
+    Runs `startup`, `__call__` and `shutdown` of `app` while the `bootstrap`
+    tasks run. Each bootstrap task is an awaitable or a function, which is
+    run in the default executor. `ready` is called when every bootstrap task
+    has completed, before the application runs. Returns the highest return
+    code and raises AssertionError, as the template does, when one of the
+    methods fails.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.ensure_future(b) if inspect.isawaitable(b)
+             else loop.run_in_executor(None, b) for b in bootstrap]
+    started = False
+    ret = 0
+    try:
+        startup = getattr(app, 'startup', None)
+        if startup is not None:
+            ret = await _result(startup())
+            if ret > 0:
+                raise AssertionError('Application startup failed with'
+                                     f' return code {ret}')
+        started = True
+        await asyncio.gather(*tasks)
+        if ready is not None:
+            ready()
+        ret = max(await _result(app()), ret)
+        if ret > 0:
+            raise AssertionError(f'The application failed with return code'
+                                 f' {ret}')
+    except BaseException:
+        await _cancel(tasks)
+        if started:
+            await _shutdown(app, ret)
+        raise
+    return await _shutdown(app, ret)
+
+
+async def _cancel(tasks) -> None:
+    import asyncio
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _shutdown(app: Any, ret: int) -> int:
+    import asyncio
+    # Tasks that the application started and left running
+    current = asyncio.current_task()
+    await _cancel([t for t in asyncio.all_tasks() if t is not current])
+    shutdown = getattr(app, 'shutdown', None)
+    if shutdown is not None:
+        ret = max(await _result(shutdown()), ret)
+        if ret > 0:
+            raise AssertionError('Application failed during shutdown with'
+                                 f' return code {ret}')
+    return ret
+
+
+def run(app: Any, bootstrap: Iterable[Bootstrap] = (),
+        debug: bool = False,
+        ready: Optional[Callable[[], Any]] = None) -> int:
+    """Runs the lifecycle of `app` on a new event loop"""
+    import asyncio
+    if not hasattr(asyncio, 'Runner'):
+        # Before Python 3.11 the remaining tasks are cancelled when the loop
+        # closes
+        return asyncio.run(lifecycle(app, bootstrap, ready), debug=debug)
+    with asyncio.Runner(debug=debug) as runner:
+        return runner.run(lifecycle(app, bootstrap, ready))
@@ -0,0 +1,38 @@
+"""
+*Linux* platform specific functions
+
+The names below are exported by the package, each from the module given for
+it. A module is imported only when one of its names is first read, see
+`lib.platforms`.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from lib.platforms import lazyExports
+
+_exports = {
+    'GroupRecord': 'identity',
+    'Identity': 'identity',
+    'IdentityIndex': 'identity',
+    'groupFile': 'identity',
+    'identityIndex': 'identity',
+    'iterGroups': 'identity',
+    'parseGroup': 'identity',
+    'Inotify': 'inotify',
+    'available': 'inotify',
+    'PasswdRecord': 'passwd',
+    'PasswdIndex': 'passwd',
+    'passwdFile': 'passwd',
+    'parseRecord': 'passwd',
+    'iterRecords': 'passwd',
+    'findUser': 'passwd',
+    'lookupUser': 'passwd',
+    'fileSignature': 'passwd',
+}
+
+__all__ = list(_exports)
+
+__getattr__, __dir__ = lazyExports(__name__, _exports)
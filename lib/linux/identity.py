@@ -0,0 +1,271 @@
+"""
+In-memory index of the users and groups of the password and group files
+
+`lib.linux.passwd` finds one user at a time, which suits the bootstrap of a
+single application. A service that builds the configuration of every member
+of an organization needs thousands of lookups, and a scan of the password
+file for each of them. `IdentityIndex` reads the password file and the group
+file once and answers each lookup from dictionaries:
+
+* a user by userid or uid, with the full user name from the gecos field,
+* a group by name or gid, and
+* the supplementary groups of a user, that is the groups that list the user
+  as a member, besides the primary group of the user.
+
+The index is kept between calls. Before a lookup it checks, at most once
+every `checkInterval` seconds, whether the device, inode, modification time
+or size of either file changed, and reads the files again if so. An index is
+shared by every caller that asks `identityIndex` for the same files.
+
+The group file has the same layout as the password file, with 4 fields:
+
+    group:password:gid:member,member,...
+
+Unlike `lookupUser`, the index only sees the users and groups in the files,
+not those supplied by other NSS sources such as LDAP.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import os
+from pathlib import Path
+import threading
+import time
+from typing import (Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    Tuple, Union)
+
+from lib.linux.passwd import (PasswdRecord, Signature, fileSignature,
+                              iterRecords, passwdFile)
+
+__all__ = ['GroupRecord', 'Identity', 'IdentityIndex', 'groupFile',
+           'identityIndex', 'iterGroups', 'parseGroup']
+
+groupFile = Path('/etc/group')
+
+PathLike = Union[str, os.PathLike]
+
+
+class GroupRecord(NamedTuple):
+    """A single record from the group file"""
+    name: str
+    password: str
+    gid: int
+    members: Tuple[str, ...]
+
+
+class Identity(NamedTuple):
+    """A user, with the groups that the user belongs to"""
+    record: PasswdRecord
+    # The names of the supplementary groups, in group file order
+    groups: Tuple[str, ...]
+    # The gid of the primary group, then those of the supplementary groups
+    gids: Tuple[int, ...]
+
+    @property
+    def userid(self) -> str:
+        return self.record.userid
+
+    @property
+    def uid(self) -> int:
+        return self.record.uid
+
+    @property
+    def gid(self) -> int:
+        return self.record.gid
+
+    @property
+    def username(self) -> str:
+        return self.record.username
+
+    def cfgEntries(self) -> Dict[str, object]:
+        """
+        The entries of the user group of the configuration data that come
+        from the password file. The user name is a list of names, as in
+        `templates/cfg.data`.
+        """
+        return {'userid': self.userid,
+                'user-name': self.username.split() or [self.userid]}
+
+
+def parseGroup(line: str) -> Optional[GroupRecord]:
+    """
+    Converts a line from the group file into a record. Blank lines, comments
+    and malformed lines return None.
+    """
+    line = line.rstrip('\r\n')
+    if not line or line.startswith('#'):
+        return None
+    fields = line.split(':')
+    if len(fields) != 4:
+        return None
+    try:
+        gid = int(fields[2])
+    except ValueError:
+        return None
+    members = tuple(m for m in fields[3].split(',') if m)
+    return GroupRecord(fields[0], fields[1], gid, members)
+
+
+def iterGroups(path: PathLike = groupFile) -> Iterator[GroupRecord]:
+    """Yields the well formed records of a group file in file order"""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            record = parseGroup(line)
+            if record is not None:
+                yield record
+
+
+class _Tables(NamedTuple):
+    """Everything read from one version of the files"""
+    signatures: Tuple[Signature, Signature]
+    users: Dict[str, Identity]
+    uids: Dict[int, str]
+    groups: Dict[str, GroupRecord]
+    gids: Dict[int, str]
+
+
+class IdentityIndex():
+    """
+    The users of the password file `path` and the groups of the group file
+    `groupPath`, by name and by number. A name or number that appears more
+    than once is indexed by its first record, which is the one that the
+    system would use.
+    """
+
+    checkInterval = 1.0     # Seconds between checks for changed files
+
+    def __init__(self,
+                 path: PathLike = passwdFile,
+                 groupPath: PathLike = groupFile) -> None:
+        self.path = Path(path)
+        self.groupPath = Path(groupPath)
+        self._tables: Optional[_Tables] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.builds = 0     # How many times the files have been read
+
+    def _signatures(self) -> Tuple[Signature, Signature]:
+        try:
+            groups = fileSignature(self.groupPath)
+        except FileNotFoundError:
+            groups = (0, 0, 0, 0)
+        return fileSignature(self.path), groups
+
+    def _build(self, signatures: Tuple[Signature, Signature]) -> _Tables:
+        supplementary: Dict[str, List[GroupRecord]] = {}
+        groups: Dict[str, GroupRecord] = {}
+        gids: Dict[int, str] = {}
+        if signatures[1] != (0, 0, 0, 0):
+            for group in iterGroups(self.groupPath):
+                if group.name in groups:
+                    continue
+                groups[group.name] = group
+                gids.setdefault(group.gid, group.name)
+                for member in group.members:
+                    supplementary.setdefault(member, []).append(group)
+        users: Dict[str, Identity] = {}
+        uids: Dict[int, str] = {}
+        for record in iterRecords(self.path):
+            if record.userid in users:
+                continue
+            uids.setdefault(record.uid, record.userid)
+            listed = supplementary.get(record.userid)
+            if listed is None:
+                users[record.userid] = Identity(record, (), (record.gid,))
+                continue
+            memberOf = [g for g in listed if g.gid != record.gid]
+            users[record.userid] = Identity(
+                record, tuple(g.name for g in memberOf),
+                (record.gid, *(g.gid for g in memberOf)))
+        self.builds += 1
+        return _Tables(signatures, users, uids, groups, gids)
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Reads the files again if they changed since they were read, or if
+        `force` is true.
+        """
+        with self._lock:
+            signatures = self._signatures()
+            if (force or self._tables is None or
+                    self._tables.signatures != signatures):
+                # A new set of tables replaces the old one in one step, so
+                # a lookup in another thread sees one version or the other
+                self._tables = self._build(signatures)
+            self._checked = time.monotonic()
+
+    def _current(self) -> _Tables:
+        tables = self._tables
+        if (tables is None or
+                time.monotonic() - self._checked >= self.checkInterval):
+            self.refresh()
+            tables = self._tables
+        return tables
+
+    def user(self, userid: str) -> Optional[Identity]:
+        """Returns the user `userid`, or None if there is no such user"""
+        return self._current().users.get(userid)
+
+    def byUid(self, uid: int) -> Optional[Identity]:
+        tables = self._current()
+        userid = tables.uids.get(uid)
+        return None if userid is None else tables.users[userid]
+
+    def group(self, name: str) -> Optional[GroupRecord]:
+        """Returns the group `name`, or None if there is no such group"""
+        return self._current().groups.get(name)
+
+    def byGid(self, gid: int) -> Optional[GroupRecord]:
+        tables = self._current()
+        name = tables.gids.get(gid)
+        return None if name is None else tables.groups[name]
+
+    def lookup(self, userids: Iterable[str]
+               ) -> Dict[str, Optional[Identity]]:
+        """
+        Returns the users `userids`, with None for those that do not exist.
+        The files are checked for changes once for the whole batch.
+        """
+        users = self._current().users
+        return {userid: users.get(userid) for userid in userids}
+
+    def members(self, name: str) -> List[str]:
+        """
+        The userids of the members of the group `name`: the users whose
+        primary group it is, then the other members listed in the group file.
+        """
+        tables = self._current()
+        group = tables.groups.get(name)
+        if group is None:
+            return []
+        found = [u for u, identity in tables.users.items()
+                 if identity.gid == group.gid]
+        found.extend(m for m in group.members if m not in found)
+        return found
+
+    def __contains__(self, userid: object) -> bool:
+        return userid in self._current().users
+
+    def __iter__(self) -> Iterator[Identity]:
+        return iter(list(self._current().users.values()))
+
+    def __len__(self) -> int:
+        return len(self._current().users)
+
+
+_indexes: Dict[Tuple[Path, Path], IdentityIndex] = {}
+_indexesLock = threading.Lock()
+
+
+def identityIndex(path: PathLike = passwdFile,
+                  groupPath: PathLike = groupFile) -> IdentityIndex:
+    """Returns the index of the files, which is shared by every caller"""
+    key = (Path(path).resolve(), Path(groupPath).resolve())
+    with _indexesLock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = IdentityIndex(path, groupPath)
+    return index
@@ -0,0 +1,123 @@
+"""
+File change notification through the Linux inotify interface
+
+The C library functions are called through ctypes, so no extension module is
+needed. `Inotify` watches directories rather than files, since an editor or
+a deployment tool often replaces a file by renaming a new file over it,
+which would end a watch on the file itself. The directory reports the name of
+every file that is written, created, moved in, moved out or deleted, and
+`read` gives the paths of those files.
+
+`available` is False when the C library has no inotify functions, as on
+other systems, in which case the caller polls instead.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+import select
+import struct
+from typing import Dict, Optional, Set, Union
+
+__all__ = ['Inotify', 'available']
+
+PathLike = Union[str, os.PathLike]
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# The changes to the files of a directory that are reported
+changes = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+           IN_DELETE | IN_ATTRIB)
+
+_event = struct.Struct('iIII')      # wd, mask, cookie, len
+
+_libc = None
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                        use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p,
+                                        ctypes.c_uint32]
+    _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+except (OSError, AttributeError):
+    _libc = None
+
+available = _libc is not None
+
+
+def _check(result: int) -> int:
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
+
+
+class Inotify():
+    """Reports the files that change in a set of directories"""
+
+    def __init__(self) -> None:
+        if not available:
+            raise OSError('inotify is not available')
+        self.fd = _check(_libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        self._directories: Dict[int, Path] = {}
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def add(self, directory: PathLike) -> None:
+        """Watches the files of `directory`"""
+        directory = Path(directory)
+        wd = _check(_libc.inotify_add_watch(self.fd, os.fsencode(directory),
+                                            changes | IN_ONLYDIR))
+        self._directories[wd] = directory
+
+    def read(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Waits up to `timeout` seconds, or without a limit if it is None, for
+        changes and returns the paths of the files that changed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        paths: Set[Path] = set()
+        while ready:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, size = _event.unpack_from(data, pos)
+                pos += _event.size
+                name = data[pos:pos + size].rstrip(b'\0')
+                pos += size
+                directory = self._directories.get(wd)
+                if mask & IN_IGNORED:
+                    self._directories.pop(wd, None)
+                elif directory is not None and name:
+                    paths.add(directory / os.fsdecode(name))
+        return paths
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self) -> 'Inotify':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,299 @@
+"""
+Streaming access to the Linux password file
+
+The password file is made up of records, one for each user, and a record is
+contained in a single physical line. Each record contains 7 fields delimited
+by a : character:
+
+    userid:password:uid:gid:gecos:home:shell
+
+The functions in this module never read the whole file into memory. The file
+is streamed and the scan stops at the first record that matches the requested
+userid. Only the matching line is split into fields.
+
+There are three ways of finding a user, chosen by `lookupUser`:
+
+* The system user database, through the `pwd` module. This is used when the
+  system password file is wanted, since it is answered by the C library and
+  also sees users supplied by NSS sources such as LDAP.
+* An optional on-disk index that maps a userid to the byte offset and length
+  of its record. The index remembers the device, inode, modification time and
+  size of the password file and is rebuilt whenever any of them change.
+* A streaming scan of the file, which is used for any other file.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import os
+from pathlib import Path
+import struct
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+import zlib
+
+try:
+    import pwd
+except ImportError:  # Not a POSIX system
+    pwd = None
+
+__all__ = ['PasswdRecord', 'PasswdIndex', 'passwdFile', 'parseRecord',
+           'iterRecords', 'findUser', 'lookupUser', 'fileSignature']
+
+passwdFile = Path('/etc/passwd')
+
+# Identifies the layout of the on-disk index. Change it whenever the layout
+# of the index data changes so that old indexes are rebuilt.
+indexVersion = 1
+
+# The number of bytes read from the password file at a time by a scan
+chunkSize = 1 << 16
+
+PathLike = Union[str, os.PathLike]
+Signature = Tuple[int, int, int, int]
+
+
+class PasswdRecord(NamedTuple):
+    """A single record from the password file"""
+    userid: str
+    password: str
+    uid: int
+    gid: int
+    gecos: str
+    home: str
+    shell: str
+
+    @property
+    def username(self) -> str:
+        """
+        The full user name is the first comma separated element of the gecos
+        field. The remaining elements hold items such as the room number and
+        the phone numbers and are often just a string of commas.
+        """
+        return self.gecos.split(',', 1)[0]
+
+
+def fileSignature(path: PathLike) -> Signature:
+    """
+    Returns the values that identify a particular version of a file. If any
+    of them change, anything derived from the file must be recomputed.
+    """
+    st = os.stat(path)
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def parseRecord(line: str) -> Optional[PasswdRecord]:
+    """
+    Converts a line from the password file into a record. Blank lines,
+    comments and malformed lines return None.
+    """
+    line = line.rstrip('\r\n')
+    if not line or line.startswith('#'):
+        return None
+    fields = line.split(':')
+    if len(fields) != 7:
+        return None
+    try:
+        uid = int(fields[2])
+        gid = int(fields[3])
+    except ValueError:
+        return None
+    return PasswdRecord(fields[0], fields[1], uid, gid, fields[4], fields[5],
+                        fields[6])
+
+
+def iterRecords(path: PathLike = passwdFile) -> Iterator[PasswdRecord]:
+    """Yields the well formed records of a password file in file order"""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            record = parseRecord(line)
+            if record is not None:
+                yield record
+
+
+def findUser(userid: str,
+             path: PathLike = passwdFile) -> Optional[PasswdRecord]:
+    """
+    Streams the password file and returns the first record for `userid`.
+
+    The file is read in fixed size chunks and each chunk is searched for the
+    start of a line that begins with the userid, so no line is split into
+    fields until it is known to match. Only one chunk is held in memory and
+    reading stops as soon as the record is found.
+    """
+    needle = f'\n{userid}:'.encode('utf-8')
+    with open(path, 'rb') as f:
+        tail = b'\n'        # Lets the first line match like any other line
+        while True:
+            chunk = f.read(chunkSize)
+            buffer = tail + chunk
+            i = buffer.find(needle)
+            while i >= 0:
+                end = buffer.find(b'\n', i + 1)
+                if end < 0:
+                    if chunk:
+                        break       # The line continues in the next chunk
+                    end = len(buffer)
+                record = parseRecord(buffer[i + 1:end].decode('utf-8',
+                                                              'replace'))
+                if record is not None and record.userid == userid:
+                    return record
+                i = buffer.find(needle, end)
+            if not chunk:
+                return None
+            # Keep either the start of a matching line that is incomplete or
+            # enough of the end of the chunk to find a match that straddles
+            # two chunks.
+            tail = buffer[i:] if i >= 0 else buffer[1 - len(needle):]
+
+
+class PasswdIndex():
+    """
+    An on-disk index of a password file, keyed by userid.
+
+    The index is a hash table stored in a file. A userid is hashed to a bucket
+    and the bucket lists the offset and length of the record for each userid
+    in it, so a lookup reads the index header, one small bucket and exactly
+    one record of the password file. Nothing is loaded that is not needed for
+    the lookup, which keeps the cost independent of the size of the password
+    file.
+
+    The header records the signature of the password file that the index was
+    built from. The index is rebuilt when the password file changes. A userid
+    that appears more than once is indexed by its first record, which is the
+    one that the system would use.
+    """
+
+    _header = struct.Struct('<8sI4qI')
+    _slot = struct.Struct('<Q')
+    _magic = b'GVPWIDX\0'
+    bucketSize = 8  # The average number of userids per bucket
+
+    def __init__(self,
+                 indexPath: PathLike,
+                 path: PathLike = passwdFile) -> None:
+        self.path = Path(path)
+        self.indexPath = Path(indexPath)
+
+    @staticmethod
+    def _bucket(userid: bytes, buckets: int) -> int:
+        return zlib.crc32(userid) % buckets
+
+    def build(self) -> bool:
+        """
+        Scans the password file and rewrites the index. Returns False if the
+        index could not be written.
+        """
+        signature = fileSignature(self.path)
+        entries: Dict[bytes, Tuple[int, int]] = {}
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                userid, sep, _ = line.partition(b':')
+                if sep and not line.startswith(b'#'):
+                    entries.setdefault(userid, (offset, len(line)))
+                offset += len(line)
+        buckets = max(1, len(entries) // self.bucketSize)
+        contents: List[List[bytes]] = [[] for _ in range(buckets)]
+        for userid, (offset, length) in entries.items():
+            contents[self._bucket(userid, buckets)].append(
+                b'%s\t%d\t%d\n' % (userid, offset, length))
+        data = [b''.join(c) for c in contents]
+        table = self._header.size + (buckets + 1) * self._slot.size
+        slots = [table]
+        for d in data:
+            slots.append(slots[-1] + len(d))
+        try:
+            self.indexPath.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.indexPath.with_name(f'{self.indexPath.name}'
+                                           f'.{os.getpid()}')
+            with open(tmp, 'wb') as f:
+                f.write(self._header.pack(self._magic, indexVersion,
+                                          *signature, buckets))
+                f.write(b''.join(self._slot.pack(s) for s in slots))
+                f.write(b''.join(data))
+            os.replace(tmp, self.indexPath)
+        except OSError:
+            return False
+        return True
+
+    def _find(self, userid: bytes) -> Optional[Tuple[int, int]]:
+        """
+        Returns the location of the record for `userid` in the password file.
+        Raises ValueError if the index is missing, damaged or out of date.
+        """
+        try:
+            f = open(self.indexPath, 'rb')
+        except OSError:
+            raise ValueError('no index')
+        with f:
+            header = f.read(self._header.size)
+            if len(header) != self._header.size:
+                raise ValueError('damaged index')
+            magic, version, *signature, buckets = self._header.unpack(header)
+            if (magic != self._magic or version != indexVersion or
+                    tuple(signature) != fileSignature(self.path)):
+                raise ValueError('out of date index')
+            f.seek(self._header.size +
+                   self._bucket(userid, buckets) * self._slot.size)
+            start, end = struct.unpack('<2Q', f.read(2 * self._slot.size))
+            f.seek(start)
+            bucket = f.read(end - start)
+        for entry in bucket.splitlines():
+            name, offset, length = entry.split(b'\t')
+            if name == userid:
+                return int(offset), int(length)
+        return None
+
+    def lookup(self, userid: str) -> Optional[PasswdRecord]:
+        """Returns the record for `userid` or None if there is no such user"""
+        key = userid.encode('utf-8')
+        try:
+            location = self._find(key)
+        except ValueError:
+            if not self.build():
+                return findUser(userid, self.path)
+            try:
+                location = self._find(key)
+            except ValueError:
+                # The password file changed while the index was built.
+                return findUser(userid, self.path)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            record = parseRecord(f.read(length).decode('utf-8', 'replace'))
+        if record is None or record.userid != userid:
+            # The password file changed after the signature was checked.
+            return findUser(userid, self.path)
+        return record
+
+
+def lookupUser(userid: str,
+               path: Optional[PathLike] = None,
+               indexPath: Optional[PathLike] = None) -> Optional[PasswdRecord]:
+    """
+    Finds the password file record for `userid` using the cheapest available
+    method.
+
+    When no `path` is given the system user database is queried through the
+    `pwd` module if it exists. Otherwise `path`, which defaults to the system
+    password file, is searched through the index at `indexPath` if one is
+    given, or by a streaming scan if not.
+    """
+    if path is None:
+        if pwd is not None:
+            try:
+                pw = pwd.getpwnam(userid)
+            except KeyError:
+                return None
+            return PasswdRecord(pw.pw_name, pw.pw_passwd, pw.pw_uid,
+                                pw.pw_gid, pw.pw_gecos, pw.pw_dir,
+                                pw.pw_shell)
+        path = passwdFile
+    if indexPath is not None:
+        return PasswdIndex(indexPath, path).lookup(userid)
+    return findUser(userid, path)
+
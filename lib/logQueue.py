@@ -0,0 +1,324 @@
+"""
+Queue based logging for applications started from the startup template
+
+A logging call normally formats the record and writes it, with every handler
+of the logger, in the thread that made the call. On a slow disk, or with a
+syslog or socket handler, the calling thread waits for the write. In queue
+mode the handlers of the loggers are moved behind a bounded in-memory queue,
+the call only puts the record on the queue, and a writer thread takes the
+records off the queue in batches and passes them to the handlers.
+
+A bounded queue can fill up. What happens then is the overflow policy:
+
+* `drop` discards the new record,
+* `block` makes the calling thread wait until there is room, and
+* `sample` keeps one new record in every `sampleRate`, and every record at
+  ERROR or above, in place of the oldest record on the queue.
+
+The writer reports how many records were lost in a WARNING record. Queue mode
+is set up from a specification of the form
+
+    policy[:size]
+
+such as `drop:10000`, where a specification of `True` is `block` with the
+default size. Records still on the queue are written by `flush`, which the
+template calls in its shutdown and exception paths, and when the process
+exits.
+
+The writer thread does not survive a fork. A fork only waits for the lock of
+the queue, not for the queue to drain, so a slow handler does not hold it up.
+The records on the queue are left to the writer of the parent and the child
+starts with an empty queue and a new writer, so each record is written once.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import atexit
+from collections import deque
+import logging
+import os
+import threading
+import time
+from typing import Deque, Iterable, List, Optional, Sequence, Tuple, Union
+
+__all__ = ['QueueBackend', 'QueueHandler', 'policies', 'install', 'flush',
+           'uninstall', 'current']
+
+policies = ('drop', 'block', 'sample')
+
+Item = Tuple[Sequence[logging.Handler], logging.LogRecord]
+
+
+class QueueBackend():
+    """
+    The bounded queue of records and the writer thread that passes them to
+    their handlers.
+    """
+
+    def __init__(self,
+                 maxSize: int = 10000,
+                 policy: str = 'block',
+                 batchSize: int = 512,
+                 sampleRate: int = 10) -> None:
+        if policy not in policies:
+            raise ValueError(f'Unknown overflow policy {policy!r},'
+                             f' expected one of {list(policies)}')
+        self.maxSize = maxSize
+        self.policy = policy
+        self.batchSize = batchSize
+        self.sampleRate = sampleRate
+        self.dropped = 0            # Records lost since the last report
+        self.droppedTotal = 0
+        self._overflow = 0
+        self._queued = 0            # Records put on the queue
+        self._written = 0           # Records handled by the writer
+        self._closed = False
+        self._setup()
+
+    def _setup(self) -> None:
+        self._records: Deque[Item] = deque()
+        self._lock = threading.Lock()
+        self._notEmpty = threading.Condition(self._lock)
+        self._notFull = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._writer = threading.Thread(target=self._write,
+                                        name='gvLogWriter', daemon=True)
+        self._writer.start()
+
+    def put(self, handlers: Sequence[logging.Handler],
+            record: logging.LogRecord) -> None:
+        with self._lock:
+            if len(self._records) >= self.maxSize and not self._closed:
+                if self.policy == 'block':
+                    while len(self._records) >= self.maxSize and \
+                            not self._closed:
+                        self._notFull.wait()
+                elif self.policy == 'drop':
+                    self._lose()
+                    return
+                else:
+                    self._overflow += 1
+                    if record.levelno < logging.ERROR and \
+                            self._overflow % self.sampleRate:
+                        self._lose()
+                        return
+                    self._records.popleft()
+                    self._written += 1
+                    self._lose()
+            if self._closed:
+                # Written in the calling thread once the writer has stopped
+                self._handle(handlers, record)
+                return
+            self._records.append((handlers, record))
+            self._queued += 1
+            if len(self._records) == 1:
+                self._notEmpty.notify()
+
+    def _lose(self) -> None:
+        self.dropped += 1
+        self.droppedTotal += 1
+
+    @staticmethod
+    def _handle(handlers: Sequence[logging.Handler],
+                record: logging.LogRecord) -> None:
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _lossRecord(self, count: int) -> logging.LogRecord:
+        return logging.LogRecord('lib.logQueue', logging.WARNING, __file__, 0,
+                                 f'{count} log records were dropped because'
+                                 ' the log queue was full', None, None)
+
+    def _write(self) -> None:
+        while True:
+            with self._lock:
+                while not self._records and not self._closed:
+                    self._notEmpty.wait()
+                if not self._records and self._closed:
+                    return
+                batch: List[Item] = []
+                while self._records and len(batch) < self.batchSize:
+                    batch.append(self._records.popleft())
+                dropped, self.dropped = self.dropped, 0
+                self._notFull.notify_all()
+            flushed = set()
+            for handlers, record in batch:
+                try:
+                    self._handle(handlers, record)
+                except Exception:
+                    # The handlers report their own errors, anything else
+                    # must not stop the writer.
+                    pass
+                flushed.update(handlers)
+            if dropped:
+                # The lost records came after those of the batch
+                self._handle(batch[-1][0], self._lossRecord(dropped))
+            for handler in flushed:
+                handler.flush()
+            with self._lock:
+                self._written += len(batch)
+                self._drained.notify_all()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Waits until every record put on the queue so far has been written.
+        Returns False if that took longer than `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            target = self._queued
+            while self._written < target and self._writer.is_alive():
+                remaining = (None if deadline is None else
+                             deadline - time.monotonic())
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._drained.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Writes the records on the queue and stops the writer"""
+        with self._lock:
+            self._closed = True
+            self._notEmpty.notify()
+            self._notFull.notify_all()
+        self._writer.join(timeout)
+
+    def _beforeFork(self) -> None:
+        self._lock.acquire()
+
+    def _afterForkInParent(self) -> None:
+        self._lock.release()
+
+    def _afterForkInChild(self) -> None:
+        # Only the forking thread exists in the child. The records on the
+        # queue, and the report of those lost, are left to the parent.
+        self._queued = self._written = 0
+        self.dropped = 0
+        self._setup()
+
+
+class QueueHandler(logging.Handler):
+    """
+    Takes the place of the handlers of one logger and puts its records on the
+    queue of `backend`, for those handlers.
+    """
+
+    def __init__(self, backend: QueueBackend,
+                 handlers: Iterable[logging.Handler]) -> None:
+        super().__init__()
+        self.backend = backend
+        self.handlers = tuple(handlers)
+        # Records below the level of every handler are not queued
+        self.setLevel(min((h.level for h in self.handlers),
+                          default=logging.NOTSET))
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Makes the record independent of the calling thread. The message and
+        the traceback are formatted now, since the arguments may change or
+        the exception may be gone by the time that the record is written.
+        """
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(
+                    record.exc_info)
+            record.exc_info = None
+        return record
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # No handler lock is needed since the queue has its own
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.backend.put(self.handlers, self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+current: Optional[QueueBackend] = None
+
+
+def _loggers() -> List[logging.Logger]:
+    loggers = [logging.getLogger()]
+    loggers.extend(l for l in logging.Logger.manager.loggerDict.values()
+                   if isinstance(l, logging.Logger))
+    return loggers
+
+
+def install(spec: Union[str, bool] = True,
+            loggers: Optional[Iterable[logging.Logger]] = None,
+            **kw) -> QueueBackend:
+    """
+    Puts queue mode, given by the `policy:size` specification `spec`, in
+    front of the handlers of `loggers`, by default every logger that has
+    handlers. It is installed once; later calls return the same backend.
+    """
+    global current
+    if current is not None:
+        return current
+    if spec is not True:
+        policy, _, size = str(spec).partition(':')
+        kw.setdefault('policy', policy or 'block')
+        if size:
+            kw.setdefault('maxSize', int(size))
+    current = QueueBackend(**kw)
+    for logger in (_loggers() if loggers is None else loggers):
+        if logger.handlers and \
+                not any(isinstance(h, QueueHandler) for h in logger.handlers):
+            logger.handlers = [QueueHandler(current, logger.handlers)]
+    atexit.register(uninstall)
+    return current
+
+
+def flush(timeout: Optional[float] = 5.0) -> bool:
+    """Writes the records on the queue, if queue mode is installed"""
+    return current.flush(timeout) if current is not None else True
+
+
+def uninstall() -> None:
+    """Writes the records on the queue and gives the loggers their handlers"""
+    global current
+    backend, current = current, None
+    if backend is None:
+        return
+    backend.close()
+    for logger in _loggers():
+        handlers: List[logging.Handler] = []
+        for h in logger.handlers:
+            if isinstance(h, QueueHandler) and h.backend is backend:
+                handlers.extend(h.handlers)
+            else:
+                handlers.append(h)
+        logger.handlers = handlers
+
+
+def _beforeFork() -> None:
+    if current is not None:
+        current._beforeFork()
+
+
+def _afterForkInParent() -> None:
+    if current is not None:
+        current._afterForkInParent()
+
+
+def _afterForkInChild() -> None:
+    if current is not None:
+        current._afterForkInChild()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_beforeFork,
+                        after_in_parent=_afterForkInParent,
+                        after_in_child=_afterForkInChild)
@@ -0,0 +1,147 @@
+"""
+Dispatch to the platform specific packages
+
+The functions that differ between operating systems live in a package for
+each platform, `lib.linux` and `lib.windows`, whose modules hold identically
+named functions. Importing all of them with `from linux import *` would
+import every module of the package, and test `sys.platform` again in every
+caller that needs to choose the package.
+
+Here the platform is examined once per process. Reading a function from this
+module imports the package of the current platform, which imports only the
+module that holds the function, and keeps the function as an attribute of
+this module, so that later reads are plain attribute lookups:
+
+    from lib import platforms
+    ...
+    record = platforms.lookupUser(userid)     # Imported here
+
+The functions resolved so far form the dispatch table. A zygote that calls
+`preload` before it forks passes the whole table on to its workers, which
+then import nothing to use them. A platform package makes its functions
+available the same way, with the module level `__getattr__` and `__dir__`
+returned by `lazyExports`.
+
+On a platform that is not supported, `package` raises UnsupportedPlatform,
+while reading a function raises AttributeError, caused by it, so that probes
+such as `hasattr` see a missing function.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from importlib import import_module
+import sys
+from types import ModuleType
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+__all__ = ['UnsupportedPlatform', 'current', 'lazyExports', 'package',
+           'packages', 'preload', 'reset', 'supported']
+
+# The package for each platform, by the prefix of sys.platform
+packages = {'linux': 'lib.linux', 'win32': 'lib.windows'}
+# The platforms that the startup code runs on
+supported = ('linux',)
+
+_unset = object()
+_current = _unset       # The prefix of the current platform, once examined
+_package: Optional[ModuleType] = None
+_dispatched: List[str] = []     # The names in the dispatch table
+
+
+class UnsupportedPlatform(ValueError):
+    """The startup code does not run on this platform"""
+
+
+def current(platform: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the prefix in `packages` of `platform`, or None if it has no
+    package. The current platform is examined only the first time.
+    """
+    global _current
+    if platform is not None:
+        return next((p for p in packages if platform.startswith(p)), None)
+    if _current is _unset:
+        _current = current(sys.platform)
+    return _current     # type: ignore[return-value]
+
+
+def package() -> ModuleType:
+    """
+    Returns the package of the current platform. Raises UnsupportedPlatform
+    if the platform is not one of `supported`.
+    """
+    global _package
+    if _package is None:
+        name = current()
+        if name not in supported:
+            raise UnsupportedPlatform(
+                f'{sys.platform} is not a supported platform'
+                if name is None else f'{sys.platform} is not supported yet')
+        _package = import_module(packages[name])
+    return _package
+
+
+def __getattr__(name: str) -> Callable:
+    if name.startswith('__'):
+        raise AttributeError(name)
+    try:
+        platform = package()
+    except UnsupportedPlatform as e:
+        # Probes such as hasattr and getattr with a default see a missing
+        # attribute; package() raises the platform error itself.
+        raise AttributeError(f'module {__name__!r} has no attribute'
+                             f' {name!r}: {e}') from e
+    function = getattr(platform, name)
+    globals()[name] = function
+    _dispatched.append(name)
+    return function
+
+
+def preload(names: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Resolves the platform functions `names`, all of those in the package of
+    the current platform by default, so that the processes forked afterwards
+    find them in the dispatch table. Returns the names resolved.
+    """
+    if names is None:
+        names = package().__all__
+    for name in names:
+        getattr(sys.modules[__name__], name)
+    return list(_dispatched)
+
+
+def reset() -> None:
+    """Forgets the current platform and empties the dispatch table"""
+    global _current, _package
+    g = globals()
+    for name in _dispatched:
+        g.pop(name, None)
+    _dispatched.clear()
+    _current = _unset
+    _package = None
+
+
+def lazyExports(name: str, exports: Dict[str, str]
+                ) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    Returns the module level `__getattr__` and `__dir__` of the package
+    `name`, which exports the names in `exports`, each from the module of the
+    package given for it. A module is imported when one of its names is first
+    read, and the name is then kept in the package.
+    """
+    def getExport(attribute: str) -> object:
+        module = exports.get(attribute)
+        if module is None:
+            raise AttributeError(f'module {name!r} has no attribute'
+                                 f' {attribute!r}')
+        value = getattr(import_module(f'{name}.{module}'), attribute)
+        setattr(sys.modules[name], attribute, value)
+        return value
+
+    def exported() -> List[str]:
+        return sorted(set(vars(sys.modules[name])) | set(exports))
+
+    return getExport, exported
@@ -0,0 +1,379 @@
+"""
+Profiling of applications started from the startup template
+
+A profiling session is set up from a specification of the form
+
+    backend[:scope[:directory]]
+
+where each part is optional:
+
+* The backend is `cprofile`, the deterministic profiler from the standard
+  library, or `sample`, a statistical profiler that records the Python stacks
+  of every thread from a signal timer. The sampling profiler costs far less,
+  so it can be left on for production processes. It needs `signal.setitimer`
+  and must be started from the main thread.
+* The scope is `startup`, which profiles until the application starts to run,
+  `run`, which profiles only while the application runs, or `process`, which
+  profiles the whole process. The template reports the phases with `phase`.
+* The directory receives the profiles and defaults to the current directory.
+
+A specification of `True`, as given by a configuration flag, profiles the
+whole process with cProfile. Each profile goes to its own file, named after
+the program, the process id and the time, so repeated runs and fleets of
+workers never overwrite each other's results:
+
+* cProfile profiles are `.prof` files that `pstats` reads.
+* Sampled profiles are `.folded` files with a line per distinct stack,
+  `outer;inner;leaf count`, which is the input format of the common flame
+  graph tools.
+
+Profiles from many runs are combined into one report by the merge tool:
+
+    python -m lib.profiling merge -o report.txt profiles/
+
+A session can also be started by setting the environment variable named by
+`environmentKey` to a specification, which profiles the imports and the
+building of the configuration as well.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from abc import ABC, abstractmethod
+import atexit
+from collections import Counter
+import os
+from pathlib import Path
+import signal
+import sys
+import threading
+import time
+from types import CodeType, FrameType
+from typing import (Dict, Iterable, List, Optional, Sequence, TextIO, Tuple,
+                    Union)
+
+__all__ = ['Profiler', 'DeterministicProfiler', 'SamplingProfiler', 'Session',
+           'backends', 'scopes', 'start', 'phase', 'finish', 'current',
+           'profileName', 'merge', 'environmentKey']
+
+PathLike = Union[str, os.PathLike]
+Stack = Tuple[str, ...]
+
+# Setting this environment variable to a specification starts profiling when
+# this module is first imported.
+environmentKey = 'GV_PROFILE'
+
+scopes = ('startup', 'run', 'process')
+
+
+def profileName(program: str, suffix: str) -> str:
+    """A file name that is unique to this process and this moment"""
+    now = time.time()
+    stamp = (time.strftime('%Y%m%dT%H%M%S', time.localtime(now)) +
+             f'.{int(now % 1 * 1e6):06d}')
+    return f'{program}-{os.getpid()}-{stamp}{suffix}'
+
+
+class Profiler(ABC):
+    """The interface of a profiling backend"""
+
+    suffix = ''
+
+    @abstractmethod
+    def start(self) -> None:
+        """Starts recording"""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stops recording"""
+
+    @abstractmethod
+    def save(self, path: Path) -> None:
+        """Writes what was recorded to `path`"""
+
+
+class DeterministicProfiler(Profiler):
+    """Records every call and return with cProfile"""
+
+    suffix = '.prof'
+
+    def __init__(self) -> None:
+        import cProfile
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def save(self, path: Path) -> None:
+        self.profile.dump_stats(str(path))
+
+
+class SamplingProfiler(Profiler):
+    """
+    Records the Python stacks of all threads every `interval` seconds of CPU
+    time (or of wall time if `clock` is 'wall') from a signal handler.
+    """
+
+    suffix = '.folded'
+
+    def __init__(self, interval: float = 0.005, clock: str = 'cpu') -> None:
+        if not hasattr(signal, 'setitimer'):
+            raise RuntimeError('The sampling profiler needs signal.setitimer')
+        self.interval = interval
+        self.timer, self.signal = ((signal.ITIMER_PROF, signal.SIGPROF)
+                                   if clock == 'cpu' else
+                                   (signal.ITIMER_REAL, signal.SIGALRM))
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[CodeType, str] = {}
+        self._previous = None
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = (f'{code.co_name}'
+                                          f' ({code.co_filename}'
+                                          f':{code.co_firstlineno})')
+        return label
+
+    def _stack(self, frame: Optional[FrameType]) -> Stack:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    def _sample(self, signum: int, frame: Optional[FrameType]) -> None:
+        self.samples += 1
+        counts = self.counts
+        # The frame of the main thread is the interrupted frame given to the
+        # handler, since the current frame of that thread is the handler.
+        counts[self._stack(frame)] += 1
+        main = threading.main_thread().ident
+        for ident, other in sys._current_frames().items():
+            if ident != main:
+                counts[self._stack(other)] += 1
+
+    def start(self) -> None:
+        self._previous = signal.signal(self.signal, self._sample)
+        signal.setitimer(self.timer, self.interval, self.interval)
+
+    def stop(self) -> None:
+        signal.setitimer(self.timer, 0, 0)
+        if self._previous is not None:
+            signal.signal(self.signal, self._previous)
+            self._previous = None
+
+    def save(self, path: Path) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f'{";".join(stack)} {count}\n')
+
+
+backends = {'cprofile': DeterministicProfiler,
+            'sample': SamplingProfiler}
+
+
+class Session():
+    """
+    Profiles the phases of the process selected by `scope` and writes the
+    profile to `directory` when it is finished.
+    """
+
+    def __init__(self,
+                 backend: str = 'cprofile',
+                 scope: str = 'process',
+                 directory: Optional[PathLike] = None,
+                 program: Optional[str] = None) -> None:
+        if backend not in backends:
+            raise ValueError(f'Unknown profiling backend {backend!r},'
+                             f' expected one of {sorted(backends)}')
+        if scope not in scopes:
+            raise ValueError(f'Unknown profiling scope {scope!r},'
+                             f' expected one of {list(scopes)}')
+        self.profiler = backends[backend]()
+        self.scope = scope
+        self.directory = Path(directory) if directory else Path.cwd()
+        self.program = program or Path(sys.argv[0]).stem or 'python'
+        self.running = False
+        self.path: Optional[Path] = None
+
+    @classmethod
+    def fromSpecification(cls, spec: Union[str, bool],
+                          program: Optional[str] = None) -> 'Session':
+        """Creates a session from a `backend:scope:directory` string"""
+        if spec is True:
+            return cls(program=program)
+        backend, scope, directory = (str(spec).split(':', 2) + ['', ''])[:3]
+        return cls(backend or 'cprofile', scope or 'process',
+                   directory or None, program)
+
+    def _start(self) -> None:
+        if not self.running:
+            self.profiler.start()
+            self.running = True
+
+    def _stop(self) -> None:
+        if self.running:
+            self.profiler.stop()
+            self.running = False
+
+    def begin(self) -> None:
+        """Called at the start of the startup phase"""
+        if self.scope in ('startup', 'process'):
+            self._start()
+
+    def phase(self, name: str) -> None:
+        """
+        Called when the process enters the phase `name`, which is one of
+        'run' or 'shutdown'.
+        """
+        if self.scope == 'startup' or \
+                (self.scope == 'run' and name != 'run'):
+            self._stop()
+        elif self.scope == 'run':
+            self._start()
+
+    def finish(self) -> Optional[Path]:
+        """Stops profiling and writes the profile. Returns its path."""
+        self._stop()
+        if self.path is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.path = self.directory / profileName(self.program,
+                                                     self.profiler.suffix)
+            self.profiler.save(self.path)
+        return self.path
+
+
+current: Optional[Session] = None
+
+
+def start(spec: Union[str, bool],
+          program: Optional[str] = None) -> Session:
+    """
+    Starts the profiling session given by `spec`, unless one has already
+    been started, and arranges for it to be finished when the process exits.
+    """
+    global current
+    if current is None:
+        current = Session.fromSpecification(spec, program)
+        current.begin()
+        atexit.register(finish)
+    return current
+
+
+def phase(name: str) -> None:
+    """Reports a phase of the process to the profiling session, if any"""
+    if current is not None:
+        current.phase(name)
+
+
+def finish() -> Optional[Path]:
+    """Finishes the profiling session, if any, and writes its profile"""
+    return current.finish() if current is not None else None
+
+
+def _profileFiles(paths: Iterable[PathLike]) -> List[Path]:
+    files = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(sorted(f for f in p.iterdir()
+                                if f.suffix in ('.prof', '.folded')))
+        else:
+            files.append(p)
+    return files
+
+
+def _mergeFolded(files: Sequence[Path]) -> Counter:
+    counts: Counter = Counter()
+    for f in files:
+        with open(f, encoding='utf-8') as lines:
+            for line in lines:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                if stack:
+                    counts[stack] += int(count)
+    return counts
+
+
+def merge(paths: Iterable[PathLike],
+          out: TextIO,
+          top: int = 40,
+          combined: Optional[PathLike] = None) -> int:
+    """
+    Writes a report that combines the profiles in `paths`, which may be
+    files or directories of profiles, to `out`. The cProfile and the sampled
+    profiles are reported separately. If `combined` is given, the merged
+    profiles are also written there, with the suffix of their kind. Returns
+    the number of profiles merged.
+    """
+    files = _profileFiles(paths)
+    prof = [f for f in files if f.suffix == '.prof']
+    folded = [f for f in files if f.suffix == '.folded']
+    if prof:
+        import pstats
+        stats = pstats.Stats(*map(str, prof), stream=out)
+        out.write(f'cProfile: {len(prof)} profiles\n')
+        stats.sort_stats('cumulative').print_stats(top)
+        if combined:
+            stats.dump_stats(f'{combined}.prof')
+    if folded:
+        counts = _mergeFolded(folded)
+        total = sum(counts.values()) or 1
+        selfCounts: Counter = Counter()
+        totalCounts: Counter = Counter()
+        for stack, count in counts.items():
+            frames = stack.split(';')
+            selfCounts[frames[-1]] += count
+            for frame in set(frames):
+                totalCounts[frame] += count
+        out.write(f'Sampled: {len(folded)} profiles, {total} samples\n\n')
+        out.write(f'{"self %":>8} {"total %":>8}  function\n')
+        for frame, count in selfCounts.most_common(top):
+            out.write(f'{100 * count / total:8.2f} '
+                      f'{100 * totalCounts[frame] / total:8.2f}  {frame}\n')
+        if combined:
+            with open(f'{combined}.folded', 'w', encoding='utf-8') as f:
+                for stack, count in counts.most_common():
+                    f.write(f'{stack} {count}\n')
+    return len(prof) + len(folded)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='python -m lib.profiling',
+        description='Combines the profiles of many runs into one report')
+    commands = parser.add_subparsers(dest='command', required=True)
+    m = commands.add_parser('merge', help=merge.__doc__.split('.')[0])
+    m.add_argument('paths', nargs='+',
+                   help='profiles or directories of profiles')
+    m.add_argument('-o', '--output', help='the report, default stdout')
+    m.add_argument('--top', type=int, default=40,
+                   help='the number of functions reported')
+    m.add_argument('--combined',
+                   help='also write the merged profiles to this path prefix')
+    args = parser.parse_args(argv)
+    out = open(args.output, 'w', encoding='utf-8') if args.output \
+        else sys.stdout
+    try:
+        count = merge(args.paths, out, args.top, args.combined)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if not count:
+        print('No profiles found', file=sys.stderr)
+        return 1
+    return 0
+
+
+if os.environ.get(environmentKey) and __name__ != '__main__':
+    start(os.environ[environmentKey])
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,225 @@
+"""
+Timed spans for startup instrumentation
+
+A span measures the wall time of a block of code:
+
+    with span('configuration', 'stage'):
+        ...
+
+Spans nest. A span that starts while another span is open in the same thread
+becomes its child, so the spans of the startup stages contain the spans of
+the master files, which contain the spans of their providers. Spans opened in
+other threads, such as the master files that run in a thread pool, form their
+own trees for those threads.
+
+Recording is off unless it is enabled, and when it is off `span` returns a
+shared object whose `__enter__` and `__exit__` do nothing, so that
+instrumented code costs no more than a function call and a test of a global
+flag. Recording is enabled by `enable`, normally when the configuration asks
+for it, or from the start of the process by setting the environment variable
+named by `environmentKey`, which also captures the work done while the
+configuration itself is being built.
+
+The recorded spans are reported in two formats:
+
+* `report` - a JSON document with the spans of each thread as a tree, with
+  times in milliseconds from the start of recording.
+* `chromeTrace` - the Trace Event format read by `chrome://tracing` and by
+  Perfetto, with one complete event per span.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import atexit
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+__all__ = ['Span', 'span', 'enable', 'disable', 'reset', 'recorded', 'report',
+           'chromeTrace', 'write', 'environmentKey']
+
+PathLike = Union[str, os.PathLike]
+
+# Setting this environment variable to a path prefix enables recording from
+# the start of the process and writes the reports there when it exits.
+environmentKey = 'GV_TRACE'
+
+enabled = False             # True while spans are being recorded
+output: Optional[str] = None     # The path prefix of the reports
+_origin = time.perf_counter_ns()
+_roots: List['Span'] = []
+_local = threading.local()
+_atexit = False
+
+
+class Span():
+    """A timed block of code and the spans that it contains"""
+
+    __slots__ = ('name', 'category', 'args', 'start', 'end', 'thread',
+                 'children')
+
+    def __init__(self, name: str, category: str,
+                 args: Optional[Dict[str, Any]]) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+        self.end = 0
+        self.thread = 0
+        self.children: List['Span'] = []
+
+    @property
+    def duration(self) -> float:
+        """The duration of the span in seconds"""
+        return (self.end - self.start) / 1e9
+
+    def __enter__(self) -> 'Span':
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        (stack[-1].children if stack else _roots).append(self)
+        stack.append(self)
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.end = time.perf_counter_ns()
+        stack = _local.stack
+        if stack and stack[-1] is self:
+            stack.pop()
+
+    def __repr__(self) -> str:
+        return f'Span({self.name!r}, {self.category!r})'
+
+
+class _NoSpan():
+    """The span returned when recording is off"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_noSpan = _NoSpan()
+
+
+def span(name: str, category: str = 'startup', **args: Any):
+    """
+    Returns a context manager that records the time taken by its block as a
+    span called `name`. The keyword arguments are kept with the span.
+    """
+    if not enabled:
+        return _noSpan
+    return Span(name, category, args or None)
+
+
+def enable(path: Optional[PathLike] = None) -> None:
+    """
+    Starts recording spans. If `path` is given, the reports are written to
+    `path` with the suffixes `.json` and `.trace.json` when the process exits.
+    """
+    global enabled, output, _atexit
+    enabled = True
+    if path:
+        output = os.fspath(path)
+        if not _atexit:
+            atexit.register(write)
+            _atexit = True
+
+
+def disable() -> None:
+    """Stops recording spans. The spans already recorded are kept."""
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """Discards the recorded spans and restarts the clock"""
+    global _origin
+    _roots.clear()
+    _local.stack = []
+    _origin = time.perf_counter_ns()
+
+
+def recorded() -> List[Span]:
+    """The spans that are not contained in another span"""
+    return list(_roots)
+
+
+def _ms(ns: int) -> float:
+    return round(ns / 1e6, 6)
+
+
+def _tree(s: Span) -> Dict[str, Any]:
+    node: Dict[str, Any] = {'name': s.name,
+                            'category': s.category,
+                            'start': _ms(s.start - _origin),
+                            'duration': _ms(s.end - s.start)}
+    if s.args:
+        node['args'] = s.args
+    if s.children:
+        node['children'] = [_tree(c) for c in s.children]
+    return node
+
+
+def report() -> Dict[str, Any]:
+    """The recorded spans as a JSON compatible tree, grouped by thread"""
+    threads: Dict[int, List[Dict[str, Any]]] = {}
+    for s in list(_roots):
+        if s.end:
+            threads.setdefault(s.thread, []).append(_tree(s))
+    return {'pid': os.getpid(),
+            'units': 'ms',
+            'threads': [{'thread': t, 'spans': trees}
+                        for t, trees in threads.items()]}
+
+
+def chromeTrace() -> Dict[str, Any]:
+    """The recorded spans in the Chrome Trace Event format"""
+    pid = os.getpid()
+    events = []
+    todo = list(_roots)
+    while todo:
+        s = todo.pop()
+        if not s.end:
+            continue    # Still open
+        event = {'name': s.name, 'cat': s.category, 'ph': 'X',
+                 'ts': (s.start - _origin) / 1e3,
+                 'dur': (s.end - s.start) / 1e3,
+                 'pid': pid, 'tid': s.thread}
+        if s.args:
+            event['args'] = {k: str(v) for k, v in s.args.items()}
+        events.append(event)
+        todo.extend(s.children)
+    events.sort(key=lambda e: e['ts'])
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write(path: Optional[PathLike] = None) -> None:
+    """
+    Writes the JSON report to `path` with the suffix `.json` and the Chrome
+    trace to `path` with the suffix `.trace.json`. `path` defaults to the one
+    given to `enable`.
+    """
+    path = os.fspath(path) if path else output
+    if path is None or not _roots:
+        return
+    import json
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for suffix, data in (('.json', report()),
+                         ('.trace.json', chromeTrace())):
+        with open(f'{path}{suffix}', 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, default=str)
+
+
+if os.environ.get(environmentKey):
+    enable(os.environ[environmentKey])
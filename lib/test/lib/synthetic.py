@@ -0,0 +1,361 @@
+"""
+Generators for synthetic test and benchmark data
+
+The data produced here has the same shape as the real data that the startup
+code processes, but it can be made as large as needed.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+def passwdLine(n: int) -> str:
+    """Returns the password file record for the synthetic user number `n`"""
+    return (f'user{n:06d}:x:{10000 + n}:{10000 + n % 500}:'
+            f'Synthetic User {n},Room {n % 100},,:/home/user{n:06d}:/bin/bash\n')
+
+
+def writePasswd(path: PathLike,
+                count: int,
+                target: Optional[str] = None,
+                position: float = 0.5) -> Path:
+    """
+    Writes a password file containing `count` synthetic users. If `target` is
+    given, a record for that userid is placed at the fraction `position` of the
+    way through the file.
+    """
+    path = Path(path)
+    where = int(count * position) if target else -1
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('root:x:0:0:root:/root:/bin/bash\n')
+        for n in range(count):
+            if n == where:
+                f.write(f'{target}:x:1000:1000:Target User,,,:'
+                        f'/home/{target}:/bin/bash\n')
+            f.write(passwdLine(n))
+    return path
+
+
+def writeGroup(path: PathLike,
+               users: int,
+               groups: int = 500,
+               membersPerGroup: int = 20) -> Path:
+    """
+    Writes a group file for the synthetic users of `writePasswd`. The groups
+    `group000` and on are the primary groups of the users, and each also
+    lists `membersPerGroup` users as supplementary members.
+    """
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('root:x:0:\n')
+        for g in range(groups):
+            members = ','.join(f'user{(g * membersPerGroup + i) % users:06d}'
+                               for i in range(min(membersPerGroup, users)))
+            f.write(f'group{g:03d}:x:{10000 + g}:{members}\n')
+    return path
+
+
+# Records what the synthetic master files do, in the order that they do it.
+# Each event is a tuple of the event name, the master file name and the time.
+events: List[Tuple[str, str, float]] = []
+# The contributions of all the synthetic master files that have run
+merged: Dict[str, int] = {}
+
+
+class Configuration():
+    """
+    Collects the contributions of the synthetic master files in `merged`. It
+    takes the place of `lib.configuration.Configuration` when the synthetic
+    master files are run by `Master`.
+    """
+
+    @staticmethod
+    def add(entries: Dict[str, int]) -> None:
+        merged.update(entries)
+
+_masterTemplate = '''"""Synthetic master file {name}"""
+import asyncio
+import time
+
+from lib.test.lib import synthetic
+
+
+class configCode():
+{dependencies}{ttl}
+    def __init__(self):
+        self._cfgSource = {{}}
+
+    {asynchronous}def __call__(self):
+        synthetic.events.append(('start', {name!r}, time.perf_counter()))
+        {sleep}
+        self._cfgSource = {{f'{name}-{{n}}': n for n in range({keys!r})}}
+        synthetic.events.append(('end', {name!r}, time.perf_counter()))
+
+    def shutdown(self):
+        synthetic.events.append(('merge', {name!r}, time.perf_counter()))
+        synthetic.Configuration.add(self._cfgSource)
+        return 0
+'''
+
+
+def writeMasterFile(configDir: PathLike,
+                    package: str,
+                    name: str,
+                    delay: float = 0.0,
+                    keys: int = 1,
+                    dependencies: Optional[Sequence[str]] = None,
+                    ttl: Optional[Dict[str, float]] = None,
+                    asynchronous: bool = False) -> Path:
+    """
+    Writes a synthetic master file called `name` in `package` under the
+    configuration directory. When it runs, it sleeps for `delay` seconds and
+    contributes `keys` configuration entries, called `name-0`, `name-1` and so
+    on. If `dependencies` is None the master file does not declare its
+    dependencies. `ttl` gives the time to live of volatile entries. An
+    asynchronous master file has an `async` `__call__` that awaits its delay.
+    """
+    directory = Path(configDir) / package
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / '__init__.py').touch()
+    declared = ('' if dependencies is None else
+                f'    dependencies = {tuple(dependencies)!r}\n')
+    path = directory / f'{name}.py'
+    volatile = '' if ttl is None else f'    ttl = {ttl!r}\n'
+    path.write_text(_masterTemplate.format(name=name, delay=delay, keys=keys,
+                                           dependencies=declared,
+                                           ttl=volatile,
+                                           asynchronous=('async '
+                                                         if asynchronous
+                                                         else ''),
+                                           sleep=(f'await asyncio.sleep'
+                                                  f'({delay!r})'
+                                                  if asynchronous else
+                                                  f'time.sleep({delay!r})')),
+                    encoding='utf-8')
+    return path
+
+
+def writeMasterFiles(configDir: PathLike,
+                     package: str,
+                     count: int,
+                     delay: float = 0.0,
+                     keys: int = 1,
+                     dependencies: Optional[Sequence[str]] = None
+                     ) -> Dict[str, Tuple[str, str]]:
+    """
+    Writes `count` synthetic master files, called `master0`, `master1` and so
+    on, and returns the table of them to use as `Master.masterFiles`.
+    """
+    table = {}
+    for n in range(count):
+        name = f'master{n}'
+        writeMasterFile(configDir, package, name, delay, keys, dependencies)
+        table[name] = (name, 'configCode')
+    return table
+
+
+def writeCfgData(path: PathLike,
+                 groups: int,
+                 keysPerGroup: int,
+                 refFraction: float = 0.25,
+                 chainKeys: int = 5) -> Path:
+    """
+    Writes a configuration data file with `groups` groups of `keysPerGroup`
+    keys each. A fraction of the keys of every group after the first are
+    interpolations of keys of the group before it. The first `chainKeys` keys
+    of each group, called `shared-0` and so on, default to the same key in
+    the previous group, which makes chains of interpolations as long as the
+    number of groups.
+    """
+    path = Path(path)
+    refEvery = int(1 / refFraction) if refFraction else 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n  # Synthetic configuration data\n')
+        for g in range(groups):
+            f.write(f'  "group-{g}" = {{\n')
+            for n in range(keysPerGroup):
+                if n < chainKeys:
+                    key = f'shared-{n}'
+                    value = (f'value {n}' if g == 0 else
+                             f'%shared-{n} % default {n}')
+                else:
+                    key = f'g{g}-k{n}'
+                    if g and refEvery and n % refEvery == 0:
+                        value = f'%g{g - 1}-k{n} % default {n}'
+                    else:
+                        value = f'value {g}.{n}'
+                f.write(f'    "{key}" = "{value}",\n')
+            f.write('  },\n')
+        f.write(']\n')
+    return path
+
+
+def writeCfgStore(path: PathLike,
+                  sites: int,
+                  usersPerSite: int,
+                  keys: int = 10) -> Path:
+    """
+    Writes a configuration store in the layout of `templates/cfg.data`: an
+    organization group, then each site group followed by the anonymous groups
+    of its users. Sites take some of their values from the organization, and
+    users from their site. The users are named `user-<site>-<n>`.
+    """
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n  [  # Organization and site variables\n')
+        f.write('    "organization" = {\n')
+        for n in range(keys):
+            f.write(f'      "organization-k{n}" = "value {n}",\n')
+        f.write('      "organization-email" = "admin@example.org",\n    },\n')
+        for s in range(sites):
+            f.write(f'    "site-{s}" = {{\n')
+            for n in range(keys):
+                value = (f'%organization-k{n}' if n % 2 else
+                         f'site {s} value {n}')
+                f.write(f'      "site-k{n}" = "{value}",\n')
+            f.write(f'      "site-email" = "site{s}@example.org",\n'
+                    f'      "site-admin" = "%organization-email",\n    }},\n')
+            for u in range(usersPerSite):
+                f.write(f'    {{ "userid" = "user-{s}-{u}",\n')
+                for n in range(keys):
+                    f.write(f'      "user-k{n}" = "user {u} value {n}",\n')
+                f.write('      "user-email" = "%site-email",\n    },\n')
+        f.write('  ],\n]\n')
+    return path
+
+
+def zygoteTarget() -> int:
+    """
+    The application run by the workers of a test zygote. It writes what it
+    sees to its standard output as JSON and exits with the status given by
+    its first argument.
+    """
+    import json
+    import logging
+    import os
+    import random
+    import sys
+    handler = next((h for h in logging.getLogger('zygote').handlers
+                    if isinstance(h, logging.FileHandler)), None)
+    logging.getLogger('zygote').warning('worker %d', os.getpid())
+    json.dump({'pid': os.getpid(), 'ppid': os.getppid(), 'argv': sys.argv[1:],
+               'random': random.random(), 'cwd': os.getcwd(),
+               'env': os.environ.get('ZYGOTE_TEST'),
+               'reopened': handler is not None and
+               handler.stream is not zygoteStream}, sys.stdout)
+    sys.stdout.write('\n')
+    return int(sys.argv[1]) if len(sys.argv) > 1 else 0
+
+
+zygoteStream = None     # The log file of the test zygote
+
+
+def zygoteServer(socketPath: str, logPath: str) -> None:
+    """Runs a test zygote with a file handler on the `zygote` logger"""
+    import logging
+    import os
+    from lib.zygote import Zygote
+    global zygoteStream
+    handler = logging.FileHandler(logPath)
+    logging.getLogger('zygote').addHandler(handler)
+    zygoteStream = handler.stream
+    print(os.getpid(), flush=True)
+    Zygote(socketPath, zygoteTarget).serve()
+
+
+class ConfigServer():
+    """
+    A stand-in configuration server on the loopback interface. It serves the
+    contents of `files`, by name, with an ETag, a Last-Modified date and a
+    max-age of `maxAge` seconds, and answers conditional requests for an
+    unchanged file with 304. Each response is delayed by `delay` seconds.
+    Every request is recorded in `requests` as (path, conditional, status).
+    Use it as a context manager; `url` is its address.
+    """
+
+    def __init__(self, files: Dict[str, bytes], delay: float = 0.0,
+                 maxAge: int = 60) -> None:
+        import hashlib
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import threading
+        import time
+        self.files = files
+        self.delay = delay
+        self.maxAge = maxAge
+        self.requests: List[Tuple[str, bool, int]] = []
+        self.lastModified = 'Sun, 18 Oct 2026 09:00:00 GMT'
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self) -> None:
+                time.sleep(server.delay)
+                body = server.files.get(self.path.rsplit('/', 1)[-1])
+                etag = body and f'"{hashlib.sha1(body).hexdigest()}"'
+                conditional = 'If-None-Match' in self.headers
+                if body is None:
+                    status = 404
+                elif self.headers.get('If-None-Match') == etag:
+                    status = 304
+                else:
+                    status = 200
+                server.requests.append((self.path, conditional, status))
+                self.send_response(status)
+                if status != 404:
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', server.lastModified)
+                    self.send_header('Cache-Control',
+                                     f'max-age={server.maxAge}')
+                payload = body if status == 200 else b''
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        args=(0.05,), daemon=True)
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}/cfg'
+
+    def __enter__(self) -> 'ConfigServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TrivialApp():
+    """
+    A user application that does nothing, for timing the startup template.
+    The template asks whether the application has a `startup` or `shutdown`
+    method with `in`.
+    """
+
+    def __contains__(self, name: str) -> bool:
+        return callable(getattr(self, name, None))
+
+    def startup(self) -> int:
+        return 0
+
+    def __call__(self) -> int:
+        return 0
+
+    def shutdown(self) -> int:
+        return 0
+
+
+# The name under which the template finds the application of a module
+upc = TrivialApp()
@@ -0,0 +1,187 @@
+"""
+Benchmark of the bootstrap from a slow configuration directory
+
+Runs `Master` over synthetic master files in a configuration directory whose
+file system accesses are each delayed by `--latency` seconds, as on a network
+file system, then imports a copy of the platform package `lib.linux` from the
+same directory and the modules of an application from a fast directory. This
+is done with the configuration directory on `sys.path`, with its bytecode
+already cached, and with the same modules in a bundle of `gvConfig.bundle`.
+
+The delays are injected by a shim that wraps the stat, directory listing and
+open functions that the import system and `Master` use, for the paths in the
+configuration directory only, so no FUSE file system is needed. Each run
+starts as a new process would, with no modules of the directory imported and
+no cached directory listings.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchBundle --files 20 --latency 0.002
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import builtins
+import importlib
+import io
+import logging
+import os
+from pathlib import Path
+import posix
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from gvConfig import bundle
+from gvConfig.master import Master
+from lib.test.lib import synthetic
+
+package = 'gvbenchbundle'
+platformPackage = 'gvbenchlinux'
+appPackage = 'gvbenchapp'
+
+
+class SlowFiles():
+    """
+    Delays every stat, directory listing and open of a path under `root` by
+    `latency` seconds while it is active, and counts them in `calls`.
+    """
+
+    def __init__(self, root: Path, latency: float) -> None:
+        self.root = str(root)
+        self.latency = latency
+        self.calls = 0
+        self._saved: List[Tuple[Any, str, Callable]] = []
+
+    def _wrap(self, function: Callable) -> Callable:
+        def slow(path: Any = '.', *args: Any, **kw: Any) -> Any:
+            if isinstance(path, (str, os.PathLike)) and \
+                    os.fspath(path).startswith(self.root):
+                self.calls += 1
+                time.sleep(self.latency)
+            return function(path, *args, **kw)
+        return slow
+
+    def __enter__(self) -> 'SlowFiles':
+        # The import system calls the functions of posix and _io directly
+        for owner, name in ((os, 'stat'), (posix, 'stat'), (os, 'listdir'),
+                            (posix, 'listdir'), (io, 'open_code'),
+                            (builtins, 'open')):
+            function = getattr(owner, name)
+            self._saved.append((owner, name, function))
+            setattr(owner, name, self._wrap(function))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        for owner, name, function in reversed(self._saved):
+            setattr(owner, name, function)
+        self._saved = []
+
+
+def writeApp(directory: Path, modules: int) -> List[str]:
+    """An application package of `modules` small modules"""
+    (directory / appPackage).mkdir(parents=True)
+    (directory / appPackage / '__init__.py').touch()
+    for n in range(modules):
+        (directory / appPackage / f'module{n}.py').write_text(
+            f'VALUE = {n}\n')
+    return [f'{appPackage}.module{n}' for n in range(modules)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=20,
+                        help='master files')
+    parser.add_argument('--latency', type=float, default=0.002,
+                        help='seconds of each file system access')
+    parser.add_argument('--appModules', type=int, default=50,
+                        help='modules imported by the application')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    linux = Path(__file__).resolve().parents[2] / 'linux'
+    saved = {name: getattr(Master, name)
+             for name in ('configDir', 'gvPackage', 'masterFiles', '_L',
+                          '_C', 'bundlePath')}
+    with tempfile.TemporaryDirectory() as tmp:
+        configDir = Path(tmp) / 'config'
+        table = synthetic.writeMasterFiles(configDir, package, args.files,
+                                           keys=20, dependencies=())
+        shutil.copytree(linux, configDir / platformPackage,
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        platform = [f'{platformPackage}.{p.stem}'
+                    for p in sorted((configDir / platformPackage).glob('*.py'))
+                    if p.stem != '__init__']
+        appDir = Path(tmp) / 'app'
+        app = writeApp(appDir, args.appModules)
+        sys.path.append(str(appDir))
+        bundlePath = configDir / 'config.bundle'
+        bundle.build(bundlePath, [(package, configDir / package),
+                                  (platformPackage,
+                                   configDir / platformPackage)])
+
+        def fresh() -> None:
+            for name in list(sys.modules):
+                if name.split('.')[0] in (package, platformPackage,
+                                          appPackage):
+                    del sys.modules[name]
+            for finder in list(sys.meta_path):
+                if isinstance(finder, bundle.BundleFinder):
+                    bundle.uninstall(finder)
+            if str(configDir) in sys.path:
+                sys.path.remove(str(configDir))
+            sys.path_importer_cache.clear()
+            synthetic.merged.clear()
+            synthetic.events.clear()
+
+        def bootstrap() -> None:
+            if Master()():
+                raise RuntimeError('A synthetic master file failed')
+            if Master.bundlePath is None:
+                sys.path.insert(0, str(configDir))
+            for name in platform + app:
+                importlib.import_module(name)
+
+        rows = []
+        try:
+            Master.configDir = configDir
+            Master.gvPackage = package
+            Master.masterFiles = table
+            Master._L = logging.getLogger('benchBundle')
+            Master._C = synthetic.Configuration
+            for name, path in (('configuration directory', None),
+                               ('bundle', bundlePath)):
+                Master.bundlePath = path
+                # Caches the bytecode of the directory
+                fresh()
+                bootstrap()
+                best = None
+                for _ in range(args.repeat):
+                    fresh()
+                    with SlowFiles(configDir, args.latency) as slow:
+                        start = time.perf_counter()
+                        bootstrap()
+                        elapsed = time.perf_counter() - start
+                    if best is None or elapsed < best[0]:
+                        best = (elapsed, slow.calls)
+                rows.append((name, *best))
+        finally:
+            for name, value in saved.items():
+                setattr(Master, name, value)
+            fresh()
+            sys.path.remove(str(appDir))
+    print(f'{args.files} master files, {len(platform)} platform modules and'
+          f' {len(app)} application modules,'
+          f' {args.latency * 1000:g} ms per file system access')
+    for name, elapsed, calls in rows:
+        print(f'  {name:24} {elapsed * 1000:9.1f} ms {calls:6} slow accesses')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
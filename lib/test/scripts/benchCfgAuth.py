@@ -0,0 +1,126 @@
+"""
+Benchmark of the permission checks on configuration writes
+
+Times a million checks of whether a user may change a variable, by walking
+the nested admin lists of the group and the userident of the user on every
+check, and through the index of `gvConfig.cfgAuth`. Also times building the
+index and following an edit of one admin list. The configuration has an
+organization, sites with nested admin lists and the groups of their users.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchCfgAuth --checks 1000000
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from gvConfig.cfgAuth import AuthIndex, Permission
+
+Groups = Dict[str, Dict[str, Any]]
+
+
+def build(sites: int, users: int, admins: int) -> Groups:
+    """
+    Returns configuration data with `sites` sites of `users` users each. Each
+    site lists `admins` of its users, by userident, in nested admin lists.
+    """
+    data: Groups = {'organization': {
+        'organization-admins': [str(n) for n in range(admins)]}}
+    for s in range(sites):
+        listed = [str(s * users + u) for u in range(admins)]
+        data[f'site-{s}'] = {'site-email': f'site{s}@example.org',
+                             'site-admins': [listed[:1], [listed[1:]]]}
+        for u in range(users):
+            n = s * users + u
+            data[f'user-{n}'] = {'userid': f'user-{n}', 'userident': str(n)}
+    return data
+
+
+def walk(data: Groups, userid: str, group: str) -> bool:
+    """The check without an index"""
+    values = data.get(group)
+    if values is None:
+        return True
+    ident = data.get(userid, {}).get('userident')
+    names = {userid, ident}
+    protected = values.get('userid') is not None
+    if values.get('userid') in names:
+        return True
+    for key, value in values.items():
+        if key.endswith('-admins'):
+            protected = True
+            todo = [value]
+            while todo:
+                item = todo.pop()
+                if isinstance(item, list):
+                    todo.extend(item)
+                elif item in names:
+                    return True
+    return not protected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--checks', type=int, default=1000000)
+    parser.add_argument('--sites', type=int, default=200)
+    parser.add_argument('--users', type=int, default=50,
+                        help='users of each site')
+    parser.add_argument('--admins', type=int, default=10,
+                        help='admins of each site')
+    args = parser.parse_args(argv)
+    data = build(args.sites, args.users, args.admins)
+    rng = random.Random(1)
+    people = args.sites * args.users
+    # Only 1000 distinct checks are needed; they are repeated. Half of them
+    # are of the site of the user.
+    samples = []
+    for i in range(1000):
+        n = rng.randrange(people)
+        site = n // args.users if i % 2 else rng.randrange(args.sites)
+        samples.append((f'user-{n}', f'site-{site}'))
+    checks = (samples * (args.checks // len(samples) + 1))[:args.checks]
+
+    start = time.perf_counter()
+    expected = [walk(data, u, g) for u, g in checks]
+    walked = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = AuthIndex(data)
+    built = time.perf_counter() - start
+
+    check = index.check
+    change = Permission.CHANGE
+    start = time.perf_counter()
+    found = [check(u, g, change) for u, g in checks]
+    indexed = time.perf_counter() - start
+    if found != expected:
+        raise AssertionError('The index and the walk disagree')
+
+    data['site-0']['site-admins'] = [['0'], [['user-2', '3']]]
+    start = time.perf_counter()
+    index.update(data, [('site-0', 'site-admins')])
+    updated = time.perf_counter() - start
+
+    print(f'{args.checks} checks, {args.sites} sites of {args.users} users'
+          f' and {args.admins} admins, {sum(found) / len(found):.0%}'
+          ' allowed')
+    print(f'  walk admin lists   {walked * 1000:9.1f} ms'
+          f' {walked / args.checks * 1e9:8.0f} ns per check')
+    print(f'  index              {indexed * 1000:9.1f} ms'
+          f' {indexed / args.checks * 1e9:8.0f} ns per check'
+          f' {walked / indexed:6.1f}x')
+    print(f'  index build        {built * 1000:9.1f} ms')
+    print(f'  admin list update  {updated * 1000:9.3f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+"""
+Benchmark of the configuration data loader
+
+Times parsing with interpolation, the first load that also writes the
+compiled form, and later loads from the compiled form, for synthetic
+configuration data files of 10k and 100k keys.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchCfgData
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+from pathlib import Path
+import tempfile
+import time
+from typing import List, Optional
+
+from gvConfig import cfgData
+from lib.test.lib.synthetic import writeCfgData
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--keys', type=int, nargs='*',
+                        default=[10000, 100000])
+    parser.add_argument('--group-size', type=int, default=100)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        for keys in args.keys:
+            path = writeCfgData(Path(tmp) / f'cfg{keys}.data',
+                                keys // args.group_size, args.group_size)
+            size = path.stat().st_size
+            parse = timed(lambda: cfgData.load(path, compiled=False))
+            first = timed(lambda: cfgData.load(path))
+            warm = min(timed(lambda: cfgData.load(path)) for _ in range(3))
+            print(f'{keys} keys, {size / 1e6:.1f} MB,'
+                  f' chains {keys // args.group_size} deep')
+            print(f'  parse and resolve      {parse * 1000:9.1f} ms'
+                  f' {keys / parse:10.0f} keys/s')
+            print(f'  first load (compiles)  {first * 1000:9.1f} ms')
+            print(f'  compiled load          {warm * 1000:9.1f} ms'
+                  f' {parse / warm:9.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
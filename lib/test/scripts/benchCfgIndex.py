@@ -0,0 +1,68 @@
+"""
+Benchmark of selective loading of configuration data through an index
+
+Writes a configuration store with many sites and users and times, for the
+groups of a single user, a full parse, a load of the compiled form of the
+whole store and a selective load through the index.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchCfgIndex --sites 500 --users 10
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+from pathlib import Path
+import tempfile
+import time
+from typing import List, Optional
+
+from gvConfig import cfgData, cfgIndex
+from lib.test.lib.synthetic import writeCfgStore
+
+
+def best(fn, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sites', type=int, default=500)
+    parser.add_argument('--users', type=int, default=10,
+                        help='users per site')
+    parser.add_argument('--keys', type=int, default=10,
+                        help='keys per group')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = writeCfgStore(Path(tmp) / 'store.data', args.sites, args.users,
+                             args.keys)
+        user = f'user-{args.sites // 2}-{args.users // 2}'
+        parse = best(lambda: cfgData.load(path, compiled=False), 1)
+        cfgData.load(path)
+        compiled = best(lambda: cfgData.load(path), args.runs)
+        build = best(lambda: cfgIndex.CfgIndex(path).build(), 1)
+        indexed = best(lambda: cfgIndex.loadGroups(path, [user]), args.runs)
+        groups = len(cfgIndex.loadGroups(path, [user]))
+        total = args.sites * (args.users + 1) + 1
+        print(f'{total} groups, {path.stat().st_size / 1e6:.1f} MB,'
+              f' loading {groups} groups for {user}')
+        print(f'  full parse             {parse * 1000:9.1f} ms')
+        print(f'  compiled load          {compiled * 1000:9.1f} ms')
+        print(f'  index build            {build * 1000:9.1f} ms')
+        print(f'  indexed load           {indexed * 1000:9.1f} ms'
+              f' {compiled / indexed:9.1f}x faster than compiled')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
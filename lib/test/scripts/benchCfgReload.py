@@ -0,0 +1,73 @@
+"""
+Benchmark of the incremental reload of configuration data
+
+Writes a configuration store with many sites and users, then times one-line
+edits of it: a user value that nothing takes, a site value that the users of
+the site take and an organization value that every site takes. Each edit is
+applied by a full parse of the store and by an incremental reload. The first
+reload also builds the dependency indexes that later reloads use.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchCfgReload --sites 500 --users 10
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+from pathlib import Path
+import tempfile
+import time
+from typing import List, Optional
+
+from gvConfig import cfgData
+from gvConfig.cfgReload import CfgReloader
+from lib.test.lib.synthetic import writeCfgStore
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sites', type=int, default=500)
+    parser.add_argument('--users', type=int, default=10,
+                        help='users per site')
+    parser.add_argument('--keys', type=int, default=10,
+                        help='keys per group')
+    args = parser.parse_args(argv)
+    site = args.sites // 2
+    user = args.users // 2
+    edits = [('first reload', f'"user {user} value 1"'),
+             ('user value', f'"user {user} value 0"'),
+             ('site value', f'"site{site}@example.org"'),
+             ('organization value', '"admin@example.org"')]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = writeCfgStore(Path(tmp) / 'store.data', args.sites, args.users,
+                             args.keys)
+        total = args.sites * (args.users + 1) + 1
+        print(f'{total} groups, {path.stat().st_size / 1e6:.1f} MB')
+        print(f'  {"edit":20} {"full parse":>12} {"reload":>10}'
+              f' {"groups":>7} {"values":>7} {"changed":>8}')
+        reloader = CfgReloader(path, compiled=False)
+        reloader.load()
+        for name, old in edits:
+            text = path.read_text()
+            # Edits the occurrence in the middle of the store
+            at = text.index(old, len(text) // 2 if 'user' in old else 0)
+            path.write_text(text[:at] + old[:-1] + ' edited"' +
+                            text[at + len(old):])
+            start = time.perf_counter()
+            cfgData.load(path, compiled=False)
+            parse = time.perf_counter() - start
+            start = time.perf_counter()
+            changes = reloader.reload()
+            reload = time.perf_counter() - start
+            print(f'  {name:20} {parse * 1000:9.1f} ms {reload * 1000:7.2f} ms'
+                  f' {reloader.reparsed:7} {reloader.resolved:7}'
+                  f' {len(changes):8}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""
+Memory benchmark of the compact configuration entry storage
+
+Builds the configuration of many users, each a group of entries with an
+administrator, in each of three designs, and reports the memory allocated
+per entry and the growth of the resident set size:
+
+* dict - a dict per group of `CfgEntry` objects, each with its own `CfgAdmin`,
+  as the configuration is held now.
+* slots - a dict per group of `CompactEntry` objects, with the
+  administrators shared through an `AdminPool`.
+* columnar - a `CompactGroups` store.
+
+Each design is measured in a fresh interpreter. `CfgEntry` and `CfgAdmin`
+come from `lib.configuration` when it can be imported, otherwise from plain
+classes with the same attributes.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchCompact --users 5000 --keys 20
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import gc
+import subprocess
+import sys
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+designs = ('dict', 'slots', 'columnar')
+
+
+def _entryClasses() -> Tuple[type, type, bool]:
+    try:
+        import lib.configuration as _c
+        return _c.CfgEntry, _c.CfgAdmin, True
+    except ImportError:
+        pass
+
+    class CfgAdmin():
+        def __init__(self, owner, override=True):
+            self.owner = owner
+            self.override = override
+
+    class CfgEntry():
+        def __init__(self, key, value, admin=None):
+            self.key = key
+            self.value = value
+            self.admin = admin
+    return CfgEntry, CfgAdmin, False
+
+
+def rows(users: int, keys: int) -> Iterator[Tuple[str, str, str, str]]:
+    """(group, key, value, admin owner) for each entry, built as a parser
+    would, so that equal strings are separate objects"""
+    for u in range(users):
+        group = f'user-{u}'
+        for k in range(keys):
+            value = 'true' if k % 4 == 0 else f'user {u} value {k}'
+            yield group, f'user-k{k}', ''.join(value), f'admin-{u % 10}'
+
+
+def build(design: str, users: int, keys: int) -> Any:
+    CfgEntry, CfgAdmin, _ = _entryClasses()
+    if design == 'dict':
+        groups: Dict[str, Dict[str, Any]] = {}
+        for group, key, value, owner in rows(users, keys):
+            groups.setdefault(group, {})[key] = \
+                CfgEntry(key, value, admin=CfgAdmin(owner, override=False))
+        return groups
+    from gvConfig.compact import AdminPool, CompactEntry, CompactGroups
+    pool = AdminPool()
+    if design == 'slots':
+        groups = {}
+        for group, key, value, owner in rows(users, keys):
+            groups.setdefault(group, {})[key] = \
+                CompactEntry(key, value,
+                             pool.intern(CfgAdmin(owner, override=False)))
+        return groups
+    store = CompactGroups(pool)
+    for group, key, value, owner in rows(users, keys):
+        store.group(group).add(key, value, CfgAdmin(owner, override=False))
+    return store
+
+
+def rss() -> int:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096
+
+
+def child(design: str, users: int, keys: int, traced: bool) -> None:
+    """Prints the bytes allocated by the design, or if `traced` is false the
+    growth of the resident set size, which tracing would inflate"""
+    from gvConfig import compact    # noqa: F401 - not part of the growth
+    _entryClasses()
+    gc.collect()
+    before = rss()
+    if traced:
+        tracemalloc.start()
+    data = build(design, users, keys)
+    gc.collect()
+    if traced:
+        print(tracemalloc.get_traced_memory()[0])
+    else:
+        print(rss() - before)
+    del data
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--keys', type=int, default=20,
+                        help='entries per user')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--traced', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(args.child, args.users, args.keys, args.traced)
+        return 0
+    entries = args.users * args.keys
+    real = _entryClasses()[2]
+    print(f'{args.users} users, {entries} entries, CfgEntry from'
+          f' {"lib.configuration" if real else "a stand-in class"}')
+    print(f'  {"design":10} {"allocated":>12} {"per entry":>10} {"RSS":>10}')
+    baseline = None
+    for design in designs:
+        allocated, grown = (
+            int(subprocess.run([sys.executable, '-m', __spec__.name,
+                                '--users', str(args.users),
+                                '--keys', str(args.keys), '--child', design,
+                                *traced], check=True, capture_output=True,
+                               text=True).stdout)
+            for traced in (['--traced'], []))
+        baseline = baseline or allocated
+        print(f'  {design:10} {allocated / 1e6:9.1f} MB'
+              f' {allocated / entries:8.0f} B {grown / 1e6:7.1f} MB'
+              f'  {baseline / allocated:4.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark of reading the configuration in a hot path
+
+Times `--reads` reads of one configuration value: through `_C.get` of
+`lib.configuration` when it can be imported, through a configuration of
+`CompactEntry` objects that unwraps the entry on each read as `_C.get` does,
+through a layered view of `gvConfig.layered`, and through the frozen copy of
+`gvConfig.frozen`, by attribute, by item and by `get`. A local variable read
+is the floor. The reads are unrolled ten to a loop iteration so that the loop
+costs little.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchFrozen --reads 10000000
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from gvConfig.compact import CompactEntry
+from gvConfig.frozen import freeze
+from gvConfig.layered import Layer, LayerStack
+
+
+class EntryConfiguration():
+    """A configuration that holds entries and unwraps them when read"""
+
+    def __init__(self, values: Dict[str, Any]) -> None:
+        self._entries = {k: CompactEntry(k, v) for k, v in values.items()}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        return default if entry is None else entry.value
+
+
+def timeReads(read: Callable[[int], None], reads: int) -> float:
+    start = time.perf_counter()
+    read(reads // 10)
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--reads', type=int, default=10000000)
+    parser.add_argument('--keys', type=int, default=500,
+                        help='keys of the configuration')
+    args = parser.parse_args(argv)
+    values: Dict[str, Any] = {f'key-{n}': n for n in range(args.keys)}
+    values['site-city'] = 'Ottawa'
+    key = 'site-city'
+
+    configuration = EntryConfiguration(values)
+    view = LayerStack([Layer('organization', values)]).view()
+    frozen = freeze(values)
+    local = frozen.site_city
+    rows = []
+
+    print(f'{args.reads} reads of one of {len(values)} keys')
+    try:
+        import lib.configuration as _c
+    except ImportError:
+        print('  lib.configuration is not available: _C.get is skipped')
+    else:
+        _C = _c.Configuration()
+        for k, v in values.items():
+            _C.setMember(k, v)
+
+        def configurationGet(n: int) -> None:
+            get = _C.get
+            for _ in range(n):
+                get(key); get(key); get(key); get(key); get(key)
+                get(key); get(key); get(key); get(key); get(key)
+        rows.append(('_C.get', configurationGet))
+
+    def entryGet(n: int) -> None:
+        c = configuration
+        for _ in range(n):
+            c.get(key); c.get(key); c.get(key); c.get(key); c.get(key)
+            c.get(key); c.get(key); c.get(key); c.get(key); c.get(key)
+
+    def viewItem(n: int) -> None:
+        v = view
+        for _ in range(n):
+            v[key]; v[key]; v[key]; v[key]; v[key]
+            v[key]; v[key]; v[key]; v[key]; v[key]
+
+    def frozenGet(n: int) -> None:
+        f = frozen
+        for _ in range(n):
+            f.get(key); f.get(key); f.get(key); f.get(key); f.get(key)
+            f.get(key); f.get(key); f.get(key); f.get(key); f.get(key)
+
+    def frozenItem(n: int) -> None:
+        f = frozen
+        for _ in range(n):
+            f[key]; f[key]; f[key]; f[key]; f[key]
+            f[key]; f[key]; f[key]; f[key]; f[key]
+
+    def frozenAttribute(n: int) -> None:
+        f = frozen
+        for _ in range(n):
+            f.site_city; f.site_city; f.site_city; f.site_city; f.site_city
+            f.site_city; f.site_city; f.site_city; f.site_city; f.site_city
+
+    def localVariable(n: int) -> None:
+        v = local
+        for _ in range(n):
+            v; v; v; v; v; v; v; v; v; v
+
+    rows.extend([('entry get', entryGet), ('layered view item', viewItem),
+                 ('frozen get', frozenGet), ('frozen item', frozenItem),
+                 ('frozen attribute', frozenAttribute),
+                 ('local variable', localVariable)])
+    first = None
+    for name, read in rows:
+        elapsed = timeReads(read, args.reads)
+        first = first or elapsed
+        print(f'  {name:20} {elapsed * 1000:9.1f} ms'
+              f' {elapsed / args.reads * 1e9:7.1f} ns per read'
+              f' {first / elapsed:6.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""
+Benchmark of looking up many users
+
+Compares the time to look up every member of a set of users, one password
+file scan per user as `platformUserData` would, through the on-disk index of
+`lib.linux.passwd`, and through the in-memory index of `lib.linux.identity`,
+which includes the groups of each user. Synthetic password and group files
+are used. The scans are timed on a sample of the users and scaled up.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchIdentity --users 100000 --lookups 10000
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+from pathlib import Path
+import random
+import tempfile
+import time
+from typing import List, Optional
+
+from lib.linux import passwd
+from lib.linux.identity import IdentityIndex
+from lib.test.lib.synthetic import writeGroup, writePasswd
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=100000,
+                        help='users in the password file')
+    parser.add_argument('--lookups', type=int, default=10000,
+                        help='users looked up')
+    parser.add_argument('--sample', type=int, default=50,
+                        help='users looked up by the scans')
+    args = parser.parse_args(argv)
+    rng = random.Random(1)
+    userids = [f'user{rng.randrange(args.users):06d}'
+               for _ in range(args.lookups)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = writePasswd(Path(tmp) / 'passwd', args.users)
+        groupPath = writeGroup(Path(tmp) / 'group', args.users)
+        rows = []
+
+        start = time.perf_counter()
+        for userid in userids[:args.sample]:
+            passwd.findUser(userid, path)
+        scan = (time.perf_counter() - start) / args.sample
+        rows.append(('scan per user', scan * args.lookups, scan))
+
+        indexPath = Path(tmp) / 'passwd.idx'
+        passwd.PasswdIndex(indexPath, path).build()
+        start = time.perf_counter()
+        for userid in userids:
+            passwd.PasswdIndex(indexPath, path).lookup(userid)
+        elapsed = time.perf_counter() - start
+        rows.append(('on-disk index', elapsed, elapsed / args.lookups))
+
+        start = time.perf_counter()
+        index = IdentityIndex(path, groupPath)
+        index.refresh()
+        build = time.perf_counter() - start
+        rows.append(('identity index build', build, None))
+        start = time.perf_counter()
+        for userid in userids:
+            index.user(userid)
+        elapsed = time.perf_counter() - start
+        rows.append(('identity index lookups', elapsed,
+                     elapsed / args.lookups))
+        start = time.perf_counter()
+        index.lookup(userids)
+        elapsed = time.perf_counter() - start
+        rows.append(('identity index batch', elapsed, elapsed / args.lookups))
+    print(f'{args.lookups} lookups in a password file of {args.users} users')
+    print(f'  {"":24} {"total":>12} {"per lookup":>12}')
+    for name, total, each in rows:
+        per = '' if each is None else f'{each * 1e6:9.2f} us'
+        print(f'  {name:24} {total * 1000:9.1f} ms {per:>12}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""
+Benchmark of the configuration of many users
+
+Builds the configuration of every user of a site, first by merging a copy of
+the resolved organization and site values with the values of the user, then
+as layered views of `gvConfig.layered` over one shared stack. Reports the
+time to build them, the time to read some values of each user and the memory
+that the configurations of the users hold.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchLayered --users 10000
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from gvConfig.layered import Layer, LayerStack
+
+Values = Dict[str, Any]
+
+
+def build(keys: int) -> Tuple[Values, Values]:
+    """The organization and site values, half of the site interpolated"""
+    organization = {f'organization-{n}': f'value {n}' for n in range(keys)}
+    site = {f'site-{n}': (f'%organization-{n} % null' if n % 2 else
+                          f'site value {n}') for n in range(keys)}
+    return organization, site
+
+
+def user(n: int, keys: int) -> Values:
+    values = {'userid': f'user{n}', 'user-name': [f'User', f'{n}']}
+    values.update((f'user-{k}', f'%site-{k}') for k in range(keys))
+    return values
+
+
+def measure(make: Callable[[], List[Any]]) -> Tuple[List[Any], float, int]:
+    """
+    Returns what `make` made, the time it took and the memory that it holds.
+    The memory is measured on another run, since tracing slows it down.
+    """
+    gc.collect()
+    tracemalloc.start()
+    made = make()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del made
+    gc.collect()
+    start = time.perf_counter()
+    made = make()
+    return made, time.perf_counter() - start, size
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--keys', type=int, default=200,
+                        help='keys of the organization and of the site')
+    parser.add_argument('--userKeys', type=int, default=10,
+                        help='keys of each user')
+    parser.add_argument('--reads', type=int, default=20,
+                        help='values read for each user')
+    args = parser.parse_args(argv)
+    organization, site = build(args.keys)
+    users = [user(n, args.userKeys) for n in range(args.users)]
+    rng = random.Random(1)
+    every = list(organization) + list(site) + list(users[0])[1:]
+    reads = rng.sample(every, min(args.reads, len(every)))
+    rows = []
+
+    stack = LayerStack([Layer('organization', organization),
+                        Layer('site', site)])
+    # The values of the stack are resolved once, for both ways
+    base = dict(stack.view())
+
+    def merged() -> List[Values]:
+        found = []
+        for values in users:
+            view = stack.view(Layer(values['userid'], values))
+            config = dict(base)
+            config.update((key, view[key]) for key in values)
+            found.append(config)
+        return found
+
+    def layered() -> List[Any]:
+        return [stack.view(Layer(values['userid'], values))
+                for values in users]
+
+    for name, make in (('merged copies', merged), ('layered views', layered)):
+        configs, built, size = measure(make)
+        start = time.perf_counter()
+        for config in configs:
+            for key in reads:
+                config.get(key)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for config in configs:
+            for key in reads:
+                config.get(key)
+        again = time.perf_counter() - start
+        rows.append((name, built, first, again, size))
+        del configs
+
+    lookups = args.users * len(reads)
+    print(f'{args.users} users, {2 * args.keys} organization and site keys,'
+          f' {args.userKeys} user keys, {len(reads)} reads per user')
+    print(f'  {"":14} {"build":>10} {"first read":>12} {"memo read":>12}'
+          f' {"memory":>10}')
+    for name, built, first, again, size in rows:
+        print(f'  {name:14} {built * 1000:7.1f} ms'
+              f' {first / lookups * 1e9:9.0f} ns {again / lookups * 1e9:9.0f}'
+              f' ns {size / args.users:7.0f} B per user')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark of logging calls from many threads
+
+Compares the rate of logging calls made by a number of threads, and the
+longest time that one call took, when the records are written in the calling
+thread and in each overflow policy of queue mode, see `lib.logQueue`. The
+records go to a file. A slow disk is simulated by a delay for each write.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchLogQueue --threads 16 --delay 0.0001
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import logging
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from lib import logQueue
+
+modes = ('sync', 'block', 'drop', 'sample')
+
+
+class SlowFileHandler(logging.FileHandler):
+    """A file handler that waits `delay` seconds for each write"""
+
+    def __init__(self, path: Path, delay: float) -> None:
+        super().__init__(path)
+        self.delay = delay
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        if self.delay:
+            time.sleep(self.delay)
+
+
+def run(mode: str, path: Path, threads: int, calls: int, delay: float,
+        size: int) -> Tuple[float, float, float, int]:
+    """
+    Returns the calls per second, the longest call, the time until every
+    record was written and the number of records dropped.
+    """
+    logger = logging.getLogger(f'benchLogQueue.{mode}')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = SlowFileHandler(path, delay)
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(threadName)s %(levelname)s %(message)s'))
+    logger.handlers = [handler]
+    backend = None
+    if mode != 'sync':
+        backend = logQueue.install(f'{mode}:{size}', [logger])
+    longest = [0.0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def work(n: int) -> None:
+        barrier.wait()
+        worst = 0.0
+        for i in range(calls):
+            start = time.perf_counter()
+            logger.info('request %d of thread %d done', i, n)
+            worst = max(worst, time.perf_counter() - start)
+        longest[n] = worst
+
+    workers = [threading.Thread(target=work, args=(n,))
+               for n in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    logQueue.flush(None)
+    written = time.perf_counter() - start
+    dropped = backend.droppedTotal if backend is not None else 0
+    logQueue.uninstall()
+    handler.close()
+    return threads * calls / elapsed, max(longest), written, dropped
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--calls', type=int, default=5000,
+                        help='logging calls made by each thread')
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help='simulated time of each write in seconds')
+    parser.add_argument('--size', type=int, default=10000,
+                        help='the size of the queue')
+    parser.add_argument('--mode', action='append', choices=modes,
+                        help='the modes to run, default all')
+    args = parser.parse_args(argv)
+    print(f'{args.threads} threads, {args.calls} calls each,'
+          f' {args.delay * 1e6:.0f} us per write, queue of {args.size}'
+          f' on {os.cpu_count()} CPUs')
+    print(f'  {"mode":8} {"calls/s":>10} {"longest call":>13}'
+          f' {"all written":>12} {"dropped":>8}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.mode or modes:
+            rate, longest, written, dropped = run(
+                mode, Path(tmp) / f'{mode}.log', args.threads, args.calls,
+                args.delay, args.size)
+            print(f'  {mode:8} {rate:10.0f} {longest * 1000:10.2f} ms'
+                  f' {written * 1000:9.0f} ms {dropped:8}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark of the password file lookup methods
+
+Compares the regular expression scan that `configCode.platformUserData` used
+to run over the whole password file with the streaming and indexed lookups in
+`lib.linux.passwd`, using a synthetic password file.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchPasswd --lines 100000
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+from pathlib import Path
+import re
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+from lib.linux import passwd
+from lib.test.lib.synthetic import writePasswd
+
+target = 'benchuser'
+
+
+def legacyScan(userid: str, path: Path):
+    """The original lookup - the whole file is searched with one regex"""
+    reflags = re.VERBOSE | re.MULTILINE
+    pattern = r"""
+^%s:                      # The userid
+[^:](?!:)*:               # The password
+(\d{1,5}):                # The UID
+(\d{1,5}):                # The GID
+([\w (?! )]+):|\,{1,3}:   # The user name
+""" % userid
+    text = path.read_text()
+    return re.search(pattern, text, reflags)
+
+
+def best(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the best wall time of `repeat` calls of `fn`, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(lines: int, repeat: int, position: float) -> List[tuple]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = writePasswd(Path(tmp) / 'passwd', lines, target, position)
+        indexPath = Path(tmp) / 'passwd.idx'
+        results.append(('regex scan (current)',
+                        best(lambda: legacyScan(target, path), repeat)))
+        results.append(('streaming scan',
+                        best(lambda: passwd.findUser(target, path), repeat)))
+        results.append(('streaming scan, missing user',
+                        best(lambda: passwd.findUser('nobody-here', path),
+                             repeat)))
+
+        def cold():
+            indexPath.unlink(missing_ok=True)
+            passwd.PasswdIndex(indexPath, path).lookup(target)
+        results.append(('index build + lookup', best(cold, repeat)))
+        passwd.PasswdIndex(indexPath, path).build()
+        results.append(('index lookup (prebuilt index)',
+                        best(lambda: passwd.PasswdIndex(indexPath,
+                                                        path).lookup(target),
+                             repeat)))
+        if passwd.pwd is not None:
+            import getpass
+            me = getpass.getuser()
+            results.append(('pwd module (system database)',
+                            best(lambda: passwd.lookupUser(me), repeat)))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--position', type=float, default=0.5,
+                        help='where the target user is in the file (0-1)')
+    args = parser.parse_args(argv)
+    results = run(args.lines, args.repeat, args.position)
+    base = results[0][1]
+    print(f'{args.lines} line password file, best of {args.repeat}')
+    for name, seconds in results:
+        print(f'  {name:32} {seconds * 1000:10.3f} ms'
+              f' {base / seconds:8.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
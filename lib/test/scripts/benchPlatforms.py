@@ -0,0 +1,91 @@
+"""
+Benchmark of the dispatch to the platform specific packages
+
+Times, in new interpreters, importing the whole of `lib.linux` as
+`from linux import *` would and reading one function from `lib.platforms`,
+which imports only its module. Then times the call path of a platform
+function chosen by testing `sys.platform` on each call against one read from
+the dispatch table of `lib.platforms`.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchPlatforms --calls 1000000
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from lib import platforms
+
+_probe = '''
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+'''
+
+
+def startup(code: str, repeat: int) -> float:
+    """The best time of `repeat` runs of `code` in a new interpreter"""
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    return min(float(subprocess.run([sys.executable, '-c',
+                                     _probe.format(code=code)],
+                                    env=env, check=True, capture_output=True,
+                                    text=True).stdout)
+               for _ in range(repeat))
+
+
+def checked(name: str):
+    """Chooses the platform package by testing sys.platform, on every call"""
+    p = sys.platform
+    if p.startswith('win32'):
+        raise ValueError('Windows is not supported yet')
+    elif p.startswith('linux'):
+        import lib.linux as package
+    else:
+        raise ValueError(f'{p} is an unsupported platform')
+    return getattr(package, name)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    rows = [
+        ('import the whole package',
+         startup('from lib.linux import identity, inotify, passwd',
+                 args.repeat)),
+        ('read one function', startup('from lib import platforms\n'
+                                      'platforms.lookupUser', args.repeat)),
+    ]
+    print('Import, best of', args.repeat)
+    for name, elapsed in rows:
+        print(f'  {name:26} {elapsed * 1000:9.2f} ms')
+
+    platforms.lookupUser
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        checked('lookupUser')
+    rows = [('sys.platform on each call', time.perf_counter() - start)]
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        platforms.lookupUser
+    rows.append(('dispatch table', time.perf_counter() - start))
+    print(f'Finding the function, {args.calls} times')
+    for name, elapsed in rows:
+        print(f'  {name:26} {elapsed * 1e9 / args.calls:9.1f} ns')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""
+Benchmark of fetching master files from a configuration server
+
+Times making `--files` master files available from a stand-in configuration
+server that takes `--latency` seconds to answer: fetched one after the other,
+fetched at the same time by `gvConfig.remote.RemoteMasters` with no local
+copy, with fresh local copies, and with stale local copies that are
+revalidated in the background.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchRemote --files 8 --latency 0.1
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import hashlib
+from pathlib import Path
+import tempfile
+import time
+from typing import List, Optional
+
+from gvConfig.remote import RemoteMasters
+from lib.test.lib.synthetic import ConfigServer
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.1,
+                        help='seconds the server takes to answer')
+    args = parser.parse_args(argv)
+    modules = [f'master{n}' for n in range(args.files)]
+    files = {f'{m}.py': f'# {m}\n'.encode() * 100 for m in modules}
+    # The stand-in server is plain HTTP, so the master files are pinned
+    digests = {m: hashlib.sha256(files[f'{m}.py']).hexdigest()
+               for m in modules}
+    rows = []
+    with ConfigServer(files, args.latency) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        remote = RemoteMasters(server.url, Path(tmp) / 'sequential',
+                               digests)
+        start = time.perf_counter()
+        for module in modules:
+            remote.fetch(module)
+        rows.append(('one after the other', time.perf_counter() - start))
+
+        directory = Path(tmp) / 'gvconfig'
+        remote = RemoteMasters(server.url, directory, digests)
+        start = time.perf_counter()
+        remote.sync(modules)
+        rows.append(('together, no copy', time.perf_counter() - start))
+
+        remote = RemoteMasters(server.url, directory, digests)
+        start = time.perf_counter()
+        remote.sync(modules)
+        rows.append(('fresh copies', time.perf_counter() - start))
+
+        remote = RemoteMasters(server.url, directory, digests)
+        start = time.perf_counter()
+        remote.sync(modules, now=time.time() + 3600)
+        rows.append(('stale copies', time.perf_counter() - start))
+        remote.wait()
+        rows.append(('  revalidation', time.perf_counter() - start))
+    print(f'{args.files} master files, {args.latency * 1000:.0f} ms server'
+          ' latency')
+    for name, elapsed in rows:
+        print(f'  {name:22} {elapsed * 1000:9.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
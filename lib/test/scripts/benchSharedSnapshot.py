@@ -0,0 +1,176 @@
+"""
+Memory and start time of workers that share their configuration
+
+Launches a number of worker interpreters at the same time that build the
+configuration from synthetic master files, first each on its own (bootstrap)
+and then by attaching to the snapshot published by an earlier launch
+(attach), see `gvConfig.sharedSnapshot`. Each worker reads a fraction of the
+configuration values. While all of them are running, each reports its private
+memory, and its proportional set size, in which the shared pages count as a
+fraction, above what it used before the bootstrap. The memory figures need
+Linux.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchSharedSnapshot --workers 8 --keys 20000
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import logging
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from lib.test.lib import synthetic
+
+package = 'gvconfig'
+masterFiles = ('platform', 'siteMaster', 'organizationMaster', 'gvMaster')
+modes = ('bootstrap', 'attach')
+
+
+class Sources():
+    """
+    Keeps the contributions of the master files as they are, as
+    `lib.configuration.Configuration` does, so that the values of a shared
+    snapshot are not all decoded when it is added.
+    """
+    sources: List[Mapping[str, int]] = []
+
+    @classmethod
+    def add(cls, entries: Mapping[str, int]) -> None:
+        cls.sources.append(entries)
+
+    @classmethod
+    def get(cls, key: str) -> Optional[int]:
+        for source in reversed(cls.sources):
+            if key in source:
+                return source[key]
+        return None
+
+
+def memory() -> Dict[str, int]:
+    """The memory of this process, in kB, from /proc/self/smaps_rollup"""
+    sizes = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if rest.strip().endswith('kB'):
+                    sizes[name] = int(rest.split()[0])
+    except OSError:
+        pass
+    return {'private': (sizes.get('Private_Clean', 0) +
+                        sizes.get('Private_Dirty', 0)),
+            'pss': sizes.get('Pss', 0)}
+
+
+def child(mode: str, configDir: str, sharedDir: str, keys: int,
+          reads: float) -> int:
+    """
+    Runs in a worker - bootstraps, reads values and reports the time, then
+    reports the memory once every worker is ready.
+    """
+    before = memory()
+    start = time.perf_counter()
+    from gvConfig.master import Master
+    Master.configDir = Path(configDir)
+    Master.sharedSnapshot = mode == 'attach'
+    Master.sharedDir = Path(sharedDir)
+    Master._L = logging.getLogger('benchSharedSnapshot')
+    Master._C = synthetic.Configuration = Sources
+    errors = Master()()
+    boot = time.perf_counter() - start
+    step = max(1, round(1 / reads)) if reads else 0
+    if step:
+        for name in masterFiles:
+            for n in range(0, keys, step):
+                Sources.get(f'{name}-{n}')
+    print(boot, flush=True)
+    sys.stdin.readline()
+    after = memory()
+    print(after['private'] - before['private'], after['pss'] - before['pss'],
+          flush=True)
+    return errors
+
+
+def launch(mode: str, configDir: Path, sharedDir: Path, workers: int,
+           keys: int, reads: float) -> List[Tuple[float, int, int]]:
+    """
+    Returns the bootstrap time, the private memory and the proportional set
+    size of each worker.
+    """
+    procs = [subprocess.Popen([sys.executable, '-m', __spec__.name, '--child',
+                               mode, str(configDir), str(sharedDir),
+                               str(keys), str(reads)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                              text=True)
+             for _ in range(workers)]
+    boots = [float(p.stdout.readline()) for p in procs]
+    results = []
+    for p, boot in zip(procs, boots):
+        p.stdin.write('\n')
+        p.stdin.flush()
+    for p, boot in zip(procs, boots):
+        private, pss = p.stdout.readline().split()
+        results.append((boot, int(private), int(pss)))
+        p.stdin.close()
+        p.stdout.close()
+        if p.wait():
+            raise RuntimeError(f'A {mode} worker failed')
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--delay', type=float, default=0.01,
+                        help='simulated work per master file in seconds')
+    parser.add_argument('--keys', type=int, default=20000,
+                        help='entries contributed by each master file')
+    parser.add_argument('--reads', type=float, default=0.1,
+                        help='the fraction of the values read by a worker')
+    parser.add_argument('--child', nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        mode, configDir, sharedDir, keys, reads = args.child
+        return child(mode, configDir, sharedDir, int(keys), float(reads))
+    with tempfile.TemporaryDirectory() as tmp:
+        configDir = Path(tmp)
+        sharedDir = configDir / 'shm'
+        for name in masterFiles:
+            synthetic.writeMasterFile(configDir, package, name, args.delay,
+                                      args.keys)
+        # Publishes the snapshot that the attaching workers use
+        launch('attach', configDir, sharedDir, 1, args.keys, 0)
+        size = sum(p.stat().st_size for p in sharedDir.iterdir())
+        results = {mode: launch(mode, configDir, sharedDir, args.workers,
+                                args.keys, args.reads)
+                   for mode in modes}
+    print(f'{args.workers} workers, {len(masterFiles)} master files of'
+          f' {args.keys} entries, {args.delay * 1000:.1f} ms each,'
+          f' {args.reads:.0%} of the values read, snapshot of'
+          f' {size / 1024:.0f} kB on {os.cpu_count()} CPUs')
+    print(f'  {"":10} {"start":>10} {"private":>11} {"pss":>11}'
+          f' {"total pss":>11}')
+    for mode, rows in results.items():
+        boot = statistics.median(r[0] for r in rows)
+        private = statistics.median(r[1] for r in rows)
+        pss = statistics.median(r[2] for r in rows)
+        total = sum(r[2] for r in rows)
+        print(f'  {mode:10} {boot * 1000:7.1f} ms {private:8.0f} kB'
+              f' {pss:8.0f} kB {total:8.0f} kB')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+"""
+Cold and warm start benchmark of the bootstrap snapshot
+
+Launches fresh interpreters that run `Master` over synthetic master files,
+first without a snapshot (cold) and then with the snapshot written by the
+previous launch (warm). Each synthetic master file simulates its work with a
+delay and contributes a number of configuration entries.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchSnapshot --runs 20
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import logging
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from lib.test.lib import synthetic
+
+package = 'gvconfig'
+masterFiles = ('platform', 'siteMaster', 'organizationMaster', 'gvMaster')
+
+
+def child(configDir: str, snapshotFile: str) -> int:
+    """Runs in the launched interpreter - bootstraps and reports the time"""
+    start = time.perf_counter()
+    from gvConfig.master import Master
+    Master.configDir = Path(configDir)
+    Master.useSnapshot = True
+    Master.snapshotFile = Path(snapshotFile)
+    Master._L = logging.getLogger('benchSnapshot')
+    Master._C = synthetic.Configuration
+    errors = Master()()
+    print(time.perf_counter() - start, len(synthetic.merged))
+    return errors
+
+
+def launch(configDir: Path, snapshotFile: Path) -> Tuple[float, float]:
+    """Returns the process wall time and the bootstrap time of one launch"""
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-m', __spec__.name, '--child',
+                          str(configDir), str(snapshotFile)],
+                         check=True, capture_output=True, text=True).stdout
+    wall = time.perf_counter() - start
+    return wall, float(out.split()[0])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--delay', type=float, default=0.01,
+                        help='simulated work per master file in seconds')
+    parser.add_argument('--keys', type=int, default=1000,
+                        help='entries contributed by each master file')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return child(*args.child)
+    with tempfile.TemporaryDirectory() as tmp:
+        configDir = Path(tmp)
+        snapshotFile = configDir / 'cache' / 'bootstrap.snapshot'
+        for name in masterFiles:
+            synthetic.writeMasterFile(configDir, package, name, args.delay,
+                                      args.keys)
+        results = {}
+        for mode in ('cold', 'warm'):
+            walls, boots = [], []
+            for _ in range(args.runs):
+                if mode == 'cold':
+                    snapshotFile.unlink(missing_ok=True)
+                wall, boot = launch(configDir, snapshotFile)
+                walls.append(wall)
+                boots.append(boot)
+            results[mode] = (statistics.median(walls),
+                             statistics.median(boots))
+    print(f'{len(masterFiles)} master files, {args.delay * 1000:.1f} ms and'
+          f' {args.keys} entries each, median of {args.runs} launches')
+    print(f'  {"":6} {"process":>12} {"bootstrap":>12}')
+    for mode, (wall, boot) in results.items():
+        print(f'  {mode:6} {wall * 1000:9.1f} ms {boot * 1000:9.1f} ms')
+    cold, warm = results['cold'][1], results['warm'][1]
+    print(f'  bootstrap speedup {cold / warm:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
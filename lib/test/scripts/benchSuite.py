@@ -0,0 +1,359 @@
+"""
+Benchmark suite of the bootstrap path
+
+Times each part of the bootstrap over synthetic data: the password file
+lookups, one at a time and in bulk, the parsing and the interpolation of a
+large configuration data file with deep chains of interpolations, `Master`
+running many master files, cold, from the snapshot and attached to a shared
+snapshot, each provider of the platform master file and the startup
+template, imported and running `main` with an application that does nothing.
+The template and the platform providers need `lib.configuration` and
+`lib.gvLogging`; without them they are reported as skipped.
+
+Each benchmark is run `--repeat` times. The results are written as JSON by
+`--output` and can be compared with an earlier result by `--compare`, which
+reports every benchmark whose best time grew by more than `--threshold`
+and then exits with status 1. The best time is compared since it is the
+least disturbed by other work on the host.
+
+The synthetic configuration copies every value that is added to it, so
+`master.shared` includes decoding every value of the shared snapshot.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchSuite --output baseline.json
+    python -m lib.test.scripts.benchSuite --compare baseline.json
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+from fnmatch import fnmatch
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from lib.test.lib import synthetic
+
+resultsVersion = 1
+
+Samples = Dict[str, List[float]]
+
+
+class Skip(Exception):
+    """Raised by a benchmark that cannot run here, with the reason"""
+
+
+class Context():
+    """What a benchmark needs: a work directory, repetitions and sizes"""
+
+    def __init__(self, tmp: Path, repeat: int, scale: float) -> None:
+        self.tmp = tmp
+        self.repeat = repeat
+        self.scale = scale
+
+    def size(self, n: int) -> int:
+        """`n` scaled by the size factor of the run"""
+        return max(1, int(n * self.scale))
+
+    def time(self, fn: Callable[..., Any],
+             setup: Optional[Callable[[], Any]] = None) -> List[float]:
+        """
+        Returns the time of each of `repeat` calls of `fn`. If `setup` is
+        given it is called, untimed, before each call and what it returns is
+        passed to `fn`.
+        """
+        samples = []
+        for _ in range(self.repeat):
+            if setup is None:
+                start = time.perf_counter()
+                fn()
+            else:
+                arg = setup()
+                start = time.perf_counter()
+                fn(arg)
+            samples.append(time.perf_counter() - start)
+        return samples
+
+
+benchmarks: Dict[str, Callable[[Context], Samples]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Registers a benchmark, which returns samples by result name"""
+    def register(fn: Callable[[Context], Samples]) -> Callable:
+        benchmarks[name] = fn
+        return fn
+    return register
+
+
+@benchmark('passwd')
+def passwdLookups(ctx: Context) -> Samples:
+    from lib.linux import passwd
+    target = 'benchuser'
+    path = synthetic.writePasswd(ctx.tmp / 'passwd', ctx.size(100000),
+                                 target)
+    index = ctx.tmp / 'passwd.idx'
+    results = {'passwd.stream': ctx.time(lambda: passwd.findUser(target,
+                                                                 path)),
+               'passwd.streamMissing': ctx.time(
+                   lambda: passwd.findUser('nobody-here', path)),
+               'passwd.indexBuild': ctx.time(
+                   lambda _: passwd.PasswdIndex(index, path).build(),
+                   lambda: index.unlink(missing_ok=True))}
+    results['passwd.indexLookup'] = ctx.time(
+        lambda: passwd.PasswdIndex(index, path).lookup(target))
+    from lib.linux.identity import IdentityIndex
+    groupPath = synthetic.writeGroup(ctx.tmp / 'group', ctx.size(100000))
+    identities = IdentityIndex(path, groupPath)
+    results['passwd.identityBuild'] = ctx.time(
+        lambda: identities.refresh(force=True))
+    userids = [f'user{n:06d}' for n in range(0, ctx.size(100000), 10)]
+    results['passwd.identityLookups'] = ctx.time(
+        lambda: identities.lookup(userids))
+    return results
+
+
+@benchmark('cfgData')
+def cfgDataLoading(ctx: Context) -> Samples:
+    from gvConfig import cfgData
+    groups = ctx.size(1000)
+    path = synthetic.writeCfgData(ctx.tmp / 'cfg.data', groups, 20)
+    source = str(path)
+    text = path.read_text(encoding='utf-8')
+
+    def parse():
+        return cfgData.parse(cfgData.splitLines(text), source)
+
+    results = {'cfgData.parse': ctx.time(parse),
+               'cfgData.interpolate': ctx.time(
+                   lambda g: cfgData.resolve(g, source), parse),
+               'cfgData.load': ctx.time(
+                   lambda: cfgData.load(path, compiled=False))}
+    cfgData.load(path)
+    results['cfgData.loadCompiled'] = ctx.time(lambda: cfgData.load(path))
+    return results
+
+
+@benchmark('master')
+def masterFiles(ctx: Context) -> Samples:
+    from gvConfig.master import Master
+    package = 'gvbenchsuite'
+    configDir = ctx.tmp / 'master'
+    table = synthetic.writeMasterFiles(configDir, package, ctx.size(50),
+                                       keys=ctx.size(200), dependencies=())
+    saved = {name: getattr(Master, name)
+             for name in ('configDir', 'gvPackage', 'masterFiles', '_L',
+                          '_C', 'useSnapshot', 'snapshotFile',
+                          'sharedSnapshot', 'sharedDir')}
+
+    def fresh() -> None:
+        # Every run imports the master files again, as a new process would
+        for name in list(sys.modules):
+            if name == package or name.startswith(f'{package}.'):
+                del sys.modules[name]
+        synthetic.events.clear()
+        synthetic.merged.clear()
+
+    def run(_) -> None:
+        if Master()():
+            raise RuntimeError('A synthetic master file failed')
+
+    try:
+        Master.configDir = configDir
+        Master.gvPackage = package
+        Master.masterFiles = table
+        Master._L = logging.getLogger('benchSuite')
+        Master._C = synthetic.Configuration
+        results = {'master.call': ctx.time(run, fresh)}
+        Master.useSnapshot = True
+        Master.snapshotFile = ctx.tmp / 'bootstrap.snapshot'
+        run(fresh())
+        results['master.snapshot'] = ctx.time(run, fresh)
+        Master.useSnapshot = False
+        Master.sharedSnapshot = True
+        Master.sharedDir = ctx.tmp / 'shm'
+        run(fresh())
+        results['master.shared'] = ctx.time(run, fresh)
+    finally:
+        for name, value in saved.items():
+            setattr(Master, name, value)
+        fresh()
+        if str(configDir) in sys.path:
+            sys.path.remove(str(configDir))
+    return results
+
+
+@benchmark('providers')
+def platformProviders(ctx: Context) -> Samples:
+    try:
+        from gvConfig.platform import configCode
+    except ImportError as e:
+        raise Skip(f'the platform master file cannot be imported: {e}')
+    results = {}
+    for spec in configCode.providers:
+        results[f'providers.{spec.name}'] = ctx.time(
+            lambda code, spec=spec: code.runProvider(spec), configCode)
+    return results
+
+
+def templateChild() -> int:
+    """
+    Runs in a launched interpreter - imports the template and runs `main`
+    with an application that does nothing, and reports the times.
+    """
+    start = time.perf_counter()
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] /
+                           'templates'))
+    try:
+        from pydev import gv_start_ide as ide
+    except ImportError as e:
+        print(json.dumps({'skip': f'the template cannot be imported: {e}'}))
+        return 0
+    imported = time.perf_counter() - start
+    ide._C.setMember(ide._c.umname, synthetic.__name__)
+    ide._C.setMember(ide._c.umpkg, 'lib')
+    ide._C.setMember(ide._c.umclass, 'upc')
+    ide._C.setMember(ide._key('noargs'), True)
+    start = time.perf_counter()
+    status = ide.main()
+    print(json.dumps({'template.import': imported,
+                      'template.main': time.perf_counter() - start}))
+    return status
+
+
+@benchmark('template')
+def startupTemplate(ctx: Context) -> Samples:
+    results: Samples = {}
+    for _ in range(ctx.repeat):
+        out = subprocess.run([sys.executable, '-m', __spec__.name,
+                              '--template-child'],
+                             capture_output=True, text=True)
+        lines = out.stdout.strip().splitlines()
+        if out.returncode or not lines:
+            raise RuntimeError(f'The template failed: {out.stderr.strip()}')
+        # The template prints before the report
+        report = json.loads(lines[-1])
+        if 'skip' in report:
+            raise Skip(report['skip'])
+        for name, seconds in report.items():
+            results.setdefault(name, []).append(seconds)
+    return results
+
+
+def summary(samples: List[float]) -> Dict[str, Any]:
+    return {'median': statistics.median(samples),
+            'min': min(samples),
+            'max': max(samples),
+            'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'samples': samples}
+
+
+def run(names: List[str], repeat: int, scale: float) -> Dict[str, Any]:
+    """Runs the benchmarks in `names` and returns the results document"""
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            directory = Path(tmp) / name
+            directory.mkdir()
+            try:
+                samples = benchmarks[name](Context(directory, repeat, scale))
+            except Skip as e:
+                skipped[name] = str(e)
+                continue
+            for result, values in samples.items():
+                results[result] = summary(values)
+    return {'version': resultsVersion,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': repeat,
+            'scale': scale,
+            'results': results,
+            'skipped': skipped}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float, floor: float
+            ) -> List[Tuple[str, float, float, str]]:
+    """
+    Returns the name, the baseline and current best times and the verdict
+    of each result in both documents. A result is a regression when its
+    best time grew by more than the fraction `threshold` and by more than
+    `floor` seconds, and an improvement in the opposite case.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        old, new = base['min'], result['min']
+        verdict = ''
+        if new - old > max(old * threshold, floor):
+            verdict = 'REGRESSION'
+        elif old - new > max(old * threshold, floor):
+            verdict = 'improved'
+        rows.append((name, old, new, verdict))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiplies the size of the synthetic data')
+    parser.add_argument('--benchmark', action='append',
+                        help='the benchmarks to run, as glob patterns,'
+                        f' default all of {", ".join(benchmarks)}')
+    parser.add_argument('--output', type=Path,
+                        help='writes the results to this JSON file')
+    parser.add_argument('--compare', type=Path,
+                        help='compares the results with this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='the growth of a best time that is a regression')
+    parser.add_argument('--floor', type=float, default=0.0001,
+                        help='the smallest growth in seconds that counts')
+    parser.add_argument('--template-child', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.template_child:
+        return templateChild()
+    names = [n for n in benchmarks
+             if any(fnmatch(n, p) for p in args.benchmark or ['*'])]
+    document = run(names, args.repeat, args.scale)
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + '\n',
+                               encoding='utf-8')
+    print(f'Median of {args.repeat} runs, scale {args.scale},'
+          f' on {document["cpus"]} CPUs')
+    for name, result in document['results'].items():
+        print(f'  {name:32} {result["median"] * 1000:10.3f} ms'
+              f' (min {result["min"] * 1000:.3f})')
+    for name, reason in document['skipped'].items():
+        print(f'  {name:32} skipped, {reason}')
+    if args.compare is None:
+        return 0
+    baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+    rows = compare(baseline, document, args.threshold, args.floor)
+    print(f'Compared with {args.compare}')
+    for name, old, new, verdict in rows:
+        print(f'  {name:32} {old * 1000:10.3f} ms {new * 1000:10.3f} ms'
+              f' {(new - old) / old:+7.1%} {verdict}')
+    return 1 if any(r[3] == 'REGRESSION' for r in rows) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark of starting workers from a zygote
+
+Compares the time taken to start an application and wait for it to finish,
+when every start runs the bootstrap in a fresh interpreter and when the
+bootstrap is done once by a zygote that forks a worker for each start. The
+bootstrap runs `Master` over synthetic master files.
+
+Run it from the top of the source tree:
+
+    python -m lib.test.scripts.benchZygote --runs 20
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+import argparse
+import logging
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from lib.test.lib import synthetic
+
+package = 'gvconfig'
+masterFiles = ('platform', 'siteMaster', 'organizationMaster', 'gvMaster')
+
+
+def bootstrap(configDir: str) -> None:
+    from gvConfig.master import Master
+    Master.configDir = Path(configDir)
+    Master._L = logging.getLogger('benchZygote')
+    Master._C = synthetic.Configuration
+    Master()()
+
+
+def app() -> int:
+    """The application - all the work is in the bootstrap"""
+    return 0 if synthetic.merged else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--delay', type=float, default=0.01,
+                        help='simulated work per master file in seconds')
+    parser.add_argument('--keys', type=int, default=1000,
+                        help='entries contributed by each master file')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--serve', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        bootstrap(args.child)
+        return app()
+    if args.serve:
+        from lib.zygote import Zygote
+        bootstrap(args.serve[1])
+        Zygote(args.serve[0], app).serve()
+        return 0
+    from lib import zygote
+    with tempfile.TemporaryDirectory() as tmp:
+        configDir = Path(tmp)
+        sock = configDir / 'zygote.sock'
+        for name in masterFiles:
+            synthetic.writeMasterFile(configDir, package, name, args.delay,
+                                      args.keys)
+        fresh = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-m', __spec__.name, '--child',
+                            str(configDir)], check=True)
+            fresh.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, '-m', __spec__.name,
+                                   '--serve', str(sock), str(configDir)])
+        while not sock.exists():
+            time.sleep(0.001)
+        ready = time.perf_counter() - start
+        forked = []
+        try:
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                status = zygote.spawn(sock, stdio=None).wait()
+                forked.append(time.perf_counter() - start)
+                if status:
+                    raise RuntimeError(f'A worker failed with {status}')
+        finally:
+            zygote.stop(sock)
+            server.wait()
+    print(f'{len(masterFiles)} master files, {args.delay * 1000:.1f} ms and'
+          f' {args.keys} entries each, median of {args.runs} starts'
+          f' on {os.cpu_count()} CPUs')
+    print(f'  fresh interpreter  {statistics.median(fresh) * 1000:9.1f} ms')
+    print(f'  zygote worker      {statistics.median(forked) * 1000:9.1f} ms'
+          f'   (zygote ready in {ready * 1000:.1f} ms)')
+    speedup = statistics.median(fresh) / statistics.median(forked)
+    print(f'  speedup {speedup:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
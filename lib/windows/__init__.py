@@ -0,0 +1,21 @@
+"""
+*Windows* platform specific functions
+
+Windows is not supported yet, so the package exports nothing. Its functions
+are to be exported as those of `lib.linux` are, see `lib.platforms`.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from typing import Dict
+
+from lib.platforms import lazyExports
+
+_exports: Dict[str, str] = {}
+
+__all__ = list(_exports)
+
+__getattr__, __dir__ = lazyExports(__name__, _exports)
@@ -0,0 +1,371 @@
+"""
+Pre-fork launcher for applications started from the startup template
+
+Starting an application repeats the whole bootstrap: the interpreter starts,
+the master files run, the platform is examined, logging is set up and the
+user application module is imported. When many instances of the same
+application are started, a zygote does all of this once. It then waits on a
+Unix domain socket and, for each request, forks a worker that runs the
+application. A worker starts in the time that it takes to fork.
+
+A request carries the command line arguments, environment variables and
+working directory of the worker, and the file descriptors to use as its
+standard input, output and error, which are passed over the socket. The
+worker reports its process id when it starts and its exit status when the
+application finishes:
+
+    python -m lib.zygote serve --socket /run/app.sock --target pkg.mod:main
+    python -m lib.zygote spawn --socket /run/app.sock -- arg1 arg2
+
+A forked worker shares everything with the zygote, including some state that
+must be unique to each process. Before it runs the application the worker:
+
+* seeds the `random` module again, and calls the functions registered with
+  `atFork`, where other per-process state, such as the seeds of other random
+  number generators, is renewed,
+* reopens the files of the logging file handlers and drops the connections of
+  the logging socket handlers, so that the worker does not share file offsets
+  or connections with the zygote, and
+* gives the span and profile reports of `lib.spans` and `lib.profiling`
+  names of their own, since the process id is part of them.
+
+The zygote must not run threads of its own when it forks, since only the
+forking thread exists in the worker, so `serve` refuses to start while other
+threads are running. A worker exits with the status returned by the
+application, or 1 if that is not an exit status from 0 to 255.
+
+.. only:: development_administrator
+
+    Module management
+
+    Created on Oct. 18, 2026
+"""
+from importlib import import_module
+import json
+import logging
+import logging.handlers
+import os
+import random
+import socket
+import sys
+import threading
+import traceback
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Sequence,
+                    Tuple, Union)
+
+__all__ = ['Zygote', 'Worker', 'spawn', 'atFork', 'reinitialize']
+
+PathLike = Union[str, os.PathLike]
+
+# The largest request, in bytes
+maxRequest = 1 << 20
+
+_atFork: List[Callable[[], None]] = []
+
+
+def atFork(fn: Callable[[], None]) -> Callable[[], None]:
+    """
+    Registers a function that renews per-process state in a new worker. It
+    can be used as a decorator.
+    """
+    _atFork.append(fn)
+    return fn
+
+
+def _reopenLogging() -> None:
+    loggers = [logging.getLogger()]
+    loggers.extend(l for l in logging.Logger.manager.loggerDict.values()
+                   if isinstance(l, logging.Logger))
+    seen = set()
+    for logger in loggers:
+        for handler in logger.handlers:
+            if id(handler) in seen:
+                continue
+            seen.add(id(handler))
+            if isinstance(handler, logging.FileHandler):
+                if handler.stream is not None:
+                    handler.stream.close()
+                    # A file opened with mode 'w' was already truncated by
+                    # the zygote and must not be truncated by each worker
+                    handler.mode = 'a'
+                    handler.stream = handler._open()
+            elif isinstance(handler, logging.handlers.SocketHandler):
+                if handler.sock is not None:
+                    handler.sock.close()
+                    handler.sock = None     # Reconnects on the next record
+            elif isinstance(handler, logging.handlers.SysLogHandler):
+                handler.socket.close()
+                handler.createSocket()
+
+
+def _renameReports() -> None:
+    spans = sys.modules.get('lib.spans')
+    if spans is not None:
+        spans.reset()
+        if spans.output is not None:
+            spans.output = f'{spans.output}-{os.getpid()}'
+    profiling = sys.modules.get('lib.profiling')
+    if profiling is not None and profiling.current is not None:
+        profiling.current.path = None
+
+
+def _writeReports() -> None:
+    """Writes the reports that would otherwise be written at exit"""
+    spans = sys.modules.get('lib.spans')
+    if spans is not None:
+        spans.write()
+    profiling = sys.modules.get('lib.profiling')
+    if profiling is not None:
+        profiling.finish()
+
+
+def reinitialize() -> None:
+    """Renews the per-process state of a new worker"""
+    random.seed()
+    _reopenLogging()
+    _renameReports()
+    for fn in _atFork:
+        fn()
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]) -> None:
+    conn.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+class Zygote():
+    """
+    Forks a worker that calls `target` for each request received on the Unix
+    domain socket at `path`. The return value of `target` is the exit status
+    of the worker. The modules in `preload` are imported first.
+    """
+
+    def __init__(self, path: PathLike,
+                 target: Callable[[], Optional[int]],
+                 preload: Iterable[str] = ()) -> None:
+        self.path = os.fspath(path)
+        self.target = target
+        for name in preload:
+            import_module(name)
+        self.workers: List[int] = []      # The workers still running
+        self.stopping = False
+        self.listener: Optional[socket.socket] = None
+
+    def listen(self) -> None:
+        # The socket is bound to a temporary name and renamed once it is
+        # listening, so that a client that finds it can connect at once.
+        temporary = f'{self.path}.{os.getpid()}'
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(temporary)
+        os.chmod(temporary, 0o600)
+        self.listener.listen(64)
+        self.listener.settimeout(0.2)
+        os.replace(temporary, self.path)
+
+    def reap(self) -> None:
+        """Collects the workers that have finished"""
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.workers:
+                self.workers.remove(pid)
+
+    def serve(self) -> None:
+        """Handles requests until a stop request is received"""
+        others = [t.name for t in threading.enumerate()
+                  if t is not threading.current_thread()]
+        if others:
+            raise RuntimeError('A zygote must not run threads when it forks,'
+                               f' but these are running: {others}')
+        if self.listener is None:
+            self.listen()
+        try:
+            while not self.stopping:
+                self.reap()
+                try:
+                    conn, _ = self.listener.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    conn.settimeout(None)
+                    self.handle(conn)
+        finally:
+            self.close()
+
+    def handle(self, conn: socket.socket) -> None:
+        data, fds, _, _ = socket.recv_fds(conn, maxRequest, 3)
+        try:
+            request = json.loads(data.decode('utf-8'))
+            if request.get('command') == 'stop':
+                self.stopping = True
+                _send(conn, {'stopped': True})
+                return
+            # Anything still buffered would be written again by the worker
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                self._worker(conn, request, fds)   # Does not return
+            self.workers.append(pid)
+        except (ValueError, OSError) as e:
+            _send(conn, {'error': str(e)})
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _worker(self, conn: socket.socket, request: Dict[str, Any],
+                fds: Sequence[int]) -> None:
+        status = 1
+        try:
+            self.listener.close()
+            for target, fd in zip((0, 1, 2), fds):
+                os.dup2(fd, target)
+            reinitialize()
+            if request.get('cwd'):
+                os.chdir(request['cwd'])
+            os.environ.update(request.get('env') or {})
+            sys.argv = [sys.argv[0], *request.get('argv', ())]
+            _send(conn, {'pid': os.getpid()})
+            status = self._run()
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                _writeReports()
+                logging.shutdown()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                _send(conn, {'status': status})
+            finally:
+                os._exit(status)
+
+    def _run(self) -> int:
+        try:
+            result = self.target()
+        except SystemExit as e:
+            result = e.code
+        if result is None:
+            return 0
+        # os._exit() keeps only the low byte of the status
+        return result if isinstance(result, int) and 0 <= result <= 255 \
+            else 1
+
+    def close(self) -> None:
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class Worker():
+    """A worker started by a zygote, as seen by the process that asked"""
+
+    def __init__(self, conn: socket.socket) -> None:
+        self.conn = conn
+        self.reader = conn.makefile('rb')
+        reply = self._read()
+        if 'error' in reply:
+            self.close()
+            raise OSError(f'The zygote could not start a worker:'
+                          f' {reply["error"]}')
+        # A worker that fails before the application starts reports only its
+        # status.
+        self.pid: Optional[int] = reply.get('pid')
+        self.status: Optional[int] = reply.get('status')
+        if self.status is not None:
+            self.close()
+
+    def _read(self) -> Dict[str, Any]:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError('The worker ended without a status')
+        return json.loads(line)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Waits for the worker to finish and returns its exit status"""
+        if self.status is None:
+            self.conn.settimeout(timeout)
+            self.status = self._read()['status']
+            self.close()
+        return self.status
+
+    def close(self) -> None:
+        self.reader.close()
+        self.conn.close()
+
+
+def _request(path: PathLike, message: Dict[str, Any],
+             fds: Sequence[int] = ()) -> socket.socket:
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(os.fspath(path))
+        socket.send_fds(conn, [json.dumps(message).encode('utf-8')], fds)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def spawn(path: PathLike,
+          argv: Sequence[str] = (),
+          env: Optional[Dict[str, str]] = None,
+          cwd: Optional[PathLike] = None,
+          stdio: Optional[Tuple[int, int, int]] = (0, 1, 2)) -> Worker:
+    """
+    Asks the zygote listening at `path` for a worker with the command line
+    arguments `argv`. The worker uses the file descriptors in `stdio` as its
+    standard input, output and error, or those of the zygote if it is None.
+    """
+    message = {'argv': list(argv), 'env': env or {},
+               'cwd': os.fspath(cwd) if cwd else None}
+    return Worker(_request(path, message, stdio or ()))
+
+
+def stop(path: PathLike) -> None:
+    """Asks the zygote listening at `path` to stop"""
+    with _request(path, {'command': 'stop'}) as conn:
+        conn.recv(64)
+
+
+def _target(spec: str) -> Callable[[], Optional[int]]:
+    module, _, name = spec.partition(':')
+    return getattr(import_module(module), name or 'main')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='python -m lib.zygote',
+        description='Starts workers of an application by forking a zygote')
+    commands = parser.add_subparsers(dest='command', required=True)
+    s = commands.add_parser('serve', help='bootstrap once and serve requests')
+    s.add_argument('--socket', required=True)
+    s.add_argument('--target', required=True,
+                   help='module:function run by each worker')
+    s.add_argument('--preload', action='append', default=[],
+                   help='a module to import before serving')
+    c = commands.add_parser('spawn', help='start a worker and wait for it')
+    c.add_argument('--socket', required=True)
+    c.add_argument('args', nargs='*')
+    t = commands.add_parser('stop', help='stop a zygote')
+    t.add_argument('--socket', required=True)
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        Zygote(args.socket, _target(args.target), args.preload).serve()
+        return 0
+    if args.command == 'stop':
+        stop(args.socket)
+        return 0
+    return spawn(args.socket, args.args, cwd=os.getcwd()).wait()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
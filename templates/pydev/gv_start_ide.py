@@ -49,16 +49,61 @@ This code can be used in two ways:
 
 import sys
 import os
+import functools
 import importlib
-from typing import Callable, Optional
+from typing import Callable, List, Optional
+
+from lib import spans
+from lib.lazyImport import lazyModule
+from lib.spans import span
+
+# Only needed when a configuration file is given on the command line
+cfgIndex = lazyModule('gvConfig.cfgIndex')
+cfgAuth = lazyModule('gvConfig.cfgAuth')
+# Only needed when the user application is asynchronous
+lifecycle = lazyModule('lib.lifecycle')
+# Only needed when the configuration is watched for changes
+cfgReload = lazyModule('gvConfig.cfgReload')
+# Only needed in queue mode, see the logqueue configuration key
+logQueue = lazyModule('lib.logQueue')
+# Only needed once main() runs
+platforms = lazyModule('lib.platforms')
+# lib.profiling is only imported when profiling. The GV_PROFILE environment
+# variable starts a session when the module is imported, which is done here
+# so that the profile covers the imports as well.
+profiling = None
+if os.environ.get('GV_PROFILE'):
+    from lib import profiling
+# The frozen copy of the configuration, see freezeConfiguration()
+frozen = None
+# Who may change the groups of the configuration file, see
+# loadConfigurationFile()
+authIndex = None
 
 print(f'In start of template - {sys.path}')
 
-import lib.configuration as _c
+# The startup is divided into timed spans. They are only recorded when the
+# trace configuration key, or the GV_TRACE environment variable, gives the
+# path prefix of the reports, see lib.spans.
+with span('lib.configuration', 'import'):
+    import lib.configuration as _c
 _C = _c.Configuration
-import lib.gvLogging as _l
+
+
+def _key(name: str):
+    """
+    The configuration key `name`. The keys that this version of
+    lib.configuration does not define yet are given by their names, so that
+    they are simply not set.
+    """
+    return getattr(_c, name, name)
+
+
+with span('lib.gvLogging', 'import'):
+    import lib.gvLogging as _l
 _L = _l.Logging
-_l.setLogging()  # Setup the Global Village logger, if not already done
+with span('logging setup', 'stage'):
+    _l.setLogging()  # Setup the Global Village logger, if not already done
 
 
 
@@ -66,11 +111,29 @@ _l.setLogging()  # Setup the Global Village logger, if not already done
 # Initialize the Configuration class. This will acquire disk files or remote
 # site based configuration files, as well as the command line arguments if
 # desired.
-_C = _C()  # Initialize the local configuration
+with span('configuration', 'stage'):
+    _C = _C()  # Initialize the local configuration
+if _C.get(_key('trace')):
+    spans.enable(_C.get(_key('trace')))
+# The profile configuration key selects the profiler, the part of the run that
+# is profiled and where the profiles go, see lib.profiling. Profiles are
+# written when the process exits.
+if _C.get(_c.profile):
+    from lib import profiling
+    profiling.start(_C.get(_c.profile),
+                    '${module}')
 # Initializes the site logger if not already done and fully configures the
 # Global Village logger if necessary.
 # Record the logging state in the configuration
-_L = _l.initializeLogging()
+with span('logging initialization', 'stage'):
+    _L = _l.initializeLogging()
+# The logqueue configuration key moves the log handlers behind a bounded queue
+# that a writer thread empties, so that logging calls do not wait for slow
+# disks or syslog, see lib.logQueue. The queue is flushed when main() returns
+# or fails. A zygote must not run threads when it forks, so in zygote mode
+# each worker installs the queue when main() starts instead.
+if _C.get(_key('logqueue')) and not _C.get(_key('zygote')):
+    logQueue.install(_C.get(_key('logqueue')))
 _C.setMember(_c.log,
              _L)
 
@@ -105,25 +168,113 @@ class gvError(Exception):
         return self.msg
 
 
+def phase(name: str) -> None:
+    """Reports a phase of the run to the profiling session, if any"""
+    if profiling is not None:
+        profiling.phase(name)
+
+
+def freezeConfiguration() -> None:
+    """
+    Gives the application a frozen copy of the finished configuration, with
+    a slot for each key, for reads in its hot paths, when the freeze
+    configuration key is set, see gvConfig.frozen. The copy is kept in
+    `frozen` and in the frozen configuration key. Called once the bootstrap
+    has finished, so that the copy has everything that it added.
+    """
+    global frozen
+    if _C.get(_key('freeze')):
+        from gvConfig.frozen import freeze
+        frozen = freeze(_C)
+        _C.setMember(_key('frozen'),
+                     frozen)
+
+
+def configurationGroups() -> List[str]:
+    """The groups of this organization, site and user"""
+    return [_g for _g in (_C.get(_key('organization')),
+                          _C.get(_key('site')),
+                          _C.get(_c.userid)) if _g]
+
+
+def loadConfigurationFile(path: str) -> None:
+    """
+    Adds the groups of this organization, site and user in the configuration
+    file `path` to the configuration. The groups that their values are taken
+    from are loaded too, but only to resolve those values. The index of the
+    configuration file gives their place in the file and is rebuilt when the
+    file changes. The permissions that the loaded groups give are indexed in
+    `authIndex`, see gvConfig.cfgAuth.
+    """
+    global authIndex
+    with span('configuration file', 'stage', file=path):
+        _cg = configurationGroups()
+        _cd = cfgIndex.loadGroups(path, _cg)
+        authIndex = cfgAuth.AuthIndex(_cd)
+        for _g in _cg:
+            if _g not in _cd:
+                continue
+            for _k, _v in _cd[_g].items():
+                _C.setMember(_k,
+                             _v)
+
+
+def applyConfigurationChanges(notification) -> None:
+    """
+    Applies the changes to the groups of this organization, site and user
+    that the configuration watcher reports, see gvConfig.watch. A change that
+    the user may not make to a group, by the permissions in `authIndex`
+    before the change, is not applied. The permissions then follow the
+    changes that were applied.
+    """
+    if notification.error is not None:
+        _L.warning(f'Configuration change in {notification.path} not'
+                   f' applied: {notification.error}')
+        return
+    _cg = configurationGroups()
+    _user = _C.get(_c.userid)
+    _applied = []
+    for (_g, _k), _ch in notification.changes.items():
+        if authIndex is not None:
+            if _ch.old is cfgReload.missing:
+                _p = cfgAuth.Permission.ADD
+            elif _ch.new is cfgReload.missing:
+                _p = cfgAuth.Permission.DELETE
+            else:
+                _p = cfgAuth.Permission.CHANGE
+            try:
+                authIndex.require(_user, _g, _p)
+            except PermissionError as e:
+                _L.warning(f'Configuration change in {notification.path} not'
+                           f' applied: {e}')
+                continue
+        _applied.append((_g, _k))
+        if _g in _cg:
+            _C.setMember(_k,
+                         None if _ch.new is cfgReload.missing else _ch.new)
+    if authIndex is not None and notification.data is not None:
+        authIndex.update(notification.data, _applied)
+
+
 def main() -> int:
     """The application agnostic startup controller"""
 
+    if _C.get(_key('logqueue')):
+        logQueue.install(_C.get(_key('logqueue')))
     try:
         # Stage 1
         # Validate the configuration data
         # Validate that we are running on a supported platform
-        plsys: Optional[str] = None
-        sa: str = _C.get(_c.pname)
-        if sa is None:
-            sa = 'StartupApp template'
-        p: str = sys.platform
-        if p.startswith('win32'):
-            raise(ValueError, f'{sa} - Windows is not supported yet')
-        elif p.startswith('linux'):
-            plsys = 'linux'
-        else:
-            # Platform is unsupported
-            raise(ValueError, f'{sa} - {plsys} is an unsupported platform')
+        with span('validation', 'stage'):
+            sa: str = _C.get(_c.pname)
+            if sa is None:
+                sa = 'StartupApp template'
+            # The platform is examined once per process, so a worker forked
+            # by a zygote finds it already done, see lib.platforms.
+            try:
+                platforms.package()
+            except platforms.UnsupportedPlatform as e:
+                raise ValueError(f'{sa} - {e}') from e
 
         # Load the user's application specific high level class
         um = _C.get(_c.umname)
@@ -132,21 +283,64 @@ def main() -> int:
         _uac: Optional[Callable] = None
         if um and upk and upc:
             # from upk import um.uc as _uac
-            _uac = importlib.import_module(um,
-                                           upk).upc
+            with span(um, 'import', package=upk):
+                _uac = importlib.import_module(um,
+                                               upk).upc
 
         # Gives the program name
         _C.setMember(_c.pname,
                      os.path.basename(sys.argv[0]))
 
+        # An application whose startup, __call__ or shutdown is a coroutine
+        # function runs on an event loop, together with the rest of the
+        # bootstrap, see lib.lifecycle.
+        _async = bool(_uac) and lifecycle.isAsync(_uac)
+
+        # The rest of the bootstrap. When the configuration leaves the master
+        # files to the application they run here.
+        _bootstrap: List = []
+        if _C.get(_key('asyncbootstrap')):
+            from gvConfig.master import Master
+            _bootstrap.append(Master().arun() if _async else Master())
         # If we got a command line argument specifying the name of the config
         # file to use for the test run use it if dynamic configuration is not
         # suppressed.
-        #TODO: Handle configuration file processing including the index
-
-#       _tf = sys.argv[1] if len(sys.argv) > 1 else None
+        _tf = sys.argv[1] if len(sys.argv) > 1 else None
+        if _tf and not _C.get(_key('noargs')):
+            _bootstrap.append(functools.partial(loadConfigurationFile,
+                                                _tf))
+
+        # The watch configuration key keeps the configuration up to date while
+        # the application runs. Only a master file or a group that changed is
+        # processed again. The application can subscribe to the watcher for
+        # notifications of the changes.
+        if _C.get(_key('watch')):
+            from gvConfig.master import Master
+            from gvConfig.watch import ConfigWatcher
+            _w = ConfigWatcher(Master(),
+                               [_tf] if _tf and not _C.get(_key('noargs'))
+                               else [])
+            _w.subscribe(applyConfigurationChanges)
+            _w.start()
+            _C.setMember(_key('watcher'),
+                         _w)
 
         # Stage 3 - Run the application
+        if _async:
+            # The bootstrap runs while the application starts up. Ctrl-C
+            # cancels the outstanding tasks and then runs shutdown.
+            phase('run')
+            with span('lifecycle', 'stage'):
+                _ret = lifecycle.run(_uac,
+                                     _bootstrap,
+                                     bool(_C.get(_c.debug)),
+                                     freezeConfiguration)
+            phase('shutdown')
+            return _ret
+        for _b in _bootstrap:
+            _b()
+        freezeConfiguration()
+        phase('run')
         # The first step imports the user's module
         # The second step creates an instance of the user's module
         # The third step invokes the user's module as a callable
@@ -165,7 +359,8 @@ tolerates the lack of a startup method.
                                  ' class must be callable'))
             
             if 'startup' in _uac:
-                _ret = _uac.startup()
+                with span('startup', 'stage'):
+                    _ret = _uac.startup()
                 if _ret > 0:
                     raise(AssertionError('Application startup failed with'
                                          f' return code {_ret}'))
@@ -179,8 +374,9 @@ a parameter and that it contains a callable method that runs the application.
             # The first step imports the user's module
             # The second step creates an instance of the user's module
             # The third step invokes the user's module as a callable
-            _ret = max(_uac(),
-                   _ret)
+            with span('run', 'stage'):
+                _ret = max(_uac(),
+                       _ret)
                 
             if _ret > 0:
                 raise(AssertionError('The application failed with return'
@@ -191,6 +387,7 @@ a parameter and that it contains a callable method that runs the application.
 
 
         # Stage 4 Application completed - Do application cleanup
+        phase('shutdown')
 
         """"
 !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
@@ -201,8 +398,9 @@ lack of a shutdown method.
 !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
         """
         if _uac and 'shutdown' in _uac:
-            _ret = max(_uac.shutdown(),
-                       _ret)
+            with span('shutdown', 'stage'):
+                _ret = max(_uac.shutdown(),
+                           _ret)
             if _ret > 0:
                 raise(AssertionError('Application failed during shutdown with'
                                      f' return code {_ret}'))
@@ -220,6 +418,12 @@ lack of a shutdown method.
         else:
             sys.exit(2)
 
+    finally:
+        # Every record logged so far is written before the process goes on
+        # to exit
+        if _C.get(_key('logqueue')):
+            logQueue.flush()
+
 
 # Note that this code runs before the start of the main-line.
 if __name__ == '__main__':
@@ -230,16 +434,20 @@ if __name__ == '__main__':
         import doctest
         doctest.testmod()
 
-    if _C.get(_c.profile):
-        import cProfile
-        import pstats
-        profile_filename = '${module}_profile.txt'
-        cProfile.run('main()', profile_filename)
-        statsfile = open('profile_stats.txt', 'wb')
-        p = pstats.Stats(profile_filename, stream=statsfile)
-        stats = p.strip_dirs().sort_stats('cumulative')
-        stats.print_stats()
-        statsfile.close()
+    # In zygote mode the bootstrap above and the import of the user module
+    # are done once. Each request on the socket named by the zygote
+    # configuration key then forks a worker that runs main(), see lib.zygote.
+    # Anything that starts a thread, such as the log queue and the
+    # configuration watcher, is started by main() in each worker.
+    if _C.get(_key('zygote')):
+        from lib.zygote import Zygote
+        # The workers inherit the platform functions resolved here
+        platforms.preload()
+        if _C.get(_c.umname):
+            importlib.import_module(_C.get(_c.umname),
+                                    _C.get(_c.umpkg))
+        Zygote(_C.get(_key('zygote')),
+               main).serve()
         sys.exit(0)
 
     # Run the application startup controller